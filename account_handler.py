@@ -1,75 +1,142 @@
 # 계좌 정보 처리 전용 모듈
-from PyQt5.QtCore import QObject, pyqtSignal
+import logging
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from config import Config
+from metrics import timed
+from portfolio import PortfolioValuation
+from tr_decoder import TrDecoder
+from tr_scheduler import PRIORITY_INTERACTIVE, PRIORITY_NORMAL
+
+logger = logging.getLogger(__name__)
+
+BALANCE_RQNAME = "계좌평가잔고내역요청"
 
 class AccountHandler(QObject):
-    # 계좌 정보 업데이트 시그널
+    # 계좌 정보 업데이트 시그널 (실시간 평가는 PORTFOLIO_REFRESH_MS 주기로 묶어서 전달)
     account_updated = pyqtSignal(dict)
     
     def __init__(self, kiwoom_api):
         super().__init__()
         self.kiwoom = kiwoom_api
+        self.decoder = TrDecoder(kiwoom_api)  # 스키마 기반 TR 응답 변환
         
-    def process_balance_data(self, rqname, trcode):
-        """계좌 잔고 데이터 처리"""
-        try:
-            account_data = {}
+        # 보유종목 실시간 평가 (틱마다 평가금액 증분 갱신, 잔고 조회는 주기적으로만)
+        self.portfolio = PortfolioValuation()
+        self.portfolio.account_updated.connect(self.account_updated)
+        self.balance_request = None  # 진행 중인 잔고 조회 (중복 요청 방지)
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self._request_reconcile)
+        self._reconcile_args = None
+        
+    def request_balance(self, scheduler, account, priority=PRIORITY_INTERACTIVE, callback=None):
+        """잔고 조회 요청 (opw00018 - 이미 대기/진행 중이면 그 요청을 반환)"""
+        request = self.balance_request
+        if request is not None and not request.future.done():
+            return request
             
-            if rqname == "계좌평가잔고내역요청":
-                # 예수금
-                deposit = self.kiwoom.get_comm_data(trcode, "", rqname, 0, "예수금")
-                if deposit:
-                    account_data['deposit'] = abs(int(deposit.strip()))
+        def on_pages(pages):
+            self.apply_balance(pages)
+            if callback:
+                callback(pages)
                 
-                # 총평가액
-                total_value = self.kiwoom.get_comm_data(trcode, "", rqname, 0, "총평가액")
-                if total_value:
-                    account_data['total_value'] = abs(int(total_value.strip()))
-                
-                # 총손익
-                total_profit = self.kiwoom.get_comm_data(trcode, "", rqname, 0, "총손익금액")
-                if total_profit:
-                    account_data['total_profit'] = int(total_profit.strip())
-                
-                # 수익률 계산
-                if 'total_value' in account_data and 'total_profit' in account_data:
-                    if account_data['total_value'] > 0:
-                        profit_rate = (account_data['total_profit'] / (account_data['total_value'] - account_data['total_profit'])) * 100
-                        account_data['profit_rate'] = profit_rate
-                
-                # 보유종목 개수
-                stock_count = self.kiwoom.get_repeat_cnt(trcode, rqname)
-                account_data['stock_count'] = stock_count
-                
-                self.account_updated.emit(account_data)
+        self.balance_request = scheduler.submit(
+            BALANCE_RQNAME, "opw00018",
+            {
+                "계좌번호": account,
+                "비밀번호": "",
+                "비밀번호입력매체구분": "00",
+                "조회구분": "1",
+            },
+            parser=self.process_balance_data,
+            priority=priority,
+            callback=on_pages,
+        )
+        return self.balance_request
+        
+    def start_reconcile(self, scheduler, account, interval_sec=None):
+        """주기적 잔고 조회 시작 (실시간 평가값을 증권사 값에 다시 맞춤)"""
+        self._reconcile_args = (scheduler, account)
+        self.reconcile_timer.start(int((interval_sec or Config.PORTFOLIO_RECONCILE_SEC) * 1000))
+        self.portfolio.start()
+        
+    def stop_reconcile(self):
+        self.reconcile_timer.stop()
+        self.portfolio.stop()
+        self.balance_request = None
+        self._reconcile_args = None
+        
+    def _request_reconcile(self):
+        if self._reconcile_args is not None:
+            scheduler, account = self._reconcile_args
+            self.request_balance(scheduler, account, priority=PRIORITY_NORMAL)
+            
+    def apply_balance(self, pages):
+        """잔고 조회 전체 페이지로 실시간 평가를 맞추고 계좌 요약 즉시 전달"""
+        pages = [page for page in pages if page is not None]
+        if not pages:
+            return None
+        single = pages[0].single
+        holdings = [holding for page in pages for holding in self.holdings_from_page(page)]
+        drift = self.portfolio.reconcile(single['deposit'], holdings,
+                                         single['total_value'], single['total_profit'])
+        if drift:
+            logger.info(f"💰 잔고 조회 반영 - 실시간 평가 차이 {drift:+,.0f}원")
+        self.portfolio.flush()
+        return holdings
+        
+    @timed("kiwoom_balance_handler_seconds", "계좌평가잔고 응답 처리 시간")
+    def process_balance_data(self, rqname, trcode):
+        """계좌 잔고 응답 1페이지 변환 (TrPage 반환 - 전체 페이지를 받으면 apply_balance 로 반영)"""
+        try:
+            if rqname != BALANCE_RQNAME:
+                return None
                 
+            # 싱글 필드 + 보유종목 전체 행을 한 번에 변환
+            return self.decoder.decode(trcode, rqname)
+            
         except Exception as e:
-            print(f"계좌 데이터 처리 오류: {e}")
+            logger.error(f"계좌 데이터 처리 오류: {e}")
+            return None
             
     def get_holdings_data(self, rqname, trcode):
         """보유종목 데이터 가져오기"""
         try:
-            holdings = []
-            stock_count = self.kiwoom.get_repeat_cnt(trcode, rqname)
-            
-            for i in range(stock_count):
-                stock_data = {
-                    'name': self.kiwoom.get_comm_data(trcode, "", rqname, i, "종목명").strip(),
-                    'code': self.kiwoom.get_comm_data(trcode, "", rqname, i, "종목번호").strip(),
-                    'quantity': int(self.kiwoom.get_comm_data(trcode, "", rqname, i, "보유수량").strip()),
-                    'buy_price': int(self.kiwoom.get_comm_data(trcode, "", rqname, i, "매입가").strip()),
-                    'current_price': int(self.kiwoom.get_comm_data(trcode, "", rqname, i, "현재가").strip()),
-                    'profit': int(self.kiwoom.get_comm_data(trcode, "", rqname, i, "평가손익").strip()),
-                }
-                
-                # 수익률 계산
-                if stock_data['buy_price'] > 0:
-                    profit_rate = ((stock_data['current_price'] - stock_data['buy_price']) / stock_data['buy_price']) * 100
-                    stock_data['profit_rate'] = profit_rate
-                
-                holdings.append(stock_data)
-                
-            return holdings
+            return self.holdings_from_page(self.decoder.decode(trcode, rqname))
             
         except Exception as e:
-            print(f"보유종목 데이터 처리 오류: {e}")
+            logger.error(f"보유종목 데이터 처리 오류: {e}")
+            return []
+            
+    def holdings_from_page(self, page):
+        """TrPage -> 보유종목 dict 목록"""
+        rows = page.rows
+        if not page.count:
             return []
+            
+        # 수익률은 매입가 대비 현재가로 컬럼 단위 계산
+        buy_price = rows['buy_price']
+        profit_rate = np.divide((rows['current_price'] - buy_price) * 100.0, buy_price,
+                                out=np.zeros(page.count), where=buy_price > 0)
+        
+        holdings = []
+        for name, code, quantity, available, price, current, profit, rate in zip(
+                rows['name'].tolist(), rows['code'].tolist(), rows['quantity'].tolist(),
+                rows['available'].tolist(), buy_price.tolist(), rows['current_price'].tolist(),
+                rows['profit'].tolist(), profit_rate.tolist()):
+            stock_data = {
+                'name': name,
+                'code': code,
+                'quantity': quantity,
+                'available': available,
+                'buy_price': price,
+                'current_price': current,
+                'profit': profit,
+            }
+            if price > 0:
+                stock_data['profit_rate'] = rate
+            holdings.append(stock_data)
+            
+        return holdings
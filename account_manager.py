@@ -0,0 +1,282 @@
+# 여러 계좌 관리
+# 계좌마다 잔고/보유종목 평가(AccountHandler)와 주문 상태(OrderManager)를 따로 두고,
+# 체잔 이벤트는 한 번만 변환해 해당 계좌로, 실시간 틱은 그 종목을 보유한 계좌에만 전달한다.
+# 잔고 조회는 공용 TR 대기열에 계좌를 돌아가며 하나씩 넣고, 전체 합계는 계좌 요약이 바뀔 때 차이만 더한다.
+import logging
+import time
+from functools import partial
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from account_handler import AccountHandler
+from config import Config
+from metrics import timed
+from order_manager import ChejanDecoder, OrderManager
+from tr_scheduler import PRIORITY_NORMAL, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 계좌 합계에 더하는 요약 항목
+TOTAL_KEYS = ('deposit', 'total_value', 'total_profit', 'total_eval', 'stock_count')
+
+
+def select_accounts(login_accounts):
+    """로그인 계좌 중 관리할 계좌 목록 (ACCOUNTS 가 있으면 그 계좌만, ACCOUNT_NUMBER 를 맨 앞으로)"""
+    accounts = [account for account in login_accounts if account]  # 빈 문자열 제거
+    if Config.ACCOUNTS:
+        accounts = [account for account in accounts if account in Config.ACCOUNTS]
+    if Config.ACCOUNT_NUMBER in accounts:
+        accounts.remove(Config.ACCOUNT_NUMBER)
+        accounts.insert(0, Config.ACCOUNT_NUMBER)
+    return accounts
+
+
+class _PortfolioSubscriptions:
+    """계좌 평가의 실시간 구독 요청을 AccountManager 보유 인덱스로 전달"""
+
+    def __init__(self, manager, portfolio):
+        self.manager = manager
+        self.portfolio = portfolio
+
+    def subscribe(self, code):
+        self.manager._hold(code, self.portfolio)
+
+    def unsubscribe(self, code):
+        self.manager._release(code, self.portfolio)
+
+
+class AccountManager(QObject):
+    """계좌별 잔고/주문 상태 + 전체 계좌 합계"""
+
+    account_updated = pyqtSignal(str, dict)  # (계좌번호, 계좌 요약)
+    aggregate_updated = pyqtSignal(dict)  # 전체 계좌 합계 (갱신 주기당 최대 1회)
+
+    def __init__(self, kiwoom, scheduler, subscriptions=None, clock=time.monotonic, refresh_ms=None):
+        super().__init__()
+        self.kiwoom = kiwoom
+        self.scheduler = scheduler  # 공용 TR 대기열 (TrScheduler)
+        self.subscriptions = subscriptions  # 실시간 구독 (RealSubscriptionManager)
+        self.clock = clock
+        self.decoder = ChejanDecoder(kiwoom)
+        self.order_limiter = RateLimiter(Config.ORDER_RATE_PER_SECOND, 1.0, clock)  # 주문 제한은 로그인 단위
+
+        self.accounts = []  # 등록 순서
+        self.handlers = {}  # 계좌번호 -> AccountHandler
+        self.order_managers = {}  # 계좌번호 -> OrderManager
+        self.primary = None  # 화면 표시 / 자동 주문 계좌
+        self._slots = {}  # 계좌번호 -> account_updated 연결 (해제용)
+
+        self.holders = {}  # 종목코드 -> [보유 계좌 PortfolioValuation]
+        self.summaries = {}  # 계좌번호 -> 마지막 계좌 요약
+        self.totals = dict.fromkeys(TOTAL_KEYS, 0)
+        self.aggregate_dirty = False
+        self.unrouted = 0  # 등록되지 않은 계좌의 체잔 이벤트 수
+
+        self.refresh_ms = refresh_ms or Config.PORTFOLIO_REFRESH_MS
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.flush)
+        self.order_timer = QTimer(self)
+        self.order_timer.timeout.connect(self.pump_orders)
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self.reconcile_next)
+        self._cursor = 0
+
+    # ------------------------------------------------------------------
+    # 계좌 등록
+    # ------------------------------------------------------------------
+    def add_account(self, account, handler=None, order_manager=None):
+        """계좌 등록 (기존 핸들러/주문 관리자를 넘기면 그대로 사용)
+
+        Returns:
+            (AccountHandler, OrderManager)
+        """
+        if account in self.handlers:
+            return self.handlers[account], self.order_managers[account]
+
+        handler = handler or AccountHandler(self.kiwoom)
+        order_manager = order_manager or OrderManager(self.kiwoom, account=account, clock=self.clock)
+        order_manager.account = account
+        order_manager.limiter = self.order_limiter
+        order_manager.stop()  # 주문 대기열은 pump_orders 가 한 타이머로 처리
+
+        portfolio = handler.portfolio
+        portfolio.stop()  # 계좌 요약은 flush 가 한 타이머로 처리
+        portfolio.subscriptions = _PortfolioSubscriptions(self, portfolio)
+        for code in portfolio.slots:
+            self._hold(code, portfolio)
+        order_manager.position_changed.connect(portfolio.on_position)
+        slot = partial(self._on_account_updated, account)
+        handler.account_updated.connect(slot)
+        self._slots[account] = slot
+
+        self.accounts.append(account)
+        self.handlers[account] = handler
+        self.order_managers[account] = order_manager
+        if self.primary is None:
+            self.primary = account
+        self._update_reconcile_interval()
+        return handler, order_manager
+
+    def handler(self, account=None):
+        return self.handlers.get(account or self.primary)
+
+    def order_manager(self, account=None):
+        return self.order_managers.get(account or self.primary)
+
+    def __len__(self):
+        return len(self.accounts)
+
+    # ------------------------------------------------------------------
+    # 시작 / 중지
+    # ------------------------------------------------------------------
+    def start(self, reconcile_sec=None):
+        """계좌 요약 / 주문 대기열 / 순환 잔고 조회 시작"""
+        self.refresh_timer.start(self.refresh_ms)
+        self.order_timer.start(Config.ORDER_PUMP_INTERVAL_MS)
+        self._update_reconcile_interval(reconcile_sec)
+
+    def stop(self):
+        self.refresh_timer.stop()
+        self.order_timer.stop()
+        self.reconcile_timer.stop()
+        for handler in self.handlers.values():
+            handler.balance_request = None
+
+    def clear(self):
+        """계좌 등록 해제 (로그아웃용 - 실시간 해제는 RealSubscriptionManager.teardown 이 처리)"""
+        self.stop()
+        for account in self.accounts:
+            handler = self.handlers[account]
+            order_manager = self.order_managers[account]
+            try:
+                handler.account_updated.disconnect(self._slots[account])
+                order_manager.position_changed.disconnect(handler.portfolio.on_position)
+            except TypeError:
+                pass
+            handler.portfolio.clear()
+            handler.portfolio.subscriptions = None
+        self.accounts = []
+        self.handlers = {}
+        self.order_managers = {}
+        self.primary = None
+        self._slots = {}
+        self.holders.clear()
+        self.summaries.clear()
+        self.totals = dict.fromkeys(TOTAL_KEYS, 0)
+        self.aggregate_dirty = False
+        self._cursor = 0
+
+    def _update_reconcile_interval(self, reconcile_sec=None):
+        """계좌 수에 맞춰 순환 조회 간격 설정 (계좌당 주기는 늘어나도 전체 TR 부하는 일정)"""
+        if not self.refresh_timer.isActive() or not self.accounts:
+            return
+        period = reconcile_sec or Config.PORTFOLIO_RECONCILE_SEC
+        interval = max(period / len(self.accounts), Config.PORTFOLIO_RECONCILE_MIN_SEC)
+        self.reconcile_timer.start(int(interval * 1000))
+
+    # ------------------------------------------------------------------
+    # 잔고 조회
+    # ------------------------------------------------------------------
+    def request_balance(self, account=None, priority=PRIORITY_NORMAL, callback=None):
+        """계좌 잔고 조회 (공용 TR 대기열, 진행 중이면 그 요청을 반환)"""
+        account = account or self.primary
+        handler = self.handlers.get(account)
+        if handler is None:
+            return None
+        return handler.request_balance(self.scheduler, account, priority, callback)
+
+    def request_all(self, priority=PRIORITY_NORMAL):
+        """모든 계좌 잔고 조회 (로그인 직후 1회)"""
+        return [self.request_balance(account, priority) for account in self.accounts]
+
+    def reconcile_next(self):
+        """다음 계좌 1개 잔고 조회 (타이머 주기)"""
+        if not self.accounts:
+            return None
+        account = self.accounts[self._cursor % len(self.accounts)]
+        self._cursor += 1
+        return self.request_balance(account)
+
+    # ------------------------------------------------------------------
+    # 이벤트 분배
+    # ------------------------------------------------------------------
+    @timed("kiwoom_chejan_handler_seconds", "OnReceiveChejanData 처리 시간")
+    def on_receive_chejan_data(self, gubun, item_cnt, fid_list):
+        """OnReceiveChejanData 를 한 번 변환해서 해당 계좌 주문 관리자로 전달"""
+        try:
+            event = self.decoder.decode(gubun)
+            if event is None:
+                return
+            order_manager = self.order_managers.get(event.account)
+            if order_manager is None:
+                self.unrouted += 1
+                return
+            order_manager.on_event(event)
+        except Exception as e:
+            logger.error(f"❌ 체결 데이터 처리 오류: {e}")
+
+    def on_tick(self, code, price):
+        """실시간 체결가 (보유 계좌에만 전달, 보유 계좌가 없으면 dict 조회 1회)"""
+        portfolios = self.holders.get(code)
+        if portfolios is None:
+            return
+        for portfolio in portfolios:
+            portfolio.on_tick(code, price)
+
+    def _hold(self, code, portfolio):
+        portfolios = self.holders.get(code)
+        if portfolios is None:
+            self.holders[code] = [portfolio]
+            if self.subscriptions is not None:
+                self.subscriptions.subscribe(code)
+        elif portfolio not in portfolios:
+            portfolios.append(portfolio)
+
+    def _release(self, code, portfolio):
+        portfolios = self.holders.get(code)
+        if portfolios is None or portfolio not in portfolios:
+            return
+        portfolios.remove(portfolio)
+        if not portfolios:
+            del self.holders[code]
+            if self.subscriptions is not None:
+                self.subscriptions.unsubscribe(code)
+
+    def pump_orders(self):
+        """계좌별 주문 대기열 전송 (1초 슬라이딩 윈도우 제한을 공용으로 써서 계좌 수와 관계없이 초당 제한 유지)"""
+        for order_manager in self.order_managers.values():
+            if order_manager.queue:
+                order_manager.pump()
+
+    def pending_orders(self):
+        return sum(order_manager.pending_count() for order_manager in self.order_managers.values())
+
+    # ------------------------------------------------------------------
+    # 계좌 요약 / 합계
+    # ------------------------------------------------------------------
+    def flush(self):
+        """바뀐 계좌 요약 전달 후 합계는 1회만 전달 (타이머 주기)"""
+        for account in self.accounts:
+            self.handlers[account].portfolio.flush()
+        if self.aggregate_dirty:
+            self.aggregate_dirty = False
+            self.aggregate_updated.emit(self.aggregate())
+
+    def _on_account_updated(self, account, summary):
+        """계좌 요약이 바뀌면 이전 값과의 차이만 합계에 반영"""
+        previous = self.summaries.get(account)
+        totals = self.totals
+        for key in TOTAL_KEYS:
+            totals[key] += summary.get(key, 0) - (previous.get(key, 0) if previous else 0)
+        self.summaries[account] = summary
+        self.aggregate_dirty = True
+        self.account_updated.emit(account, summary)
+
+    def aggregate(self):
+        """전체 계좌 합계 (계좌 요약과 같은 형식 + 'account_count')"""
+        totals = dict(self.totals)
+        invested = totals['total_value'] - totals['total_profit']
+        if totals['total_value'] > 0 and invested:
+            totals['profit_rate'] = totals['total_profit'] / invested * 100
+        totals['account_count'] = len(self.accounts)
+        return totals
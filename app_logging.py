@@ -0,0 +1,194 @@
+# 로그 설정
+# 모든 모듈은 logging.getLogger(__name__) 으로 기록하고 루트 로거에는 QueueHandler 만 붙인다.
+# 파일(회전)/콘솔/화면 버퍼 기록은 QueueListener 백그라운드 스레드가 맡아 호출 스레드를 막지 않는다.
+# 화면 로그는 최근 N줄 링버퍼에서 타이머가 새 줄만 묶어서 한 번에 반영한다.
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from PyQt5.QtCore import QObject, QTimer
+
+from config import Config
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+VIEW_FORMAT = "[%(asctime)s] %(message)s"
+VIEW_DATE_FORMAT = "%H:%M:%S"
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기록을 버리고 개수만 센다 (호출 스레드를 막지 않음)"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogRing(logging.Handler):
+    """최근 로그 N줄 링버퍼 (리스너 스레드가 쓰고 GUI 스레드가 읽음)"""
+
+    def __init__(self, capacity=None):
+        super().__init__()
+        self.lines = deque(maxlen=capacity or Config.LOG_VIEW_LINES)
+        self.total = 0  # 지금까지 들어온 줄 수
+        self.ring_lock = threading.Lock()
+        self.setFormatter(logging.Formatter(VIEW_FORMAT, VIEW_DATE_FORMAT))
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.ring_lock:
+            self.lines.append(line)
+            self.total += 1
+
+    def since(self, seen):
+        """seen 이후 새 줄 (현재 번호, 줄 목록, 버퍼를 넘어 건너뛴 줄 수)"""
+        with self.ring_lock:
+            total = self.total
+            new = total - seen
+            if new <= 0:
+                return total, [], 0
+            kept = min(new, len(self.lines))
+            lines = list(self.lines)[-kept:] if kept < len(self.lines) else list(self.lines)
+        return total, lines, new - kept
+
+
+class LogSystem:
+    """큐 핸들러 + 백그라운드 리스너 (setup_logging 이 만든다)"""
+
+    def __init__(self, handler, listener, ring, targets):
+        self.handler = handler
+        self.listener = listener
+        self.ring = ring
+        self.targets = targets  # 리스너 스레드에서 실행되는 핸들러 (파일/콘솔/링버퍼)
+
+    @property
+    def dropped(self):
+        return self.handler.dropped
+
+    def stop(self):
+        """남은 기록을 모두 쓰고 리스너 스레드 종료"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            for handler in self.targets:
+                handler.flush()
+
+
+_system = None
+
+
+def setup_logging(level=None, log_file=None, console=None):
+    """로그 설정 (이미 설정되어 있으면 기존 설정 반환)
+
+    Args:
+        level: 로그 레벨 (기본 Config.LOG_LEVEL)
+        log_file: 로그 파일 경로 (기본 Config.LOG_FILE, 빈 값이면 파일 기록 안 함)
+        console: True 면 콘솔에도 출력 (기본 Config.LOG_CONSOLE)
+    """
+    global _system
+    if _system is not None:
+        return _system
+
+    level = level or Config.LOG_LEVEL
+    log_file = Config.LOG_FILE if log_file is None else log_file
+    console = Config.LOG_CONSOLE if console is None else console
+
+    targets = []
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=Config.LOG_MAX_BYTES,
+                                           backupCount=Config.LOG_BACKUP_COUNT, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        targets.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(VIEW_FORMAT, VIEW_DATE_FORMAT))
+        targets.append(console_handler)
+    ring = LogRing()
+    targets.append(ring)
+
+    log_queue = queue.Queue(Config.LOG_QUEUE_SIZE)
+    handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(handler)
+    listener.start()
+
+    _system = LogSystem(handler, listener, ring, targets)
+    return _system
+
+
+def shutdown_logging():
+    """리스너 종료 및 루트 로거에서 큐 핸들러 제거"""
+    global _system
+    if _system is None:
+        return
+    _system.stop()
+    logging.getLogger().removeHandler(_system.handler)
+    for handler in _system.targets:
+        handler.close()
+    _system = None
+
+
+class LogView(QObject):
+    """링버퍼의 새 줄을 주기적으로 텍스트 위젯에 한 번에 추가 (최대 줄 수 유지, 폭주시 최근 줄만 표시)"""
+
+    def __init__(self, widget, ring, interval_ms=None, max_lines=None, max_batch=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.ring = ring
+        self.max_batch = max_batch or Config.LOG_VIEW_BATCH  # 1회 반영 최대 줄 수
+        self.seen = 0
+        self.skipped = 0  # 화면 반영 전에 버퍼에서 밀려난 줄 수
+        self.last_refresh = 0.0
+        self.max_refresh = 0.0
+        widget.document().setMaximumBlockCount(max_lines or Config.LOG_VIEW_LINES)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms or Config.LOG_REFRESH_MS)
+
+    def refresh(self):
+        from PyQt5.QtGui import QTextCursor  # 화면 없는 엔진은 QtGui 를 불러오지 않음
+
+        start = time.perf_counter()
+        self.seen, lines, skipped = self.ring.since(self.seen)
+        if not lines:
+            return
+        if len(lines) > self.max_batch:
+            # 폭주 구간: 최근 줄만 표시 (전체 기록은 로그 파일에 남는다)
+            skipped += len(lines) - self.max_batch
+            lines = [f"... {skipped:,}줄 생략 (전체 로그: {Config.LOG_FILE})"] + lines[-self.max_batch:]
+        elif skipped:
+            lines = [f"... {skipped:,}줄 생략 (전체 로그: {Config.LOG_FILE})"] + lines
+        self.skipped += skipped
+
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        cursor = QTextCursor(self.widget.document())
+        cursor.movePosition(QTextCursor.End)
+        if not self.widget.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(lines))
+
+        # 사용자가 위로 스크롤해 둔 경우에는 위치를 유지
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+        self.last_refresh = time.perf_counter() - start
+        self.max_refresh = max(self.max_refresh, self.last_refresh)
@@ -0,0 +1,239 @@
+# 이벤트 기반 백테스트 엔진
+# 운영과 같은 signal_engine 시그널을 봉마다 적용하고, 체결/손절/익절/비용을 전 종목 배열 연산으로 처리한다.
+# 봉 t-1 종가 기준 시그널은 봉 t 시가에 체결한다 (미래 데이터 사용 방지).
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import signal_engine
+from bar_store import BAR_COLUMNS
+from config import Config
+
+
+def load_bar_matrix(store, stock_codes, timeframe='D', n=None):
+    """BarStore 에서 종목별 봉을 읽어 (종목 x 봉) 행렬로 정렬 (최신 봉 기준 오른쪽 정렬, 빈 곳은 NaN)
+
+    Returns:
+        bars: {'open', 'high', 'low', 'close': 2차원 배열, 'time': 가장 긴 종목의 봉 시각}
+    """
+    columns = {name: [] for name, _ in BAR_COLUMNS}
+    for code in stock_codes:
+        for name, data in store.read(code, timeframe, n).items():
+            columns[name].append(data)
+
+    longest = max(columns['time'], key=len) if columns['time'] else np.empty(0, dtype=np.int64)
+    bars = {name: signal_engine.as_price_matrix(columns[name]) for name in ('open', 'high', 'low', 'close')}
+    bars['time'] = np.asarray(longest)
+    return bars
+
+
+class BacktestResult:
+    """백테스트 결과"""
+
+    def __init__(self, equity, pnl, trades, wins, turnover_value, costs, initial_capital):
+        self.equity = equity  # 봉별 평가금액
+        self.pnl = pnl  # 종목별 실현+평가 손익
+        self.trades = trades  # 청산 횟수
+        self.wins = wins  # 이익 청산 횟수
+        self.turnover_value = turnover_value  # 매수+매도 거래대금
+        self.costs = costs  # 수수료+세금
+        self.initial_capital = initial_capital
+
+    @property
+    def total_pnl(self):
+        return float(self.equity[-1] - self.initial_capital) if len(self.equity) else 0.0
+
+    @property
+    def max_drawdown(self):
+        """최대 낙폭 (비율, 음수)"""
+        if not len(self.equity):
+            return 0.0
+        peak = np.maximum.accumulate(self.equity)
+        return float(((self.equity - peak) / peak).min())
+
+    def summary(self):
+        return {
+            'total_pnl': self.total_pnl,
+            'total_return': self.total_pnl / self.initial_capital if self.initial_capital else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'turnover': self.turnover_value / self.initial_capital if self.initial_capital else 0.0,
+            'trades': self.trades,
+            'win_rate': self.wins / self.trades if self.trades else 0.0,
+            'costs': self.costs,
+        }
+
+
+class Backtester:
+    """봉 데이터 백테스트 (종목별 독립 슬롯, 매수 전용)
+
+    Args:
+        strategy_name: 'sma' 또는 'rsi' (TradingStrategy 와 동일한 signal_engine 규칙)
+        params: 전략 파라미터 (short_period/long_period 또는 period/oversold/overbought)
+        max_position_size: 종목당 최대 매수 금액 (기본 Config.MAX_POSITION_SIZE)
+        stop_loss / take_profit: 손절/익절 비율 (기본 Config 값, 0 이면 사용 안 함)
+    """
+
+    def __init__(self, strategy_name="sma", params=None, max_position_size=None, stop_loss=None,
+                 take_profit=None, commission=None, sell_tax=None, slippage=None):
+        self.strategy_name = strategy_name
+        self.params = dict(params or {})
+        self.max_position_size = max_position_size or Config.MAX_POSITION_SIZE
+        self.stop_loss = Config.STOP_LOSS_PERCENT if stop_loss is None else stop_loss
+        self.take_profit = Config.TAKE_PROFIT_PERCENT if take_profit is None else take_profit
+        self.commission = Config.COMMISSION_RATE if commission is None else commission
+        self.sell_tax = Config.SELL_TAX_RATE if sell_tax is None else sell_tax
+        self.slippage = Config.SLIPPAGE_RATE if slippage is None else slippage
+
+    def run(self, bars, initial_capital=None):
+        """백테스트 실행
+
+        Args:
+            bars: {'open', 'high', 'low', 'close'} (종목 x 봉) 배열
+            initial_capital: 초기 자본 (기본: 종목수 x 종목당 최대 매수 금액)
+
+        Returns:
+            BacktestResult
+        """
+        open_ = signal_engine.as_price_matrix(bars['open'])
+        high = signal_engine.as_price_matrix(bars['high'])
+        low = signal_engine.as_price_matrix(bars['low'])
+        close = signal_engine.as_price_matrix(bars['close'])
+        n_symbols, n_bars = close.shape
+
+        signals = signal_engine.signal_series(close, self.strategy_name, **self.params)
+        if initial_capital is None:
+            initial_capital = float(self.max_position_size * n_symbols)
+
+        buy_cost = 1 + self.commission
+        sell_keep = 1 - self.commission - self.sell_tax
+        slip_up = 1 + self.slippage
+        slip_down = 1 - self.slippage
+
+        qty = np.zeros(n_symbols)
+        basis = np.zeros(n_symbols)  # 비용 포함 매수금액
+        stop = np.zeros(n_symbols)
+        take = np.full(n_symbols, np.inf)
+        last_close = np.zeros(n_symbols)
+        realized = np.zeros(n_symbols)
+
+        cash = float(initial_capital)
+        equity = np.empty(n_bars)
+        trades = wins = 0
+        turnover_value = costs = 0.0
+
+        def close_positions(mask, fill):
+            nonlocal cash, trades, wins, turnover_value, costs
+            proceeds = qty[mask] * fill[mask]
+            net = proceeds * sell_keep
+            profit = net - basis[mask]
+            realized[mask] += profit
+            cash += net.sum()
+            turnover_value += proceeds.sum()
+            costs += (proceeds - net).sum()
+            trades += int(mask.sum())
+            wins += int((profit > 0).sum())
+            qty[mask] = 0
+            basis[mask] = 0
+            take[mask] = np.inf
+
+        for t in range(1, n_bars):
+            o, h, l, c = open_[:, t], high[:, t], low[:, t], close[:, t]
+            tradable = ~np.isnan(o)
+            prev_signal = signals[:, t - 1]
+            held = qty > 0
+
+            # 1) 시가 청산: 매도 시그널 또는 갭으로 손절/익절가를 넘어선 경우
+            exit_open = held & tradable & ((prev_signal == signal_engine.SELL) | (o <= stop) | (o >= take))
+            if exit_open.any():
+                close_positions(exit_open, o * slip_down)
+
+            # 2) 시가 진입: 매수 시그널 + 미보유
+            enter = ~held & tradable & (prev_signal == signal_engine.BUY)
+            if enter.any():
+                fill = o[enter] * slip_up
+                shares = np.floor(self.max_position_size / (fill * buy_cost))
+                valid = shares > 0
+                idx = np.flatnonzero(enter)[valid]
+                fill, shares = fill[valid], shares[valid]
+                notional = shares * fill
+                qty[idx] = shares
+                basis[idx] = notional * buy_cost
+                cash -= basis[idx].sum()
+                turnover_value += notional.sum()
+                costs += (basis[idx] - notional).sum()
+                if self.stop_loss:
+                    stop[idx] = fill * (1 - self.stop_loss)
+                if self.take_profit:
+                    take[idx] = fill * (1 + self.take_profit)
+
+            # 3) 장중 손절/익절 (같은 봉에서 둘 다 닿으면 손절 우선)
+            held = qty > 0
+            if self.stop_loss:
+                hit_stop = held & (l <= stop)
+                if hit_stop.any():
+                    close_positions(hit_stop, stop * slip_down)
+                    held &= ~hit_stop
+            if self.take_profit:
+                hit_take = held & (h >= take)
+                if hit_take.any():
+                    close_positions(hit_take, take * slip_down)
+
+            # 4) 종가 평가
+            last_close = np.where(np.isnan(c), last_close, c)
+            equity[t] = cash + (qty * last_close).sum()
+
+        equity[0] = initial_capital
+        pnl = realized + qty * last_close * sell_keep - basis
+        return BacktestResult(equity, pnl, trades, wins, turnover_value, costs, initial_capital)
+
+
+# ----------------------------------------------------------------------
+# 파라미터 스윕 (프로세스 풀)
+# ----------------------------------------------------------------------
+_worker_bars = None
+
+
+def _init_worker(bars):
+    # 봉 데이터는 워커마다 한 번만 전달받는다
+    global _worker_bars
+    _worker_bars = bars
+
+
+def _run_one(args):
+    strategy_name, params, options = args
+    result = Backtester(strategy_name, params, **options).run(_worker_bars)
+    return params, result.summary()
+
+
+def parameter_grid(**ranges):
+    """{이름: 값목록} -> 파라미터 조합 목록"""
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*ranges.values())]
+
+
+def run_sweep(bars, strategy_name, grid, processes=None, **options):
+    """파라미터 조합별 백테스트를 프로세스 풀로 실행
+
+    Args:
+        bars: Backtester.run 과 같은 봉 데이터
+        grid: 파라미터 dict 목록 (parameter_grid 참고)
+        processes: 프로세스 수 (기본: CPU 수)
+        options: Backtester 생성 옵션 (stop_loss, commission 등)
+
+    Returns:
+        [(params, summary)] - 총손익 내림차순
+    """
+    tasks = [(strategy_name, params, options) for params in grid]
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1:
+        _init_worker(bars)
+        results = [_run_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(bars,)) as pool:
+            results = list(pool.map(_run_one, tasks, chunksize=max(len(tasks) // (processes * 4), 1)))
+
+    results.sort(key=lambda item: item[1]['total_pnl'], reverse=True)
+    return results
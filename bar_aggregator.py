@@ -0,0 +1,255 @@
+# 실시간 틱 -> 다중 주기 봉 집계
+# 종목마다 슬롯 번호를 주고 주기별 OHLCV 를 array 컬럼(슬롯 인덱스)에 보관한다.
+# 틱마다 주기별로 봉 시작 시각만 비교해 갱신하고, 구간이 바뀌거나 flush 시각이 지나면 봉 완성을 알린다.
+# 봉 시각은 BarStore 와 같은 로컬 벽시계 epoch 초(봉 시작 시각)를 쓴다.
+from array import array
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from bar_store import to_bar_time
+from config import Config
+
+# 완성/진행 중 봉 (time: 봉 시작 시각)
+Bar = namedtuple('Bar', ['code', 'timeframe', 'time', 'open', 'high', 'low', 'close', 'volume'])
+
+
+def timeframe_seconds(timeframe):
+    """주기 이름 -> 초 ('D': 일봉, 'mN': N분봉)"""
+    if timeframe == 'D':
+        return 86400
+    if timeframe.startswith('m') and timeframe[1:].isdigit():
+        return int(timeframe[1:]) * 60
+    raise ValueError(f"지원하지 않는 주기입니다: {timeframe}")
+
+
+class _Frame:
+    """주기 1개의 종목별 진행 중 봉 (array 컬럼, 슬롯 인덱스)"""
+
+    def __init__(self, timeframe):
+        self.timeframe = timeframe
+        self.period = timeframe_seconds(timeframe)
+        self.cumulative = self.period == 86400  # 일봉 거래량은 누적거래량 그대로 사용
+        self.start = array('q')  # 봉 시작 시각 (-1: 봉 없음)
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('q')
+        self.done = array('b')  # 1: flush 로 이미 완성 처리된 봉
+
+    def grow(self, n):
+        self.start.extend([-1] * n)
+        for column in (self.open, self.high, self.low, self.close):
+            column.extend([0.0] * n)
+        self.volume.extend([0] * n)
+        self.done.extend([0] * n)
+
+    def bar(self, code, slot):
+        return Bar(code, self.timeframe, self.start[slot], self.open[slot], self.high[slot],
+                   self.low[slot], self.close[slot], self.volume[slot])
+
+
+class BarAggregator(QObject):
+    """종목별 다중 주기 OHLCV 실시간 집계"""
+
+    bar_closed = pyqtSignal(str, object)  # (종목코드, Bar)
+
+    def __init__(self, timeframes=None, trading_day=None):
+        super().__init__()
+        self.frames = [_Frame(timeframe) for timeframe in (timeframes or Config.BAR_TIMEFRAMES)]
+        self.slots = {}  # 종목코드 -> 슬롯 번호
+        self.codes = []  # 슬롯 번호 -> 종목코드
+        self.last_volume = array('q')  # 슬롯별 마지막 누적거래량
+        self.day_start = 0
+        self.start_day(trading_day)
+
+        self.clock = -1  # 지금까지 받은 가장 늦은 틱 시각 (봉 시각 기준)
+        self.ticks = 0
+        self.late_ticks = 0
+        self.closed = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+
+    def start(self, interval_ms=None):
+        """완성 봉 정리 타이머 시작 (틱이 끊긴 종목도 구간이 지나면 봉 완성)"""
+        self.timer.start(interval_ms or Config.BAR_FLUSH_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def start_day(self, trading_day=None):
+        """틱 시각(HHMMSS)에 붙일 거래일 설정 (기본: 오늘)"""
+        day = trading_day or datetime.now()
+        self.day_start = to_bar_time(datetime(day.year, day.month, day.day))
+
+    def _slot(self, code):
+        slot = self.slots.get(code)
+        if slot is None:
+            slot = self.slots[code] = len(self.codes)
+            self.codes.append(code)
+            # 용량을 두 배로 늘려 두고 슬롯만 배정
+            if slot >= len(self.last_volume):
+                grow = max(len(self.last_volume), 64)
+                self.last_volume.extend([0] * grow)
+                for frame in self.frames:
+                    frame.grow(grow)
+        return slot
+
+    # ------------------------------------------------------------------
+    # 틱 반영
+    # ------------------------------------------------------------------
+    def on_tick(self, tick):
+        """RealDataDecoder 의 Tick 반영"""
+        return self.update(tick.code, tick.time, tick.price, tick.volume, tick.trade_volume)
+
+    def update(self, code, hhmmss, price, cum_volume=0, trade_volume=0):
+        """틱 1건 반영 (완성된 봉이 있으면 bar_closed 발생)
+
+        Args:
+            hhmmss: 체결시간 HHMMSS 정수 (음수면 마지막 틱 시각 사용)
+            cum_volume: 누적거래량 (FID 13, 체결량은 직전 누적거래량과의 차이)
+            trade_volume: 체결량 (FID 15, 누적거래량이 없을 때 사용)
+        """
+        slot = self.slots.get(code)
+        if slot is None:
+            slot = self._slot(code)
+        if hhmmss >= 0:
+            t = self.day_start + hhmmss // 10000 * 3600 + hhmmss // 100 % 100 * 60 + hhmmss % 100
+            if t > self.clock:
+                self.clock = t
+        else:
+            t = self.clock
+
+        last = self.last_volume[slot]
+        if cum_volume > last > 0:
+            volume = cum_volume - last
+        elif last > 0 and cum_volume == last:
+            volume = 0
+        else:
+            volume = abs(trade_volume)
+        if cum_volume:
+            self.last_volume[slot] = cum_volume
+        self.ticks += 1
+
+        price = float(price)
+        for frame in self.frames:
+            start = t - t % frame.period
+            current = frame.start[slot]
+            if start == current:
+                if frame.done[slot]:
+                    self.late_ticks += 1  # 이미 완성 처리된 구간의 늦은 틱
+                    continue
+                if price > frame.high[slot]:
+                    frame.high[slot] = price
+                elif price < frame.low[slot]:
+                    frame.low[slot] = price
+                frame.close[slot] = price
+                if frame.cumulative and cum_volume:
+                    frame.volume[slot] = cum_volume
+                else:
+                    frame.volume[slot] += volume
+            elif start > current:
+                if current >= 0 and not frame.done[slot]:
+                    self._emit(frame, slot)
+                frame.start[slot] = start
+                frame.open[slot] = frame.high[slot] = frame.low[slot] = frame.close[slot] = price
+                frame.volume[slot] = cum_volume if frame.cumulative and cum_volume else volume
+                frame.done[slot] = 0
+            else:
+                self.late_ticks += 1  # 이전 구간의 늦은 틱 (봉에 반영하지 않음)
+
+    def _emit(self, frame, slot):
+        self.closed += 1
+        frame.done[slot] = 1
+        self.bar_closed.emit(self.codes[slot], frame.bar(self.codes[slot], slot))
+
+    def flush(self, now=None):
+        """구간이 끝난 진행 중 봉을 완성 처리
+
+        Args:
+            now: 봉 시각 기준 현재 시각 (기본: 마지막 틱 시각 - Config.BAR_CLOSE_GRACE_SEC,
+                 다른 종목 틱이 조금 늦게 도착해도 봉이 먼저 닫히지 않도록 여유를 둔다)
+
+        Returns:
+            완성 처리한 봉 개수
+        """
+        if now is None:
+            now = self.clock - Config.BAR_CLOSE_GRACE_SEC if self.clock >= 0 else -1
+        n = len(self.codes)
+        if now < 0 or not n:
+            return 0
+
+        emitted = 0
+        for frame in self.frames:
+            # 전 종목 구간 종료 여부를 한 번에 계산
+            start = np.frombuffer(frame.start, dtype=np.int64, count=n)
+            done = np.frombuffer(frame.done, dtype=np.int8, count=n)
+            expired = np.flatnonzero((start >= 0) & (done == 0) & (start + frame.period <= now)).tolist()
+            # 시그널 처리 중 새 종목이 추가되면 array 가 커지므로 버퍼 뷰를 먼저 놓는다
+            del start, done
+            for slot in expired:
+                self._emit(frame, slot)
+            emitted += len(expired)
+        return emitted
+
+    # ------------------------------------------------------------------
+    # 초기값 / 조회
+    # ------------------------------------------------------------------
+    def seed(self, store, codes, now=None):
+        """저장소의 마지막 봉이 현재 구간이면 진행 중 봉으로 불러옴 (장중 재시작용)
+
+        Returns:
+            불러온 봉 개수
+        """
+        now = now if now is not None else to_bar_time(datetime.now())
+        seeded = 0
+        for code in codes:
+            slot = self._slot(code)
+            for frame in self.frames:
+                n = store.count(code, frame.timeframe)
+                if not n:
+                    continue
+                bars = store.read(code, frame.timeframe, 1)
+                start = int(bars['time'][0])
+                if start != now - now % frame.period:
+                    continue
+                frame.start[slot] = start
+                frame.open[slot] = float(bars['open'][0])
+                frame.high[slot] = float(bars['high'][0])
+                frame.low[slot] = float(bars['low'][0])
+                frame.close[slot] = float(bars['close'][0])
+                frame.volume[slot] = int(bars['volume'][0])
+                frame.done[slot] = 0
+                seeded += 1
+        return seeded
+
+    def current(self, code, timeframe):
+        """진행 중 봉 (없으면 None)"""
+        slot = self.slots.get(code)
+        for frame in self.frames:
+            if frame.timeframe == timeframe:
+                if slot is None or frame.start[slot] < 0:
+                    return None
+                return frame.bar(code, slot)
+        raise ValueError(f"집계하지 않는 주기입니다: {timeframe}")
+
+    def remove(self, code):
+        """종목 진행 중 봉 초기화 (슬롯은 재사용하지 않고 비워 둠)"""
+        slot = self.slots.get(code)
+        if slot is None:
+            return
+        self.last_volume[slot] = 0
+        for frame in self.frames:
+            frame.start[slot] = -1
+            frame.done[slot] = 0
+
+    def clear(self):
+        self.slots.clear()
+        self.codes.clear()
+        self.last_volume = array('q')
+        self.frames = [_Frame(frame.timeframe) for frame in self.frames]
+        self.clock = -1
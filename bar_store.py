@@ -0,0 +1,290 @@
+# 과거 봉 데이터 로컬 저장소
+# 종목/주기별로 컬럼 파일(append-only)을 두고 numpy.memmap 으로 복사 없이 읽는다.
+#
+#   {root}/{주기}/{종목코드}/time.i8, open.f8, high.f8, low.f8, close.f8, volume.i8
+#
+# time 은 봉 시작 시각을 로컬 벽시계 기준 epoch 초(UTC 로 간주한 naive 시각)로 저장한다.
+import calendar
+import logging
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = (
+    ('time', np.dtype(np.int64)),
+    ('open', np.dtype(np.float64)),
+    ('high', np.dtype(np.float64)),
+    ('low', np.dtype(np.float64)),
+    ('close', np.dtype(np.float64)),
+    ('volume', np.dtype(np.int64)),
+)
+COLUMN_DTYPES = dict(BAR_COLUMNS)
+
+# 주기 -> (TR코드, 시간 필드명, 틱범위)
+TIMEFRAME_TR = {
+    'D': ('opt10081', '일자', None),
+    'm1': ('opt10080', '체결시간', '1'),
+    'm3': ('opt10080', '체결시간', '3'),
+    'm5': ('opt10080', '체결시간', '5'),
+    'm10': ('opt10080', '체결시간', '10'),
+    'm15': ('opt10080', '체결시간', '15'),
+    'm30': ('opt10080', '체결시간', '30'),
+    'm60': ('opt10080', '체결시간', '60'),
+}
+
+
+def to_bar_time(dt):
+    """datetime -> 봉 시각(로컬 벽시계 epoch 초)"""
+    return calendar.timegm(dt.timetuple())
+
+
+def from_bar_time(bar_time):
+    """봉 시각 -> datetime"""
+    return datetime(1970, 1, 1) + timedelta(seconds=int(bar_time))
+
+
+def parse_tr_time(text):
+    """TR 응답의 일자(YYYYMMDD) 또는 체결시간(YYYYMMDDHHMMSS) 문자열을 봉 시각으로 변환"""
+    text = text.strip()
+    if len(text) == 8:
+        return to_bar_time(datetime.strptime(text, "%Y%m%d"))
+    return to_bar_time(datetime.strptime(text[:14], "%Y%m%d%H%M%S"))
+
+
+def synthetic_bars(n, start_time=None, step=86400, base_price=10000, seed=42):
+    """오프라인 테스트용 합성 봉 데이터 생성
+
+    Returns:
+        bars: {컬럼명: 배열} (시간 오름차순)
+    """
+    rng = np.random.default_rng(seed)
+    if start_time is None:
+        start_time = to_bar_time(datetime(2020, 1, 2))
+
+    close = base_price + np.cumsum(rng.integers(-200, 201, size=n)).astype(np.float64)
+    close = np.maximum(close, 100.0)
+    open_ = np.concatenate(([float(base_price)], close[:-1]))
+    spread = rng.integers(0, 150, size=(2, n))
+
+    return {
+        'time': start_time + step * np.arange(n, dtype=np.int64),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread[0],
+        'low': np.maximum(np.minimum(open_, close) - spread[1], 1.0),
+        'close': close,
+        'volume': rng.integers(1000, 1000000, size=n).astype(np.int64),
+    }
+
+
+class BarStore:
+    """종목/주기별 append-only 컬럼 파일 저장소"""
+
+    def __init__(self, root_dir=None):
+        self.root_dir = root_dir or Config.BAR_STORE_DIR
+        self._maps = {}  # (종목코드, 주기, 컬럼) -> (길이, memmap)
+        self._counts = {}  # (종목코드, 주기) -> 봉 개수 (append 로만 바뀜)
+
+    def _dir(self, code, timeframe):
+        return os.path.join(self.root_dir, timeframe, code)
+
+    def _path(self, code, timeframe, column):
+        dtype = COLUMN_DTYPES[column]
+        return os.path.join(self._dir(code, timeframe), f"{column}.{dtype.kind}{dtype.itemsize}")
+
+    def count(self, code, timeframe):
+        """저장된 봉 개수 (중간에 끊긴 쓰기가 있으면 가장 짧은 컬럼 기준)"""
+        key = (code, timeframe)
+        n = self._counts.get(key)
+        if n is None:
+            n = self._count_files(code, timeframe)
+            self._counts[key] = n
+        return n
+
+    def _count_files(self, code, timeframe):
+        counts = []
+        for column, dtype in BAR_COLUMNS:
+            path = self._path(code, timeframe, column)
+            if not os.path.exists(path):
+                return 0
+            counts.append(os.path.getsize(path) // dtype.itemsize)
+        return min(counts)
+
+    def last_time(self, code, timeframe):
+        """마지막 저장 봉 시각 (없으면 None)"""
+        n = self.count(code, timeframe)
+        if n == 0:
+            return None
+        return int(self.column(code, timeframe, 'time')[n - 1])
+
+    def append(self, code, timeframe, bars):
+        """봉 추가 (마지막 저장 시각 이후의 봉만 기록)
+
+        Args:
+            bars: {컬럼명: 배열} - 순서는 상관없고 시각 기준으로 정렬해서 기록
+
+        Returns:
+            추가된 봉 개수
+        """
+        times = np.asarray(bars['time'], dtype=np.int64)
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+
+        n = self.count(code, timeframe)
+        last_time = self.last_time(code, timeframe)
+        keep = np.ones(len(times), dtype=bool)
+        if last_time is not None:
+            keep &= times > last_time
+        # 같은 시각 중복 봉은 마지막 것만 사용
+        if len(times) > 1:
+            keep[:-1] &= times[:-1] != times[1:]
+
+        if not keep.any():
+            return 0
+
+        os.makedirs(self._dir(code, timeframe), exist_ok=True)
+        added = int(keep.sum())
+
+        # time 컬럼을 마지막에 기록해야 중간에 끊겨도 count 가 짧은 쪽으로 맞춰진다
+        try:
+            for column, dtype in BAR_COLUMNS[1:] + BAR_COLUMNS[:1]:
+                values = np.asarray(bars[column])[order][keep].astype(dtype)
+                path = self._path(code, timeframe, column)
+                with open(path, 'ab') as f:
+                    if f.tell() != n * dtype.itemsize:
+                        f.truncate(n * dtype.itemsize)
+                        f.seek(n * dtype.itemsize)
+                    f.write(values.tobytes())
+        except BaseException:
+            # 일부 컬럼만 기록됐을 수 있으니 다음 count 는 파일 크기로 다시 구한다
+            self._invalidate(code, timeframe)
+            raise
+
+        self._invalidate(code, timeframe)
+        self._counts[(code, timeframe)] = n + added
+        return added
+
+    def _invalidate(self, code, timeframe):
+        self._counts.pop((code, timeframe), None)
+        for column, _ in BAR_COLUMNS:
+            self._maps.pop((code, timeframe, column), None)
+
+    def column(self, code, timeframe, column='close'):
+        """컬럼 전체 memmap (읽기 전용)"""
+        key = (code, timeframe, column)
+        n = self.count(code, timeframe)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == n:
+            return cached[1]
+
+        if n == 0:
+            data = np.empty(0, dtype=COLUMN_DTYPES[column])
+        else:
+            data = np.memmap(self._path(code, timeframe, column), dtype=COLUMN_DTYPES[column],
+                             mode='r', shape=(n,))
+        self._maps[key] = (n, data)
+        return data
+
+    def tail(self, code, timeframe, n, column='close'):
+        """최근 n개 봉의 컬럼 뷰 (복사 없음)"""
+        data = self.column(code, timeframe, column)
+        return data[max(len(data) - n, 0):]
+
+    def read(self, code, timeframe, n=None):
+        """최근 n개 봉 전체 컬럼 뷰 (n 이 None 이면 전체)"""
+        bars = {}
+        for column, _ in BAR_COLUMNS:
+            data = self.column(code, timeframe, column)
+            bars[column] = data if n is None else data[max(len(data) - n, 0):]
+        return bars
+
+
+def parse_bar_page(kiwoom, trcode, rqname, timeframe):
+    """opt10081/opt10080 응답 1페이지를 컬럼 배열로 변환 (최신 봉이 먼저)"""
+    time_field = TIMEFRAME_TR[timeframe][1]
+    count = kiwoom.get_repeat_cnt(trcode, rqname)
+    rows = {column: [] for column, _ in BAR_COLUMNS}
+
+    for i in range(count):
+        bar_time = kiwoom.get_comm_data(trcode, "", rqname, i, time_field).strip()
+        if not bar_time:
+            continue
+        rows['time'].append(parse_tr_time(bar_time))
+        rows['open'].append(abs(int(kiwoom.get_comm_data(trcode, "", rqname, i, "시가").strip() or 0)))
+        rows['high'].append(abs(int(kiwoom.get_comm_data(trcode, "", rqname, i, "고가").strip() or 0)))
+        rows['low'].append(abs(int(kiwoom.get_comm_data(trcode, "", rqname, i, "저가").strip() or 0)))
+        rows['close'].append(abs(int(kiwoom.get_comm_data(trcode, "", rqname, i, "현재가").strip() or 0)))
+        rows['volume'].append(abs(int(kiwoom.get_comm_data(trcode, "", rqname, i, "거래량").strip() or 0)))
+
+    return {column: np.asarray(rows[column], dtype=dtype) for column, dtype in BAR_COLUMNS}
+
+
+class BarBackfiller:
+    """저장소의 마지막 봉 이후 구간만 TR 로 조회해서 채운다"""
+
+    RQNAME_PREFIX = "봉조회:"
+
+    def __init__(self, store, kiwoom, scheduler, max_pages=None):
+        self.store = store
+        self.kiwoom = kiwoom
+        self.scheduler = scheduler  # TrScheduler (대량 조회 우선순위로 등록)
+        self.max_pages = max_pages or Config.BAR_BACKFILL_MAX_PAGES
+        self.pending = {}  # rqname -> TrRequest
+
+    def needs_update(self, code, timeframe, now=None):
+        """저장된 마지막 봉 이후 조회할 구간이 있는지 확인"""
+        last_time = self.store.last_time(code, timeframe)
+        if last_time is None:
+            return True
+
+        now = now or datetime.now()
+        if timeframe == 'D':
+            return last_time < to_bar_time(datetime(now.year, now.month, now.day))
+        return last_time < to_bar_time(now) - 60 * int(TIMEFRAME_TR[timeframe][2])
+
+    def request_gap(self, code, timeframe, now=None):
+        """마지막 저장 봉 이후 구간 조회 요청 (필요 없으면 None)"""
+        rqname = f"{self.RQNAME_PREFIX}{code}:{timeframe}"
+        if rqname in self.pending or not self.needs_update(code, timeframe, now):
+            return None
+
+        from tr_scheduler import PRIORITY_BULK
+
+        trcode, _, tick_range = TIMEFRAME_TR[timeframe]
+        inputs = {"종목코드": code}
+        if tick_range is None:
+            inputs["기준일자"] = (now or datetime.now()).strftime("%Y%m%d")
+        else:
+            inputs["틱범위"] = tick_range
+        inputs["수정주가구분"] = "1"
+
+        last_time = self.store.last_time(code, timeframe)
+
+        def parse(rqname, trcode):
+            return parse_bar_page(self.kiwoom, trcode, rqname, timeframe)
+
+        def continue_if(page):
+            # 이미 저장된 구간에 도달하면 연속 조회 중단
+            return last_time is None or not len(page['time']) or page['time'].min() > last_time
+
+        def done(pages):
+            self.finish(code, timeframe, pages)
+
+        request = self.scheduler.submit(rqname, trcode, inputs, parser=parse, priority=PRIORITY_BULK,
+                                        callback=done, continue_if=continue_if, max_pages=self.max_pages)
+        self.pending[rqname] = request
+        request.future.add_done_callback(lambda _: self.pending.pop(rqname, None))
+        return request
+
+    def finish(self, code, timeframe, pages):
+        """모은 페이지를 저장소에 기록"""
+        if not pages:
+            return 0
+        bars = {column: np.concatenate([page[column] for page in pages]) for column, _ in BAR_COLUMNS}
+        added = self.store.append(code, timeframe, bars)
+        logger.info(f"✅ {code} {timeframe} 봉 {added}개 저장")
+        return added
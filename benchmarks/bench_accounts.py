@@ -0,0 +1,156 @@
+# 여러 계좌 관리 벤치마크 (가상 OCX)
+# 계좌별 잔고/주문 상태 분리(체잔 이벤트 계좌별 전달, 주문 제한 공용), 전체 합계 증분 계산,
+# 순환 잔고 조회의 TR 부하를 확인하고, 계좌 수에 따른 틱 처리 비용을 모든 계좌에 전달하는 방식과 비교한다.
+# 사용법: python benchmarks/bench_accounts.py [계좌수] [계좌당 보유종목수] [틱수]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication
+
+from account_manager import TOTAL_KEYS, AccountManager
+from config import Config
+from fake_ocx import FakeClock, FakeKiwoom, make_symbols
+from tr_scheduler import TrScheduler
+
+
+class CountingSubscriptions:
+    """실시간 구독 참조 횟수 기록"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def subscribe(self, code):
+        self.counts[code] = self.counts.get(code, 0) + 1
+
+    def unsubscribe(self, code):
+        self.counts[code] -= 1
+        if not self.counts[code]:
+            del self.counts[code]
+
+
+def check_accounts(n_accounts, n_holdings):
+    """계좌별 상태 분리 / 합계 / 순환 조회"""
+    accounts = [f"80123456{i:02d}" for i in range(n_accounts)]
+    kiwoom = FakeKiwoom(symbols=make_symbols(n_holdings * 2), accounts=accounts)
+    codes = list(kiwoom.ocx.symbols)
+    rng = np.random.default_rng(5)
+    for i, account in enumerate(accounts):
+        # 계좌마다 보유종목 절반이 겹친다
+        for code in codes[(i % 2) * n_holdings // 2:][:n_holdings]:
+            kiwoom.ocx.account_holdings[account][code] = (int(rng.integers(1, 300)), int(rng.integers(100, 5000)) * 10)
+    for code in codes:
+        kiwoom.ocx.real_values[code] = {10: str(int(rng.integers(100, 5000)) * 10)}
+
+    scheduler = TrScheduler(kiwoom, per_second=1000, per_hour=100000)
+    kiwoom.ocx.OnReceiveTrData.connect(scheduler.on_receive_tr_data)
+    subscriptions = CountingSubscriptions()
+    clock = FakeClock()
+    manager = AccountManager(kiwoom, scheduler, subscriptions, clock=clock)
+    kiwoom.ocx.OnReceiveChejanData.connect(manager.on_receive_chejan_data)
+    for account in accounts:
+        manager.add_account(account)
+    aggregates = []
+    manager.aggregate_updated.connect(aggregates.append)
+    manager.start()
+
+    # 로그인 직후 전체 조회: 계좌당 1회, 중복 요청 없음
+    manager.request_all()
+    manager.request_all()
+    assert len(kiwoom.ocx.tr_requests) == n_accounts
+    kiwoom.ocx.process_events()
+    for account in accounts:
+        assert manager.handler(account).portfolio.held == len(kiwoom.ocx.account_holdings[account])
+    # 여러 계좌가 보유한 종목도 실시간 구독은 1회
+    held = set().union(*(kiwoom.ocx.account_holdings[account] for account in accounts))
+    assert subscriptions.counts == dict.fromkeys(held, 1)
+
+    # 합계는 갱신 주기당 1회, 계좌 요약의 합과 일치
+    manager.flush()
+    assert len(aggregates) == 1
+    manager.flush()
+    assert len(aggregates) == 1
+    for key in TOTAL_KEYS:
+        assert aggregates[-1][key] == sum(manager.summaries[account][key] for account in accounts), key
+    assert aggregates[-1]['account_count'] == n_accounts
+
+    # 주문 상태는 계좌별, 주문 제한은 공용
+    clock.now += 10
+    target, other = accounts[1], accounts[0]
+    code = next(iter(kiwoom.ocx.account_holdings[target]))
+    before_other = dict(manager.order_manager(other).positions)
+    for account in accounts:
+        manager.order_manager(account).buy(code, 1, 1000)
+    sent = len(kiwoom.ocx.orders)
+    assert sent == Config.ORDER_RATE_PER_SECOND, sent
+    kiwoom.ocx.process_events()
+    assert {order[1] for order in kiwoom.ocx.orders} == set(accounts[:sent])
+    assert manager.order_manager(target).positions[code]['quantity'] == kiwoom.ocx.account_holdings[target][code][0]
+    assert manager.order_manager(other).positions.keys() - before_other.keys() <= {code}
+    assert manager.unrouted == 0
+    manager.flush()
+    assert len(aggregates) == 2
+
+    # 순환 조회: 한 번에 계좌 1개, 간격은 계좌 수와 관계없이 최소 간격 이상
+    requests = len(kiwoom.ocx.tr_requests)
+    for _ in range(n_accounts):
+        manager.reconcile_next()
+        kiwoom.ocx.process_events()
+    assert len(kiwoom.ocx.tr_requests) == requests + n_accounts
+    interval = manager.reconcile_timer.interval() / 1000
+    assert interval >= Config.PORTFOLIO_RECONCILE_MIN_SEC
+    print(f"계좌 {n_accounts}개: 잔고/주문 상태 분리, 공용 구독 {len(held)}종목, "
+          f"순환 조회 {interval:.0f}초마다 1건 (시간당 {3600 / interval:.0f}건)")
+
+    manager.clear()
+    assert not manager.holders and not manager.accounts
+    return manager
+
+
+def main():
+    n_accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_holdings = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    n_ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 300000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_accounts(min(n_accounts, 8), 20)
+
+    # 계좌마다 다른 종목 보유, 시장 전체 틱 (대부분 미보유)
+    kiwoom = FakeKiwoom(accounts=[f"80123456{i:02d}" for i in range(n_accounts)])
+    manager = AccountManager(kiwoom, scheduler=None)
+    for i in range(n_accounts):
+        handler, _ = manager.add_account(f"80123456{i:02d}")
+        holdings = [{'code': f"{100000 + i * n_holdings + j:06d}", 'quantity': 10, 'buy_price': 1000.0,
+                     'current_price': 1000} for j in range(n_holdings)]
+        handler.portfolio.reconcile(1_000_000, holdings)
+    universe = n_accounts * n_holdings * 5
+    rng = np.random.default_rng(11)
+    tick_codes = [f"{100000 + i:06d}" for i in rng.integers(0, universe, n_ticks).tolist()]
+    tick_prices = rng.integers(900, 1100, n_ticks).tolist()
+
+    on_tick = manager.on_tick
+    start = time.perf_counter()
+    for code, price in zip(tick_codes, tick_prices):
+        on_tick(code, price)
+    indexed = (time.perf_counter() - start) / n_ticks
+
+    portfolios = [manager.handler(account).portfolio for account in manager.accounts]
+    start = time.perf_counter()
+    for code, price in zip(tick_codes, tick_prices):
+        for portfolio in portfolios:
+            portfolio.on_tick(code, price)
+    broadcast = (time.perf_counter() - start) / n_ticks
+
+    market_value = sum(portfolio.market_value for portfolio in portfolios)
+    manager.flush()
+    assert manager.aggregate()['total_eval'] == round(market_value)
+    print(f"틱 {n_ticks:,}개 (계좌 {n_accounts}개 x {n_holdings}종목): 보유 계좌 인덱스 {indexed * 1e9:.0f}ns/틱, "
+          f"전체 계좌 전달 {broadcast * 1e9:.0f}ns/틱 ({broadcast / indexed:.1f}배)")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
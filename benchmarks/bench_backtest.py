@@ -0,0 +1,49 @@
+# 백테스트 엔진 벤치마크
+# 사용법: python benchmarks/bench_backtest.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtester import Backtester, parameter_grid, run_sweep
+
+
+def make_bars(n_symbols, n_bars, seed=7):
+    """랜덤워크 일봉 OHLC 생성"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.02, size=(n_symbols, n_bars))
+    close = 10000 * np.exp(np.cumsum(returns, axis=1))
+    open_ = close * np.exp(rng.normal(0, 0.005, size=close.shape))
+    spread = np.abs(rng.normal(0, 0.01, size=close.shape))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    return {'open': open_, 'high': high, 'low': low, 'close': close}
+
+
+def main():
+    n_symbols, n_bars = 2500, 1250  # 5년 x 2,500종목 일봉
+    bars = make_bars(n_symbols, n_bars)
+
+    for strategy_name in ("sma", "rsi"):
+        start = time.perf_counter()
+        result = Backtester(strategy_name).run(bars)
+        elapsed = time.perf_counter() - start
+        summary = result.summary()
+        print(f"{strategy_name}: {elapsed:.2f}s  손익 {summary['total_pnl']:,.0f}원  "
+              f"MDD {summary['max_drawdown']:.2%}  회전율 {summary['turnover']:.1f}  "
+              f"거래 {summary['trades']:,}  승률 {summary['win_rate']:.1%}")
+
+    grid = parameter_grid(short_period=[3, 5, 10], long_period=[20, 40, 60])
+    for processes in (1, None):
+        start = time.perf_counter()
+        results = run_sweep(bars, "sma", grid, processes=processes)
+        elapsed = time.perf_counter() - start
+        label = processes or os.cpu_count()
+        print(f"스윕 {len(grid)}개 조합 (프로세스 {label}): {elapsed:.2f}s  최고 {results[0][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# 틱 -> 봉 집계 벤치마크
+# 2,000종목 합성 틱을 BarAggregator 에 넣어 초당 처리 틱 수를 재고,
+# 완성된 1분/5분봉과 진행 중 일봉을 numpy 로 따로 계산한 값과 비교한다.
+# 사용법: python benchmarks/bench_bar_aggregator.py [틱수] [종목수]
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication
+
+from bar_aggregator import BarAggregator
+from bar_store import BarStore, to_bar_time
+
+
+def make_ticks(n, n_codes, rate=2000.0, seed=3):
+    """합성 틱 (종목 번호, 초, HHMMSS, 가격, 누적거래량, 체결량) 배열 - 시각 오름차순"""
+    rng = np.random.default_rng(seed)
+    code_idx = rng.integers(0, n_codes, size=n)
+    seconds = 9 * 3600 + (np.arange(n) / rate).astype(np.int64)
+    hhmmss = seconds // 3600 * 10000 + seconds // 60 % 60 * 100 + seconds % 60
+
+    base = rng.integers(50, 2000, size=n_codes) * 100
+    steps = rng.integers(-3, 4, size=n) * 100
+    prices = np.empty(n, dtype=np.int64)
+    cum = np.empty(n, dtype=np.int64)
+    qty = rng.integers(1, 500, size=n)
+    # 종목별 누적합 (같은 종목 순서 유지)
+    order = np.argsort(code_idx, kind='stable')
+    sorted_codes = code_idx[order]
+    first = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+    step_cum = np.cumsum(steps[order])
+    qty_cum = np.cumsum(qty[order])
+    prices[order] = base[sorted_codes] + step_cum - step_cum[group_start] + steps[order][group_start]
+    cum[order] = qty_cum - qty_cum[group_start] + qty[order][group_start]
+    return code_idx, seconds, hhmmss, np.maximum(prices, 100), cum, qty
+
+
+def reference_bars(code_idx, seconds, prices, cum, period):
+    """(종목, 봉 시작) -> (시가, 고가, 저가, 종가, 거래량)"""
+    starts = seconds - seconds % period
+    order = np.lexsort((np.arange(len(seconds)), starts, code_idx))
+    keys = np.stack([code_idx[order], starts[order]], axis=1)
+    boundary = np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)]
+    idx = np.flatnonzero(boundary)
+    last = np.r_[idx[1:], len(order)] - 1
+    p = prices[order]
+    volume = np.diff(np.r_[0, cum[order]])
+    # 종목 첫 틱의 거래량은 체결량 (= 합성 데이터의 첫 누적거래량)
+    first_tick = np.r_[True, code_idx[order][1:] != code_idx[order][:-1]]
+    volume[first_tick] = cum[order][first_tick]
+    high = np.maximum.reduceat(p, idx)
+    low = np.minimum.reduceat(p, idx)
+    total = np.add.reduceat(volume, idx)
+    return {
+        (int(keys[i, 0]), int(keys[i, 1])): (p[i], high[k], low[k], p[last[k]], total[k])
+        for k, i in enumerate(idx)
+    }
+
+
+def check_seed():
+    """장중 재시작: 저장소의 오늘 일봉을 진행 중 봉으로 이어받는다"""
+    day = datetime(2024, 1, 2)
+    day_start = to_bar_time(day)
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        store.append("005930", 'D', {'time': [day_start - 86400, day_start], 'open': [70000, 71000],
+                                     'high': [71000, 72000], 'low': [69000, 70500], 'close': [71000, 71500],
+                                     'volume': [1000000, 400000]})
+        aggregator = BarAggregator(('m1', 'D'), trading_day=day)
+        assert aggregator.seed(store, ["005930"], now=day_start + 10 * 3600) == 1
+        assert aggregator.current("005930", 'm1') is None
+        aggregator.update("005930", 100000, 72500, 400100, 100)
+        bar = aggregator.current("005930", 'D')
+        assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (71000, 72500, 70500, 72500, 400100)
+    print("저장소 일봉 이어받기 확인")
+
+
+def main():
+    n_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_codes = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_seed()
+    code_idx, seconds, hhmmss, prices, cum, qty = make_ticks(n_ticks, n_codes)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    ticks = list(zip([codes[i] for i in code_idx.tolist()], hhmmss.tolist(), prices.tolist(), cum.tolist(), qty.tolist()))
+
+    day = datetime(2024, 1, 2)
+    aggregator = BarAggregator(('m1', 'm5', 'D'), trading_day=day)
+    closed = {'m1': {}, 'm5': {}}
+    aggregator.bar_closed.connect(
+        lambda code, bar: closed[bar.timeframe].__setitem__((int(code), bar.time), bar))
+
+    update = aggregator.update
+    start = time.perf_counter()
+    for code, t, price, volume, trade_volume in ticks:
+        update(code, t, price, volume, trade_volume)
+    elapsed = time.perf_counter() - start
+
+    # 마지막 틱 이후 남은 분봉 완성 처리 (일봉은 진행 중으로 남는다)
+    day_start = to_bar_time(day)
+    aggregator.flush(day_start + int(seconds[-1]) + 3600)
+
+    for timeframe, period in (('m1', 60), ('m5', 300)):
+        expected = reference_bars(code_idx, seconds, prices, cum, period)
+        got = {(code, bar_time - day_start): tuple(bar[3:]) for (code, bar_time), bar in closed[timeframe].items()}
+        assert got.keys() == expected.keys(), timeframe
+        for key, values in expected.items():
+            assert np.allclose(got[key], values), (timeframe, key, got[key], values)
+    daily = reference_bars(code_idx, seconds, prices, cum, 86400)
+    for (code, _), values in daily.items():
+        bar = aggregator.current(codes[code], 'D')
+        assert np.allclose(tuple(bar[3:]), values), (code, bar, values)
+    assert aggregator.late_ticks == 0
+
+    n_bars = sum(len(bars) for bars in closed.values())
+    print(f"틱 {n_ticks:,}건 / {n_codes:,}종목 / 주기 3개: {elapsed:.2f}초 -> {n_ticks / elapsed:,.0f} 틱/초 "
+          f"({elapsed / n_ticks * 1e6:.2f}µs/틱)")
+    print(f"완성 봉 {n_bars:,}개 (1분 {len(closed['m1']):,}, 5분 {len(closed['m5']):,}), 일봉 진행 중 {len(daily):,}개 - 기준 계산과 일치")
+    assert n_ticks / elapsed >= 100000, "초당 10만 틱 미달"
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# 조건검색 편입 종목 추적 벤치마크 (헤드리스)
+# 조건식 10개를 동시에 실행하고 초기 목록 + 대량 편입/이탈 이벤트를 처리하면서
+# 처리량, 메모리 증가, 편입 종목 실시간 등록 호출 수를 측정한다.
+# 사용법: python benchmarks/bench_condition_tracker.py [이벤트수]
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from condition_handler import ConditionHandler
+from condition_model import ConditionTableModel
+from fake_ocx import FakeKiwoom, make_symbols, synthetic_conditions
+from real_subscriptions import RealSubscriptionManager
+
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    kiwoom = FakeKiwoom()
+    symbols = list(make_symbols(2000))
+    names = [f"가상조건{i}" for i in range(10)]
+    for i, name in enumerate(names):
+        kiwoom.ocx.condition_results[name] = symbols[i * 50:i * 50 + 300]
+
+    handler = ConditionHandler(kiwoom)
+    handler.subscriptions = RealSubscriptionManager(kiwoom)
+    model = ConditionTableModel()
+    handler.condition_result.connect(lambda name, added, removed: model.apply_changes(
+        name, [(code, code, entered_at) for code, entered_at in added], removed))
+    kiwoom.ocx.OnReceiveTrCondition.connect(handler.on_receive_tr_condition)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, name in enumerate(names):
+            handler.start_condition_search(f"{i:03d}", name)
+        assert not handler.start_condition_search("010", "초과조건")
+        kiwoom.ocx.process_events()
+        handler.subscriptions.commit()
+    print(f"초기 편입: {model.rowCount()}행, 화면번호 {sorted(s for _, s in handler.monitoring_conditions.values())}")
+
+    # 조건식별 이벤트를 시간 순서대로 섞는다
+    per_condition = n_events // len(names)
+    events = sorted((event for i, name in enumerate(names)
+                     for event in synthetic_conditions(symbols, per_condition, name, f"{i:03d}", seed=i)),
+                    key=lambda event: event[0])
+    flush_every = 200  # 타이머 1회 동안 들어오는 이벤트 수 가정
+
+    def run(traced):
+        half = len(events) // 2
+        middle = 0
+        for i, (_, _, args) in enumerate(events):
+            handler.on_receive_real_condition(*args)
+            if i % flush_every == flush_every - 1:
+                handler.flush_changes()
+                handler.subscriptions.commit()
+            if traced and i == half:
+                middle = tracemalloc.get_traced_memory()[0]
+        handler.flush_changes()
+        handler.subscriptions.commit()
+        return middle
+
+    start = time.perf_counter()
+    run(False)
+    elapsed = time.perf_counter() - start
+
+    # 같은 이벤트를 한 번 더 처리하면서 메모리 증가 확인 (추적 오버헤드로 처리량 측정과 분리)
+    tracemalloc.start()
+    middle = run(True)
+    end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    members = sum(len(handler.tracker.members(name)) for name in names)
+    assert model.rowCount() == members, (model.rowCount(), members)
+    print(f"이벤트 {len(events):,}건 {elapsed:.2f}초 -> {len(events) / elapsed:,.0f} 이벤트/초")
+    print(f"현재 편입 {members}개, 이력 {len(handler.tracker.history):,}건 보관")
+    print(f"메모리: 중간 {middle / 1024:,.0f} KB -> 종료 {end / 1024:,.0f} KB")
+
+    # 가상 OCX 에 실제로 등록된 종목 = 어느 조건식에든 편입된 종목
+    live = set().union(*(handler.tracker.members(name) for name in names))
+    registered = set().union(*kiwoom.ocx.real_registrations.values())
+    assert registered == live == handler.subscriptions.registered_codes()
+    calls = kiwoom.ocx.real_reg_calls
+    print(f"실시간 등록: {len(registered)}종목, SetRealReg {len(calls)}회, "
+          f"호출당 최대 {max(len(call[1].split(';')) for call in calls)}종목, {handler.subscriptions.stats()}")
+    for stat in handler.condition_stats()[:3]:
+        print(f"  {stat['name']}: 이벤트 {stat['events']:,}건, 최대 반영 지연 {stat['max_latency'] * 1000:.1f}ms, "
+              f"초기 목록 {stat['load_latency'] * 1000:.1f}ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# 화면 없는 엔진 + IPC 벤치마크 (가상 OCX)
+# 프레임 분할 수신, 공유 메모리 틱 링 쓰기 비용/밀린 읽기, 엔진 시작 시간(로그인 후 첫 상태 발행까지)을 재고
+# 읽지 않는(멈춘) 화면이 붙어 있어도 엔진의 틱/주문 처리가 늦어지지 않고, 화면이 다시 읽으면 전체 상태를 받는지 확인한다.
+# 사용법: python benchmarks/bench_engine.py [틱수]
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+from config import Config
+from engine_ipc import FrameDecoder, IpcClient, TickRing, encode_frame
+from fake_ocx import FakeKiwoom, synthetic_ticks
+from real_decoder import Tick
+
+IPC_NAME = f"kiwoom-engine-bench-{os.getpid()}"
+RING_NAME = f"kiwoom_ticks_bench_{os.getpid()}"
+
+
+def wait_until(app, condition, timeout=5.0):
+    """조건을 만족할 때까지 이벤트 처리 (초과하면 False)"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents(QEventLoop.AllEvents, 10)
+    return True
+
+
+def check_frames():
+    """조각난 수신에서도 프레임 복원"""
+    rng = random.Random(1)
+    messages = [(f"topic{i % 7}", {'i': i, 'name': "삼성전자", 'values': list(range(i % 50))}) for i in range(2000)]
+    stream = b"".join(encode_frame(topic, payload) for topic, payload in messages)
+    decoder = FrameDecoder()
+    received = []
+    offset = 0
+    while offset < len(stream):
+        size = rng.randint(1, 300)
+        received.extend(decoder.feed(stream[offset:offset + size]))
+        offset += size
+    assert received == messages and not decoder.buffer
+    try:
+        FrameDecoder().feed(b"\xff\xff\xff\xff\x01")
+        raise AssertionError("잘못된 프레임 길이를 받아들임")
+    except ValueError:
+        pass
+    print(f"프레임: {len(messages):,}개 / {len(stream) / 1024:.0f}KB 를 임의 조각으로 받아 모두 복원")
+
+
+def check_ring(n_ticks):
+    """링 쓰기 비용 / 밀린 읽기는 최근 용량만 (잃은 개수 집계)"""
+    capacity = 4096
+    writer = TickRing(RING_NAME + "_check", capacity, create=True)
+    reader = TickRing(RING_NAME + "_check")
+    try:
+        ticks = [Tick(f"{100000 + i % 500:06d}", 90000 + i % 3600, 1000 + i % 97, i % 13 - 6, 0.5, i, i % 100)
+                 for i in range(n_ticks)]
+        write = writer.write_tick
+        start = time.perf_counter()
+        for i, tick in enumerate(ticks):
+            write(tick, i)
+        elapsed = (time.perf_counter() - start) / n_ticks
+
+        # 용량보다 많이 밀린 독자는 최근 capacity 개만 받는다
+        batch = reader.read()
+        assert len(batch) + reader.lost == n_ticks, (len(batch), reader.lost)
+        assert len(batch) <= capacity and batch['ts'][-1] == n_ticks - 1
+        assert batch['code'][-1].decode() == ticks[-1].code and batch['price'][-1] == ticks[-1].price
+        assert (batch['ts'][1:] - batch['ts'][:-1] == 1).all()
+
+        # 따라잡은 뒤에는 잃는 틱 없음
+        lost = reader.lost
+        for i in range(n_ticks, n_ticks + 1000):
+            write(ticks[i % n_ticks], i)
+            if i % 100 == 0:
+                assert len(reader.read()) > 0
+        reader.read()
+        assert reader.lost == lost and reader.cursor == writer.sequence()
+        print(f"틱 링: 쓰기 {elapsed * 1e9:.0f}ns/틱, 용량 {capacity:,} 에 {n_ticks:,}개 밀린 독자는 "
+              f"최근 {len(batch):,}개만 받음 (건너뜀 {lost:,})")
+    finally:
+        reader.close()
+        writer.close()
+
+
+def check_engine(app, n_ticks):
+    """엔진 시작 시간 / 틱 전달 / 멈춘 화면과 무관한 주문 처리"""
+    start = time.perf_counter()
+    from engine import TradingEngine
+    kiwoom = FakeKiwoom()
+    engine = TradingEngine(kiwoom, ipc_name=IPC_NAME, ring_name=RING_NAME)
+    constructed = time.perf_counter() - start
+
+    client = IpcClient(IPC_NAME)
+    messages = []
+    client.message_received.connect(lambda topic, payload: messages.append((topic, payload)))
+    codes = list(kiwoom.ocx.symbols)[:4]
+    engine.start(watch=codes)
+    assert client.connect_to_engine()
+    ready = wait_until(app, lambda: any(t == "status" and p.get('logged_in') for t, p in messages))
+    started = time.perf_counter() - start
+    assert ready and started < 1.0, started
+    assert wait_until(app, lambda: any(t == "account" for t, _ in messages))
+    watch = [p for t, p in messages if t == "watch"][-1]
+    assert list(watch['stocks']) == codes
+    print(f"엔진 시작: 생성 {constructed * 1e3:.0f}ms, 로그인/계좌 등록/감시 종목 발행까지 {started * 1e3:.0f}ms")
+
+    # 틱: 엔진 처리 + 링 기록, 화면은 자기 주기에 링을 읽음
+    reader = TickRing(RING_NAME)
+    events = synthetic_ticks(codes, n_ticks)
+    receive = kiwoom.ocx.emit_real
+    begin = time.perf_counter()
+    for _, _, (code, real_type, fids) in events:
+        receive(code, real_type, fids)
+    per_tick = (time.perf_counter() - begin) / n_ticks
+    batch = reader.read()
+    assert len(batch) + reader.lost == n_ticks
+    last = {}
+    for code, price in zip(batch['code'].tolist(), batch['price'].tolist()):
+        last[code.decode()] = price
+    for code, tick in engine.real_data.items():
+        assert last[code] == tick.price
+    print(f"틱 {n_ticks:,}개: 엔진 처리 {per_tick * 1e6:.1f}µs/틱 (링 기록 포함), 화면 마지막 가격 일치")
+
+    # 멈춘 화면: 연결만 하고 읽지 않음 (Qt 소켓은 이벤트 루프에서 알아서 읽으므로 일반 유닉스 소켓 사용)
+    # -> 엔진 발행은 밀린 화면을 건너뛰고 계속
+    frozen = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    frozen.connect(engine.ipc.server.fullServerName())
+    assert wait_until(app, lambda: len(engine.ipc.clients) == 2)
+    filler = {'text': "x" * 8192}
+    worst = 0.0
+    for _ in range(Config.IPC_MAX_PENDING_BYTES // 4096):
+        begin = time.perf_counter()
+        engine.publish("filler", filler)
+        worst = max(worst, time.perf_counter() - begin)
+        app.processEvents()
+    stale = [c for c in engine.ipc.clients.values() if c.stale]
+    assert len(stale) == 1 and stale[0].socket is not client.socket
+    assert stale[0].socket.bytesToWrite() <= Config.IPC_MAX_PENDING_BYTES + 16384
+
+    # 화면이 멈춰 있는 동안에도 주문은 바로 접수/체결
+    orders_before = len(kiwoom.ocx.orders)
+    begin = time.perf_counter()
+    engine.place_order({'code': codes[0], 'side': "buy", 'quantity': 1, 'price': 0})
+    filled = wait_until(app, lambda: engine.order_manager.position(codes[0]) is not None)
+    order_latency = time.perf_counter() - begin
+    assert filled and len(kiwoom.ocx.orders) == orders_before + 1
+    assert wait_until(app, lambda: any(t == "order" for t, _ in messages))
+    dropped = stale[0].dropped
+    print(f"멈춘 화면: 발행 최대 {worst * 1e6:.0f}µs, 건너뛴 메시지 {dropped}개, "
+          f"주문 접수~체결 반영 {order_latency * 1e3:.0f}ms (정상 화면은 주문 메시지 수신)")
+
+    # 멈춘 화면이 다시 읽기 시작하면 밀린 데이터 뒤에 전체 상태를 다시 받음
+    decoder = FrameDecoder()
+    resumed = []
+    frozen.setblocking(False)
+
+    def drain():
+        try:
+            while True:
+                resumed.extend(decoder.feed(frozen.recv(65536)))
+        except BlockingIOError:
+            pass
+        topics = [t for t, _ in resumed]
+        return "filler" in topics and "positions" in topics[len(topics) - topics[::-1].index("filler"):]
+    assert wait_until(app, drain)
+    positions = [p for t, p in resumed if t == "positions"][-1]['positions']
+    assert codes[0] in positions and not stale[0].stale
+    print(f"재개: 밀린 {sum(t == 'filler' for t, _ in resumed)}개 수신 후 전체 상태 재전송 (보유 {len(positions)}종목)")
+
+    # 명령: 화면에서 감시 종목 제거
+    client.send("unwatch", {'code': codes[-1]})
+    assert wait_until(app, lambda: codes[-1] not in engine.watch_stocks)
+
+    frozen.close()
+    client.close()
+    reader.close()
+    engine.shutdown()
+
+
+def main():
+    n_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_frames()
+    check_ring(n_ticks)
+    # 저널 / 봉 / 종목 마스터 / 지표 파일은 임시 폴더에
+    with tempfile.TemporaryDirectory() as root:
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            check_engine(app, min(n_ticks, 50000))
+        finally:
+            os.chdir(cwd)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# 스트리밍 지표 검증 및 벤치마크
+# 매 틱마다 스트리밍 값이 일괄(윈도우 재계산) 결과와 같은지 확인하고 틱당 비용을 비교한다.
+# Wilder 모드(wilder=True)는 기준 구현과 매 틱, 배열 일괄 반영(update_many)까지 비교한다.
+# 사용법: python benchmarks/bench_indicators.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import StreamingRSI, StreamingSMA
+from strategy import TradingStrategy
+
+
+def wilder_rsi_reference(prices, period):
+    """Wilder RSI 기준 구현 (전체 구간 재계산)"""
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def wilder_rsi_series(prices, period):
+    """Wilder RSI 기준 구현 - 틱별 값 배열 (데이터 부족 구간은 nan)"""
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    values = np.full(len(prices), np.nan)
+    if len(deltas) < period:
+        return values
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    for i in range(period, len(deltas) + 1):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        values[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return values
+
+
+def check_wilder(n_ticks=5000):
+    """Wilder 모드 (wilder=True) 스트리밍/일괄 반영 값이 매 틱 기준 구현과 같은지"""
+    rng = np.random.default_rng(11)
+    series = [
+        50000 + np.cumsum(rng.integers(-300, 300, size=n_ticks)).astype(np.float64),
+        np.linspace(10000, 20000, 200),  # 하락 없음 -> 100
+        np.full(100, 7000.0),  # 변동 없음
+    ]
+    max_diff = 0.0
+    for prices in series:
+        for period in (2, 14, 30):
+            expected = wilder_rsi_series(prices, period)
+            rsi = StreamingRSI(period, wilder=True)
+            for i, price in enumerate(prices):
+                got = rsi.update(price)
+                assert (got is None) == np.isnan(expected[i]), f"기간 {period} {i}번째 틱 준비 상태 불일치"
+                if got is not None:
+                    max_diff = max(max_diff, abs(got - expected[i]))
+
+            # 배열 일괄 반영 (저널 재생 경로): 임의 길이로 나눠 넣어도 같은 값
+            batched = StreamingRSI(period, wilder=True)
+            pos = 0
+            while pos < len(prices):
+                size = int(rng.integers(0, 3 * period))
+                got = batched.update_many(prices[pos:pos + size])
+                pos += size
+                if got is not None and size:
+                    max_diff = max(max_diff, abs(got - expected[min(pos, len(prices)) - 1]))
+            assert batched.value is not None and rsi.value is not None
+            max_diff = max(max_diff, abs(batched.value - rsi.value))
+
+    assert max_diff < 1e-6, f"Wilder 최대 오차 {max_diff}"
+    print(f"✅ Wilder RSI 스트리밍/일괄 반영 = 기준 구현 (기간 2/14/30, 매 틱 비교, 최대 오차 {max_diff:.2e})")
+
+
+def verify(n_ticks=3000, seed=7):
+    """스트리밍 결과와 일괄 계산 결과 비교"""
+    strategy = TradingStrategy(None)
+    rng = np.random.default_rng(seed)
+    prices = 50000 + np.cumsum(rng.integers(-300, 300, size=n_ticks)).astype(np.float64)
+
+    sma_short, sma_long = StreamingSMA(5), StreamingSMA(20)
+    rsi, wilder = StreamingRSI(14), StreamingRSI(14, wilder=True)
+    max_diff = 0.0
+
+    for i, price in enumerate(prices):
+        values = (sma_short.update(price), sma_long.update(price), rsi.update(price))
+        wilder_value = wilder.update(price)
+        window = prices[:i + 1]
+
+        expected = (
+            np.mean(window[-5:]) if len(window) >= 5 else None,
+            np.mean(window[-20:]) if len(window) >= 20 else None,
+            strategy._calculate_rsi(window[-15:], 14) if len(window) >= 15 else None,
+        )
+        for got, want in zip(values, expected):
+            assert (got is None) == (want is None), f"{i}번째 틱 준비 상태 불일치"
+            if got is not None:
+                max_diff = max(max_diff, abs(got - want))
+
+        if i % 97 == 0 and len(window) >= 15:
+            max_diff = max(max_diff, abs(wilder_value - wilder_rsi_reference(window, 14)))
+
+    assert max_diff < 1e-6, f"최대 오차 {max_diff}"
+    print(f"✅ 스트리밍 = 일괄 계산 ({n_ticks:,}틱, 최대 오차 {max_diff:.2e})")
+
+
+def bench(n_ticks=200000, window=60):
+    """틱당 갱신 비용 비교"""
+    strategy = TradingStrategy(None)
+    prices = list(50000 + np.cumsum(np.random.default_rng(1).integers(-300, 300, size=n_ticks)))
+
+    start = time.perf_counter()
+    for i in range(n_ticks):
+        strategy.on_price("005930", prices[i])
+        strategy.simple_moving_average_strategy("005930")
+        strategy.rsi_strategy("005930")
+    stream_us = (time.perf_counter() - start) / n_ticks * 1e6
+
+    history = []
+    n_batch = n_ticks // 20
+    start = time.perf_counter()
+    for price in prices[:n_batch]:
+        history.append(price)
+        recent = history[-window:]
+        if len(recent) >= 20:
+            np.mean(recent[-5:])
+            np.mean(recent[-20:])
+            strategy._calculate_rsi(recent[-15:], 14)
+    batch_us = (time.perf_counter() - start) / n_batch * 1e6
+
+    print(f"스트리밍: {stream_us:.2f} µs/틱 (갱신 + SMA/RSI 시그널)")
+    print(f"윈도우 재계산: {batch_us:.2f} µs/틱")
+
+
+def main():
+    verify()
+    check_wilder()
+    bench()
+
+
+if __name__ == "__main__":
+    main()
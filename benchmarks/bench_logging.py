@@ -0,0 +1,126 @@
+# 로그 처리 벤치마크 (초당 1만 줄)
+# 백그라운드 스레드가 초당 1만 줄을 기록하는 동안 GUI 이벤트 루프 1회 처리 시간(프레임 시간)을 잰다.
+#   큐 + 링버퍼 + LogView: 화면에는 주기적으로 묶어서 반영, 최대 줄 수 유지
+#   기존 방식: GUI 스레드에서 줄마다 QTextEdit.append + 커서 이동 (문서 무제한 증가)
+# 사용법: python benchmarks/bench_logging.py [초]
+import glob
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit, QTextEdit
+
+from app_logging import LogView, setup_logging, shutdown_logging
+from config import Config
+
+RATE = 10000  # 초당 줄 수
+BATCH = 100  # 생산자 1회 기록 줄 수 (10ms 마다)
+
+
+def produce(emit, seconds, stop):
+    """초당 RATE 줄을 BATCH 단위로 기록"""
+    start = time.perf_counter()
+    sent = 0
+    while not stop.is_set() and time.perf_counter() - start < seconds:
+        for _ in range(BATCH):
+            emit(f"📊 가상조건: 편입 {sent}개, 123.4건/초, 지연 5ms (종목 {sent % 2000:06d})")
+            sent += 1
+        target = start + sent / RATE
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    return sent
+
+
+def frame_stats(frames, seconds):
+    busy = sum(frames) / seconds * 100
+    frames = np.asarray(frames) * 1e3
+    return (f"프레임 p50 {np.percentile(frames, 50):.2f}ms, p99 {np.percentile(frames, 99):.2f}ms, "
+            f"최대 {frames.max():.2f}ms, GUI 스레드 점유 {busy:.1f}%")
+
+
+def run_async(app, seconds, root, widget_class=QTextEdit):
+    Config.LOG_MAX_BYTES = 2 * 1024 * 1024
+    system = setup_logging(log_file=os.path.join(root, "trading.log"), console=False)
+    widget = widget_class()
+    widget.resize(800, 300)
+    widget.show()
+    view = LogView(widget, system.ring)
+    logger = logging.getLogger("bench")
+
+    stop = threading.Event()
+    result = {}
+    producer = threading.Thread(target=lambda: result.update(sent=produce(logger.info, seconds, stop)))
+    producer.start()
+
+    frames = []
+    while producer.is_alive():
+        t0 = time.perf_counter()
+        app.processEvents()
+        frames.append(time.perf_counter() - t0)
+        time.sleep(0.001)
+    producer.join()
+    shutdown_logging()
+    view.refresh()
+
+    files = glob.glob(os.path.join(root, "trading.log*"))
+    with open(os.path.join(root, "trading.log"), encoding='utf-8') as f:
+        last_line = f.read().rstrip("\n").rsplit("\n", 1)[-1]
+    assert len(files) > 1, "로그 파일 회전 안 됨"
+    assert f"편입 {result['sent'] - 1}개" in last_line, last_line
+    assert widget.document().blockCount() <= Config.LOG_VIEW_LINES
+    assert system.dropped == 0
+
+    print(f"큐 + LogView ({widget_class.__name__}): {result['sent']:,}줄 / {seconds}초 - {frame_stats(frames, seconds)}, "
+          f"화면 반영 최대 {view.max_refresh * 1e3:.2f}ms")
+    print(f"  화면 {widget.document().blockCount():,}줄 유지, 파일 {len(files)}개로 회전, 버림 {system.dropped}줄")
+
+
+def run_direct(app, seconds):
+    """기존 방식: GUI 스레드에서 줄마다 위젯 갱신"""
+    widget = QTextEdit()
+    widget.resize(800, 300)
+    widget.show()
+
+    def log(message):
+        widget.append(f"[{time.strftime('%H:%M:%S')}] {message}")
+        cursor = widget.textCursor()
+        cursor.movePosition(cursor.End)
+        widget.setTextCursor(cursor)
+
+    frames = []
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < seconds:
+        # 10ms 동안 도착한 줄을 GUI 스레드가 처리 (밀리면 다음 프레임에 누적)
+        due = int((time.perf_counter() - start) * RATE) - sent
+        t0 = time.perf_counter()
+        for _ in range(due):
+            log(f"📊 가상조건: 편입 {sent}개, 123.4건/초, 지연 5ms (종목 {sent % 2000:06d})")
+            sent += 1
+        app.processEvents()
+        frames.append(time.perf_counter() - t0)
+        time.sleep(0.001)
+    behind = int(seconds * RATE) - sent
+    print(f"기존 방식: {sent:,}줄 처리 / {seconds}초 (밀린 줄 {max(behind, 0):,}) - {frame_stats(frames, seconds)}, "
+          f"화면 {widget.document().blockCount():,}줄")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = QApplication.instance() or QApplication(sys.argv)
+    for widget_class in (QTextEdit, QPlainTextEdit):
+        with tempfile.TemporaryDirectory() as root:
+            run_async(app, seconds, root, widget_class)
+    run_direct(app, seconds)
+
+
+if __name__ == "__main__":
+    main()
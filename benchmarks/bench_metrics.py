@@ -0,0 +1,165 @@
+# 지연 계측 벤치마크 (가상 OCX)
+# HDR 히스토그램 분위수 오차, @timed 계측 비용, 핸들러/TR 왕복 지연 기록,
+# Prometheus 텍스트 내보내기 형식과 지표 도크 갱신 시간을 확인한다.
+# 사용법: python benchmarks/bench_metrics.py [호출수]
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from account_handler import AccountHandler
+from condition_handler import ConditionHandler
+from fake_ocx import FakeKiwoom, make_symbols, synthetic_conditions
+from metrics import LatencyHistogram, MetricsRegistry, registry, timed
+from metrics_panel import MetricsPanel
+from realtime_model import RealtimeTableModel
+from tr_scheduler import TrScheduler
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? '
+                         r'[-+0-9.eEinfINFNa]+$')
+
+
+def check_accuracy():
+    """분위수 추정값이 실제 분위수보다 작지 않고 구간 폭(12.5%) 안에 있는지"""
+    rng = np.random.default_rng(5)
+    samples = rng.lognormal(np.log(200e-6), 1.2, size=200000)
+    histogram = LatencyHistogram()
+    for value in samples.tolist():
+        histogram.record(value)
+    for q in (50, 90, 99, 99.9):
+        exact = np.percentile(samples, q)
+        estimate = histogram.percentile(q)
+        assert exact * 0.99 <= estimate <= exact * 1.13, (q, exact, estimate)
+    print(f"분위수 오차 확인: p50 {histogram.percentile(50) * 1e6:.0f}µs (실제 {np.percentile(samples, 50) * 1e6:.0f}µs), "
+          f"p99 {histogram.percentile(99) * 1e3:.2f}ms (실제 {np.percentile(samples, 99) * 1e3:.2f}ms), "
+          f"구간 {LatencyHistogram.BUCKETS}개")
+
+
+def check_overhead(n):
+    """@timed 래퍼 1회 비용"""
+    def handler(code, real_type, real_data):
+        return code
+
+    wrapped = timed("bench_overhead_seconds")(handler)
+    args = ("005930", "주식체결", "")
+    best = []
+    for func in (handler, wrapped):
+        elapsed = []
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(n):
+                func(*args)
+            elapsed.append(time.perf_counter() - start)
+        best.append(min(elapsed) / n)
+    overhead = best[1] - best[0]
+    registry.remove("bench_overhead_seconds")
+    print(f"@timed 계측 비용: {overhead * 1e9:.0f}ns/호출 (핸들러 {best[0] * 1e9:.0f}ns -> {best[1] * 1e9:.0f}ns)")
+    assert overhead < 2e-6, "계측 비용 2µs 초과"
+
+
+def run_pipeline(app):
+    """가상 OCX 로 TR 왕복 / 조건검색 / 실시간 테이블 지연 기록"""
+    kiwoom = FakeKiwoom(tr_latency_ms=20)
+    scheduler = TrScheduler(kiwoom, per_second=1000, per_hour=100000)
+    account = AccountHandler(kiwoom)
+    kiwoom.ocx.OnReceiveTrData.connect(scheduler.on_receive_tr_data)
+    requests = [scheduler.submit("계좌평가잔고내역요청", "opw00018", {"계좌번호": "8012345611"},
+                                 parser=account.process_balance_data) for _ in range(20)]
+    deadline = time.perf_counter() + 5
+    while not all(request.future.done() for request in requests) and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert all(request.future.done() for request in requests)
+
+    symbols = list(make_symbols(500))
+    handler = ConditionHandler(kiwoom)
+    handler.start_condition_search("000", "가상조건")
+    kiwoom.ocx.process_events()
+    for i, (_, _, args) in enumerate(synthetic_conditions(symbols, 5000, "가상조건", "000")):
+        handler.on_receive_real_condition(*args)
+        if i % 100 == 99:
+            handler.flush_changes()
+
+    model = RealtimeTableModel()
+    for code in symbols:
+        model.add_symbol(code, code)
+    for i in range(20000):
+        model.update_tick(symbols[i % len(symbols)], price=10000 + i % 50)
+        if i % 1000 == 999:
+            model.flush()
+
+    roundtrip = registry.histogram("kiwoom_tr_roundtrip_seconds", trcode="opw00018").summary()
+    assert roundtrip['count'] >= 20 and roundtrip['p50'] >= 0.015, roundtrip
+    for name in ("kiwoom_balance_handler_seconds", "kiwoom_real_condition_handler_seconds",
+                 "kiwoom_condition_signal_latency_seconds", "kiwoom_realtime_table_latency_seconds"):
+        assert registry.histogram(name).count > 0, name
+    print(f"TR 왕복 (opw00018, 가상 지연 20ms): p50 {roundtrip['p50'] * 1e3:.1f}ms, "
+          f"p99 {roundtrip['p99'] * 1e3:.1f}ms, {roundtrip['count']}건")
+
+
+def check_export(root):
+    """Prometheus 텍스트 형식"""
+    sample = MetricsRegistry()
+    sample.histogram("demo_seconds", "설명\n두 줄", trcode='op"w').record(0.01)
+    sample.gauge("demo_depth", lambda: 3, queue="tr")
+    text = sample.to_prometheus()
+    assert 'demo_seconds{trcode="op\\"w",quantile="0.99"} 0.01' in text, text
+    assert "# HELP demo_seconds 설명\\n두 줄" in text and "demo_depth{queue=\"tr\"} 3" in text, text
+
+    path = os.path.join(root, "metrics.prom")
+    registry.gauge("kiwoom_queue_depth", lambda: 7, "대기열 길이", queue="bench")
+    start = time.perf_counter()
+    registry.write_prometheus(path)
+    elapsed = time.perf_counter() - start
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    types = {}
+    for line in lines:
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types, f"TYPE 중복: {name}"
+            types[name] = kind
+        elif not line.startswith("#"):
+            assert SAMPLE_LINE.match(line), line
+    assert types.get("kiwoom_queue_depth") == "gauge"
+    assert types.get("kiwoom_tr_roundtrip_seconds") == "summary"
+    assert not [name for name in os.listdir(root) if name.endswith(".tmp")]
+    print(f"Prometheus 내보내기: 지표 {len(types)}종 / {len(lines)}줄, {elapsed * 1e3:.2f}ms")
+
+
+def check_panel(app):
+    panel = MetricsPanel(export_file="")
+    panel.resize(600, 400)
+    panel.show()
+    app.processEvents()
+    panel.refresh()
+    start = time.perf_counter()
+    for _ in range(20):
+        panel.refresh()
+    elapsed = (time.perf_counter() - start) / 20
+    titles = [panel.table.item(row, 0).text() for row in range(panel.table.rowCount())]
+    assert "kiwoom_tr_roundtrip_seconds trcode=opw00018" in titles, titles
+    assert "kiwoom_queue_depth queue=bench" in titles, titles
+    print(f"지표 도크: {len(titles)}행, 갱신 {elapsed * 1e3:.2f}ms")
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    app = QApplication.instance() or QApplication(sys.argv)
+    check_accuracy()
+    check_overhead(n_calls)
+    run_pipeline(app)
+    with tempfile.TemporaryDirectory() as root:
+        check_export(root)
+    check_panel(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# 파라미터 최적화 벤치마크
+# 사용법: python benchmarks/bench_optimizer.py
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import signal_engine
+from bench_backtest import make_bars
+from optimizer import ParameterOptimizer, precompute, signals_from_arrays
+
+
+def check_signals(bars):
+    """공유 누적합 시그널이 signal_engine 과 같은지 확인"""
+    arrays = precompute(bars)
+    for name, params in (("sma", {'short_period': 7, 'long_period': 45}),
+                         ("rsi", {'period': 9, 'oversold': 25, 'overbought': 75})):
+        expected = signal_engine.signal_series(bars['close'], name, **params)
+        assert np.array_equal(signals_from_arrays(arrays, name, params), expected), name
+
+
+def main():
+    bars = make_bars(1000, 1250)
+    check_signals(bars)
+
+    for strategy_name in ("sma", "rsi"):
+        for processes in (1, max(os.cpu_count() or 1, 2)):
+            optimizer = ParameterOptimizer(bars, strategy_name, processes=processes)
+            optimizer.run(method="random", n_samples=64, seed=1)
+            print(f"[{strategy_name}]")
+            print(optimizer.format_table(top=5))
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# 주문/체결 처리 벤치마크 (가상 OCX)
+# 가상 OCX 가 즉시 체결시키는 주문을 대량으로 보내고 체잔 이벤트 처리량과 잔고 일치를 확인한다.
+# 가상 시계로 몰리는 주문을 흘려 보내 어느 1초 구간에도 SendOrder 가 초당 제한을 넘지 않는지도 본다.
+# 사용법: python benchmarks/bench_orders.py [주문수]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from fake_ocx import FakeClock, FakeKiwoom, make_symbols, max_in_window
+from order_manager import OrderManager
+from strategy import TradingStrategy
+
+
+def check_rate_limit():
+    """초당 주문 제한: 어느 1초 구간에도 SendOrder 가 5건을 넘지 않고, 넘는 주문은 대기열에 남는다"""
+    kiwoom = FakeKiwoom()
+    clock = FakeClock()
+    manager = OrderManager(kiwoom, clock=clock, per_second=5)
+    sent_at = []
+    send_order = kiwoom.send_order
+
+    def recording_send_order(*args):
+        sent_at.append(clock.now)
+        return send_order(*args)
+    kiwoom.send_order = recording_send_order
+
+    for _ in range(12):
+        manager.buy("005930", 1, 70000)
+    assert len(kiwoom.ocx.orders) == 5 and manager.pending_count() == 7
+    clock.now += 1.0
+    manager.pump()
+    assert len(kiwoom.ocx.orders) == 10
+
+    # 불규칙한 시각에 몰려 들어오는 주문 + 50ms 주기 pump
+    rng = random.Random(7)
+    for _ in range(400):
+        clock.now += 0.05
+        for _ in range(rng.choice([0, 0, 0, 1, 3, 8])):
+            manager.buy("005930", 1, 70000)
+        manager.pump()
+    while manager.pending_count():
+        clock.now += 0.05
+        manager.pump()
+    worst = max_in_window(sent_at, 1.0)
+    assert worst <= 5, worst
+    assert len(kiwoom.ocx.orders) == len(sent_at)
+    print(f"초당 주문 제한 확인: 12건 중 5건 전송, 1초 후 10건 / "
+          f"몰린 주문 {len(sent_at)}건 전송 중 1초 구간 최대 {worst}건")
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_rate_limit()
+
+    kiwoom = FakeKiwoom()
+    strategy = TradingStrategy(kiwoom)
+    manager = OrderManager(kiwoom, strategy, per_second=1e9)
+    codes = list(make_symbols(50))
+
+    requests = []
+    for i in range(n_orders):
+        code = codes[i % len(codes)]
+        if i % 3 == 2:
+            requests.append(manager.sell(code, 1, 10000 + i % 100))
+        else:
+            requests.append(manager.buy(code, 2, 10000 + i % 100))
+    kiwoom.ocx.OnReceiveChejanData.connect(manager.on_receive_chejan_data)
+
+    pending = len(kiwoom.ocx.pending)
+    start = time.perf_counter()
+    kiwoom.ocx.process_events()
+    elapsed = time.perf_counter() - start
+
+    assert all(request.future.done() for request in requests)
+    assert manager.fill_count == n_orders and not manager.open_orders
+    expected = {code: qty for code, (qty, _) in kiwoom.ocx.holdings.items()}
+    assert {code: p['quantity'] for code, p in manager.positions.items()} == expected
+    assert {code: p['quantity'] for code, p in strategy.positions.items()} == expected
+
+    print(f"체잔 이벤트 {pending:,}건 (체결 {manager.fill_count:,}건) {elapsed:.2f}초 -> "
+          f"{manager.fill_count / elapsed:,.0f} 체결/초, {pending / elapsed:,.0f} 이벤트/초")
+    print(f"잔고 {len(manager.positions)}종목 가상 OCX 와 일치")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# 실시간 잔고 평가 벤치마크 (가상 OCX)
+# 보유 종목 틱마다 평가금액을 O(1) 로 갱신하는 비용과 결과(전체 재계산과 일치)를 확인하고,
+# 계좌 요약 시그널이 갱신 주기로만 나가는지, 주기적 잔고 조회가 한 번에 하나만 대기열에 들어가는지 확인한다.
+# 사용법: python benchmarks/bench_portfolio.py [보유종목수] [틱수]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication
+
+from account_handler import AccountHandler
+from fake_ocx import FakeKiwoom, make_symbols
+from order_manager import OrderManager
+from portfolio import PortfolioValuation
+from tr_scheduler import TrScheduler
+
+
+class CountingSubscriptions:
+    """실시간 구독 요청 기록"""
+
+    def __init__(self):
+        self.codes = set()
+
+    def subscribe(self, code):
+        self.codes.add(code)
+
+    def unsubscribe(self, code):
+        self.codes.discard(code)
+
+
+def check_reconcile(n_holdings):
+    """잔고 조회 반영 / 중복 요청 방지 / 체결 잔고 반영"""
+    kiwoom = FakeKiwoom(symbols=make_symbols(n_holdings))
+    rng = np.random.default_rng(3)
+    codes = list(kiwoom.ocx.symbols)
+    for code, quantity, price in zip(codes, rng.integers(1, 500, n_holdings), rng.integers(100, 5000, n_holdings) * 10):
+        kiwoom.ocx.holdings[code] = (int(quantity), int(price))
+        kiwoom.ocx.real_values[code] = {10: f"-{int(price * rng.uniform(0.9, 1.1))}"}
+
+    scheduler = TrScheduler(kiwoom, per_second=1000, per_hour=100000)
+    kiwoom.ocx.OnReceiveTrData.connect(scheduler.on_receive_tr_data)
+    handler = AccountHandler(kiwoom)
+    subscriptions = CountingSubscriptions()
+    handler.portfolio.subscriptions = subscriptions
+    accounts = []
+    handler.account_updated.connect(accounts.append)
+
+    # 주기 조회가 겹쳐도 대기/진행 중인 요청은 하나
+    first = handler.request_balance(scheduler, "1234567890")
+    assert handler.request_balance(scheduler, "1234567890") is first
+    assert len(kiwoom.ocx.tr_requests) == 1
+    kiwoom.ocx.process_events()
+    assert first.future.done() and len(accounts) == 1
+    assert handler.request_balance(scheduler, "1234567890") is not first
+    kiwoom.ocx.process_events()
+
+    portfolio = handler.portfolio
+    assert subscriptions.codes == set(codes) and portfolio.held == n_holdings
+    # 조회 직후 요약은 증권사 값 그대로
+    single = first.future.result()[0].single
+    assert accounts[-1]['total_value'] == single['total_value']
+    assert accounts[-1]['total_profit'] == single['total_profit']
+    assert accounts[-1]['deposit'] == single['deposit']
+
+    # 체결 잔고 이벤트 (매수 추가 / 전량 매도)
+    manager = OrderManager(kiwoom, per_second=1e9)
+    kiwoom.ocx.OnReceiveChejanData.connect(manager.on_receive_chejan_data)
+    manager.position_changed.connect(portfolio.on_position)
+    manager.sell(codes[0], kiwoom.ocx.holdings[codes[0]][0], 1000)
+    manager.pump()
+    kiwoom.ocx.process_events()
+    assert codes[0] not in portfolio.slots and codes[0] not in subscriptions.codes
+    assert portfolio.held == n_holdings - 1
+    new_code = "999990"
+    manager.buy(new_code, 10, 5000)
+    manager.pump()
+    kiwoom.ocx.process_events()
+    assert new_code in portfolio.slots and new_code in subscriptions.codes
+    assert portfolio.quantity[portfolio.slots[new_code]] == 10
+
+    # 다음 잔고 조회로 계산값을 다시 맞춤
+    handler.request_balance(scheduler, "1234567890")
+    kiwoom.ocx.process_events()
+    assert portfolio.held == len(kiwoom.ocx.holdings)
+    print(f"잔고 조회 반영: 보유 {n_holdings}종목, 중복 요청 없음, 체결 잔고 반영 / 실시간 구독 일치")
+
+
+def main():
+    n_holdings = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    n_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_reconcile(min(n_holdings, 200))
+
+    rng = np.random.default_rng(7)
+    codes = [f"{i:06d}" for i in range(100000, 100000 + n_holdings)]
+    quantity = rng.integers(1, 1000, n_holdings)
+    avg_price = rng.integers(1000, 100000, n_holdings).astype(np.float64)
+    holdings = [{'code': code, 'quantity': int(q), 'buy_price': float(p), 'current_price': int(p)}
+                for code, q, p in zip(codes, quantity, avg_price)]
+    portfolio = PortfolioValuation(refresh_ms=500)
+    portfolio.reconcile(10_000_000, holdings)
+
+    # 보유 종목 + 보유하지 않은 종목 틱 (절반씩)
+    tick_codes = [codes[i] if i % 2 == 0 else f"{200000 + i % 5000:06d}"
+                  for i in rng.integers(0, n_holdings, n_ticks).tolist()]
+    tick_prices = (rng.integers(1000, 100000, n_ticks)).tolist()
+
+    emitted = []
+    portfolio.account_updated.connect(emitted.append)
+    on_tick = portfolio.on_tick
+    start = time.perf_counter()
+    for code, price in zip(tick_codes, tick_prices):
+        on_tick(code, price)
+    elapsed = time.perf_counter() - start
+
+    # 전체 재계산과 비교
+    last = dict(zip(codes, avg_price.tolist()))
+    for code, price in zip(tick_codes, tick_prices):
+        if code in last:
+            last[code] = price
+    expected_value = float(np.dot(quantity, [last[code] for code in codes]))
+    assert abs(portfolio.market_value - expected_value) < 1e-6 * expected_value, (portfolio.market_value, expected_value)
+    columns = portfolio.columns()
+    assert np.allclose(columns['profit'].sum(), expected_value - float(np.dot(quantity, avg_price)))
+    print(f"틱 {n_ticks:,}개 (보유 종목 절반): {elapsed / n_ticks * 1e9:.0f}ns/틱, "
+          f"평가금액 {portfolio.market_value:,.0f}원 (전체 재계산과 일치)")
+
+    # 틱 처리 중에는 시그널 없음, 타이머 주기에 1회
+    assert not emitted
+    assert portfolio.flush() and len(emitted) == 1 and not portfolio.flush()
+    summary = emitted[0]
+    assert summary['total_value'] == round(expected_value) and summary['stock_count'] == n_holdings
+
+    # 기존 방식: 틱마다 전체 보유종목 합산 + 시그널
+    n_legacy = min(n_ticks, 20000)
+    legacy_count = 0
+    quantities = quantity.tolist()
+    start = time.perf_counter()
+    for code, price in zip(tick_codes[:n_legacy], tick_prices[:n_legacy]):
+        if code in last:
+            last[code] = price
+            sum(q * last[c] for c, q in zip(codes, quantities))
+            legacy_count += 1
+    legacy = (time.perf_counter() - start) / n_legacy
+    print(f"틱마다 전체 합산: {legacy * 1e9:.0f}ns/틱 ({legacy / (elapsed / n_ticks):.0f}배), "
+          f"시그널 {legacy_count:,}회 -> 갱신 주기당 1회")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# 실시간 FID 디코더 마이크로벤치마크
+# 기존 FID별 GetCommRealData 호출 + int()/abs() 파싱과 real_data 페이로드 단일 분해를 비교한다.
+# 가상 OCX 의 dynamicCall 은 실제 COM 왕복보다 훨씬 싸므로, 실제 환경에서는 차이가 더 커진다.
+# 사용법: python benchmarks/bench_real_decoder.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_ocx import FakeKiwoom, make_symbols, synthetic_ticks
+from real_decoder import REAL_TYPE_FIDS, RealDataDecoder
+
+
+def per_fid(kiwoom, code):
+    """기존 방식: FID 마다 COM 호출"""
+    price = abs(int(kiwoom.get_comm_real_data(code, 10)))
+    change = int(kiwoom.get_comm_real_data(code, 11))
+    rate = float(kiwoom.get_comm_real_data(code, 12))
+    volume = int(kiwoom.get_comm_real_data(code, 13))
+    t = kiwoom.get_comm_real_data(code, 20)
+    return price, change, rate, volume, t
+
+
+def main(n=100000):
+    symbols = make_symbols(50)
+    kiwoom = FakeKiwoom(symbols=symbols)
+    events = synthetic_ticks(symbols, n)
+    payloads = []
+    for _, _, (code, real_type, fids) in events:
+        payloads.append((code, real_type, "\t".join(fids.get(fid, "") for fid in REAL_TYPE_FIDS[real_type]), fids))
+
+    decoder = RealDataDecoder()
+
+    # 결과 일치 확인
+    for code, real_type, payload, fids in payloads[:1000]:
+        kiwoom.ocx.real_values[code] = fids
+        price, change, rate, volume, t = per_fid(kiwoom, code)
+        tick = decoder.decode(code, real_type, payload)
+        assert (tick.price, tick.change, tick.rate, tick.volume, tick.time) == (price, change, rate, volume, int(t))
+
+    real_values = kiwoom.ocx.real_values
+    start = time.perf_counter()
+    for code, real_type, payload, fids in payloads:
+        real_values[code] = fids
+        per_fid(kiwoom, code)
+    fid_us = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    for code, real_type, payload, fids in payloads:
+        decoder.decode(code, real_type, payload)
+    decode_us = (time.perf_counter() - start) / n * 1e6
+
+    print(f"FID별 GetCommRealData 5회: {fid_us:.2f} µs/틱 ({1e6 / fid_us:,.0f} 틱/초)")
+    print(f"real_data 단일 디코드:     {decode_us:.2f} µs/틱 ({1e6 / decode_us:,.0f} 틱/초)")
+    print(f"-> {fid_us / decode_us:.1f}배 (COM 호출 5회/틱 제거)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# 실시간 등록 관리자 검증/벤치마크 (가상 OCX)
+# 참조 횟수, 화면번호 묶음, 변경 합치기, 일괄 해제 동작을 확인하고 종목별 등록 대비 호출 수를 비교한다.
+# 사용법: python benchmarks/bench_real_subscriptions.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from fake_ocx import FakeKiwoom, make_symbols
+from real_subscriptions import TICK_FIDS, RealSubscriptionManager
+
+
+def registered(ocx):
+    return set().union(*ocx.real_registrations.values()) if ocx.real_registrations else set()
+
+
+def check_behaviour(app):
+    kiwoom = FakeKiwoom()
+    ocx = kiwoom.ocx
+    codes = list(make_symbols(250))
+    manager = RealSubscriptionManager(kiwoom, codes_per_screen=100, coalesce_ms=20)
+
+    # 변경 합치기: 타이머 만료 전에는 호출 없음, 만료 후 화면번호당 1회
+    for code in codes:
+        manager.subscribe(code)
+    assert not ocx.real_reg_calls
+    loop = QEventLoop()
+    QTimer.singleShot(60, loop.quit)
+    loop.exec_()
+    assert len(ocx.real_reg_calls) == 3, ocx.real_reg_calls
+    assert all(len(call[1].split(';')) <= 100 for call in ocx.real_reg_calls)
+    assert registered(ocx) == set(codes)
+
+    # 참조 횟수: 두 번 구독한 종목은 한 번 해제해도 유지
+    manager.subscribe(codes[0])
+    manager.unsubscribe(codes[0])
+    manager.commit()
+    assert len(ocx.real_reg_calls) == 3 and codes[0] in registered(ocx)
+
+    # 일부 해제: 해당 화면만 남은 종목으로 교체 등록 ("0")
+    for code in codes[:10]:
+        manager.unsubscribe(code)
+    manager.commit()
+    screen_no, code_list, _, opt_type = ocx.real_reg_calls[-1]
+    assert len(ocx.real_reg_calls) == 4 and opt_type == "0"
+    assert registered(ocx) == set(codes[10:])
+
+    # FID 추가 구독: 합집합 FID 묶음 화면으로 이동
+    extra = TICK_FIDS + (41, 61)
+    manager.subscribe(codes[20], extra)
+    manager.commit()
+    assert manager.screen_of(codes[20]) != screen_no
+    assert ocx.real_reg_calls[-1][2] == ";".join(str(fid) for fid in sorted(extra))
+    manager.unsubscribe(codes[20], extra)
+    manager.commit()
+    assert manager.assigned[codes[20]][1] == tuple(sorted(TICK_FIDS))
+
+    # 해제: 화면번호당 1회
+    screens = len(manager.screens)
+    manager.teardown()
+    assert len(ocx.real_remove_calls) == screens + 1  # +1: FID 묶음 화면 비움
+    assert not registered(ocx) and manager.screen_pool.available() == manager.screen_pool.count
+    print("동작 확인 완료: 참조 횟수 / 화면번호 묶음 / 변경 합치기 / 일괄 해제")
+
+
+def compare_calls():
+    codes = list(make_symbols(2000))
+
+    # 기존 방식: 종목마다 SetRealReg / SetRealRemove
+    kiwoom = FakeKiwoom()
+    start = time.perf_counter()
+    for code in codes:
+        kiwoom.set_real_reg("1000", code, ";".join(map(str, TICK_FIDS)), "1")
+    for code in codes:
+        kiwoom.set_real_remove("1000", code)
+    legacy_time = time.perf_counter() - start
+    legacy_calls = len(kiwoom.ocx.real_reg_calls) + len(kiwoom.ocx.real_remove_calls)
+
+    kiwoom = FakeKiwoom()
+    manager = RealSubscriptionManager(kiwoom, coalesce_ms=50)
+    start = time.perf_counter()
+    # 한 구간에 모두 들어온 것으로 가정하고 바로 반영
+    for code in codes:
+        manager.subscribe(code)
+    manager.commit()
+    manager.teardown()
+    batched_time = time.perf_counter() - start
+    batched_calls = len(kiwoom.ocx.real_reg_calls) + len(kiwoom.ocx.real_remove_calls)
+
+    # 가상 OCX 는 호출 비용이 없으므로 실제 COM 환경에서는 호출 수 차이가 곧 지연 차이다
+    print(f"종목 {len(codes):,}개 등록+해제: 종목별 {legacy_calls:,}회 ({legacy_time * 1000:.1f}ms) -> "
+          f"묶음 {batched_calls}회 ({batched_time * 1000:.1f}ms)")
+
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_behaviour(app)
+    compare_calls()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# 실시간 감시 테이블 갱신 벤치마크
+# 가상 틱 스트림을 이벤트 루프로 재생하면서 기존 QTableWidget.setItem 방식과
+# RealtimeTableModel(배열 갱신 + 주기적 일괄 dataChanged) 방식의 처리량/화면 지연을 비교한다.
+# 사용법: python benchmarks/bench_realtime_table.py [초당틱수] [재생초]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+from fake_ocx import FakeKiwoom, TickReplayer, make_symbols, synthetic_ticks
+from realtime_model import COLUMNS, RealtimeTableModel
+
+
+class LoopLagProbe:
+    """이벤트 루프 지연 측정 (10ms 타이머가 얼마나 늦게 실행되는지)"""
+
+    def __init__(self, interval_ms=10):
+        self.interval = interval_ms / 1000
+        self.lags = []
+        self.last = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._tick)
+        self.timer.start(interval_ms)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.lags.append(max(now - self.last - self.interval, 0.0))
+        self.last = now
+
+    def summary(self):
+        lags = sorted(self.lags) or [0.0]
+        return lags[len(lags) // 2] * 1000, lags[int(len(lags) * 0.99)] * 1000, lags[-1] * 1000
+
+
+def percentile(values, q):
+    values = sorted(values) or [0.0]
+    return values[min(int(len(values) * q), len(values) - 1)] * 1000
+
+
+def run(kiwoom, events, handler):
+    """이벤트 루프에서 1배속 재생 후 (초당 처리 틱, 루프 지연 p50/p99/max ms) 반환"""
+    kiwoom.ocx.OnReceiveRealData.connect(handler)
+    replayer = TickReplayer(kiwoom.ocx, events, speed=1.0)
+    probe = LoopLagProbe()
+    loop = QEventLoop()
+    done = QTimer()
+    done.timeout.connect(lambda: replayer.finished() and loop.quit())
+    done.start(20)
+
+    start = time.perf_counter()
+    replayer.start()
+    loop.exec_()
+    elapsed = time.perf_counter() - start
+
+    kiwoom.ocx.OnReceiveRealData.disconnect(handler)
+    probe.timer.stop()
+    return len(events) / elapsed, probe.summary()
+
+
+def main():
+    tick_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    symbols = make_symbols(60)
+    codes = list(symbols)
+    kiwoom = FakeKiwoom(symbols=symbols)
+    events = synthetic_ticks(codes, int(tick_rate * seconds), rate=tick_rate)
+    print(f"종목 {len(codes)}개, 목표 {tick_rate:,} 틱/초, {seconds:.0f}초 재생")
+
+    # 기존 방식: 틱마다 QTableWidgetItem 생성 + setItem
+    table = QTableWidget(len(codes), len(COLUMNS))
+    table.resize(900, 700)
+    table.show()
+    rows = {code: i for i, code in enumerate(codes)}
+
+    def legacy(code, real_type, real_data):
+        row = rows[code]
+        price = abs(int(kiwoom.get_comm_real_data(code, 10)))
+        table.setItem(row, 2, QTableWidgetItem(f"{price:,}"))
+        change = int(kiwoom.get_comm_real_data(code, 11))
+        item = QTableWidgetItem(f"{change:+,}")
+        item.setForeground(QColor("red") if change > 0 else QColor("blue"))
+        table.setItem(row, 3, item)
+        rate = float(kiwoom.get_comm_real_data(code, 12))
+        item = QTableWidgetItem(f"{rate:+.2f}%")
+        item.setForeground(QColor("red") if rate > 0 else QColor("blue"))
+        table.setItem(row, 4, item)
+        table.setItem(row, 5, QTableWidgetItem(f"{int(kiwoom.get_comm_real_data(code, 13)):,}"))
+        t = kiwoom.get_comm_real_data(code, 20)
+        table.setItem(row, 6, QTableWidgetItem(f"{t[:2]}:{t[2:4]}:{t[4:6]}"))
+        table.setItem(row, 7, QTableWidgetItem("실시간"))
+
+    rate, lag = run(kiwoom, events, legacy)
+    print(f"[setItem]  {rate:>10,.0f} 틱/초 | 루프 지연 p50 {lag[0]:.1f}ms p99 {lag[1]:.1f}ms max {lag[2]:.1f}ms")
+    table.close()
+
+    # 모델 방식
+    model = RealtimeTableModel(refresh_hz=10)
+    for code in codes:
+        model.add_symbol(code, symbols[code])
+    view = QTableView()
+    view.setModel(model)
+    view.resize(900, 700)
+    view.show()
+
+    latencies = []
+    flush = model.flush
+
+    def timed_flush():
+        pending = model.pending_since is not None
+        flush()
+        if pending:
+            latencies.append(model.last_latency)
+
+    model.timer.timeout.disconnect()
+    model.timer.timeout.connect(timed_flush)
+    model.start()
+
+    def modeled(code, real_type, real_data):
+        model.update_tick(
+            code,
+            price=abs(int(kiwoom.get_comm_real_data(code, 10))),
+            change=int(kiwoom.get_comm_real_data(code, 11)),
+            rate=float(kiwoom.get_comm_real_data(code, 12)),
+            volume=int(kiwoom.get_comm_real_data(code, 13)),
+            time_hhmmss=int(kiwoom.get_comm_real_data(code, 20)),
+        )
+
+    rate, lag = run(kiwoom, events, modeled)
+    print(f"[모델]     {rate:>10,.0f} 틱/초 | 루프 지연 p50 {lag[0]:.1f}ms p99 {lag[1]:.1f}ms max {lag[2]:.1f}ms")
+    print(f"           화면 반영 지연 p50 {percentile(latencies, 0.5):.1f}ms "
+          f"p99 {percentile(latencies, 0.99):.1f}ms ({model.flush_count}회 일괄 반영)")
+
+
+if __name__ == "__main__":
+    main()
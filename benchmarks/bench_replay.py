@@ -0,0 +1,78 @@
+# 가상 OCX 재생 처리량 벤치마크 (헤드리스)
+# 실시간 시세/조건검색 이벤트를 가상 백엔드로 재생하면서 앱 처리 경로의 초당 처리량을 측정한다.
+# 사용법: python benchmarks/bench_replay.py [이벤트수]
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from condition_handler import ConditionHandler
+from fake_ocx import FakeKiwoom, TickReplayer, make_symbols, synthetic_conditions, synthetic_ticks
+from real_decoder import RealDataDecoder
+from strategy import TradingStrategy
+
+
+class RealDataPath:
+    """TradingApp.receive_real_data 의 데이터 처리 부분 (위젯 제외)"""
+
+    def __init__(self, kiwoom, strategy):
+        self.decoder = RealDataDecoder(kiwoom=kiwoom)
+        self.strategy = strategy
+        self.count = 0
+
+    def receive_real_data(self, code, real_type, real_data):
+        tick = self.decoder.decode(code, real_type, real_data)
+        if tick is not None:
+            self.strategy.on_price(code, tick.price)
+        self.count += 1
+
+
+def run_paced(app, kiwoom, events, speed):
+    """이벤트 루프에서 배속 재생 후 실제 달성한 초당 이벤트 수 반환"""
+    replayer = TickReplayer(kiwoom.ocx, events, speed=speed)
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: replayer.finished() and loop.quit())
+    poll.start(10)
+
+    start = time.perf_counter()
+    replayer.start()
+    loop.exec_()
+    return len(events) / (time.perf_counter() - start)
+
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    symbols = make_symbols(50)
+    kiwoom = FakeKiwoom(symbols=symbols)
+    path = RealDataPath(kiwoom, TradingStrategy(kiwoom))
+    kiwoom.ocx.OnReceiveRealData.connect(path.receive_real_data)
+
+    condition_handler = ConditionHandler(kiwoom)
+    kiwoom.ocx.OnReceiveRealCondition.connect(condition_handler.on_receive_real_condition)
+
+    ticks = synthetic_ticks(symbols, n_events, rate=5000)
+    elapsed = TickReplayer(kiwoom.ocx, ticks).run_blocking()
+    print(f"실시간 시세 경로: {n_events:,}건 {elapsed:.2f}초 -> {n_events / elapsed:,.0f} 이벤트/초")
+
+    conditions = synthetic_conditions(symbols, n_events // 10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = TickReplayer(kiwoom.ocx, conditions).run_blocking()
+    print(f"조건검색 경로: {len(conditions):,}건 {elapsed:.2f}초 -> {len(conditions) / elapsed:,.0f} 이벤트/초")
+
+    # 5,000건/초로 기록된 스트림을 2초 분량 실시간(1배속) 재생
+    paced = synthetic_ticks(symbols, 10000, rate=5000)
+    rate = run_paced(app, kiwoom, paced, speed=1.0)
+    print(f"1배속 재생 (목표 5,000 이벤트/초): {rate:,.0f} 이벤트/초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# 리스크 엔진 벤치마크
+# 주문 전 한도 검사 초당 처리량과, 보유 종목이 많을 때 틱당 손절/익절 감시 비용을 잰다.
+# 한도/트리거 동작과 주문 전송 실패시 예약 해제는 가상 OCX 체결 흐름으로 먼저 확인한다.
+# 사용법: python benchmarks/bench_risk.py [검사횟수] [틱수]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from config import Config
+from fake_ocx import FakeClock, FakeKiwoom
+from order_manager import SIDE_BUY, SIDE_SELL, OrderManager
+from risk_engine import RiskEngine
+from strategy import TradingStrategy
+
+
+def check_limits():
+    """가상 OCX 체결 흐름에서 한도/트리거 동작 확인"""
+    kiwoom = FakeKiwoom()
+    manager = OrderManager(kiwoom, per_second=1e9)
+    kiwoom.ocx.OnReceiveChejanData.connect(manager.on_receive_chejan_data)
+    clock = FakeClock(time.time())
+    risk = RiskEngine(manager, clock=clock)
+    exits = []
+    risk.exit_triggered.connect(lambda code, kind, price: exits.append((code, kind, price)))
+
+    # 종목 한도: 승인 후 접수 전에도 예약 금액으로 계산
+    per_code = Config.MAX_POSITION_SIZE
+    assert risk.check_order("005930", SIDE_BUY, 10, per_code / 20) is None
+    assert risk.check_order("005930", SIDE_BUY, 11, per_code / 20) is not None
+    manager.buy("005930", 10, per_code // 20)
+    kiwoom.ocx.process_events()
+    assert risk.exposure("005930") == per_code / 2 and not risk.reserved
+    assert risk.exposure() == per_code / 2
+
+    # 매도: 보유 수량 초과 거절
+    assert risk.check_order("005930", SIDE_SELL, 11) is not None
+
+    # 손절/익절: 가격이 넘어선 경우만 발생, 한 번만 발생
+    avg = per_code // 20
+    risk.on_tick("005930", avg * (1 - Config.STOP_LOSS_PERCENT / 2))
+    assert not exits
+    risk.on_tick("005930", avg * (1 - Config.STOP_LOSS_PERCENT) - 1)
+    risk.on_tick("005930", avg * (1 - Config.STOP_LOSS_PERCENT) - 2)
+    assert exits == [("005930", "stop_loss", int(avg * (1 - Config.STOP_LOSS_PERCENT) - 1))]
+
+    # 손실 매도 후 당일 손실 한도 도달시 매수 차단
+    risk.daily_loss_limit = 1000
+    assert risk.check_order("005930", SIDE_SELL, 10, avg - 200) is None
+    manager.sell("005930", 10, avg - 200)
+    kiwoom.ocx.process_events()
+    assert risk.realized_pnl == -2000 and risk.exposure() == 0 and not risk.holdings
+    assert "손실" in risk.check_order("000660", SIDE_BUY, 1, 10000)
+
+    # 다음 날 손익 초기화, 분당 주문 한도
+    clock.now += 86400
+    risk.max_orders_per_minute = 3
+    assert all(risk.check_order("000660", SIDE_BUY, 1, 10000) is None for _ in range(3))
+    assert "분당" in risk.check_order("000660", SIDE_BUY, 1, 10000)
+    clock.now += 60
+    assert risk.check_order("000660", SIDE_BUY, 1, 10000) is None
+    print("한도 검사 / 손절 트리거 / 당일 손실 / 주문 횟수 확인")
+
+
+def check_failed_send():
+    """SendOrder 실패(접수 이벤트 없음)시 승인 예약 해제 - 이후 같은 종목 매수/청산이 막히지 않음"""
+    kiwoom = FakeKiwoom()
+    manager = OrderManager(kiwoom, per_second=1e9)
+    kiwoom.ocx.OnReceiveChejanData.connect(manager.on_receive_chejan_data)
+    risk = RiskEngine(manager, clock=FakeClock(time.time()))
+    strategy = TradingStrategy(kiwoom)
+    strategy.order_manager = manager
+    strategy.risk_engine = risk
+    auto_order = Config.AUTO_ORDER
+    Config.AUTO_ORDER = True
+    send_order = kiwoom.send_order
+    try:
+        price = 70000
+        quantity = int(Config.MAX_POSITION_SIZE // price)
+        kiwoom.send_order = lambda *args: -308
+        request = strategy.on_signal("sma", "005930", 'BUY', price)
+        assert request.future.exception() is not None
+        assert risk.exposure("005930") == 0 and risk.exposure() == 0 and not risk.reserved
+
+        # 다시 매수: 한도 거절 없이 전송, 접수/체결 후 예약 없이 보유로 반영
+        kiwoom.send_order = send_order
+        request = strategy.on_signal("sma", "005930", 'BUY', price)
+        assert request is not None
+        kiwoom.ocx.process_events()
+        assert risk.holdings["005930"][0] == quantity and not risk.reserved
+        strategy.positions["005930"] = dict(manager.positions["005930"])
+
+        # 청산(매도) 전송 실패도 예약 매도 수량을 남기지 않는다
+        kiwoom.send_order = lambda *args: -308
+        request = strategy.exit_position("005930", "stop_loss", price - 5000)
+        assert request.future.exception() is not None
+        assert not risk.reserved_sell_qty and not risk.reserved
+        kiwoom.send_order = send_order
+        assert strategy.exit_position("005930", "stop_loss", price - 5000) is not None
+        kiwoom.ocx.process_events()
+        assert "005930" not in risk.holdings and not risk.reserved and risk.exposure() == 0
+
+        # 해제할 예약이 없으면 아무것도 바꾸지 않음
+        assert not risk.release("005930", SIDE_BUY, 1, price)
+    finally:
+        Config.AUTO_ORDER = auto_order
+        kiwoom.send_order = send_order
+    print("전송 실패: 매수/매도 승인 예약 해제, 이후 주문 정상 처리")
+
+
+def bench_checks(n_checks, n_codes=2000):
+    risk = RiskEngine()
+    risk.max_orders_per_minute = n_checks
+    risk.max_total = float('inf')
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    for i, code in enumerate(codes[: n_codes // 2]):
+        risk.on_position(code, {'quantity': 10, 'buy_price': 1000 + i})
+    rng = random.Random(0)
+    orders = [(rng.choice(codes), SIDE_BUY if rng.random() < 0.7 else SIDE_SELL,
+               rng.randint(1, 20), rng.randint(1000, 60000)) for _ in range(n_checks)]
+
+    check = risk.check_order
+    start = time.perf_counter()
+    for code, side, quantity, price in orders:
+        check(code, side, quantity, price)
+    elapsed = time.perf_counter() - start
+    print(f"주문 검사 {n_checks:,}회 {elapsed:.3f}초 -> {n_checks / elapsed:,.0f} 검사/초 "
+          f"({elapsed / n_checks * 1e6:.2f}µs/검사, 거절 {risk.rejections:,}건)")
+
+
+def bench_ticks(n_ticks, n_positions=2000):
+    risk = RiskEngine()
+    codes = [f"{i:06d}" for i in range(n_positions)]
+    for code in codes:
+        risk.on_position(code, {'quantity': 10, 'buy_price': 10000})
+    rng = random.Random(1)
+    # 대부분 트리거 사이에서 움직이고, 가끔 손절/익절 가격을 넘는 틱
+    ticks = [(rng.choice(codes), 10000 * (1 + rng.gauss(0, 0.012))) for _ in range(n_ticks)]
+
+    start = time.perf_counter()
+    fired = 0
+    for code, price in ticks:
+        if risk.on_tick(code, price):
+            fired += 1
+    elapsed = time.perf_counter() - start
+
+    # 비교: 틱마다 보유 종목 전체를 훑는 방식
+    holdings = {code: 10000 for code in codes}
+    last = {}
+    sample = ticks[: max(n_ticks // 100, 1)]
+    start = time.perf_counter()
+    for code, price in sample:
+        last[code] = price
+        for held, avg in holdings.items():
+            p = last.get(held)
+            if p is not None and (p <= avg * (1 - Config.STOP_LOSS_PERCENT) or p >= avg * (1 + Config.TAKE_PROFIT_PERCENT)):
+                pass
+    naive = (time.perf_counter() - start) / len(sample) * n_ticks
+
+    assert fired == n_positions - len(risk.triggers)
+    print(f"보유 {n_positions:,}종목, 틱 {n_ticks:,}건 {elapsed:.3f}초 -> {n_ticks / elapsed:,.0f} 틱/초 "
+          f"(트리거 발생 {fired:,}건)")
+    print(f"전체 보유 종목 스캔 방식 추정 {naive:.1f}초 ({naive / elapsed:,.0f}배)")
+
+
+def main():
+    n_checks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_limits()
+    check_failed_send()
+    bench_checks(n_checks)
+    bench_ticks(n_ticks)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# 다종목 시그널 엔진 벤치마크
+# 사용법: python benchmarks/bench_signals.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import signal_engine
+from strategy import TradingStrategy
+
+
+def make_prices(n_symbols, n_bars, seed=42):
+    """랜덤워크 가격 행렬 생성"""
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(-500, 500, size=(n_symbols, n_bars))
+    return 10000 + np.cumsum(steps, axis=1).astype(np.float64)
+
+
+def loop_signals(strategy, prices, strategy_name):
+    """기존 방식: 종목별 반복 계산"""
+    signals = []
+    for row in prices:
+        row = list(row)
+        if strategy_name == "sma":
+            short_ma = np.mean(row[-5:])
+            long_ma = np.mean(row[-20:])
+            signals.append('BUY' if short_ma > long_ma else 'SELL' if short_ma < long_ma else 'HOLD')
+        else:
+            rsi = strategy._calculate_rsi(row[-15:], 14)
+            signals.append('BUY' if rsi < 30 else 'SELL' if rsi > 70 else 'HOLD')
+    return signals
+
+
+def main():
+    strategy = TradingStrategy(None)
+    print(f"{'종목수':>8} {'전략':>5} {'반복(ms)':>10} {'일괄(ms)':>10} {'배수':>7}")
+    
+    for n_symbols in (100, 1000, 5000):
+        prices = make_prices(n_symbols, 60)
+        codes = [f"{i:06d}" for i in range(n_symbols)]
+        
+        for strategy_name in ("sma", "rsi"):
+            start = time.perf_counter()
+            expected = loop_signals(strategy, prices, strategy_name)
+            loop_ms = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            signals = signal_engine.compute_signals(codes, prices, strategy_name)
+            batch_ms = (time.perf_counter() - start) * 1000
+            
+            assert list(signals.values()) == expected, "일괄 계산 결과가 반복 계산과 다릅니다"
+            print(f"{n_symbols:>8} {strategy_name:>5} {loop_ms:>10.2f} {batch_ms:>10.2f} {loop_ms / batch_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# 시작 시간 / import 프로파일 벤치마크 (화면 없음, 가상 OCX)
+# 새 인터프리터에서 python -X importtime 으로 모듈 import 비용을 모아 누적 시간이 큰 모듈을 보여주고,
+# 무거운 의존성(pandas, QtWidgets/QtGui)을 예전처럼 먼저 불러온 경우와 비교한다.
+# KiwoomAPI / 엔진 객체 생성 시간과 프로세스 시작부터 엔진 로그인 완료까지의 시간도 잰다.
+# 사용법: python benchmarks/bench_startup.py [반복수] [--importtime-log 경로]
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["KIWOOM_BACKEND"] = "fake"
+
+# (이름, 측정할 import 문, 불러오지 않아야 하는 무거운 의존성 - 예전에는 먼저 불러오던 모듈)
+IMPORT_CASES = [
+    ("엔진 (engine)", "import engine", ["pandas", "PyQt5.QtWidgets", "PyQt5.QtGui"]),
+    ("화면 (main_imports)", "import main_imports", ["pandas"]),
+    ("전략 (strategy)", "import strategy", ["pandas"]),
+]
+
+# 프로세스 시작 -> 엔진 로그인/계좌 등록 완료
+ENGINE_COLD_START = """
+import time
+from PyQt5.QtCore import QCoreApplication
+app = QCoreApplication([])
+from engine import TradingEngine
+engine = TradingEngine(ipc_name="kiwoom-startup-{pid}", ring_name="kiwoom_startup_{pid}")
+engine.start()
+while not engine.logged_in:
+    app.processEvents()
+    time.sleep(0.001)
+print("READY", flush=True)
+engine.shutdown()
+"""
+
+
+def run_python(args, cwd):
+    return subprocess.run([sys.executable, *args], cwd=cwd, capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": ROOT}, check=True)
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> [(누적 µs, 자체 µs, 깊이, 모듈)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def import_profile(statement, preload, runs, cwd, log=None):
+    """새 인터프리터에서 preload + import 시간 (반복 중 최소값, ms) + 모듈별 시간"""
+    code = "import time\n_t = time.perf_counter()\n"
+    code += "".join(f"import {module}\n" for module in preload)
+    code += f"{statement}\nprint((time.perf_counter() - _t) * 1e3)\n"
+    best, rows = None, None
+    for _ in range(runs):
+        result = run_python(["-X", "importtime", "-c", code], cwd)
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        if best is None or elapsed < best:
+            best, rows = elapsed, parse_importtime(result.stderr)
+            if log is not None:
+                log[statement + (f" (먼저: {', '.join(preload)})" if preload else "")] = result.stderr
+    return best, rows
+
+
+def top_modules(rows, module, count=6):
+    """측정한 모듈과 그 바로 아래 단계에서 누적 시간이 큰 모듈 (-X importtime 은 하위 모듈이 먼저 출력됨)"""
+    end = next(i for i, row in enumerate(rows) if row[2] == 0 and row[3] == module)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    return sorted((row for row in rows[start:end + 1] if row[2] <= 1), reverse=True)[:count]
+
+
+def check_imports(runs, cwd, log_path=None):
+    log = {} if log_path else None
+    for name, statement, deferred in IMPORT_CASES:
+        lazy, rows = import_profile(statement, [], runs, cwd, log)
+        loaded = {row[3] for row in rows} & set(deferred)
+        assert not loaded, f"{statement}: {loaded}"
+        line = f"{name}: {lazy:.0f}ms"
+        heavy = [module for module in deferred if importlib.util.find_spec(module.split('.')[0])]
+        if heavy:
+            eager, _ = import_profile(statement, heavy, runs, cwd, log)
+            line += f" (예전처럼 {', '.join(heavy)} 를 먼저 불러오면 {eager:.0f}ms, {eager - lazy:.0f}ms 절약)"
+        print(line)
+        for cumulative, self_us, depth, module in top_modules(rows, statement.split()[-1]):
+            print(f"    {'  ' * depth}{module:<28} {cumulative / 1e3:6.1f}ms (자체 {self_us / 1e3:.1f}ms)")
+    if log_path:
+        with open(log_path, "w", encoding="utf-8") as f:
+            for title, stderr in log.items():
+                f.write(f"# {title}\n{stderr}\n")
+        print(f"-X importtime 원본: {log_path}")
+
+
+def check_construction():
+    """KiwoomAPI / 엔진 객체 생성 시간 (OCX 는 첫 로그인 때 생성)"""
+    from engine import TradingEngine
+    from fake_ocx import FakeKiwoom
+    from kiwoom_api import KiwoomAPI
+
+    start = time.perf_counter()
+    api = KiwoomAPI()
+    lazy = time.perf_counter() - start
+    assert api.ocx is None
+    start = time.perf_counter()
+    api._init_ocx()
+    ocx = time.perf_counter() - start
+    assert api.ocx is not None
+
+    start = time.perf_counter()
+    engine = TradingEngine(FakeKiwoom(), publish=False)
+    constructed = time.perf_counter() - start
+    engine.shutdown()
+    print(f"객체 생성: KiwoomAPI {lazy * 1e6:.0f}µs (OCX 생성 {ocx * 1e6:.0f}µs 는 첫 로그인 때), "
+          f"엔진 구성요소 {constructed * 1e3:.1f}ms")
+
+
+def check_cold_start(runs, cwd):
+    """프로세스 시작부터 엔진 로그인 완료까지 (인터프리터 시작 포함)"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(["-c", ENGINE_COLD_START.format(pid=os.getpid())], cwd)
+        elapsed = time.perf_counter() - start
+        assert "READY" in result.stdout, result.stdout
+        best = elapsed if best is None else min(best, elapsed)
+    assert best < 1.0, best
+    print(f"엔진 콜드 스타트: 프로세스 시작 -> 로그인/계좌 등록 완료 {best * 1e3:.0f}ms")
+
+
+def main():
+    args = sys.argv[1:]
+    log_path = None
+    if "--importtime-log" in args:
+        i = args.index("--importtime-log")
+        log_path = os.path.abspath(args[i + 1])
+        del args[i:i + 2]
+    runs = int(args[0]) if args else 3
+
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)  # KiwoomAPI / 엔진 QObject 생성용
+    # 로그 / 종목 마스터 / 지표 파일은 임시 폴더에
+    with tempfile.TemporaryDirectory() as root:
+        check_imports(runs, root, log_path)
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            check_construction()
+        finally:
+            os.chdir(cwd)
+        check_cold_start(runs, root)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# 전략 실행기 벤치마크
+# 가상 틱을 실행기에 넣어 종목 색인 분배 처리량, 워커 스레드 평가/틱 합치기, 전략별 지연 히스토그램을 확인한다.
+# 사용법: python benchmarks/bench_strategy_runtime.py [틱수]
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication
+
+import signal_engine
+from fake_ocx import make_symbols, synthetic_ticks
+from strategy_runtime import RsiStrategy, RuntimeStrategy, SmaCrossStrategy, StrategyRuntime
+
+
+class WindowSignalStrategy(RuntimeStrategy):
+    """틱마다 최근 가격 창 전체로 signal_engine 시그널 계산 (무거운 전략 예시)"""
+
+    threaded = True
+
+    def __init__(self, name, symbols, window=2000):
+        super().__init__(name, symbols)
+        self.window = window
+        self.prices = {code: np.full(window, np.nan) for code in symbols}
+        self.evaluated = 0
+
+    def on_tick(self, code, price):
+        prices = self.prices[code]
+        prices[:-1] = prices[1:]
+        prices[-1] = price
+        self.evaluated += 1
+        series = signal_engine.signal_series(prices[None, :], "rsi")
+        return {1: 'BUY', -1: 'SELL'}.get(int(series[0, -1]))
+
+
+def drain(app, runtime, timeout=60):
+    deadline = time.time() + timeout
+    while runtime.busy():
+        app.processEvents()
+        if time.time() > deadline:
+            raise TimeoutError("전략 평가가 끝나지 않았습니다")
+        time.sleep(0.0005)
+    app.processEvents()
+
+
+def run(app, ticks, codes, threaded):
+    """실행기에 틱을 넣고 (실행기, 전략들, 시그널 수, 분배 시간, 전체 시간, 틱 1건 최대 처리 시간) 반환"""
+    runtime = StrategyRuntime(workers=2)
+    sma = runtime.add_strategy(SmaCrossStrategy("sma", codes[:200]))
+    rsi = runtime.add_strategy(RsiStrategy("rsi", codes[100:200]))
+    heavy = WindowSignalStrategy("window", codes[:20])
+    heavy.threaded = threaded
+    runtime.add_strategy(heavy)
+    signals = Counter()
+    runtime.signal_generated.connect(lambda name, code, signal, price: signals.update([name]))
+
+    worst = 0.0
+    start = time.perf_counter()
+    for i, (code, price) in enumerate(ticks):
+        t0 = time.perf_counter()
+        runtime.on_tick(code, price)
+        worst = max(worst, time.perf_counter() - t0)
+        if i % 256 == 0:
+            app.processEvents()  # GUI 이벤트 루프가 결과를 받는 주기
+    dispatched = time.perf_counter() - start
+    drain(app, runtime)
+    total = time.perf_counter() - start
+    return runtime, (sma, rsi, heavy), signals, dispatched, total, worst
+
+
+def main():
+    n_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    codes = list(make_symbols(1000))
+    ticks = [(code, abs(int(fids[10]))) for _, _, (code, _, fids) in synthetic_ticks(codes, n_ticks)]
+
+    runtime, strategies, signals, dispatched, total, worst = run(app, ticks, codes, threaded=True)
+
+    # 관심 종목 틱만 전달되었는지 확인
+    per_code = Counter(code for code, _ in ticks)
+    stats = runtime.stats()
+    for strategy in strategies:
+        expected = sum(per_code[code] for code in strategy.symbols)
+        assert stats[strategy.name]['events'] == expected, strategy.name
+        assert stats[strategy.name]['signals'] == signals[strategy.name]
+        assert stats[strategy.name]['errors'] == 0
+    heavy = strategies[2]
+    assert heavy.evaluated == stats["window"]['events'] - stats["window"]['coalesced']
+
+    print(f"틱 {n_ticks:,}건 분배 {dispatched:.2f}초 ({n_ticks / dispatched:,.0f} 틱/초), 워커 대기 포함 {total:.2f}초, "
+          f"틱 1건 최대 {worst * 1e3:.2f}ms")
+    print(f"무거운 전략: 이벤트 {stats['window']['events']:,}건 중 {stats['window']['coalesced']:,}건 합침, "
+          f"평가 {heavy.evaluated:,}회")
+    print(runtime.format_stats())
+    runtime.shutdown()
+
+    # 비교: 무거운 전략도 GUI 스레드에서 평가
+    inline, _, _, dispatched, total, worst = run(app, ticks, codes, threaded=False)
+    print(f"GUI 스레드 평가: 분배 {dispatched:.2f}초 ({n_ticks / dispatched:,.0f} 틱/초), 틱 1건 최대 {worst * 1e3:.2f}ms")
+    inline.shutdown()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
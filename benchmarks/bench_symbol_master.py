@@ -0,0 +1,108 @@
+# 종목 마스터 캐시 벤치마크 (가상 OCX)
+# 로그인 시 로드 COM 호출 수, 당일 재시작 캐시 재사용, 다음날 갱신을 확인하고
+# 조건검색 결과 반영 경로의 종목명 조회를 COM 호출 방식과 비교한다.
+# 사용법: python benchmarks/bench_symbol_master.py [종목수] [조회수]
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from fake_ocx import FakeKiwoom, make_symbols
+from symbol_master import SymbolCompleterModel, SymbolMaster
+
+
+class CountingKiwoom(FakeKiwoom):
+    """dynamicCall 호출 수를 세는 가상 백엔드"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        call = self.ocx.dynamicCall
+
+        def counted(signature, *args):
+            self.calls += 1
+            return call(signature, *args)
+        self.ocx.dynamicCall = counted
+
+
+def main():
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    n_lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    symbols = make_symbols(n_symbols)
+    kiwoom = CountingKiwoom(symbols=symbols)
+    markets = ("0", "10", "8")
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "symbols.json")
+        master = SymbolMaster(path)
+        start = time.perf_counter()
+        assert master.load(kiwoom, markets, today=date(2024, 1, 2))
+        elapsed = time.perf_counter() - start
+        # 가상 OCX 는 시장마다 같은 목록을 주므로 종목명 조회는 종목당 1회
+        assert kiwoom.calls == len(markets) + n_symbols, kiwoom.calls
+        print(f"최초 로드: {len(master):,}종목, COM 호출 {kiwoom.calls:,}회, {elapsed * 1e3:.1f}ms")
+
+        kiwoom.calls = 0
+        restarted = SymbolMaster(path)
+        start = time.perf_counter()
+        assert not restarted.load(kiwoom, markets, today=date(2024, 1, 2))
+        elapsed = time.perf_counter() - start
+        assert kiwoom.calls == 0 and restarted.names == master.names
+        print(f"당일 재시작: 캐시 파일 {os.path.getsize(path) / 1024:.0f}KB 읽기 {elapsed * 1e3:.1f}ms, COM 호출 0회")
+
+        assert restarted.load(kiwoom, markets, today=date(2024, 1, 3))
+        assert kiwoom.calls == len(markets) + n_symbols
+        print("다음날: 마스터 다시 수신")
+
+    # 조건검색 편입 종목명 조회 (마스터 dict vs 매번 COM)
+    codes = list(symbols)
+    lookup_codes = [codes[i * 7919 % len(codes)] for i in range(n_lookups)]
+    kiwoom.calls = 0
+    name = master.name
+    start = time.perf_counter()
+    for code in lookup_codes:
+        name(code)
+    cached = time.perf_counter() - start
+    assert kiwoom.calls == 0
+
+    get_name = kiwoom.get_master_code_name
+    start = time.perf_counter()
+    for code in lookup_codes:
+        get_name(code)
+    direct = time.perf_counter() - start
+    print(f"종목명 {n_lookups:,}회: 마스터 {cached / n_lookups * 1e9:.0f}ns/회, "
+          f"COM(가상) {direct / n_lookups * 1e9:.0f}ns/회 ({direct / cached:.0f}배)")
+
+    # 마스터에 없는 종목은 최초 1회만 COM
+    kiwoom.calls = 0
+    assert master.name("999990") == "" and master.name("999990") == ""
+    assert kiwoom.calls == 1 and master.misses == 1
+
+    # 접두어 검색
+    assert master.search("005930")[0] == ("005930", "삼성전자")
+    assert sorted(code for code, _ in master.search("삼성")) == ["005930", "006400"]
+    assert master.search("naver") == [("035420", "NAVER")]
+    assert all(name.startswith("가상종목1001") for _, name in master.search("가상종목1001"))
+    assert all(code.startswith("10") for code, _ in master.search("10", limit=50))
+    model = SymbolCompleterModel(master)
+    assert model.search("삼성") == 2 and model.data(model.index(0)) == "삼성SDI (006400) 코스피"
+    master.search("가")  # 인덱스 생성
+    queries = ["삼", "가상종목12", "1003", "NA", "가상종목"]
+    n_search = 20000
+    start = time.perf_counter()
+    for i in range(n_search):
+        master.search(queries[i % len(queries)])
+    elapsed = time.perf_counter() - start
+    print(f"접두어 검색 {n_search:,}회 {elapsed / n_search * 1e6:.1f}µs/회 (최대 20개)")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
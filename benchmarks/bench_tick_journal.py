@@ -0,0 +1,150 @@
+# 틱 저널 기록/재생 벤치마크
+# 생산자(Qt 스레드 역할) 큐 적재 비용, 백그라운드 압축 기록 속도, 재생 속도를 측정한다.
+# 전략까지의 재생은 틱별 콜백과 레코드 배열 일괄 전달(초당 100만 틱 이상, 지표 결과 일치)을 비교한다.
+# 사용법: python benchmarks/bench_tick_journal.py [틱수]
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_ocx import make_symbols, synthetic_ticks
+from real_decoder import REAL_TYPE_FIDS, RealDataDecoder
+from strategy import TradingStrategy
+from tick_journal import CODEC_NAMES, TickJournalReader, TickJournalWriter, journal_path
+
+
+def check_same_indicators(expected, actual):
+    """일괄 반영한 지표가 틱별 반영과 같은지"""
+    assert expected.symbols.keys() == actual.symbols.keys()
+    for code in expected.symbols:
+        for period in expected.sma_periods:
+            assert math.isclose(expected.sma(code, period) or 0, actual.sma(code, period) or 0, rel_tol=1e-9)
+        for period in expected.rsi_periods:
+            assert math.isclose(expected.rsi(code, period) or 0, actual.rsi(code, period) or 0, abs_tol=1e-6)
+
+
+def check_conditions(root, ticks):
+    """조건 이벤트가 섞인 저널: 일괄 재생도 틱/이벤트 순서를 지킨다"""
+    writer = TickJournalWriter(os.path.join(root, "conditions"), block_records=1000)
+    expected = []
+    for i, tick in enumerate(ticks):
+        writer.write_tick(tick)
+        expected.append(("tick", tick.code))
+        if i % 37 == 0:
+            writer.write_condition(tick.code, "I" if i % 2 else "D", i % 5)
+            expected.append(("I" if i % 2 else "D", tick.code))
+    writer.close()
+
+    reader = TickJournalReader(journal_path(writer.root_dir, writer.day))
+    events = []
+    count = reader.replay_blocks(lambda block: events.extend(("tick", code.decode()) for code in block['code']),
+                                 lambda code, event_type, index: events.append((event_type, code)),
+                                 batch_records=3000)
+    assert count == len(expected) and events == expected
+    print(f"조건 이벤트 포함 일괄 재생: {count:,}건 순서 일치")
+
+
+def check_write_failure(root, ticks):
+    """블록 쓰기가 실패해도 레코드를 버리지 않고 다음 기록에서 다시 쓴다 (중복 없음)"""
+    writer = TickJournalWriter(os.path.join(root, "failure"), block_records=1000)
+    write_block = writer._write_block
+    failures = [2]
+
+    def flaky_write_block(records):
+        if failures[0] and writer.blocks == 1:
+            failures[0] -= 1
+            raise OSError(28, "No space left on device")
+        write_block(records)
+    writer._write_block = flaky_write_block
+
+    for tick in ticks[:2500]:
+        writer.write_tick(tick)
+    writer._drain(force=True)  # 첫 블록만 기록, 나머지는 버퍼에 남음
+    assert writer.written == 1000 and writer.buffered == 1500
+    writer._drain(force=True)  # 다시 실패
+    assert writer.buffered == 1500
+    for tick in ticks[2500:3000]:
+        writer.write_tick(tick)
+    writer.close()
+    assert writer.written == 3000 and not writer.buffered
+
+    records = TickJournalReader(journal_path(writer.root_dir, writer.day)).read()
+    assert [code.decode() for code in records['code']] == [tick.code for tick in ticks[:3000]]
+    assert (records['price'] == [tick.price for tick in ticks[:3000]]).all()
+    print("쓰기 실패: 쓰지 못한 레코드를 보관했다가 다시 기록 (유실/중복 없음)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    symbols = make_symbols(2000)
+    decoder = RealDataDecoder()
+    ticks = []
+    for _, _, (code, real_type, fids) in synthetic_ticks(symbols, n, rate=50000):
+        ticks.append(decoder.decode(code, real_type, "\t".join(fids.get(fid, "") for fid in REAL_TYPE_FIDS[real_type])))
+
+    root = tempfile.mkdtemp(prefix="journal_")
+    writer = TickJournalWriter(root)
+    codec = {v: k for k, v in CODEC_NAMES.items()}[writer.codec_id]
+    writer.start()
+
+    start = time.perf_counter()
+    for tick in ticks:
+        writer.write_tick(tick)
+    enqueue = time.perf_counter() - start
+    writer.close()
+    total = time.perf_counter() - start
+
+    path = journal_path(root, writer.day)
+    size = os.path.getsize(path)
+    print(f"코덱 {codec}: {n:,}틱 -> {size / 1e6:.1f}MB ({size / n:.1f} 바이트/틱, 블록 {writer.blocks}개)")
+    print(f"큐 적재 (Qt 스레드 비용): {enqueue / n * 1e6:.2f} µs/틱")
+    print(f"기록 완료까지: {n / total:,.0f} 틱/초")
+
+    reader = TickJournalReader(path)
+    start = time.perf_counter()
+    records = reader.read()
+    elapsed = time.perf_counter() - start
+    assert len(records) == n
+    print(f"블록 디코드: {n / elapsed:,.0f} 틱/초")
+
+    count = [0]
+
+    def on_tick(code, price, volume, t):
+        count[0] += 1
+
+    start = time.perf_counter()
+    reader.replay(on_tick)
+    elapsed = time.perf_counter() - start
+    print(f"재생 (틱별 콜백): {count[0] / elapsed:,.0f} 틱/초")
+
+    strategy = TradingStrategy(None)
+    start = time.perf_counter()
+    reader.replay(lambda code, price, volume, t: strategy.on_price(code, price))
+    elapsed = time.perf_counter() - start
+    print(f"재생 -> TradingStrategy.on_price (틱별): {n / elapsed:,.0f} 틱/초")
+
+    # 일괄 재생: 레코드 배열 -> TradingStrategy.on_prices (틱별 파이썬 호출 없음)
+    batched = TradingStrategy(None)
+    start = time.perf_counter()
+    replayed = reader.replay_blocks(lambda block: batched.on_prices(block['code'], block['price']))
+    elapsed = time.perf_counter() - start
+    assert replayed == n
+    rate = n / elapsed
+    print(f"일괄 재생 -> TradingStrategy.on_prices: {rate:,.0f} 틱/초")
+    assert rate >= 1e6, rate
+    check_same_indicators(strategy.indicators, batched.indicators)
+
+    mid = int(records['ts'][n // 2])
+    start = time.perf_counter()
+    part = reader.read(start_ts=mid)
+    print(f"시간 인덱스 구간 조회 (후반부 {len(part):,}틱): {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    check_conditions(root, ticks[:20000])
+    check_write_failure(root, ticks)
+
+
+if __name__ == "__main__":
+    main()
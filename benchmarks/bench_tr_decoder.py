@@ -0,0 +1,167 @@
+# TR 응답 일괄 변환 벤치마크 (가상 OCX, opw00018)
+# 보유종목 N행 계좌의 잔고 응답을 기존 방식(행 x 필드 GetCommData + strip/int)과
+# 스키마 디코더(GetCommDataEx 1회 + 컬럼 변환)로 처리해 COM 호출 수 / 시간과 결과 일치를 확인한다.
+# 사용법: python benchmarks/bench_tr_decoder.py [보유종목수] [반복수]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication
+
+from account_handler import AccountHandler
+from fake_ocx import FakeKiwoom, make_symbols
+from tr_decoder import FIELD_FLOAT, FIELD_INT, FIELD_PRICE, OPW00018, TrDecoder, convert_column, page_records
+
+RQNAME = "계좌평가잔고내역요청"
+
+
+class CountingKiwoom(FakeKiwoom):
+    """dynamicCall 호출 수를 세는 가상 백엔드"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        call = self.ocx.dynamicCall
+
+        def counted(signature, *args):
+            self.calls += 1
+            return call(signature, *args)
+        self.ocx.dynamicCall = counted
+
+
+class NoExKiwoom:
+    """GetCommDataEx 가 없는 백엔드"""
+
+    def __init__(self, kiwoom):
+        self.get_comm_data = kiwoom.get_comm_data
+        self.get_repeat_cnt = kiwoom.get_repeat_cnt
+
+
+class ShortExKiwoom(NoExKiwoom):
+    """GetCommDataEx 열 수가 스키마보다 적은 백엔드"""
+
+    def __init__(self, kiwoom):
+        super().__init__(kiwoom)
+        self.kiwoom = kiwoom
+
+    def get_comm_data_ex(self, trcode, record_name):
+        return [row[:5] for row in self.kiwoom.get_comm_data_ex(trcode, record_name)]
+
+
+def legacy_holdings(kiwoom, rqname, trcode):
+    """기존 AccountHandler.get_holdings_data"""
+    holdings = []
+    stock_count = kiwoom.get_repeat_cnt(trcode, rqname)
+    for i in range(stock_count):
+        stock_data = {
+            'name': kiwoom.get_comm_data(trcode, "", rqname, i, "종목명").strip(),
+            'code': kiwoom.get_comm_data(trcode, "", rqname, i, "종목번호").strip(),
+            'quantity': int(kiwoom.get_comm_data(trcode, "", rqname, i, "보유수량").strip()),
+            'buy_price': int(kiwoom.get_comm_data(trcode, "", rqname, i, "매입가").strip()),
+            'current_price': int(kiwoom.get_comm_data(trcode, "", rqname, i, "현재가").strip()),
+            'profit': int(kiwoom.get_comm_data(trcode, "", rqname, i, "평가손익").strip()),
+        }
+        if stock_data['buy_price'] > 0:
+            stock_data['profit_rate'] = ((stock_data['current_price'] - stock_data['buy_price'])
+                                         / stock_data['buy_price']) * 100
+        holdings.append(stock_data)
+    return holdings
+
+
+def legacy_balance(kiwoom, rqname, trcode):
+    """기존 AccountHandler.process_balance_data 의 싱글 필드 조회"""
+    account_data = {}
+    for key, item in (('deposit', "예수금"), ('total_value', "총평가액")):
+        value = kiwoom.get_comm_data(trcode, "", rqname, 0, item)
+        if value:
+            account_data[key] = abs(int(value.strip()))
+    total_profit = kiwoom.get_comm_data(trcode, "", rqname, 0, "총손익금액")
+    if total_profit:
+        account_data['total_profit'] = int(total_profit.strip())
+    account_data['stock_count'] = kiwoom.get_repeat_cnt(trcode, rqname)
+    return account_data
+
+
+def check_conversion():
+    """부호 / 빈 값 / 공백 처리"""
+    values = ["000000000012345", "-00000000001234", "+00000000000077", "", "   ", " 42 "]
+    assert convert_column(values, FIELD_INT).tolist() == [12345, -1234, 77, 0, 0, 42]
+    assert convert_column(values, FIELD_PRICE).tolist() == [12345, 1234, 77, 0, 0, 42]
+    assert convert_column(["-1.25", "000000000003.50", ""], FIELD_FLOAT).tolist() == [-1.25, 3.5, 0.0]
+    print("값 변환 확인: 부호 / 앞자리 0 / 빈 값")
+
+
+def main():
+    n_holdings = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    check_conversion()
+
+    kiwoom = CountingKiwoom(symbols=make_symbols(n_holdings))
+    rng = np.random.default_rng(1)
+    for code, quantity, price in zip(kiwoom.ocx.symbols, rng.integers(1, 1000, n_holdings),
+                                     rng.integers(10, 5000, n_holdings) * 10):
+        kiwoom.ocx.holdings[code] = (int(quantity), int(price))
+        # 현재가 (하락 부호 포함, 손실 종목 포함)
+        kiwoom.ocx.real_values[code] = {10: f"-{int(price * rng.uniform(0.8, 1.2))}"}
+    kiwoom.comm_rq_data(RQNAME, "opw00018", 0, "2000")
+    kiwoom.ocx.process_events()  # 응답 데이터 설정 (OnReceiveTrData 에 연결된 처리기 없음)
+    trcode = "opw00018"
+
+    handler = AccountHandler(kiwoom)
+    accounts = []
+    handler.account_updated.connect(accounts.append)
+
+    # 결과 일치
+    page = handler.process_balance_data(RQNAME, trcode)
+    handler.apply_balance([page])
+    expected_balance = legacy_balance(kiwoom, RQNAME, trcode)
+    assert {key: accounts[-1][key] for key in expected_balance} == expected_balance, (accounts[-1], expected_balance)
+    legacy = legacy_holdings(kiwoom, RQNAME, trcode)
+    holdings = handler.holdings_from_page(page)
+    assert len(holdings) == n_holdings
+    for old, new in zip(legacy, holdings):
+        assert old['code'].lstrip('A') == new['code'] and old['name'] == new['name']
+        for key in ('quantity', 'buy_price', 'profit'):
+            assert old[key] == new[key], (key, old, new)
+        assert old['current_price'] == new['current_price']
+    assert len(page_records(page)) == n_holdings
+
+    # GetCommDataEx 미지원 / 열 배치 불일치 -> 필드별 조회
+    fallback = TrDecoder(NoExKiwoom(kiwoom)).decode(trcode, RQNAME)
+    for key, column in page.rows.items():
+        assert np.array_equal(fallback.rows[key], column), key
+    short = TrDecoder(ShortExKiwoom(kiwoom))
+    assert np.array_equal(short.decode(trcode, RQNAME).rows['quantity'], page.rows['quantity'])
+    assert not short.use_ex
+    print(f"결과 일치: 보유 {n_holdings}종목, GetCommDataEx 미지원 / 열 수 불일치시 필드별 조회로 같은 결과")
+
+    # 기존 방식: 행 x 필드 GetCommData
+    kiwoom.calls = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_balance(kiwoom, RQNAME, trcode)
+        legacy_holdings(kiwoom, RQNAME, trcode)
+    legacy_time = (time.perf_counter() - start) / repeat
+    legacy_calls = kiwoom.calls // repeat
+
+    kiwoom.calls = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        handler.holdings_from_page(handler.process_balance_data(RQNAME, trcode))
+    decoder_time = (time.perf_counter() - start) / repeat
+    decoder_calls = kiwoom.calls // repeat
+
+    print(f"기존 방식: COM {legacy_calls:,}회, {legacy_time * 1e3:.2f}ms/응답")
+    print(f"스키마 디코더: COM {decoder_calls:,}회 (싱글 {len(OPW00018.single)} + GetCommDataEx 1), "
+          f"{decoder_time * 1e3:.2f}ms/응답 ({legacy_time / decoder_time:.1f}배)")
+    assert decoder_calls == len(OPW00018.single) + 1
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# TR 스케줄러 조회 제한 벤치마크 (가상 시계)
+# 요청을 한꺼번에 쌓아 두고 가상 시계로 몇 시간을 흘려 보내면서 CommRqData 전송 시각을 모아,
+# 어느 1초 / 1시간 구간에도 전송이 제한(Config.TR_RATE_PER_SECOND / TR_RATE_PER_HOUR)을 넘지 않는지 확인한다.
+# 과부하(-200) 응답 뒤에는 1초 동안 전송하지 않는지도 본다.
+# 사용법: python benchmarks/bench_tr_scheduler.py [요청수]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from config import Config
+from fake_ocx import FakeClock, max_in_window
+from tr_scheduler import ERR_OVERLOAD, RateLimiter, TrScheduler
+
+
+class RecordingKiwoom:
+    """CommRqData 전송 시각만 기록 (overload 에 든 전송 순번은 -200 응답)"""
+
+    def __init__(self, clock, overload=()):
+        self.clock = clock
+        self.sent = []
+        self.rejected = []
+        self.overload = set(overload)
+        self.calls = 0
+
+    def set_input_value(self, key, value):
+        pass
+
+    def comm_rq_data(self, rqname, trcode, next_, screen_no):
+        self.calls += 1
+        if self.calls in self.overload:
+            self.rejected.append((self.clock(), len(self.sent)))
+            return ERR_OVERLOAD
+        self.sent.append(self.clock())
+        return 0
+
+
+def run(n_requests, overload=()):
+    """요청을 모두 쌓고 응답은 즉시 돌려주면서 가상 시계를 다음 전송 가능 시각까지 넘김"""
+    clock = FakeClock()
+    kiwoom = RecordingKiwoom(clock, overload)
+    scheduler = TrScheduler(kiwoom, clock=clock)
+    requests = [scheduler.submit(f"조회{i}", "opt10001", {'종목코드': f"{i:06d}"}) for i in range(n_requests)]
+    while scheduler.queue or scheduler.in_flight:
+        scheduler.pump()
+        for screen_no, request in list(scheduler.in_flight.items()):
+            scheduler.on_receive_tr_data(screen_no, request.rqname, request.trcode, "", "0")
+        if scheduler.queue:
+            wait = max(scheduler.second_limit.wait_time(), scheduler.hour_limit.wait_time())
+            clock.now += max(wait, 0.001)
+    assert all(request.future.done() for request in requests)
+    return kiwoom
+
+
+def check_limits(n_requests):
+    per_second, per_hour = Config.TR_RATE_PER_SECOND, Config.TR_RATE_PER_HOUR
+    begin = time.perf_counter()
+    kiwoom = run(n_requests)
+    elapsed = time.perf_counter() - begin
+    sent = kiwoom.sent
+    assert len(sent) == n_requests
+    assert sent == sorted(sent)
+    second, hour = max_in_window(sent, 1.0), max_in_window(sent, 3600.0)
+    assert second <= per_second, second
+    assert hour <= per_hour, hour
+    # 처음 1시간에는 딱 한도만큼만 나가고, 나머지는 첫 전송 1시간 뒤부터
+    assert sum(t < 3600.0 for t in sent) == min(per_hour, n_requests)
+    print(f"TR {n_requests}건: 가상 {sent[-1] / 3600:.1f}시간에 걸쳐 전송, "
+          f"1초 구간 최대 {second}건 (한도 {per_second}), 1시간 구간 최대 {hour}건 (한도 {per_hour}) "
+          f"[시뮬레이션 {elapsed * 1e3:.0f}ms]")
+
+
+def check_overload():
+    """-200 응답 뒤 1초 동안 전송 없음, 요청은 다시 대기열로"""
+    kiwoom = run(20, overload={3})
+    assert len(kiwoom.sent) == 20 and len(kiwoom.rejected) == 1
+    rejected, before = kiwoom.rejected[0]
+    resumed = kiwoom.sent[before]
+    assert resumed >= rejected + 1.0, (rejected, resumed)
+    assert max_in_window(kiwoom.sent, 1.0) <= Config.TR_RATE_PER_SECOND
+    print(f"과부하 응답: {rejected:.2f}s 거절 후 다음 전송 {resumed:.2f}s")
+
+
+def check_limiter():
+    """경계: 구간이 지난 전송만 빠지고, 대기 시간은 가장 오래된 전송이 빠지는 시각까지"""
+    clock = FakeClock()
+    limiter = RateLimiter(5, 1.0, clock)
+    assert all(limiter.take() for _ in range(4))
+    clock.now = 0.5
+    assert limiter.take()
+    assert not limiter.take() and limiter.wait_time() == 0.5
+    clock.now = 0.999
+    assert not limiter.available()
+    clock.now = 1.0
+    assert all(limiter.take() for _ in range(4))
+    assert not limiter.take() and limiter.wait_time() == 0.5
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)  # TrScheduler QTimer 생성용
+    check_limiter()
+    check_limits(n_requests)
+    check_overload()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,44 @@
 # 조건식 자동매매 모듈
+import logging
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 import time
 
+from condition_tracker import ConditionTracker
+from config import Config
+from metrics import registry, timed
+from screen_pool import ScreenPool
+
+logger = logging.getLogger(__name__)
+
+# 편입 이벤트 수신 -> condition_result 처리(전략 반영) 완료까지
+CONDITION_LATENCY = registry.histogram("kiwoom_condition_signal_latency_seconds",
+                                       "조건검색 편입 이벤트 수신 -> 전략 반영 완료 지연")
+
 class ConditionHandler(QObject):
     # 조건식 검색 결과 시그널
-    condition_result = pyqtSignal(str, list)  # (조건식명, 종목리스트)
+    condition_result = pyqtSignal(str, list, list)  # (조건식명, 편입 [(종목코드, 편입시각)], 이탈 [종목코드])
     
     def __init__(self, kiwoom_api):
         super().__init__()
         self.kiwoom = kiwoom_api
         self.condition_list = {}  # 조건식 목록
-        self.monitoring_conditions = []  # 감시 중인 조건식
+        self.monitoring_conditions = {}  # 감시 중인 조건식 인덱스 -> (조건식명, 화면번호)
+        self.screen_pool = ScreenPool(Config.CONDITION_SCREEN_START, Config.CONDITION_MAX_ACTIVE)
+        self.search_started = {}  # 조건식명 -> 검색 요청 시각 (초기 목록 수신 지연 측정)
+        self.load_latency = {}  # 조건식명 -> 초기 목록 수신 지연 (초)
+        self.last_stats = (time.perf_counter(), {})  # 이벤트율 계산용 (시각, 조건식별 누적 이벤트 수)
+        
+        # 편입 종목 실시간 시세 구독 (RealSubscriptionManager, 없으면 등록하지 않음)
+        self.subscriptions = None
+        self.journal = None  # 조건검색 이벤트 저널 (TickJournalWriter)
+        self.tracker = ConditionTracker()  # 조건식별 편입 종목
         self.monitor_timer = QTimer()
         self.monitor_timer.timeout.connect(self.monitor_conditions)
         
+        # 편입/이탈 변화는 모아서 주기적으로 한 번에 전달
+        self.flush_timer = QTimer()
+        self.flush_timer.timeout.connect(self.flush_changes)
+        
     def load_condition_list(self):
         """조건식 목록 로드"""
         try:
@@ -32,14 +57,14 @@ class ConditionHandler(QObject):
                         name = parts[1]
                         self.condition_list[index] = name
                         
-                print(f"✅ 조건식 {len(self.condition_list)}개 로드 완료")
+                logger.info(f"✅ 조건식 {len(self.condition_list)}개 로드 완료")
                 return True
             else:
-                print("❌ 조건식 로드 실패")
+                logger.error("❌ 조건식 로드 실패")
                 return False
                 
         except Exception as e:
-            print(f"❌ 조건식 로드 오류: {e}")
+            logger.error(f"❌ 조건식 로드 오류: {e}")
             return False
             
     def get_condition_list(self):
@@ -47,82 +72,171 @@ class ConditionHandler(QObject):
         return self.condition_list
         
     def start_condition_search(self, condition_index, condition_name):
-        """조건식 검색 시작"""
+        """조건식 검색 시작 (조건식마다 별도 화면번호 사용)"""
         try:
+            if condition_index in self.monitoring_conditions:
+                logger.warning(f"⚠️ 조건식 '{condition_name}' 이미 검색 중")
+                return True
+                
+            screen_no = self.screen_pool.acquire()
+            if screen_no is None:
+                logger.error(f"❌ 동시 조건검색은 최대 {Config.CONDITION_MAX_ACTIVE}개까지 가능합니다")
+                return False
+                
             # 실시간 조건검색 시작
-            result = self.kiwoom.send_condition_stop("0156", condition_name, condition_index, 1)
+            self.search_started[condition_name] = time.perf_counter()
+            result = self.kiwoom.send_condition_stop(screen_no, condition_name, condition_index, 1)
             
             if result == 1:
-                print(f"✅ 조건식 '{condition_name}' 검색 시작")
-                if condition_index not in self.monitoring_conditions:
-                    self.monitoring_conditions.append(condition_index)
+                logger.info(f"✅ 조건식 '{condition_name}' 검색 시작 (화면 {screen_no})")
+                self.monitoring_conditions[condition_index] = (condition_name, screen_no)
+                if not self.flush_timer.isActive():
+                    self.flush_timer.start(Config.CONDITION_REFRESH_MS)
                 return True
             else:
-                print(f"❌ 조건식 '{condition_name}' 검색 시작 실패")
+                self.screen_pool.release(screen_no)
+                logger.error(f"❌ 조건식 '{condition_name}' 검색 시작 실패")
                 return False
                 
         except Exception as e:
-            print(f"❌ 조건식 검색 시작 오류: {e}")
+            logger.error(f"❌ 조건식 검색 시작 오류: {e}")
             return False
             
     def stop_condition_search(self, condition_index, condition_name):
         """조건식 검색 중단"""
         try:
-            result = self.kiwoom.send_condition_stop("0156", condition_name, condition_index, 0)
+            if condition_index not in self.monitoring_conditions:
+                return False
+            screen_no = self.monitoring_conditions[condition_index][1]
+            result = self.kiwoom.send_condition_stop(screen_no, condition_name, condition_index, 0)
             
             if result == 1:
-                print(f"✅ 조건식 '{condition_name}' 검색 중단")
-                if condition_index in self.monitoring_conditions:
-                    self.monitoring_conditions.remove(condition_index)
+                logger.info(f"✅ 조건식 '{condition_name}' 검색 중단")
+                del self.monitoring_conditions[condition_index]
+                self.screen_pool.release(screen_no)
+                self.tracker.reset(condition_name)
+                self.flush_changes()
+                if not self.monitoring_conditions:
+                    self.flush_timer.stop()
                 return True
             else:
-                print(f"❌ 조건식 '{condition_name}' 검색 중단 실패")
+                logger.error(f"❌ 조건식 '{condition_name}' 검색 중단 실패")
                 return False
                 
         except Exception as e:
-            print(f"❌ 조건식 검색 중단 오류: {e}")
+            logger.error(f"❌ 조건식 검색 중단 오류: {e}")
             return False
             
+    def stop_all(self):
+        """모든 조건검색 중단"""
+        for condition_index, (condition_name, _) in list(self.monitoring_conditions.items()):
+            self.stop_condition_search(condition_index, condition_name)
+            
     def on_receive_condition_ver(self, ret, msg):
         """조건식 목록 수신 이벤트"""
         if ret == 1:
-            print("✅ 조건식 목록 수신 완료")
+            logger.info("✅ 조건식 목록 수신 완료")
             self.load_condition_list()
         else:
-            print(f"❌ 조건식 목록 수신 실패: {msg}")
+            logger.error(f"❌ 조건식 목록 수신 실패: {msg}")
             
+    @timed("kiwoom_tr_condition_handler_seconds", "OnReceiveTrCondition 처리 시간")
+    def on_receive_tr_condition(self, screen_no, code_list, condition_name, condition_index, next):
+        """조건검색 초기 종목 목록 수신 (세미콜론 구분 종목코드)"""
+        try:
+            codes = [code for code in code_list.split(';') if code]
+            count = self.tracker.load(condition_name, codes)
+            started = self.search_started.pop(condition_name, None)
+            if started is not None:
+                self.load_latency[condition_name] = time.perf_counter() - started
+            logger.info(f"✅ 조건식 '{condition_name}' 초기 편입 {count}개")
+            self.flush_changes()
+            
+        except Exception as e:
+            logger.error(f"❌ 조건검색 초기 목록 처리 오류: {e}")
+            
+    @timed("kiwoom_real_condition_handler_seconds", "OnReceiveRealCondition 처리 시간")
     def on_receive_real_condition(self, code, type, condition_name, condition_index):
         """실시간 조건검색 결과 수신"""
         try:
-            if type == "I":  # 편입
-                print(f"📈 조건편입: {code} ({self.kiwoom.get_master_code_name(code)})")
-            elif type == "D":  # 이탈
-                print(f"📉 조건이탈: {code} ({self.kiwoom.get_master_code_name(code)})")
+            if self.journal is not None:
+                self.journal.write_condition(code, type, condition_index)
                 
-            # 조건식 결과 시그널 발생
-            self.condition_result.emit(condition_name, [code])
+            # 편입 상태만 갱신하고 화면 반영은 flush_changes 에서 일괄 처리
+            self.tracker.apply(condition_name, code, type)
+            
+        except Exception as e:
+            logger.error(f"❌ 실시간 조건검색 처리 오류: {e}")
             
+    def flush_changes(self):
+        """마지막 반영 이후 조건식별 편입/이탈 순변화 전달"""
+        try:
+            taken_at = time.perf_counter()
+            for condition_name, (added, removed) in self.tracker.take_changes().items():
+                if self.subscriptions is not None:
+                    # 조건식마다 참조 횟수를 올리고 내려서 여러 조건식에 편입된 종목은 유지
+                    for code, _ in added:
+                        self.subscriptions.subscribe(code)
+                    for code in removed:
+                        self.subscriptions.unsubscribe(code)
+                self.condition_result.emit(condition_name, added, removed)
+                if added:
+                    # take_changes 가 잰 수신 -> 반영 지연 + 시그널 처리(전략 평가) 시간
+                    membership = self.tracker.membership(condition_name)
+                    CONDITION_LATENCY.record(membership.last_latency + time.perf_counter() - taken_at)
+                
         except Exception as e:
-            print(f"❌ 실시간 조건검색 처리 오류: {e}")
+            logger.error(f"❌ 조건검색 결과 반영 오류: {e}")
             
+    def condition_stats(self):
+        """조건식별 통계 목록 (편입 종목수, 이벤트 수/초, 화면 반영 지연)"""
+        now = time.perf_counter()
+        last_time, last_events = self.last_stats
+        elapsed = max(now - last_time, 1e-9)
+        
+        stats = []
+        events = {}
+        for condition_index, (condition_name, screen_no) in self.monitoring_conditions.items():
+            membership = self.tracker.membership(condition_name)
+            events[condition_name] = membership.events
+            stats.append({
+                'index': condition_index,
+                'name': condition_name,
+                'screen': screen_no,
+                'members': len(membership),
+                'events': membership.events,
+                'rate': (membership.events - last_events.get(condition_name, 0)) / elapsed,
+                'entries': membership.entries,
+                'exits': membership.exits,
+                'latency': membership.last_latency,
+                'max_latency': membership.max_latency,
+                'load_latency': self.load_latency.get(condition_name),
+            })
+        self.last_stats = (now, events)
+        return stats
+        
     def start_monitoring(self, interval=5):
         """조건식 모니터링 시작"""
         if not self.monitor_timer.isActive():
             self.monitor_timer.start(interval * 1000)  # 초 단위를 밀리초로 변환
-            print(f"✅ 조건식 모니터링 시작 (간격: {interval}초)")
+            logger.info(f"✅ 조건식 모니터링 시작 (간격: {interval}초)")
             
     def stop_monitoring(self):
         """조건식 모니터링 중단"""
         if self.monitor_timer.isActive():
             self.monitor_timer.stop()
-            print("✅ 조건식 모니터링 중단")
+            logger.info("✅ 조건식 모니터링 중단")
             
     def monitor_conditions(self):
-        """조건식 상태 모니터링"""
+        """조건식 상태 모니터링 (조건식별 이벤트율 / 반영 지연)"""
         try:
-            current_time = time.strftime("%H:%M:%S")
-            if self.monitoring_conditions:
-                print(f"[{current_time}] 📊 {len(self.monitoring_conditions)}개 조건식 모니터링 중...")
+            for stat in self.condition_stats():
+                logger.info(f"📊 {stat['name']}: 편입 {stat['members']}개, "
+                            f"{stat['rate']:.1f}건/초, 지연 {stat['latency'] * 1000:.0f}ms "
+                            f"(최대 {stat['max_latency'] * 1000:.0f}ms)")
+            if self.subscriptions is not None:
+                stats = self.subscriptions.stats()
+                logger.info(f"📡 실시간 등록 {stats['codes']}개 (화면 {stats['screens']}개)")
                 
         except Exception as e:
-            print(f"❌ 조건식 모니터링 오류: {e}")
+            logger.error(f"❌ 조건식 모니터링 오류: {e}")
@@ -0,0 +1,127 @@
+# 조건검색 편입 종목 테이블 모델
+# ConditionTracker 의 순변화(편입/이탈 목록)를 묶어서 반영한다. 이탈 종목은 행에서 제거된다.
+# 이탈 행 자리에는 마지막 행을 옮겨오므로 행 순서는 유지하지 않는다.
+import time
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+COLUMNS = ["편입시간", "조건식", "종목명", "종목코드", "상태"]
+
+
+class ConditionTableModel(QAbstractTableModel):
+    """조건식별 현재 편입 종목 테이블"""
+
+    # 한 번에 이만큼 이상 바뀌면 행 단위 알림 대신 모델 전체를 다시 그린다
+    RESET_THRESHOLD = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []  # [조건식명, 종목코드, 종목명, 편입시각]
+        self.rows = {}  # (조건식명, 종목코드) -> 행 번호
+
+    def apply_changes(self, condition_name, added, removed):
+        """편입/이탈 순변화 반영
+
+        Args:
+            added: [(종목코드, 종목명, 편입 시각)] (이미 있는 종목은 편입 시각만 갱신)
+            removed: [종목코드]
+        """
+        new_items = [(code, name, entered_at) for code, name, entered_at in added
+                     if (condition_name, code) not in self.rows]
+        removed_rows = sorted((self.rows[(condition_name, code)] for code in removed
+                               if (condition_name, code) in self.rows), reverse=True)
+
+        if len(new_items) + len(removed_rows) >= self.RESET_THRESHOLD:
+            self.beginResetModel()
+            for row in removed_rows:
+                self._swap_remove(row)
+            self._append(condition_name, new_items)
+            self._apply_updates(condition_name, added)
+            self.endResetModel()
+            return
+
+        # 제거할 행에 마지막 행을 옮겨오고 마지막 행을 지워서 행 번호 재계산을 피한다
+        for row in removed_rows:
+            last = len(self.items) - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            moved = self._swap_remove(row)
+            self.endRemoveRows()
+            if moved:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1), [Qt.DisplayRole])
+
+        if new_items:
+            start = len(self.items)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_items) - 1)
+            self._append(condition_name, new_items)
+            self.endInsertRows()
+
+        for row in self._apply_updates(condition_name, added):
+            self.dataChanged.emit(self.index(row, 0), self.index(row, 0), [Qt.DisplayRole])
+
+    def remove_condition(self, condition_name):
+        """조건식의 모든 행 제거"""
+        codes = [item[1] for item in self.items if item[0] == condition_name]
+        if codes:
+            self.apply_changes(condition_name, [], codes)
+
+    def clear(self):
+        self.beginResetModel()
+        self.items.clear()
+        self.rows.clear()
+        self.endResetModel()
+
+    def _append(self, condition_name, new_items):
+        for code, name, entered_at in new_items:
+            self.rows[(condition_name, code)] = len(self.items)
+            self.items.append([condition_name, code, name, entered_at])
+
+    def _swap_remove(self, row):
+        """row 를 마지막 행으로 덮고 마지막 행 삭제 (마지막 행이 옮겨졌으면 True)"""
+        item = self.items[row]
+        del self.rows[(item[0], item[1])]
+        last = self.items.pop()
+        if row == len(self.items):
+            return False
+        self.items[row] = last
+        self.rows[(last[0], last[1])] = row
+        return True
+
+    def _apply_updates(self, condition_name, added):
+        """재편입 종목 편입 시각 갱신 (변경된 행 번호 반환)"""
+        changed = []
+        for code, _, entered_at in added:
+            row = self.rows.get((condition_name, code))
+            if row is not None and self.items[row][3] != entered_at:
+                self.items[row][3] = entered_at
+                changed.append(row)
+        return changed
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        condition_name, code, name, entered_at = self.items[index.row()]
+        column = index.column()
+        if column == 0:
+            return time.strftime("%H:%M:%S", time.localtime(entered_at))
+        if column == 1:
+            return condition_name
+        if column == 2:
+            return name
+        if column == 3:
+            return code
+        return "편입"
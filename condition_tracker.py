@@ -0,0 +1,147 @@
+# 조건검색 편입 종목 추적
+# 조건식별 현재 편입 종목 집합과 편입 시각을 유지하고, 화면에는 마지막 반영 이후의 순변화만 넘긴다.
+# 이력은 고정 길이 링버퍼에만 남겨 장중 이벤트가 많아도 메모리가 늘지 않는다.
+import time
+from collections import deque, namedtuple
+
+from config import Config
+
+# time: epoch 초, event_type: 'I'(편입) / 'D'(이탈)
+ConditionEvent = namedtuple('ConditionEvent', ['time', 'condition_name', 'code', 'event_type'])
+
+
+class ConditionMembership:
+    """조건식 1개의 편입 종목 집합"""
+
+    def __init__(self, condition_name):
+        self.condition_name = condition_name
+        self.members = {}  # 종목코드 -> 편입 시각
+        self.published = {}  # 화면에 반영된 종목코드 -> 편입 시각
+        self.touched = set()  # 마지막 반영 이후 변경된 종목
+        self.entries = 0
+        self.exits = 0
+
+        # 통계: 수신 이벤트 수, 수신 -> 화면 전달 지연
+        self.events = 0
+        self.pending_since = None
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, code):
+        return code in self.members
+
+    def enter(self, code, timestamp):
+        if code in self.members:
+            return False  # 중복 편입은 최초 편입 시각 유지
+        self.members[code] = timestamp
+        self.touched.add(code)
+        self.entries += 1
+        return True
+
+    def exit(self, code):
+        if self.members.pop(code, None) is None:
+            return False
+        self.touched.add(code)
+        self.exits += 1
+        return True
+
+    def take_changes(self):
+        """마지막 반영 이후 순변화
+
+        Returns:
+            (added, removed): added 는 [(종목코드, 편입 시각)], removed 는 [종목코드]
+            (같은 구간에 편입 후 이탈한 종목은 어느 쪽에도 나오지 않는다)
+        """
+        if self.pending_since is not None:
+            self.last_latency = time.perf_counter() - self.pending_since
+            self.max_latency = max(self.max_latency, self.last_latency)
+            self.pending_since = None
+
+        added, removed = [], []
+        for code in self.touched:
+            entered_at = self.members.get(code)
+            shown_at = self.published.get(code)
+            if entered_at is not None:
+                if shown_at is None:
+                    added.append((code, entered_at))
+                    self.published[code] = entered_at
+                elif entered_at != shown_at:
+                    # 같은 구간에 이탈 후 재편입: 화면 기준으로는 계속 편입 상태이므로 최초 편입 시각 유지
+                    self.members[code] = shown_at
+            elif shown_at is not None:
+                removed.append(code)
+                del self.published[code]
+        self.touched.clear()
+        return added, removed
+
+
+class ConditionTracker:
+    """조건식별 편입 종목 / 이벤트 이력 관리"""
+
+    def __init__(self, history_size=None):
+        self.conditions = {}  # 조건식명 -> ConditionMembership
+        self.history = deque(maxlen=history_size or Config.CONDITION_HISTORY_SIZE)
+        self.event_count = 0
+
+    def membership(self, condition_name):
+        membership = self.conditions.get(condition_name)
+        if membership is None:
+            membership = self.conditions[condition_name] = ConditionMembership(condition_name)
+        return membership
+
+    def members(self, condition_name):
+        """현재 편입 종목 {종목코드: 편입 시각}"""
+        membership = self.conditions.get(condition_name)
+        return dict(membership.members) if membership else {}
+
+    def load(self, condition_name, codes, timestamp=None):
+        """OnReceiveTrCondition 초기 종목 목록 반영 (목록에 없는 기존 종목은 이탈 처리)"""
+        timestamp = timestamp or time.time()
+        membership = self.membership(condition_name)
+        codes = set(codes)
+        for code in [code for code in membership.members if code not in codes]:
+            membership.exit(code)
+        for code in codes:
+            membership.enter(code, timestamp)
+        return len(membership)
+
+    def apply(self, condition_name, code, event_type, timestamp=None):
+        """실시간 편입('I')/이탈('D') 이벤트 반영 (상태가 바뀌었으면 True)"""
+        timestamp = timestamp or time.time()
+        membership = self.membership(condition_name)
+        if event_type == "I":
+            changed = membership.enter(code, timestamp)
+        else:
+            changed = membership.exit(code)
+
+        membership.events += 1
+        if membership.pending_since is None:
+            membership.pending_since = time.perf_counter()
+
+        self.history.append(ConditionEvent(timestamp, condition_name, code, event_type))
+        self.event_count += 1
+        return changed
+
+    def reset(self, condition_name):
+        """조건식 감시 중단: 편입 종목을 모두 이탈 처리 (다음 take_changes 에서 제거로 전달)"""
+        membership = self.conditions.get(condition_name)
+        if membership is not None:
+            for code in list(membership.members):
+                membership.exit(code)
+
+    def take_changes(self):
+        """조건식별 순변화 {조건식명: (added, removed)} (변화 없는 조건식은 제외)"""
+        changes = {}
+        for name, membership in self.conditions.items():
+            if membership.touched or membership.pending_since is not None:
+                added, removed = membership.take_changes()
+                if added or removed:
+                    changes[name] = (added, removed)
+        return changes
+
+    def clear(self):
+        self.conditions.clear()
+        self.history.clear()
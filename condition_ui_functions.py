@@ -27,12 +27,9 @@
         
         group_layout.addLayout(button_layout)
         
-        # 조건검색 결과 테이블
-        self.condition_table = QTableWidget()
-        self.condition_table.setColumnCount(5)
-        self.condition_table.setHorizontalHeaderLabels([
-            "시간", "조건식", "종목명", "종목코드", "상태"
-        ])
+        # 조건검색 편입 종목 테이블 (이탈 종목은 자동 제거)
+        self.condition_table = QTableView()
+        self.condition_table.setModel(self.condition_model)
         
         # 테이블 스타일
         header = self.condition_table.horizontalHeader()
@@ -72,9 +69,9 @@
             condition_index = self.condition_combo.currentData()
             condition_name = self.condition_combo.currentText().split(' (')[0]
             
+            # 여러 조건식을 동시에 감시할 수 있으므로 시작 버튼은 계속 활성화
             if self.condition_handler.start_condition_search(condition_index, condition_name):
                 self.stop_condition_button.setEnabled(True)
-                self.start_condition_button.setEnabled(False)
                 self.condition_handler.start_monitoring()
                 
         except Exception as e:
@@ -90,32 +87,27 @@
             condition_name = self.condition_combo.currentText().split(' (')[0]
             
             if self.condition_handler.stop_condition_search(condition_index, condition_name):
-                self.start_condition_button.setEnabled(True)
-                self.stop_condition_button.setEnabled(False)
-                self.condition_handler.stop_monitoring()
+                if not self.condition_handler.monitoring_conditions:
+                    self.stop_condition_button.setEnabled(False)
+                    self.condition_handler.stop_monitoring()
                 
         except Exception as e:
             self.log(f"❌ 조건검색 중단 오류: {e}")
     
-    def on_condition_result(self, condition_name, stock_list):
-        """조건검색 결과 처리 개선"""
+    def on_condition_result(self, condition_name, added, removed):
+        """조건검색 편입/이탈 순변화 반영"""
         try:
-            current_time = QTime.currentTime().toString()
+            added = [(code, self.symbol_master.name(code), entered_at) for code, entered_at in added]
+            self.condition_model.apply_changes(condition_name, added, removed)
             
-            for stock_code in stock_list:
-                stock_name = self.kiwoom.get_master_code_name(stock_code)
-                
-                # 조건검색 테이블에 추가
-                row = self.condition_table.rowCount()
-                self.condition_table.insertRow(row)
-                
-                self.condition_table.setItem(row, 0, QTableWidgetItem(current_time))
-                self.condition_table.setItem(row, 1, QTableWidgetItem(condition_name))
-                self.condition_table.setItem(row, 2, QTableWidgetItem(stock_name))
-                self.condition_table.setItem(row, 3, QTableWidgetItem(stock_code))
-                self.condition_table.setItem(row, 4, QTableWidgetItem("편입"))
-                
+            # 초기 목록처럼 한 번에 많이 바뀌면 요약만 기록
+            if len(added) + len(removed) > 10:
+                self.log(f"🎯 {condition_name}: 편입 {len(added)}개, 이탈 {len(removed)}개")
+                return
+            for stock_code, stock_name, _ in added:
                 self.log(f"🎯 조건편입: {stock_name}({stock_code}) - {condition_name}")
+            for stock_code in removed:
+                self.log(f"📉 조건이탈: {self.symbol_master.name(stock_code)}({stock_code}) - {condition_name}")
                 
         except Exception as e:
             self.log(f"❌ 조건검색 결과 처리 오류: {e}")
\ No newline at end of file
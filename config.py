@@ -3,18 +3,107 @@ class Config:
     # 키움증권 계좌 정보 (실제 사용시 변경 필요)
     ACCOUNT_NUMBER = ""  # 계좌번호 입력
     ACCOUNT_PASSWORD = ""  # 계좌 비밀번호
+    ACCOUNTS = ()  # 함께 관리할 계좌번호 (비어 있으면 로그인 계좌 전체, 화면/자동주문은 ACCOUNT_NUMBER 또는 첫 계좌)
     
     # API 설정
     API_VERSION = "1.0"
+    KIWOOM_BACKEND = "kiwoom"  # "kiwoom": 실제 OpenAPI, "fake": 가상 백엔드 (환경변수 KIWOOM_BACKEND 로 변경 가능)
     
     # 로그 설정
     LOG_LEVEL = "INFO"
     LOG_FILE = "trading.log"
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # 로그 파일 회전 크기 (바이트)
+    LOG_BACKUP_COUNT = 5  # 보관할 이전 로그 파일 수
+    LOG_CONSOLE = True  # 콘솔에도 출력
+    LOG_QUEUE_SIZE = 100000  # 기록 대기열 크기 (가득 차면 버림)
+    LOG_VIEW_LINES = 2000  # 화면 로그 최대 줄 수
+    LOG_REFRESH_MS = 100  # 화면 로그 반영 주기 (밀리초)
+    LOG_VIEW_BATCH = 100  # 화면 로그 1회 반영 최대 줄 수 (넘으면 최근 줄만 표시)
+    
+    # 성능 지표 설정
+    METRICS_REFRESH_MS = 1000  # 지표 도크 갱신 주기 (밀리초)
+    METRICS_EXPORT_FILE = "metrics.prom"  # Prometheus 텍스트 파일 (빈 값이면 내보내지 않음)
+    METRICS_EXPORT_INTERVAL_SEC = 15  # 지표 파일 기록 주기 (초)
+    
+    # 종목 마스터 설정
+    SYMBOL_MASTER_FILE = "symbols.json"  # 종목코드/종목명 캐시 파일 (하루 한 번 갱신)
+    SYMBOL_MARKETS = ("0", "10", "8")  # GetCodeListByMarket 시장 구분 (코스피, 코스닥, ETF)
+    SYMBOL_SEARCH_LIMIT = 20  # 종목 입력 자동완성 최대 개수
     
     # 매매 설정
     MAX_POSITION_SIZE = 1000000  # 최대 포지션 크기 (원)
     STOP_LOSS_PERCENT = 0.03  # 손절 비율 (3%)
     TAKE_PROFIT_PERCENT = 0.05  # 익절 비율 (5%)
+    MAX_TOTAL_EXPOSURE = 10000000  # 전체 보유 + 미체결 매수 한도 (원)
+    DAILY_LOSS_LIMIT = 300000  # 당일 실현 손실 한도 (원, 도달시 신규 매수 차단)
+    RISK_MAX_ORDERS_PER_MINUTE = 30  # 분당 최대 매수 주문 승인 횟수
+    
+    # 실시간 잔고 평가 설정
+    PORTFOLIO_REFRESH_MS = 500  # 계좌 요약 화면 반영 주기 (밀리초, 값이 바뀐 경우만)
+    PORTFOLIO_RECONCILE_SEC = 300  # 잔고 조회(opw00018)로 평가값을 맞추는 주기 (초)
+    PORTFOLIO_RECONCILE_MIN_SEC = 180  # 여러 계좌 순환 조회 최소 간격 (초, 계좌가 늘어도 시간당 20건 이하)
+    
+    # TR 조회 제한 설정
+    TR_RATE_PER_SECOND = 5  # 초당 최대 조회 횟수
+    TR_RATE_PER_HOUR = 100  # 시간당 최대 조회 횟수
+    TR_SCREEN_START = 2000  # TR 화면번호 시작
+    TR_SCREEN_COUNT = 50  # TR 화면번호 개수
+    TR_TIMEOUT_SEC = 10  # 응답 대기 시간 (초)
+    TR_PUMP_INTERVAL_MS = 50  # 큐 처리 주기 (밀리초)
+    
+    # 주문 설정
+    AUTO_ORDER = False  # True: 전략 시그널로 자동 주문, False: 시그널 로그만 출력
+    ORDER_SCREEN_NO = "4000"  # 주문 화면번호
+    ORDER_RATE_PER_SECOND = 5  # 초당 최대 주문 횟수
+    ORDER_PUMP_INTERVAL_MS = 20  # 주문 대기열 처리 주기 (밀리초)
+    ORDER_FILL_HISTORY = 10000  # 메모리에 보관할 최근 체결 수
+    
+    # 전략 실행 설정
+    STRATEGY_WORKERS = 2  # 무거운 전략 평가용 워커 스레드 수
+    
+    # 실시간 등록 설정
+    REAL_SCREEN_START = 1100  # 실시간 시세 화면번호 시작
+    REAL_SCREEN_COUNT = 50  # 실시간 시세 화면번호 개수
+    REAL_CODES_PER_SCREEN = 100  # 화면번호당 실시간 등록 최대 종목 수
+    REAL_FIDS_PER_REGISTRATION = 100  # SetRealReg 1회당 최대 FID 수
+    REAL_COALESCE_MS = 50  # 등록/해제 변경을 모으는 시간 (밀리초)
+    
+    # 화면 갱신 설정
+    REALTIME_REFRESH_HZ = 10  # 실시간 테이블 초당 갱신 횟수
+    
+    # 엔진 / 화면 분리 설정 (python main.py --engine, python engine_client.py)
+    IPC_SERVER_NAME = "kiwoom-engine"  # 로컬 소켓 이름 (유닉스 소켓 / 네임드 파이프)
+    IPC_RING_NAME = "kiwoom_ticks"  # 틱 공유 메모리 이름
+    IPC_RING_CAPACITY = 65536  # 틱 링 레코드 수 (화면이 이보다 밀리면 오래된 틱은 건너뜀)
+    IPC_MAX_PENDING_BYTES = 1024 * 1024  # 화면별 소켓 쓰기 대기 한도 (넘으면 상태 메시지 건너뜀)
+    IPC_POLL_MS = 50  # 화면의 틱 링 읽기 주기 (밀리초)
+    
+    # 조건검색 설정
+    CONDITION_REFRESH_MS = 200  # 편입/이탈 화면 반영 주기 (밀리초)
+    CONDITION_HISTORY_SIZE = 5000  # 편입/이탈 이벤트 이력 보관 개수
+    CONDITION_MAX_ACTIVE = 10  # 동시 실시간 조건검색 최대 개수 (키움 제한)
+    CONDITION_SCREEN_START = 3000  # 조건검색 화면번호 시작
+    
+    # 과거 봉 저장소 설정
+    BAR_STORE_DIR = "bars"  # 종목/주기별 컬럼 파일 저장 경로
+    BAR_BACKFILL_MAX_PAGES = 10  # 최초 조회시 연속조회 최대 페이지 수
+    
+    # 실시간 봉 집계 설정
+    BAR_TIMEFRAMES = ('m1', 'm5', 'D')  # 틱으로 집계할 봉 주기
+    BAR_FLUSH_INTERVAL_MS = 1000  # 구간이 끝난 봉 완성 처리 주기 (밀리초)
+    BAR_CLOSE_GRACE_SEC = 2  # 늦게 도착하는 틱을 기다리는 시간 (초)
+    
+    # 틱 저널 설정
+    JOURNAL_DIR = "journal"  # 일자별 저널 파일 경로
+    JOURNAL_CODEC = "auto"  # auto / zstd / lz4 / zlib / none
+    JOURNAL_BLOCK_RECORDS = 8192  # 블록당 레코드 수
+    JOURNAL_FLUSH_INTERVAL_SEC = 1.0  # 블록이 덜 찼을 때 기록 주기 (초)
+    JOURNAL_REPLAY_BATCH_RECORDS = 262144  # 일괄 재생시 한 번에 넘기는 최대 틱 수
+    
+    # 백테스트 비용 설정
+    COMMISSION_RATE = 0.00015  # 매매 수수료 (매수/매도 각각)
+    SELL_TAX_RATE = 0.0018  # 증권거래세 (매도)
+    SLIPPAGE_RATE = 0.0005  # 체결 슬리피지
     
     # 모의투자 설정
     MOCK_INVESTMENT = True  # True: 모의투자, False: 실제투자
\ No newline at end of file
@@ -0,0 +1,402 @@
+# 화면 없는 매매 엔진
+# 키움(또는 가상) 백엔드, TR/실시간/조건검색 처리, 전략과 주문을 위젯 없이 이벤트 루프 하나에서 돌린다.
+# 화면은 별도 프로세스(engine_client.py)로 붙어서 틱은 공유 메모리 링으로, 상태는 로컬 소켓으로 받는다.
+# 화면이 느리거나 멈춰도 엔진 쪽 쓰기는 기다리지 않으므로 주문/체결 처리가 늦어지지 않는다.
+# 사용법: python main.py --engine [--watch 005930,000660]
+import logging
+import signal
+import sys
+import time
+from functools import partial
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer
+
+from account_handler import AccountHandler
+from account_manager import AccountManager, select_accounts
+from app_logging import setup_logging, shutdown_logging
+from bar_aggregator import BarAggregator
+from bar_store import BarBackfiller, BarStore
+from condition_handler import ConditionHandler
+from config import Config
+from engine_ipc import IpcServer, TickRing
+from kiwoom_api import create_kiwoom, get_backend
+from metrics import registry, timed
+from order_manager import SIDE_BUY, SIDE_SELL, OrderManager
+from real_decoder import RealDataDecoder
+from real_subscriptions import RealSubscriptionManager
+from risk_engine import RiskEngine
+from strategy import TradingStrategy
+from strategy_runtime import SmaCrossStrategy, StrategyRuntime
+from symbol_master import SymbolMaster
+from tick_journal import TickJournalWriter
+from tr_scheduler import PRIORITY_INTERACTIVE, TrScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def order_record(order):
+    """Order -> 발행용 dict"""
+    return {
+        'order_no': order.order_no,
+        'account': order.account,
+        'code': order.code,
+        'name': order.name,
+        'side': order.side,
+        'quantity': order.quantity,
+        'price': order.price,
+        'filled': order.filled,
+        'unfilled': order.unfilled,
+        'status': order.status,
+    }
+
+
+class TradingEngine(QObject):
+    """TradingApp 의 매매 로직만 모은 엔진 (위젯 없음)"""
+
+    def __init__(self, kiwoom=None, ipc_name=None, ring_name=None, publish=True):
+        super().__init__()
+        self.kiwoom = kiwoom or create_kiwoom()
+        self.watch_stocks = {}  # 감시 종목 -> 종목명
+        self.real_data = {}  # 최근 틱
+        self.real_decoder = RealDataDecoder(kiwoom=self.kiwoom)
+        self.real_subscriptions = RealSubscriptionManager(self.kiwoom)
+        self.symbol_master = SymbolMaster()
+
+        self.account_handler = AccountHandler(self.kiwoom)
+        self.condition_handler = ConditionHandler(self.kiwoom)
+        self.tr_scheduler = TrScheduler(self.kiwoom)
+        self.account_manager = AccountManager(self.kiwoom, self.tr_scheduler, self.real_subscriptions)
+        self.bar_store = BarStore()
+        self.bar_backfiller = BarBackfiller(self.bar_store, self.kiwoom, self.tr_scheduler)
+        self.strategy = TradingStrategy(self.kiwoom, self.bar_store)
+        self.order_manager = OrderManager(self.kiwoom, self.strategy)
+        self.strategy.order_manager = self.order_manager
+        self.risk_engine = RiskEngine()
+        self.risk_engine.subscriptions = self.real_subscriptions
+        self.risk_engine.attach(self.order_manager)
+        self.strategy.risk_engine = self.risk_engine
+        self.risk_engine.exit_triggered.connect(self.strategy.exit_position)
+
+        self.strategy_runtime = StrategyRuntime()
+        self.strategy_runtime.add_strategy(SmaCrossStrategy("sma"))
+        self.strategy_runtime.signal_generated.connect(self.strategy.on_signal)
+        self.bar_aggregator = BarAggregator()
+        self.bar_aggregator.bar_closed.connect(self.strategy_runtime.on_bar)
+
+        self.tick_journal = TickJournalWriter()
+        self.condition_handler.journal = self.tick_journal
+        self.condition_handler.subscriptions = self.real_subscriptions
+        self.condition_handler.condition_result.connect(self.strategy_runtime.on_condition_result)
+
+        # 화면 프로세스로 상태 발행 (틱: 공유 메모리 링, 상태/명령: 로컬 소켓)
+        self.ring = None
+        self.ipc = None
+        if publish:
+            self.ring = TickRing(ring_name, create=True)
+            self.ipc = IpcServer(ipc_name, snapshot=self.snapshot)
+            self.ipc.command_received.connect(self.on_command)
+            self.account_manager.account_updated.connect(self._publish_account)
+            self.account_manager.aggregate_updated.connect(partial(self.publish, "totals"))
+            self.condition_handler.condition_result.connect(self._publish_condition)
+            self.strategy_runtime.signal_generated.connect(self._publish_signal)
+
+        ocx = self.kiwoom.ocx
+        ocx.OnEventConnect.connect(self.on_event_connect)
+        ocx.OnReceiveRealData.connect(self.receive_real_data)
+        ocx.OnReceiveTrData.connect(self.receive_tr_data)
+        ocx.OnReceiveTrCondition.connect(self.condition_handler.on_receive_tr_condition)
+        ocx.OnReceiveRealCondition.connect(self.condition_handler.on_receive_real_condition)
+        ocx.OnReceiveChejanData.connect(self.account_manager.on_receive_chejan_data)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.export_metrics)
+        self.pending_watch = []  # 로그인 후 감시할 종목
+        self.logged_in = False
+        self.started_at = None
+
+    # ------------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------------
+    def start(self, watch=()):
+        """IPC 서버 / 처리 타이머 시작 후 로그인 요청 (감시 종목은 로그인 후 등록)"""
+        self.started_at = time.perf_counter()
+        if self.ipc is not None:
+            self.ipc.listen()
+        self.pending_watch = list(watch)
+        self.tr_scheduler.start()
+        self.bar_aggregator.start()
+        self.tick_journal.start()
+        if Config.METRICS_EXPORT_FILE:
+            self.metrics_timer.start(int(Config.METRICS_EXPORT_INTERVAL_SEC * 1000))
+        logger.info("🔐 엔진 로그인 요청")
+        self.kiwoom.CommConnect()
+
+    def on_event_connect(self, err_code):
+        """로그인 결과 (계좌 등록 / 잔고 조회 / 종목 마스터 / 감시 종목)"""
+        if err_code != 0:
+            logger.error(f"❌ 엔진 로그인 실패: {err_code}")
+            self.publish("status", {'logged_in': False, 'error': err_code})
+            return
+        self.logged_in = True
+
+        accounts = select_accounts(self.kiwoom.get_login_info("ACCNO").split(';'))
+        if accounts:
+            self.account_manager.add_account(accounts[0], self.account_handler, self.order_manager)
+            for other in accounts[1:]:
+                self.account_manager.add_account(other)
+            for account in accounts:
+                self._connect_orders(account, self.account_manager.order_manager(account))
+            self.account_manager.start()
+            self.account_manager.request_all(PRIORITY_INTERACTIVE)
+            logger.info(f"📊 엔진 계좌 {len(accounts)}개: {', '.join(accounts)}")
+        else:
+            logger.error("❌ 계좌 정보를 가져올 수 없습니다.")
+
+        try:
+            self.symbol_master.load(self.kiwoom)
+        except Exception as e:
+            logger.error(f"❌ 종목 마스터 로드 오류: {e}")
+        self.condition_handler.load_condition_list()
+
+        for code in self.pending_watch:
+            self.watch(code)
+        self.pending_watch = []
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        logger.info(f"✅ 엔진 준비 완료 ({elapsed * 1000:.0f}ms)")
+        self.publish("status", {'logged_in': True, 'accounts': accounts})
+
+    def _connect_orders(self, account, order_manager):
+        if self.ipc is None:
+            return
+        order_manager.order_updated.connect(self._publish_order)
+        order_manager.position_changed.connect(partial(self._publish_position, account))
+
+    def shutdown(self):
+        """종료 (저널 / 전략 워커 / IPC / 공유 메모리 정리)"""
+        try:
+            self.tr_scheduler.clear()
+            self.account_manager.stop()
+            self.condition_handler.stop_all()
+            self.real_subscriptions.teardown()
+        except Exception as e:
+            logger.error(f"엔진 정리 오류: {e}")
+        self.tick_journal.close()
+        self.strategy_runtime.shutdown()
+        self.export_metrics()
+        if self.ipc is not None:
+            self.ipc.close()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        try:
+            if self.kiwoom.get_connect_state() == 1:
+                self.kiwoom.comm_terminate()
+        except Exception:
+            pass
+        logger.info("🚪 엔진 종료")
+
+    def export_metrics(self):
+        if not Config.METRICS_EXPORT_FILE:
+            return
+        try:
+            registry.write_prometheus(Config.METRICS_EXPORT_FILE)
+        except OSError as e:
+            logger.warning(f"⚠️ 지표 파일 기록 실패: {e}")
+
+    # ------------------------------------------------------------------
+    # 키움 이벤트
+    # ------------------------------------------------------------------
+    @timed("kiwoom_real_data_handler_seconds", "OnReceiveRealData 처리 시간")
+    def receive_real_data(self, code, real_type, real_data):
+        """실시간 데이터 수신 (TradingApp.receive_real_data 와 같은 경로 + 틱 링 기록)"""
+        try:
+            tick = self.real_decoder.decode(code, real_type, real_data)
+            if tick is None:
+                return
+
+            self.real_data[code] = tick
+            self.tick_journal.write_tick(tick)
+            self.bar_aggregator.on_tick(tick)
+            self.risk_engine.on_tick(code, tick.price)
+            self.account_manager.on_tick(code, tick.price)
+            self.strategy_runtime.on_tick(code, tick.price)
+            if code in self.watch_stocks:
+                self.strategy.on_price(code, tick.price)
+
+            # 화면 전달은 공유 메모리에 쓰기만 (화면이 읽지 않아도 덮어씀)
+            if self.ring is not None:
+                self.ring.write_tick(tick, time.time_ns())
+
+        except Exception as e:
+            logger.error(f"❌ 실시간 데이터 처리 오류: {e}")
+
+    @timed("kiwoom_tr_data_handler_seconds", "OnReceiveTrData 처리 시간")
+    def receive_tr_data(self, screen_no, rqname, trcode, record_name, prev_next):
+        try:
+            if not self.tr_scheduler.on_receive_tr_data(screen_no, rqname, trcode, record_name, prev_next):
+                logger.warning(f"⚠️ 처리되지 않은 TR 응답: {rqname} ({trcode})")
+        except Exception as e:
+            logger.error(f"❌ TR 데이터 처리 오류: {e}")
+
+    # ------------------------------------------------------------------
+    # 감시 종목
+    # ------------------------------------------------------------------
+    def watch(self, code):
+        """실시간 감시 시작 (TradingApp.add_watch_stock 의 위젯 외 부분)"""
+        if code in self.watch_stocks:
+            return False
+        name = self.symbol_master.name(code)
+        self.watch_stocks[code] = name
+        self.real_subscriptions.subscribe(code)
+        self.strategy_runtime.watch("sma", code)
+        self.bar_aggregator.seed(self.bar_store, [code])
+        self.bar_backfiller.request_gap(code, 'D')
+        logger.info(f"✅ {name}({code}) 실시간 감시 시작")
+        self._publish_watch()
+        return True
+
+    def unwatch(self, code):
+        if self.watch_stocks.pop(code, None) is None:
+            return False
+        self.real_subscriptions.unsubscribe(code)
+        self.strategy_runtime.unwatch("sma", code)
+        self.bar_aggregator.remove(code)
+        logger.info(f"✅ {code} 감시 중단")
+        self._publish_watch()
+        return True
+
+    # ------------------------------------------------------------------
+    # 화면 명령
+    # ------------------------------------------------------------------
+    def on_command(self, command, args):
+        """화면 명령 처리 (잘못된 명령은 로그만 남김)"""
+        try:
+            if command == "watch":
+                self.watch(args['code'])
+            elif command == "unwatch":
+                self.unwatch(args['code'])
+            elif command == "balance":
+                self.account_manager.request_balance(args.get('account'), PRIORITY_INTERACTIVE)
+            elif command == "condition_start":
+                self.condition_handler.start_condition_search(args['index'], args['name'])
+            elif command == "condition_stop":
+                self.condition_handler.stop_condition_search(args['index'], args['name'])
+            elif command == "order":
+                self.place_order(args)
+            elif command == "snapshot":
+                for topic, payload in self.snapshot():
+                    self.publish(topic, payload)
+            else:
+                logger.warning(f"⚠️ 알 수 없는 화면 명령: {command}")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ 화면 명령 인자 오류 ({command}): {e}")
+
+    def place_order(self, args):
+        """화면 수동 주문 (주 계좌는 리스크 한도 검사 후 주문)"""
+        account = args.get('account') or self.account_manager.primary
+        order_manager = self.account_manager.order_manager(account)
+        if order_manager is None:
+            logger.warning(f"⚠️ 등록되지 않은 계좌: {account}")
+            return None
+        code = args['code']
+        side = SIDE_BUY if args['side'] in (SIDE_BUY, "BUY", "buy") else SIDE_SELL
+        quantity = int(args['quantity'])
+        price = int(args.get('price', 0))
+        checked = account == self.account_manager.primary
+        if checked:
+            reference = price or self._last_price(code)
+            reason = self.risk_engine.check_order(code, side, quantity, reference)
+            if reason:
+                logger.warning(f"⛔ 주문 거절 ({code}): {reason}")
+                self.publish("order_rejected", {'account': account, 'code': code, 'reason': reason})
+                return None
+        if side == SIDE_BUY:
+            request = order_manager.buy(code, quantity, price)
+        else:
+            request = order_manager.sell(code, quantity, price)
+        if checked:
+            # 전송 실패로 접수되지 않으면 승인 예약 해제
+            request.future.add_done_callback(
+                partial(self.risk_engine.release_if_failed, code, side, quantity, reference))
+        return request
+
+    def _last_price(self, code):
+        tick = self.real_data.get(code)
+        return tick.price if tick is not None else 0
+
+    # ------------------------------------------------------------------
+    # 발행
+    # ------------------------------------------------------------------
+    def publish(self, topic, payload):
+        if self.ipc is not None:
+            self.ipc.publish(topic, payload)
+
+    def snapshot(self):
+        """새로 붙었거나 밀렸던 화면에 보낼 전체 상태 [(토픽, 본문)]"""
+        manager = self.account_manager
+        messages = [("status", {'logged_in': self.logged_in, 'accounts': list(manager.accounts)}),
+                    ("watch", {'stocks': self.watch_stocks})]
+        for account, summary in manager.summaries.items():
+            messages.append(("account", {'account': account, **summary}))
+        if manager.accounts:
+            messages.append(("totals", manager.aggregate()))
+        for account in manager.accounts:
+            messages.append(("positions", {'account': account,
+                                           'positions': manager.order_manager(account).positions}))
+        messages.append(("conditions", {'conditions': self.condition_handler.condition_list,
+                                        'active': sorted(self.condition_handler.monitoring_conditions)}))
+        return messages
+
+    def _publish_watch(self):
+        self.publish("watch", {'stocks': self.watch_stocks})
+
+    def _publish_account(self, account, summary):
+        self.publish("account", {'account': account, **summary})
+
+    def _publish_order(self, order):
+        self.publish("order", order_record(order))
+
+    def _publish_position(self, account, code, position):
+        self.publish("position", {'account': account, 'code': code, 'position': position})
+
+    def _publish_condition(self, condition_name, added, removed):
+        self.publish("condition", {'name': condition_name, 'added': added, 'removed': removed})
+
+    def _publish_signal(self, strategy_name, code, signal_type, price):
+        self.publish("signal", {'strategy': strategy_name, 'code': code, 'signal': signal_type, 'price': price})
+
+
+def run_engine(argv=None):
+    """엔진 프로세스 실행 (Ctrl+C 로 종료)"""
+    import argparse
+
+    argv = sys.argv if argv is None else argv
+    parser = argparse.ArgumentParser(description="키움 매매 엔진 (화면 없음)")
+    parser.add_argument("--engine", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--watch", default="", help="로그인 후 감시할 종목코드 (쉼표 구분)")
+    args = parser.parse_args(argv[1:])
+
+    if get_backend() == "fake":
+        app = QCoreApplication(argv[:1])
+    else:
+        # 실제 OpenAPI 는 QAxWidget(ActiveX 컨트롤)이라 QApplication 이 필요하다 (창은 만들지 않음)
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication(argv[:1])
+    setup_logging()
+
+    engine = TradingEngine()
+    app.aboutToQuit.connect(engine.shutdown)
+    # Ctrl+C: 이벤트 루프가 파이썬 시그널 처리 기회를 갖도록 주기적으로 깨움
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(200)
+
+    engine.start(watch=[code for code in args.watch.split(',') if code])
+    code = app.exec_()
+    shutdown_logging()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(run_engine())
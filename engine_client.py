@@ -0,0 +1,211 @@
+# 엔진 모니터 화면 (별도 프로세스)
+# engine.py 가 발행하는 상태(로컬 소켓)와 틱(공유 메모리 링)을 받아 표시하고, 감시 종목/잔고 조회 명령을 보낸다.
+# 이 프로세스가 멈추거나 느려져도 엔진은 기다리지 않는다 (밀린 틱은 건너뛰고, 상태는 다시 붙을 때 전체를 받음).
+# 사용법: python engine_client.py  (엔진: python main.py --engine)
+import logging
+import sys
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QAbstractItemView, QApplication, QHBoxLayout, QLabel, QLineEdit, QMainWindow,
+                             QPlainTextEdit, QPushButton, QTableView, QVBoxLayout, QWidget)
+
+from app_logging import setup_logging, shutdown_logging
+from config import Config
+from engine_ipc import IpcClient, TickRing
+from realtime_model import RealtimeTableModel
+
+logger = logging.getLogger(__name__)
+
+
+class EngineClient(QObject):
+    """엔진 연결 (상태 메시지 + 틱 링 폴링, 연결이 끊기면 주기적으로 재연결)"""
+
+    message_received = pyqtSignal(str, object)  # (토픽, 본문)
+    connection_changed = pyqtSignal(bool)
+
+    def __init__(self, model, ipc_name=None, ring_name=None, poll_ms=None):
+        super().__init__()
+        self.model = model  # 틱을 반영할 RealtimeTableModel
+        self.ring_name = ring_name or Config.IPC_RING_NAME
+        self.ring = None
+        self.ipc = IpcClient(ipc_name)
+        self.ipc.message_received.connect(self.message_received)
+        self.ipc.connection_changed.connect(self._on_connection_changed)
+        self.ticks = 0
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.poll_ms = poll_ms or Config.IPC_POLL_MS
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.timeout.connect(self.connect_to_engine)
+
+    def start(self):
+        if not self.connect_to_engine():
+            self.reconnect_timer.start(1000)
+
+    def connect_to_engine(self):
+        if self.ipc.is_connected():
+            return True
+        if not self.ipc.connect_to_engine():
+            return False
+        try:
+            self._close_ring()
+            self.ring = TickRing(self.ring_name)
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning(f"⚠️ 틱 링 연결 실패: {e}")
+        self.reconnect_timer.stop()
+        self.poll_timer.start(self.poll_ms)
+        return True
+
+    def _on_connection_changed(self, connected):
+        self.connection_changed.emit(connected)
+        if not connected:
+            self.poll_timer.stop()
+            self._close_ring()
+            self.reconnect_timer.start(1000)
+
+    def _close_ring(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def poll(self):
+        """새 틱을 테이블 모델 배열에 반영 (종목별 마지막 값만 의미 있으므로 순서대로 덮어씀)"""
+        if self.ring is None:
+            return 0
+        batch = self.ring.read()
+        if not len(batch):
+            return 0
+        update = self.model.update_tick
+        for code, tick_time, price, change, rate, volume in zip(
+                batch['code'].tolist(), batch['time'].tolist(), batch['price'].tolist(),
+                batch['change'].tolist(), batch['rate'].tolist(), batch['volume'].tolist()):
+            update(code.decode(), price=price, change=change, rate=rate, volume=volume,
+                   time_hhmmss=tick_time if tick_time >= 0 else None)
+        self.ticks += len(batch)
+        return len(batch)
+
+    def send(self, command, **args):
+        self.ipc.send(command, args)
+
+    def close(self):
+        self.poll_timer.stop()
+        self.reconnect_timer.stop()
+        self.ipc.close()
+        self._close_ring()
+
+
+class EngineMonitor(QMainWindow):
+    """엔진 상태 모니터 (감시 종목 시세 / 계좌 합계 / 이벤트 로그)"""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("키움 매매 엔진 모니터")
+        self.realtime_model = RealtimeTableModel()
+        self.client = EngineClient(self.realtime_model)
+        self.client.message_received.connect(self.on_message)
+        self.client.connection_changed.connect(self.on_connection_changed)
+
+        central = QWidget()
+        layout = QVBoxLayout(central)
+        self.status_label = QLabel("엔진 연결 안됨")
+        self.total_label = QLabel("전체 계좌: -")
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.total_label)
+
+        input_layout = QHBoxLayout()
+        self.stock_code_input = QLineEdit()
+        self.stock_code_input.setPlaceholderText("종목코드 입력 (예: 005930)")
+        input_layout.addWidget(self.stock_code_input)
+        add_button = QPushButton("감시 추가")
+        add_button.clicked.connect(self.add_watch_stock)
+        input_layout.addWidget(add_button)
+        remove_button = QPushButton("감시 제거")
+        remove_button.clicked.connect(self.remove_watch_stock)
+        input_layout.addWidget(remove_button)
+        balance_button = QPushButton("잔고 조회")
+        balance_button.clicked.connect(lambda: self.client.send("balance"))
+        input_layout.addWidget(balance_button)
+        layout.addLayout(input_layout)
+
+        self.realtime_table = QTableView()
+        self.realtime_table.setModel(self.realtime_model)
+        self.realtime_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.realtime_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.realtime_table.horizontalHeader().setStretchLastSection(True)
+        self.realtime_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.realtime_table)
+
+        self.log_text = QPlainTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(Config.LOG_VIEW_LINES)
+        layout.addWidget(self.log_text)
+        self.setCentralWidget(central)
+
+        self.realtime_model.start()
+        self.client.start()
+
+    def add_watch_stock(self):
+        code = self.stock_code_input.text().strip()
+        if len(code) == 6:
+            self.client.send("watch", code=code)
+            self.stock_code_input.clear()
+
+    def remove_watch_stock(self):
+        row = self.realtime_table.currentIndex().row()
+        if row >= 0:
+            self.client.send("unwatch", code=self.realtime_model.code_at(row))
+
+    def on_connection_changed(self, connected):
+        self.status_label.setText("엔진 연결됨" if connected else "엔진 연결 끊김 (재연결 대기)")
+
+    def on_message(self, topic, payload):
+        """엔진 상태 메시지 반영"""
+        if topic == "watch":
+            self.sync_watch(payload['stocks'])
+        elif topic == "totals":
+            self.total_label.setText(
+                f"전체 계좌 {payload['account_count']}개 | 예수금 {payload['deposit']:,}원 | "
+                f"평가 {payload['total_value']:,}원 | 손익 {payload['total_profit']:+,}원 "
+                f"({payload.get('profit_rate', 0.0):+.2f}%)"
+            )
+        elif topic == "order":
+            self.log(f"📝 주문 {payload['order_no']} {payload['code']} {payload['status']} "
+                     f"{payload['filled']}/{payload['quantity']}")
+        elif topic == "order_rejected":
+            self.log(f"⛔ 주문 거절 {payload['code']}: {payload['reason']}")
+        elif topic == "signal":
+            self.log(f"📈 {payload['strategy']} {payload['code']} {payload['signal']} @ {payload['price']:,}")
+        elif topic == "condition":
+            self.log(f"🔍 {payload['name']} 편입 {len(payload['added'])} / 이탈 {len(payload['removed'])}")
+        elif topic == "status":
+            self.log(f"📡 엔진 로그인: {payload.get('logged_in')} 계좌: {', '.join(payload.get('accounts', []))}")
+
+    def sync_watch(self, stocks):
+        """감시 목록을 엔진 상태에 맞춤"""
+        for code in [code for code in self.realtime_model.codes if code not in stocks]:
+            self.realtime_model.remove_symbol(code)
+        for code, name in stocks.items():
+            if code not in self.realtime_model:
+                self.realtime_model.add_symbol(code, name)
+
+    def log(self, message):
+        self.log_text.appendPlainText(message)
+
+    def closeEvent(self, event):
+        self.client.close()
+        event.accept()
+
+
+def main():
+    app = QApplication(sys.argv)
+    setup_logging(log_file="engine_client.log")  # 엔진 로그 파일과 분리
+    window = EngineMonitor()
+    window.show()
+    code = app.exec_()
+    shutdown_logging()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
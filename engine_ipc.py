@@ -0,0 +1,314 @@
+# 엔진 <-> 화면 프로세스 통신
+# 실시간 틱은 공유 메모리 링버퍼(고정 길이 레코드)에 쓰고, 화면은 자기 속도로 읽는다.
+# 계좌/주문/감시 목록 같은 상태와 화면의 명령은 로컬 소켓(QLocalSocket - 유닉스 소켓/네임드 파이프)에
+# 길이 접두 프레임 [전체 길이 u32][토픽 길이 u8][토픽][JSON] 으로 주고받는다.
+# 엔진은 어떤 경우에도 화면을 기다리지 않는다: 링은 덮어쓰고, 소켓 쓰기가 밀린 클라이언트는 상태 메시지를 건너뛴 뒤
+# 밀린 데이터가 빠지면 전체 상태(snapshot)를 한 번 다시 받는다.
+import json
+import logging
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+from config import Config
+from tick_journal import KIND_TICK, RECORD_DTYPE
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('<IB')  # 전체 길이(토픽 길이 바이트 이후), 토픽 길이
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+RING_MAGIC = b'KTR1'
+RING_HEADER = struct.Struct('<4sIQ')  # magic, 용량(레코드 수), 쓰기 순번
+RING_HEADER_SIZE = 64  # 레코드 정렬용 여유
+RING_SEQ = struct.Struct('<Q')  # 쓰기 순번 (헤더 8바이트 위치)
+# RECORD_DTYPE 과 같은 배치 (쓰는 쪽은 numpy 레코드 대입보다 pack_into 가 몇 배 빠름)
+RING_RECORD = struct.Struct('<q6sBhiiifqi')
+assert RING_RECORD.size == RECORD_DTYPE.itemsize
+
+_created = set()  # 이 프로세스가 만든 세그먼트 (같은 프로세스의 읽는 쪽은 추적 해제하지 않음)
+
+
+# ----------------------------------------------------------------------
+# 프레임
+# ----------------------------------------------------------------------
+def encode_frame(topic, payload):
+    """토픽 + JSON 본문 -> 프레임 바이트"""
+    topic_bytes = topic.encode('utf-8')
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(topic_bytes) + len(body), len(topic_bytes)) + topic_bytes + body
+
+
+class FrameDecoder:
+    """스트림에서 프레임을 잘라 [(토픽, 본문)] 으로 변환 (조각난 수신 허용)"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        messages = []
+        offset = 0
+        buffer = self.buffer
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            length, topic_length = FRAME_HEADER.unpack_from(buffer, offset)
+            if length > MAX_FRAME_BYTES or topic_length > length:
+                raise ValueError(f"잘못된 프레임 길이: {length}")
+            start = offset + FRAME_HEADER.size
+            end = start + length
+            if end > len(buffer):
+                break
+            topic = bytes(buffer[start:start + topic_length]).decode('utf-8')
+            messages.append((topic, json.loads(bytes(buffer[start + topic_length:end]))))
+            offset = end
+        del buffer[:offset]
+        return messages
+
+
+# ----------------------------------------------------------------------
+# 공유 메모리 틱 링
+# ----------------------------------------------------------------------
+def _attach(name):
+    """기존 공유 메모리 연결 (읽는 쪽이 종료하면서 엔진의 세그먼트를 지우지 않도록 추적 해제)"""
+    shm = shared_memory.SharedMemory(name=name)
+    if name in _created:
+        return shm
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class TickRing:
+    """단일 쓰기 / 다중 읽기 공유 메모리 링버퍼 (tick_journal.RECORD_DTYPE 레코드)
+
+    쓰는 쪽은 레코드를 채운 뒤 순번을 올리고, 읽는 쪽은 자기 위치부터 순번까지 복사한다.
+    읽기가 용량 이상 밀리면 오래된 레코드는 건너뛴다 (lost 에 누적).
+    """
+
+    def __init__(self, name=None, capacity=None, create=False):
+        self.name = name or Config.IPC_RING_NAME
+        self.owner = create
+        if create:
+            capacity = capacity or Config.IPC_RING_CAPACITY
+            size = RING_HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+            try:
+                self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+            except FileExistsError:
+                # 이전 엔진이 비정상 종료하며 남긴 세그먼트
+                stale = _attach(self.name)
+                stale.close()
+                stale.unlink()
+                self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+            _created.add(self.name)
+            RING_HEADER.pack_into(self.shm.buf, 0, RING_MAGIC, capacity, 0)
+        else:
+            self.shm = _attach(self.name)
+            magic, capacity, _ = RING_HEADER.unpack_from(self.shm.buf, 0)
+            if magic != RING_MAGIC:
+                self.shm.close()
+                raise ValueError(f"틱 링 형식이 아닙니다: {self.name}")
+        self.capacity = capacity
+        self.buf = self.shm.buf
+        self.records = np.ndarray((capacity,), dtype=RECORD_DTYPE, buffer=self.buf, offset=RING_HEADER_SIZE)
+        self.cursor = self.sequence() if not create else 0  # 읽는 쪽 위치 (연결 시점 이후부터)
+        self.lost = 0
+
+    def sequence(self):
+        return RING_SEQ.unpack_from(self.buf, 8)[0]
+
+    # 쓰기 (엔진)
+    def write_tick(self, tick, ts_ns):
+        buf = self.buf
+        seq = RING_SEQ.unpack_from(buf, 8)[0]
+        RING_RECORD.pack_into(buf, RING_HEADER_SIZE + seq % self.capacity * RING_RECORD.size,
+                              ts_ns, tick.code.encode(), KIND_TICK, -1, tick.time, tick.price,
+                              tick.change, tick.rate, tick.volume, tick.trade_volume)
+        RING_SEQ.pack_into(buf, 8, seq + 1)
+
+    # 읽기 (화면)
+    def read(self, limit=None):
+        """새 레코드 복사본 (밀린 경우 최근 용량만큼)"""
+        seq = self.sequence()
+        start = self.cursor
+        if seq - start > self.capacity:
+            self.lost += seq - self.capacity - start
+            start = seq - self.capacity
+        if limit is not None and seq - start > limit:
+            seq = start + limit
+        if seq == start:
+            return self.records[:0].copy()
+        first, last = start % self.capacity, seq % self.capacity
+        if first < last:
+            batch = self.records[first:last].copy()
+        else:
+            batch = np.concatenate((self.records[first:], self.records[:last]))
+        # 복사하는 동안 덮어쓰였거나 쓰는 중일 수 있는 앞부분은 버림
+        overwritten = self.sequence() + 1 - self.capacity - start
+        if overwritten > 0:
+            self.lost += overwritten
+            batch = batch[overwritten:]
+        self.cursor = seq
+        return batch
+
+    def close(self):
+        self.records = None
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            _created.discard(self.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# ----------------------------------------------------------------------
+# 로컬 소켓
+# ----------------------------------------------------------------------
+class _Client:
+    __slots__ = ('socket', 'decoder', 'stale', 'dropped')
+
+    def __init__(self, socket):
+        self.socket = socket
+        self.decoder = FrameDecoder()
+        self.stale = False  # 쓰기가 밀려 상태 메시지를 건너뛴 상태
+        self.dropped = 0
+
+
+class IpcServer(QObject):
+    """엔진 쪽 로컬 소켓 서버 (상태 발행 + 화면 명령 수신)"""
+
+    command_received = pyqtSignal(str, dict)  # (명령, 인자)
+    client_connected = pyqtSignal(object)  # 새 클라이언트 (snapshot 전송용)
+
+    def __init__(self, name=None, max_pending=None, snapshot=None):
+        super().__init__()
+        self.name = name or Config.IPC_SERVER_NAME
+        self.max_pending = max_pending or Config.IPC_MAX_PENDING_BYTES
+        self.snapshot = snapshot  # snapshot() -> [(토픽, 본문)] (새/밀린 클라이언트에 전체 상태 전송)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.clients = {}  # QLocalSocket -> _Client
+        self.published = 0
+        self.dropped = 0
+
+    def listen(self):
+        QLocalServer.removeServer(self.name)  # 이전 실행이 남긴 소켓 파일
+        if not self.server.listen(self.name):
+            raise OSError(f"IPC 서버 시작 실패 ({self.name}): {self.server.errorString()}")
+        logger.info(f"📡 IPC 서버 대기: {self.server.fullServerName()}")
+
+    def close(self):
+        for socket in list(self.clients):
+            socket.disconnectFromServer()
+        self.clients.clear()
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            client = _Client(socket)
+            self.clients[socket] = client
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+            socket.bytesWritten.connect(lambda _, s=socket: self._on_bytes_written(s))
+            self._send_snapshot(client)
+            self.client_connected.emit(socket)
+            logger.info(f"📡 화면 연결 (총 {len(self.clients)}개)")
+
+    def _on_disconnected(self, socket):
+        if self.clients.pop(socket, None) is not None:
+            logger.info(f"📡 화면 연결 종료 (남은 {len(self.clients)}개)")
+        socket.deleteLater()
+
+    def _on_ready_read(self, socket):
+        client = self.clients.get(socket)
+        if client is None:
+            return
+        try:
+            messages = client.decoder.feed(bytes(socket.readAll()))
+        except ValueError as e:
+            logger.warning(f"⚠️ 잘못된 IPC 명령 - 연결 종료: {e}")
+            socket.abort()
+            return
+        for topic, payload in messages:
+            self.command_received.emit(topic, payload if isinstance(payload, dict) else {})
+
+    def _on_bytes_written(self, socket):
+        client = self.clients.get(socket)
+        if client is not None and client.stale and socket.bytesToWrite() < self.max_pending // 2:
+            self._send_snapshot(client)
+
+    def _send_snapshot(self, client):
+        client.stale = False
+        if self.snapshot is None:
+            return
+        for topic, payload in self.snapshot():
+            client.socket.write(encode_frame(topic, payload))
+
+    def publish(self, topic, payload):
+        """모든 클라이언트에 발행 (쓰기가 밀린 클라이언트는 건너뛰고 나중에 전체 상태 전송)"""
+        if not self.clients:
+            return
+        frame = encode_frame(topic, payload)
+        self.published += 1
+        for socket, client in self.clients.items():
+            if client.stale or socket.bytesToWrite() > self.max_pending:
+                client.stale = True
+                client.dropped += 1
+                self.dropped += 1
+                continue
+            socket.write(frame)
+
+
+class IpcClient(QObject):
+    """화면 쪽 로컬 소켓 클라이언트"""
+
+    message_received = pyqtSignal(str, object)  # (토픽, 본문)
+    connection_changed = pyqtSignal(bool)
+
+    def __init__(self, name=None):
+        super().__init__()
+        self.name = name or Config.IPC_SERVER_NAME
+        self.socket = QLocalSocket(self)
+        self.decoder = FrameDecoder()
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+
+    def connect_to_engine(self, timeout_ms=1000):
+        self.decoder = FrameDecoder()
+        self.socket.connectToServer(self.name)
+        return self.socket.waitForConnected(timeout_ms)
+
+    def is_connected(self):
+        return self.socket.state() == QLocalSocket.ConnectedState
+
+    def send(self, topic, payload=None):
+        if self.is_connected():
+            self.socket.write(encode_frame(topic, payload or {}))
+
+    def close(self):
+        self.socket.disconnectFromServer()
+
+    def _on_connected(self):
+        self.connection_changed.emit(True)
+
+    def _on_disconnected(self):
+        self.connection_changed.emit(False)
+
+    def _on_ready_read(self):
+        try:
+            messages = self.decoder.feed(bytes(self.socket.readAll()))
+        except ValueError as e:
+            logger.error(f"❌ 엔진 메시지 해석 실패: {e}")
+            self.socket.abort()
+            return
+        for topic, payload in messages:
+            self.message_received.emit(topic, payload)
@@ -0,0 +1,539 @@
+# 가상 키움 OpenAPI 백엔드
+# QAxWidget("KHOPENAPI.KHOpenAPICtrl.1") 과 같은 dynamicCall/이벤트 인터페이스를 흉내 내서
+# 윈도우/키움 설치 없이 리눅스에서 앱 로직을 실행하고 부하 테스트를 할 수 있게 한다.
+import json
+import random
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from real_decoder import REAL_TYPE_FIDS
+from tr_decoder import OPW00018
+
+DEFAULT_SYMBOLS = {
+    '005930': '삼성전자',
+    '000660': 'SK하이닉스',
+    '035420': 'NAVER',
+    '035720': '카카오',
+    '005380': '현대차',
+    '051910': 'LG화학',
+    '006400': '삼성SDI',
+    '068270': '셀트리온',
+}
+
+
+def make_symbols(count):
+    """가상 종목 목록 생성 (기본 종목 + 일련번호 종목)"""
+    symbols = dict(list(DEFAULT_SYMBOLS.items())[:count])
+    i = 100000
+    while len(symbols) < count:
+        symbols[f"{i:06d}"] = f"가상종목{i}"
+        i += 10
+    return symbols
+
+
+def synthetic_ticks(codes, n, real_type='주식체결', start_time=None, rate=1000.0, seed=42):
+    """합성 실시간 체결 이벤트 생성
+
+    Returns:
+        events: [(초, 'real', (종목코드, 실시간타입, {FID: 문자열}))]
+    """
+    rng = random.Random(seed)
+    codes = list(codes)
+    prices = {code: rng.randrange(5000, 200000, 100) for code in codes}
+    base_prices = dict(prices)
+    volumes = {code: 0 for code in codes}
+    start_time = start_time if start_time is not None else 9 * 3600
+    events = []
+
+    for i in range(n):
+        code = codes[rng.randrange(len(codes))]
+        price = max(prices[code] + rng.randint(-3, 3) * 100, 100)
+        prices[code] = price
+        qty = rng.randint(1, 500)
+        volumes[code] += qty
+
+        ts = i / rate
+        seconds = int(start_time + ts)
+        change = price - base_prices[code]
+        sign = '+' if change > 0 else '-' if change < 0 else ''
+        fids = {
+            20: f"{seconds // 3600:02d}{seconds // 60 % 60:02d}{seconds % 60:02d}",
+            10: f"{sign}{price}",
+            11: f"{change:+d}" if change else "0",
+            12: f"{change / base_prices[code] * 100:+.2f}",
+            15: f"+{qty}",
+            13: str(volumes[code]),
+            27: f"{sign}{price + 100}",
+            28: f"{sign}{price}",
+        }
+        events.append((ts, 'real', (code, real_type, fids)))
+
+    return events
+
+
+def synthetic_conditions(codes, n, condition_name="가상조건", condition_index="000", rate=100.0, seed=7):
+    """합성 실시간 조건검색 편입/이탈 이벤트 생성"""
+    rng = random.Random(seed)
+    codes = list(codes)
+    included = set()
+    events = []
+
+    for i in range(n):
+        code = codes[rng.randrange(len(codes))]
+        kind = 'D' if code in included else 'I'
+        included.symmetric_difference_update((code,))
+        events.append((i / rate, 'condition', (code, kind, condition_name, condition_index)))
+
+    return events
+
+
+def save_recording(path, events):
+    """이벤트 목록을 JSON Lines 로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for ts, kind, args in events:
+            if kind == 'real':
+                code, real_type, fids = args
+                args = (code, real_type, {str(fid): value for fid, value in fids.items()})
+            f.write(json.dumps({'ts': ts, 'kind': kind, 'args': args}, ensure_ascii=False) + "\n")
+
+
+def load_recording(path):
+    """save_recording 으로 저장한 이벤트 목록 로드"""
+    events = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            args = record['args']
+            if record['kind'] == 'real':
+                code, real_type, fids = args
+                args = (code, real_type, {int(fid): value for fid, value in fids.items()})
+            events.append((record['ts'], record['kind'], tuple(args)))
+    return events
+
+
+class FakeClock:
+    """가상 시계 (clock 인자로 넘기고 now 를 직접 움직인다)"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def max_in_window(times, window):
+    """정렬된 시각 목록에서 [t, t + window) 구간에 든 개수의 최댓값"""
+    worst = 0
+    end = 0
+    for start, t in enumerate(times):
+        while end < len(times) and times[end] < t + window:
+            end += 1
+        worst = max(worst, end - start)
+    return worst
+
+
+class FakeKiwoomOCX(QObject):
+    """KHOpenAPI 컨트롤 대체 객체 (dynamicCall + 이벤트 시그널)"""
+
+    OnEventConnect = pyqtSignal(int)
+    OnReceiveTrData = pyqtSignal(str, str, str, str, str)
+    OnReceiveRealData = pyqtSignal(str, str, str)
+    OnReceiveMsg = pyqtSignal(str, str, str, str)
+    OnReceiveChejanData = pyqtSignal(str, int, str)
+    OnReceiveConditionVer = pyqtSignal(int, str)
+    OnReceiveTrCondition = pyqtSignal(str, str, str, int, int)
+    OnReceiveRealCondition = pyqtSignal(str, str, str, str)
+
+    def __init__(self, symbols=None, accounts=None, tr_latency_ms=20):
+        super().__init__()
+        self.symbols = dict(symbols or make_symbols(len(DEFAULT_SYMBOLS)))
+        self.accounts = list(accounts or ["8012345611"])
+        self.tr_latency_ms = tr_latency_ms
+        self.connected = False
+
+        self.inputs = {}
+        self.tr_handlers = {}  # TR코드 -> handler(inputs, next) -> (single, multi, prev_next)
+        self.tr_responses = {}  # rqname -> (single, multi)
+        self.last_multi = []  # 마지막 응답 멀티 데이터 (GetCommDataEx)
+        self.tr_requests = []  # (rqname, trcode, next, screen)
+
+        self.real_values = {}  # 종목코드 -> {FID: 문자열}
+        self.real_registrations = {}  # 화면번호 -> {종목코드}
+        self.real_reg_calls = []  # (화면번호, 종목코드목록, FID목록, 옵션)
+        self.real_remove_calls = []  # (화면번호, 종목코드)
+
+        self.conditions = {"000": "가상조건", "001": "거래량급증"}
+        self.condition_results = {}  # 조건식명 -> 초기 종목 목록
+
+        self.chejan_values = {}
+        self.orders = []
+        self._order_no = 0
+        # 계좌번호 -> {종목코드 -> (수량, 평균단가)} (holdings 는 첫 계좌)
+        self.account_holdings = {account: {} for account in self.accounts}
+        self.holdings = self.account_holdings[self.accounts[0]]
+
+        self.pending = deque()  # 지연 전달 이벤트
+
+        self.tr_handlers['opw00018'] = self._opw00018
+
+    # ------------------------------------------------------------------
+    # dynamicCall 인터페이스
+    # ------------------------------------------------------------------
+    def dynamicCall(self, signature, *args):
+        """QAxWidget.dynamicCall 과 같은 형식으로 호출 ("Method(QString, int)", 인자...)"""
+        name = signature.split('(', 1)[0].strip()
+        if len(args) == 1 and isinstance(args[0], (list, tuple)):
+            args = tuple(args[0])
+        method = getattr(self, name, None)
+        if method is None:
+            raise AttributeError(f"지원하지 않는 함수: {signature}")
+        return method(*args)
+
+    def _post(self, func, *args):
+        """이벤트 지연 전달 (실제 OCX 처럼 호출이 끝난 뒤 발생)"""
+        self.pending.append((func, args))
+        QTimer.singleShot(self.tr_latency_ms, self.process_events)
+
+    def process_events(self):
+        """대기 중인 이벤트 전달 (이벤트 루프 없이 쓸 때 직접 호출)"""
+        while self.pending:
+            func, args = self.pending.popleft()
+            func(*args)
+
+    # 로그인
+    def CommConnect(self):
+        self.connected = True
+        self._post(self.OnEventConnect.emit, 0)
+        return 0
+
+    def CommTerminate(self):
+        self.connected = False
+        self.real_registrations.clear()
+
+    def GetConnectState(self):
+        return 1 if self.connected else 0
+
+    def GetLoginInfo(self, tag):
+        info = {
+            "ACCNO": "".join(f"{account};" for account in self.accounts),
+            "ACCOUNT_CNT": str(len(self.accounts)),
+            "USER_ID": "fakeuser",
+            "USER_NAME": "가상사용자",
+            "GetServerGubun": "1",
+        }
+        return info.get(tag, "")
+
+    # 종목 정보
+    def GetCodeListByMarket(self, market):
+        return "".join(f"{code};" for code in self.symbols)
+
+    def GetMasterCodeName(self, code):
+        return self.symbols.get(code, "")
+
+    # TR 조회
+    def SetInputValue(self, key, value):
+        self.inputs[key] = value
+
+    def CommRqData(self, rqname, trcode, next, screen_no):
+        self.tr_requests.append((rqname, trcode, next, screen_no))
+        handler = self.tr_handlers.get(trcode)
+        inputs, self.inputs = self.inputs, {}
+        if handler is None:
+            single, multi, prev_next = {}, [], "0"
+        else:
+            single, multi, prev_next = handler(inputs, int(next))
+        # 응답 데이터는 이벤트를 전달할 때 설정 (같은 rqname 요청이 동시에 있어도 각자 응답을 읽음)
+        self._post(self._deliver_tr, screen_no, rqname, trcode, prev_next, single, multi)
+        return 0
+
+    def _deliver_tr(self, screen_no, rqname, trcode, prev_next, single, multi):
+        self.tr_responses[rqname] = (single, multi)
+        self.last_multi = multi
+        self.OnReceiveTrData.emit(screen_no, rqname, trcode, "", prev_next)
+
+    def GetRepeatCnt(self, trcode, rqname):
+        return len(self.tr_responses.get(rqname, ({}, []))[1])
+
+    def GetCommData(self, trcode, rqname, index, item):
+        single, multi = self.tr_responses.get(rqname, ({}, []))
+        if index < len(multi) and item in multi[index]:
+            return multi[index][item]
+        return single.get(item, "")
+
+    def GetCommDataEx(self, trcode, record_name):
+        # 마지막 응답의 멀티 데이터 전체 (행 x 필드)
+        return [list(row.values()) for row in self.last_multi]
+
+    def _opw00018(self, inputs, next):
+        """계좌평가잔고내역 가상 응답"""
+        rows = []
+        total_buy = total_eval = 0
+        holdings = self.account_holdings.get(inputs.get("계좌번호"), self.holdings)
+        for code, (qty, avg_price) in holdings.items():
+            price = abs(int(self.real_values.get(code, {}).get(10, avg_price)))
+            profit = (price - avg_price) * qty
+            total_buy += avg_price * qty
+            total_eval += price * qty
+            # KOA 출력 항목 순서 그대로 (GetCommDataEx 열 순서)
+            row = dict.fromkeys((field.name for field in OPW00018.multi), "")
+            row.update({
+                "종목번호": f"A{code}",
+                "종목명": self.symbols.get(code, code),
+                "평가손익": f"{profit:015d}",
+                "수익률(%)": f"{profit / (avg_price * qty) * 100 if qty else 0:.2f}",
+                "매입가": f"{avg_price:015d}",
+                "전일종가": f"{avg_price:015d}",
+                "보유수량": f"{qty:015d}",
+                "매매가능수량": f"{qty:015d}",
+                "현재가": f"{price:015d}",
+                "매입금액": f"{avg_price * qty:015d}",
+                "평가금액": f"{price * qty:015d}",
+            })
+            rows.append(row)
+        single = {
+            "예수금": "000000010000000",
+            "총매입금액": f"{total_buy:015d}",
+            "총평가금액": f"{total_eval:015d}",
+            "총평가액": f"{total_eval:015d}",
+            "총손익금액": f"{total_eval - total_buy:015d}",
+            "총평가손익금액": f"{total_eval - total_buy:015d}",
+        }
+        return single, rows, "0"
+
+    # 실시간
+    def SetRealReg(self, screen_no, code_list, fid_list, opt_type):
+        self.real_reg_calls.append((screen_no, code_list, fid_list, opt_type))
+        codes = {code for code in code_list.split(';') if code}
+        if str(opt_type) == "0":
+            self.real_registrations[screen_no] = codes
+        else:
+            self.real_registrations.setdefault(screen_no, set()).update(codes)
+        return 0
+
+    def SetRealRemove(self, screen_no, code):
+        self.real_remove_calls.append((screen_no, code))
+        screens = list(self.real_registrations) if screen_no == "ALL" else [screen_no]
+        for screen in screens:
+            registered = self.real_registrations.get(screen)
+            if registered is None:
+                continue
+            if code == "ALL":
+                del self.real_registrations[screen]
+            else:
+                registered.discard(code)
+
+    def GetCommRealData(self, code, fid):
+        return self.real_values.get(code, {}).get(int(fid), "")
+
+    def emit_real(self, code, real_type, fids):
+        """실시간 시세 이벤트 1건 발생"""
+        self.real_values[code] = fids
+        payload = "\t".join(fids.get(fid, "") for fid in REAL_TYPE_FIDS.get(real_type, ()))
+        self.OnReceiveRealData.emit(code, real_type, payload)
+
+    # 조건검색
+    def GetConditionLoad(self):
+        self._post(self.OnReceiveConditionVer.emit, 1, "")
+        return 1
+
+    def GetConditionNameList(self):
+        return "".join(f"{index}^{name};" for index, name in self.conditions.items())
+
+    def SendCondition(self, screen_no, condition_name, condition_index, search_type):
+        codes = self.condition_results.get(condition_name, [])
+        code_list = "".join(f"{code};" for code in codes)
+        self._post(self.OnReceiveTrCondition.emit, screen_no, code_list, condition_name, int(condition_index), 0)
+        return 1
+
+    def SendConditionStop(self, screen_no, condition_name, condition_index):
+        return 1
+
+    # 주문
+    def SendOrder(self, rqname, screen_no, account, order_type, code, quantity, price, hoga, org_order_no):
+        """주문 접수 후 즉시 전량 체결 처리 (지정가 0원이면 현재가 체결)"""
+        self._order_no += 1
+        order_no = f"{self._order_no:07d}"
+        order_type = int(order_type)
+        quantity = int(quantity)
+        if not price:
+            price = abs(int(self.real_values.get(code, {}).get(10, 0) or 0))
+        self.orders.append((order_no, account, order_type, code, quantity, price))
+        is_buy = order_type in (1, 5)
+        side = "2" if is_buy else "1"
+
+        base = {9201: account, 9203: order_no, 9001: f"A{code}", 302: self.symbols.get(code, code),
+                900: str(quantity), 901: str(price), 904: org_order_no or "", 907: side,
+                905: "+매수" if is_buy else "-매도", 908: time.strftime("%H%M%S")}
+        self._post_chejan("0", {**base, 913: "접수", 902: str(quantity), 911: "", 910: ""})
+        self._post_chejan("0", {**base, 913: "체결", 902: "0", 909: order_no, 910: str(price),
+                                911: str(quantity), 903: str(price * quantity)})
+
+        holdings = self.account_holdings.setdefault(account, {})
+        qty, avg_price = holdings.get(code, (0, 0))
+        if is_buy:
+            avg_price = (qty * avg_price + quantity * price) // (qty + quantity)
+            qty += quantity
+        else:
+            qty = max(qty - quantity, 0)
+        if qty:
+            holdings[code] = (qty, avg_price)
+        else:
+            holdings.pop(code, None)
+        self._post_chejan("1", {9201: account, 9001: f"A{code}", 302: self.symbols.get(code, code),
+                                930: str(qty), 931: str(avg_price), 932: str(qty * avg_price),
+                                933: str(qty), 946: side, 10: str(price)})
+        return 0
+
+    def _post_chejan(self, gubun, values):
+        self._post(self._emit_chejan, gubun, values)
+
+    def _emit_chejan(self, gubun, values):
+        self.chejan_values = values
+        self.OnReceiveChejanData.emit(gubun, len(values), ";".join(str(fid) for fid in values))
+
+    def GetChejanData(self, fid):
+        return self.chejan_values.get(int(fid), "")
+
+
+class FakeKiwoom:
+    """pykiwoom Kiwoom 과 같은 메서드 이름을 제공하는 가상 백엔드"""
+
+    def __init__(self, ocx=None, **kwargs):
+        self.ocx = ocx or FakeKiwoomOCX(**kwargs)
+
+    def CommConnect(self):
+        return self.ocx.dynamicCall("CommConnect()")
+
+    def GetConnectState(self):
+        return self.ocx.dynamicCall("GetConnectState()")
+
+    def comm_connect(self):
+        return self.CommConnect()
+
+    def get_connect_state(self):
+        return self.GetConnectState()
+
+    def comm_terminate(self):
+        self.ocx.dynamicCall("CommTerminate()")
+
+    def get_login_info(self, tag):
+        return self.ocx.dynamicCall("GetLoginInfo(QString)", tag)
+
+    def get_code_list_by_market(self, market):
+        return self.ocx.dynamicCall("GetCodeListByMarket(QString)", market)
+
+    def get_master_code_name(self, code):
+        return self.ocx.dynamicCall("GetMasterCodeName(QString)", code)
+
+    def set_input_value(self, key, value):
+        self.ocx.dynamicCall("SetInputValue(QString, QString)", key, value)
+
+    def comm_rq_data(self, rqname, trcode, next, screen_no):
+        return self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", rqname, trcode, next, screen_no)
+
+    def get_repeat_cnt(self, trcode, rqname):
+        return self.ocx.dynamicCall("GetRepeatCnt(QString, QString)", trcode, rqname)
+
+    def get_comm_data(self, trcode, record_name, rqname, index, item):
+        return self.ocx.dynamicCall("GetCommData(QString, QString, int, QString)",
+                                    trcode, rqname, index, item)
+
+    def get_comm_data_ex(self, trcode, record_name):
+        return self.ocx.dynamicCall("GetCommDataEx(QString, QString)", trcode, record_name)
+
+    def set_real_reg(self, screen_no, code_list, fid_list, opt_type):
+        return self.ocx.dynamicCall("SetRealReg(QString, QString, QString, QString)",
+                                    screen_no, code_list, fid_list, opt_type)
+
+    def set_real_remove(self, screen_no, code):
+        self.ocx.dynamicCall("SetRealRemove(QString, QString)", screen_no, code)
+
+    def get_comm_real_data(self, code, fid):
+        return self.ocx.dynamicCall("GetCommRealData(QString, int)", code, fid)
+
+    def get_condition_load(self):
+        return self.ocx.dynamicCall("GetConditionLoad()")
+
+    def get_condition_name_list(self):
+        conditions = self.ocx.dynamicCall("GetConditionNameList()")
+        return [condition for condition in conditions.split(';') if condition]
+
+    def send_condition(self, screen_no, condition_name, condition_index, search_type):
+        return self.ocx.dynamicCall("SendCondition(QString, QString, int, int)",
+                                    screen_no, condition_name, int(condition_index), search_type)
+
+    def send_condition_stop(self, screen_no, condition_name, condition_index, search_type=0):
+        """조건검색 시작/중단 (ConditionHandler 호출 규약: search_type 1 이면 실시간 시작)"""
+        if search_type:
+            return self.send_condition(screen_no, condition_name, condition_index, search_type)
+        return self.ocx.dynamicCall("SendConditionStop(QString, QString, int)",
+                                    screen_no, condition_name, int(condition_index))
+
+    def send_order(self, rqname, screen_no, account, order_type, code, quantity, price, hoga, org_order_no):
+        return self.ocx.dynamicCall(
+            "SendOrder(QString, QString, QString, int, QString, int, int, QString, QString)",
+            [rqname, screen_no, account, order_type, code, quantity, price, hoga, org_order_no])
+
+    def get_chejan_data(self, fid):
+        return self.ocx.dynamicCall("GetChejanData(int)", fid)
+
+
+class TickReplayer(QObject):
+    """기록/합성 이벤트를 가상 OCX 로 재생
+
+    speed: 기록 시각 대비 재생 배속 (0 이면 최대 속도)
+    """
+
+    def __init__(self, ocx, events, speed=1.0, batch_interval_ms=5):
+        super().__init__()
+        self.ocx = ocx
+        self.events = events
+        self.speed = speed
+        self.position = 0
+        self.started_at = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._on_timer)
+        self.batch_interval_ms = batch_interval_ms
+
+    def _emit(self, kind, args):
+        if kind == 'real':
+            self.ocx.emit_real(*args)
+        elif kind == 'condition':
+            self.ocx.OnReceiveRealCondition.emit(*args)
+
+    def start(self):
+        """이벤트 루프 기반 재생 시작"""
+        self.started_at = time.perf_counter()
+        self.timer.start(self.batch_interval_ms)
+
+    def stop(self):
+        self.timer.stop()
+
+    def finished(self):
+        return self.position >= len(self.events)
+
+    def _on_timer(self):
+        if self.speed <= 0:
+            limit = float('inf')
+        else:
+            limit = (time.perf_counter() - self.started_at) * self.speed
+
+        events = self.events
+        while self.position < len(events) and events[self.position][0] <= limit:
+            _, kind, args = events[self.position]
+            self._emit(kind, args)
+            self.position += 1
+
+        if self.finished():
+            self.timer.stop()
+
+    def run_blocking(self):
+        """이벤트 루프 없이 남은 이벤트를 최대 속도로 모두 발생시키고 걸린 시간(초) 반환"""
+        start = time.perf_counter()
+        emit = self._emit
+        for _, kind, args in self.events[self.position:]:
+            emit(kind, args)
+        self.position = len(self.events)
+        return time.perf_counter() - start
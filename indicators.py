@@ -0,0 +1,275 @@
+# 실시간 스트리밍 지표 모듈
+# 틱마다 윈도우를 다시 계산하지 않고 링버퍼와 누적합으로 O(1) 갱신한다.
+# 저널 재생처럼 틱이 배열로 몰려 오면 update_many / IndicatorBook.update_block 으로 한 번에 반영한다.
+import numpy as np
+
+
+class StreamingSMA:
+    """링버퍼 + 누적합 기반 단순 이동평균"""
+
+    def __init__(self, period):
+        self.period = period
+        self.buffer = [0.0] * period
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, price):
+        """가격 1개 반영 후 현재 이동평균 반환 (데이터 부족 시 None)"""
+        price = float(price)
+        self.total += price - self.buffer[self.index]
+        self.buffer[self.index] = price
+        self.index += 1
+
+        if self.index == self.period:
+            self.index = 0
+            # 한 바퀴마다 누적합을 다시 구해 부동소수점 오차 누적을 막는다 (분할상환 O(1))
+            self.total = sum(self.buffer)
+
+        if self.count < self.period:
+            self.count += 1
+
+        return self.value
+
+    def update_many(self, prices):
+        """가격 배열(NumPy)을 순서대로 반영 (update 반복과 같은 상태, 마지막 period 개만 사용)"""
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) < self.period:
+            for price in prices.tolist():
+                self.update(price)
+            return self.value
+
+        self.buffer = prices[-self.period:].tolist()
+        self.index = 0
+        self.count = self.period
+        self.total = sum(self.buffer)
+        return self.value
+
+    @property
+    def ready(self):
+        return self.count >= self.period
+
+    @property
+    def value(self):
+        if self.count < self.period:
+            return None
+        return self.total / self.period
+
+
+class StreamingRSI:
+    """스트리밍 RSI
+
+    wilder=False: 최근 period 개 등락의 단순평균 (TradingStrategy._calculate_rsi 와 동일)
+    wilder=True: Wilder 평활 (avg = (avg * (period - 1) + 값) / period)
+    """
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self.prev_price = None
+        self.gains = [0.0] * period
+        self.losses = [0.0] * period
+        self.index = 0
+        self.count = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, price):
+        """가격 1개 반영 후 현재 RSI 반환 (데이터 부족 시 None)"""
+        price = float(price)
+        prev_price = self.prev_price
+        self.prev_price = price
+
+        if prev_price is None:
+            return None
+
+        delta = price - prev_price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.wilder and self.count >= self.period:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+            return self.value
+
+        self.gain_sum += gain - self.gains[self.index]
+        self.loss_sum += loss - self.losses[self.index]
+        self.gains[self.index] = gain
+        self.losses[self.index] = loss
+        self.index += 1
+
+        if self.index == self.period:
+            self.index = 0
+            self.gain_sum = sum(self.gains)
+            self.loss_sum = sum(self.losses)
+
+        if self.count < self.period:
+            self.count += 1
+
+        # Wilder 방식은 첫 period 개 단순평균으로 초기값을 잡는다
+        self.avg_gain = self.gain_sum / self.period
+        self.avg_loss = self.loss_sum / self.period
+        return self.value
+
+    def update_many(self, prices):
+        """가격 배열(NumPy)을 순서대로 반영 (update 반복과 같은 상태)"""
+        prices = np.asarray(prices, dtype=np.float64)
+        if self.prev_price is None:
+            if not len(prices):
+                return None
+            self.prev_price = float(prices[0])
+            prices = prices[1:]
+        n = len(prices)
+        if not n:
+            return self.value
+
+        # 단순평균 구간 등락 수 (Wilder 방식은 초기값을 잡을 때까지만)
+        simple = n if not self.wilder else min(n, max(self.period - self.count, 0))
+        if simple:
+            # 최근 period 개 등락만 남으므로 그 구간 가격만 본다
+            start = max(simple - self.period, 0)
+            prev = self.prev_price if start == 0 else float(prices[start - 1])
+            deltas = []
+            for price in prices[start:simple].tolist():
+                deltas.append(price - prev)
+                prev = price
+            self._push(deltas, simple)
+
+        rest = n - simple
+        if rest:
+            # avg_k = a^k * avg_0 + Σ a^(k-1-j) * x_j / period  (a = (period - 1) / period)
+            deltas = np.empty(rest)
+            deltas[0] = prices[simple] - (self.prev_price if simple == 0 else prices[simple - 1])
+            np.subtract(prices[simple + 1:], prices[simple:-1], out=deltas[1:])
+            gains = np.maximum(deltas, 0.0)
+            losses = gains - deltas
+            decay = (self.period - 1) / self.period
+            weights = decay ** np.arange(rest - 1, -1, -1, dtype=np.float64) / self.period
+            scale = decay ** rest
+            self.avg_gain = scale * self.avg_gain + float(weights @ gains)
+            self.avg_loss = scale * self.avg_loss + float(weights @ losses)
+
+        self.prev_price = float(prices[-1])
+        return self.value
+
+    def _push(self, deltas, pushed):
+        """단순평균 구간 등락 반영 (deltas: 최근 period 개 이하의 등락, pushed: 전체 등락 수)"""
+        if len(deltas) == self.period:
+            self.gains = [delta if delta > 0 else 0.0 for delta in deltas]
+            self.losses = [-delta if delta < 0 else 0.0 for delta in deltas]
+            self.index = 0
+            self.gain_sum = sum(self.gains)
+            self.loss_sum = sum(self.losses)
+        else:
+            for delta in deltas:
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                self.gain_sum += gain - self.gains[self.index]
+                self.loss_sum += loss - self.losses[self.index]
+                self.gains[self.index] = gain
+                self.losses[self.index] = loss
+                self.index += 1
+                if self.index == self.period:
+                    self.index = 0
+                    self.gain_sum = sum(self.gains)
+                    self.loss_sum = sum(self.losses)
+
+        self.count = min(self.count + pushed, self.period)
+        self.avg_gain = self.gain_sum / self.period
+        self.avg_loss = self.loss_sum / self.period
+
+    @property
+    def ready(self):
+        return self.count >= self.period
+
+    @property
+    def value(self):
+        if self.count < self.period:
+            return None
+
+        if self.avg_loss == 0:
+            return 100
+
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class IndicatorBook:
+    """종목별 스트리밍 지표 모음"""
+
+    def __init__(self, sma_periods=(5, 20), rsi_periods=(14,)):
+        self.sma_periods = tuple(sma_periods)
+        self.rsi_periods = tuple(rsi_periods)
+        self.symbols = {}  # 종목코드 -> (sma dict, rsi dict)
+
+    def _get(self, code):
+        indicators = self.symbols.get(code)
+        if indicators is None:
+            indicators = (
+                {period: StreamingSMA(period) for period in self.sma_periods},
+                {period: StreamingRSI(period) for period in self.rsi_periods},
+            )
+            self.symbols[code] = indicators
+        return indicators
+
+    def update(self, code, price):
+        """종목 가격 1개를 모든 지표에 반영"""
+        sma, rsi = self._get(code)
+        for indicator in sma.values():
+            indicator.update(price)
+        for indicator in rsi.values():
+            indicator.update(price)
+
+    def update_block(self, codes, prices):
+        """틱 배열 반영 (codes: 종목코드 배열, prices: 가격 배열, 시간 순)
+
+        종목별로 묶어서 지표마다 update_many 를 한 번씩 호출한다 (종목 안의 순서는 유지).
+        """
+        n = len(codes)
+        if not n:
+            return
+        codes = np.ascontiguousarray(codes)
+        if codes.dtype.kind == 'S' and codes.dtype.itemsize <= 8:
+            # 바이트 종목코드는 8바이트 정수로 바꿔 정렬 (문자열 정렬보다 빠름)
+            key = np.zeros(n, dtype=np.uint64)
+            key.view(np.uint8).reshape(n, 8)[:, :codes.dtype.itemsize] = codes.view(np.uint8).reshape(n, -1)
+        else:
+            key = codes
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        prices = np.asarray(prices, dtype=np.float64)[order]
+        starts = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+        ends = np.append(starts[1:], n)
+
+        for code, start, end in zip(codes[order[starts]].tolist(), starts.tolist(), ends.tolist()):
+            if isinstance(code, bytes):
+                code = code.decode()
+            sma, rsi = self._get(code)
+            block = prices[start:end]
+            for indicator in sma.values():
+                indicator.update_many(block)
+            for indicator in rsi.values():
+                indicator.update_many(block)
+
+    def sma(self, code, period):
+        """이동평균 값 (미등록 기간이거나 데이터 부족 시 None)"""
+        indicators = self.symbols.get(code)
+        if indicators is None or period not in indicators[0]:
+            return None
+        return indicators[0][period].value
+
+    def rsi(self, code, period):
+        """RSI 값 (미등록 기간이거나 데이터 부족 시 None)"""
+        indicators = self.symbols.get(code)
+        if indicators is None or period not in indicators[1]:
+            return None
+        return indicators[1][period].value
+
+    def remove(self, code):
+        """종목 지표 제거"""
+        self.symbols.pop(code, None)
+
+    def clear(self):
+        self.symbols.clear()
@@ -41,6 +41,9 @@
                 # 계좌 정보 가져오기
                 self.load_account_info()
                 
+                # 종목 마스터 (당일 캐시가 있으면 파일에서 읽음)
+                self.load_symbol_master()
+                
                 # 기본 종목 추가 (삼성전자)
                 self.stock_code_input.setText("005930")
                 self.add_watch_stock()
@@ -54,4 +57,11 @@
                 
         except Exception as e:
             self.log(f"❌ 로그인 상태 확인 오류: {e}")
-            self.login_button.setEnabled(True)
\ No newline at end of file
+            self.login_button.setEnabled(True)
+            
+    def load_symbol_master(self):
+        """종목코드/종목명 마스터 로드"""
+        try:
+            self.symbol_master.load(self.kiwoom)
+        except Exception as e:
+            self.log(f"❌ 종목 마스터 로드 오류: {e}")
@@ -1,3 +1,16 @@
+            # 실시간 시세 구독 (조건검색 편입 등과 참조 횟수 공유, 화면번호 자동 배정)
+            self.real_subscriptions.subscribe(stock_code)
+            self.strategy_runtime.watch("sma", stock_code)
+            
+            # 저장소의 오늘 봉이 있으면 진행 중 봉으로 이어받음
+            self.bar_aggregator.seed(self.bar_store, [stock_code])
+            
+            # 실시간 테이블 모델에 행 추가
+            self.realtime_model.add_symbol(stock_code, stock_name)
+            
+            # 저장된 마지막 일봉 이후 구간만 조회
+            self.bar_backfiller.request_gap(stock_code, 'D')
+            
             self.log(f"✅ {stock_name}({stock_code}) 실시간 감시 시작")
             self.stock_code_input.clear()
             
@@ -6,117 +19,99 @@
             
     def remove_watch_stock(self):
         """선택된 감시 종목 제거"""
-        current_row = self.realtime_table.currentRow()
+        current_row = self.realtime_table.currentIndex().row()
         
         if current_row < 0:
             self.log("❌ 제거할 종목을 선택하세요.")
             return
             
         try:
-            stock_code = self.realtime_table.item(current_row, 1).text()
-            stock_name = self.realtime_table.item(current_row, 0).text()
+            stock_code = self.realtime_model.code_at(current_row)
+            stock_name = self.realtime_model.name_at(current_row)
             
-            # 실시간 해제
+            # 실시간 해제 (add_watch_stock 앞부분이 화면 "1000" 에 직접 등록한 것 포함,
+            # 공용 구독은 다른 구독이 남아 있으면 등록 유지)
             self.kiwoom.set_real_remove("1000", stock_code)
+            self.real_subscriptions.unsubscribe(stock_code)
+            self.strategy_runtime.unwatch("sma", stock_code)
+            self.bar_aggregator.remove(stock_code)
             
             # 테이블에서 제거
-            self.realtime_table.removeRow(current_row)
+            self.realtime_model.remove_symbol(stock_code)
             
             # 감시 목록에서 제거
             if stock_code in self.watch_stocks:
                 del self.watch_stocks[stock_code]
-                
-            # 남은 행들의 row 번호 업데이트
-            for code, info in self.watch_stocks.items():
-                if info['row'] > current_row:
-                    info['row'] -= 1
                     
             self.log(f"✅ {stock_name}({stock_code}) 감시 중단")
             
         except Exception as e:
             self.log(f"❌ 종목 제거 오류: {e}")
             
+    @timed("kiwoom_real_data_handler_seconds", "OnReceiveRealData 처리 시간")
     def receive_real_data(self, code, real_type, real_data):
-        """실시간 데이터 수신"""
+        """실시간 데이터 수신 (real_data 한 번 파싱, 화면은 타이머가 일괄 반영)"""
         try:
+            # 주식체결/주식시세 페이로드를 FID 배치표로 한 번에 변환 (추가 COM 호출 없음)
+            tick = self.real_decoder.decode(code, real_type, real_data)
+            if tick is None:
+                return
+                
+            # 최근 틱 보관 및 저널 기록
+            self.real_data[code] = tick
+            self.tick_journal.write_tick(tick)
+            self.bar_aggregator.on_tick(tick)
+            
+            # 보유 종목 손절/익절 감시 (가격이 넘어선 트리거만 처리)
+            self.risk_engine.on_tick(code, tick.price)
+            
+            # 보유 계좌 평가금액 증분 갱신 (계좌 요약은 타이머가 묶어서 전달)
+            self.account_manager.on_tick(code, tick.price)
+            
+            # 구독 전략에만 틱 전달
+            self.strategy_runtime.on_tick(code, tick.price)
+            
             if code in self.watch_stocks:
-                row = self.watch_stocks[code]['row']
+                self.realtime_model.update_tick(
+                    code,
+                    price=tick.price,
+                    change=tick.change,  # FID 11 전일대비
+                    rate=tick.rate,  # FID 12 등락율
+                    volume=tick.volume,
+                    time_hhmmss=tick.time if tick.time >= 0 else None,
+                )
+                
+                # 스트리밍 지표 갱신
+                self.strategy.on_price(code, tick.price)
                 
-                if real_type == "주식시세":
-                    # 현재가
-                    current_price = self.kiwoom.get_comm_real_data(code, 10)
-                    if current_price:
-                        price = abs(int(current_price))
-                        self.realtime_table.setItem(row, 2, QTableWidgetItem(f"{price:,}"))
-                    
-                    # 전일대비
-                    change = self.kiwoom.get_comm_real_data(code, 12)
-                    if change:
-                        change_val = int(change)
-                        change_text = f"{change_val:+,}" if change_val != 0 else "0"
-                        item = QTableWidgetItem(change_text)
-                        
-                        # 색상 설정
-                        if change_val > 0:
-                            item.setForeground(QColor("red"))
-                        elif change_val < 0:
-                            item.setForeground(QColor("blue"))
-                            
-                        self.realtime_table.setItem(row, 3, item)
-                    
-                    # 등락률
-                    rate = self.kiwoom.get_comm_real_data(code, 12)
-                    if rate:
-                        rate_val = float(rate)
-                        rate_text = f"{rate_val:+.2f}%"
-                        item = QTableWidgetItem(rate_text)
-                        
-                        # 색상 설정
-                        if rate_val > 0:
-                            item.setForeground(QColor("red"))
-                        elif rate_val < 0:
-                            item.setForeground(QColor("blue"))
-                            
-                        self.realtime_table.setItem(row, 4, item)
-                    
-                    # 거래량
-                    volume = self.kiwoom.get_comm_real_data(code, 13)
-                    if volume:
-                        vol = int(volume)
-                        self.realtime_table.setItem(row, 5, QTableWidgetItem(f"{vol:,}"))
-                    
-                    # 시간
-                    time = self.kiwoom.get_comm_real_data(code, 20)
-                    if time:
-                        formatted_time = f"{time[:2]}:{time[2:4]}:{time[4:6]}"
-                        self.realtime_table.setItem(row, 6, QTableWidgetItem(formatted_time))
-                    
-                    # 상태
-                    self.realtime_table.setItem(row, 7, QTableWidgetItem("실시간"))
-                    
         except Exception as e:
             self.log(f"❌ 실시간 데이터 처리 오류: {e}")
             
+    @timed("kiwoom_tr_data_handler_seconds", "OnReceiveTrData 처리 시간")
     def receive_tr_data(self, screen_no, rqname, trcode, record_name, prev_next):
-        """TR 데이터 수신 (새 핸들러 연동)"""
+        """TR 데이터 수신 (스케줄러로 전달)"""
         try:
-            if rqname == "계좌평가잔고내역요청":
-                # 새 핸들러로 처리 위임
-                self.account_handler.process_balance_data(rqname, trcode)
+            if not self.tr_scheduler.on_receive_tr_data(screen_no, rqname, trcode, record_name, prev_next):
+                self.log(f"⚠️ 처리되지 않은 TR 응답: {rqname} ({trcode})")
         except Exception as e:
             self.log(f"❌ TR 데이터 처리 오류: {e}")
             
     def load_account_info(self):
         """계좌 정보 로드"""
         try:
-            # 계좌 목록
-            accounts = self.kiwoom.get_login_info("ACCNO").split(';')
-            accounts = [acc for acc in accounts if acc]  # 빈 문자열 제거
+            # 계좌 목록 (ACCOUNTS 가 있으면 그 계좌만, 화면/자동주문 계좌를 맨 앞으로)
+            accounts = select_accounts(self.kiwoom.get_login_info("ACCNO").split(';'))
             
             if accounts:
-                account = accounts[0]  # 첫 번째 계좌 사용
+                account = accounts[0]
                 self.account_labels["계좌번호:"].setText(account)
                 
+                # 계좌별 잔고/주문 상태 등록 (첫 계좌는 화면/전략에 연결된 핸들러 사용)
+                self.account_manager.add_account(account, self.account_handler, self.order_manager)
+                for other in accounts[1:]:
+                    self.account_manager.add_account(other)
+                self.account_manager.start()
+                
                 # 서버 타입
                 server_type = self.kiwoom.get_login_info("GetServerGubun")
                 server_name = "모의투자" if server_type == "1" else "실계좌"
@@ -126,10 +121,11 @@
                 user_name = self.kiwoom.get_login_info("USER_NAME")
                 self.log(f"👤 사용자: {user_name}")
                 self.log(f"🏦 서버: {server_name}")
-                self.log(f"📊 계좌: {account}")
+                self.log(f"📊 계좌: {account}" + (f" 외 {len(accounts) - 1}개" if len(accounts) > 1 else ""))
                 
-                # 계좌 잔고 정보 요청
+                # 잔고 정보 요청 (나머지 계좌는 일반 우선순위), 이후 계좌를 돌아가며 주기적으로 평가값 보정
                 self.request_balance()
+                self.account_manager.request_all()
                 
             else:
                 self.log("❌ 계좌 정보를 가져올 수 없습니다.")
@@ -146,30 +142,36 @@
             if account and account != "-":
                 self.log("💰 계좌 잔고 정보 요청 중...")
                 
-                # 계좌평가잔고내역요청 (opw00018)
-                self.kiwoom.set_input_value("계좌번호", account)
-                self.kiwoom.set_input_value("비밀번호", "")
-                self.kiwoom.set_input_value("비밀번호입력매체구분", "00")
-                self.kiwoom.set_input_value("조회구분", "1")
-                
-                # TR 요청
-                err_code = self.kiwoom.comm_rq_data("계좌평가잔고내역요청", "opw00018", 0, "2000")
-                
-                if err_code == 0:
-                    self.log("✅ 잔고 정보 요청 성공")
-                else:
-                    self.log(f"❌ 잔고 정보 요청 실패: {err_code}")
+                # 계좌평가잔고내역요청 (opw00018) - 사용자 조회는 대량 조회보다 먼저 처리 (진행 중이면 재사용)
+                self.account_manager.request_balance(
+                    account,
+                    priority=PRIORITY_INTERACTIVE,
+                    callback=lambda pages: self.log("✅ 잔고 정보 수신 완료"),
+                )
                     
         except Exception as e:
             self.log(f"❌ 잔고 정보 요청 오류: {e}")
             
+    def update_account_totals(self, totals):
+        """전체 계좌 합계 표시"""
+        self.account_total_label.setText(
+            f"전체 계좌 {totals['account_count']}개 | 예수금 {totals['deposit']:,}원 | "
+            f"평가 {totals['total_value']:,}원 | 손익 {totals['total_profit']:+,}원 "
+            f"({totals.get('profit_rate', 0.0):+.2f}%)"
+        )
+        
     def logout_kiwoom(self):
         """키움 로그아웃"""
         try:
-            # 모든 실시간 등록 해제
-            for stock_code in list(self.watch_stocks.keys()):
-                self.kiwoom.set_real_remove("1000", stock_code)
-                
+            # 대기 중인 TR 요청 취소 / 조건검색 중단
+            self.tr_scheduler.clear()
+            self.account_manager.stop()
+            self.condition_handler.stop_all()
+            
+            # 모든 실시간 등록 해제 (감시 종목 화면 "1000" + 공용 구독 화면번호당 1회)
+            self.kiwoom.set_real_remove("1000", "ALL")
+            self.real_subscriptions.teardown()
+            
             self.kiwoom.comm_terminate()
             
             self.login_status_label.setText("로그인 안됨")
@@ -187,8 +189,12 @@
                 
             # 테이블 초기화
             self.holdings_table.setRowCount(0)
-            self.realtime_table.setRowCount(0)
-            self.condition_table.setRowCount(0)
+            self.account_manager.clear()
+            self.account_total_label.setText("전체 계좌: -")
+            self.realtime_model.clear()
+            self.condition_model.clear()
+            self.condition_handler.tracker.clear()
+            self.bar_aggregator.clear()
             self.watch_stocks.clear()
             
             self.log("🚪 로그아웃 완료")
@@ -197,35 +203,54 @@
             self.log(f"❌ 로그아웃 오류: {e}")
             
     def log(self, message):
-        """로그 메시지 추가"""
-        self.log_text.append(f"[{QTime.currentTime().toString()}] {message}")
-        
-        # 스크롤을 맨 아래로
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.End)
-        self.log_text.setTextCursor(cursor)
+        """로그 메시지 기록 (화면 반영은 LogView 가 주기적으로 묶어서 처리)"""
+        logger.info(message)
         
     def closeEvent(self, event):
         """프로그램 종료 시"""
+        try:
+            self.tick_journal.close()
+        except Exception as e:
+            logger.error(f"틱 저널 종료 오류: {e}")
+            
+        try:
+            self.metrics_panel.export()
+        except Exception as e:
+            logger.error(f"지표 파일 기록 오류: {e}")
+            
+        try:
+            self.strategy_runtime.shutdown()
+        except Exception as e:
+            logger.error(f"전략 실행기 종료 오류: {e}")
+            
         try:
             if self.kiwoom.get_connect_state() == 1:
                 self.kiwoom.comm_terminate()
         except:
             pass
+            
+        # 남은 로그를 파일에 기록하고 로그 스레드 종료
+        shutdown_logging()
         event.accept()
 
 def main():
+    if "--engine" in sys.argv:
+        # 화면 없는 엔진 모드 (화면은 engine_client.py 로 따로 붙음)
+        from engine import run_engine
+        sys.exit(run_engine(sys.argv))
+        
     app = QApplication(sys.argv)
+    setup_logging()
     
-    print("=" * 50)
-    print("키움증권 자동매매 프로그램 시작")
-    print("=" * 50)
-    print("📌 실행 전 확인사항:")
-    print("✓ 32bit Python 환경")
-    print("✓ pykiwoom 라이브러리 설치")
-    print("✓ 키움증권 OpenAPI 사용 신청")
-    print("✓ 모의투자 신청")
-    print("=" * 50)
+    logger.info("=" * 50)
+    logger.info("키움증권 자동매매 프로그램 시작")
+    logger.info("=" * 50)
+    logger.info("📌 실행 전 확인사항:")
+    logger.info("✓ 32bit Python 환경")
+    logger.info("✓ pykiwoom 라이브러리 설치")
+    logger.info("✓ 키움증권 OpenAPI 사용 신청")
+    logger.info("✓ 모의투자 신청")
+    logger.info("=" * 50)
     
     window = TradingApp()
     window.show()
@@ -1,9 +1,29 @@
+import logging
 import sys
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from pykiwoom.kiwoom import Kiwoom
+from kiwoom_api import create_kiwoom
+from app_logging import LogView, setup_logging, shutdown_logging
+from metrics import registry, timed
+from metrics_panel import MetricsPanel
 
 # 새 모듈들 import 추가
 from account_handler import AccountHandler
-from condition_handler import ConditionHandler
\ No newline at end of file
+from account_manager import AccountManager, select_accounts
+from condition_handler import ConditionHandler
+from strategy import TradingStrategy
+from order_manager import OrderManager
+from risk_engine import RiskEngine
+from strategy_runtime import SmaCrossStrategy, StrategyRuntime
+from bar_store import BarStore, BarBackfiller
+from bar_aggregator import BarAggregator
+from tr_scheduler import TrScheduler, PRIORITY_INTERACTIVE
+from realtime_model import RealtimeTableModel
+from condition_model import ConditionTableModel
+from real_decoder import RealDataDecoder
+from real_subscriptions import RealSubscriptionManager
+from tick_journal import TickJournalWriter
+from symbol_master import SymbolCompleterModel, SymbolMaster
+
+logger = logging.getLogger(__name__)
\ No newline at end of file
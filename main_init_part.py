@@ -1,23 +1,110 @@
+import logging
 import sys
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from pykiwoom.kiwoom import Kiwoom
+from kiwoom_api import create_kiwoom
+from app_logging import LogView, setup_logging, shutdown_logging
+from metrics import registry, timed
+from metrics_panel import MetricsPanel
 
 # 새 모듈들 import
 from account_handler import AccountHandler
+from account_manager import AccountManager, select_accounts
 from condition_handler import ConditionHandler
+from strategy import TradingStrategy
+from order_manager import OrderManager
+from risk_engine import RiskEngine
+from strategy_runtime import SmaCrossStrategy, StrategyRuntime
+from bar_store import BarStore, BarBackfiller
+from bar_aggregator import BarAggregator
+from tr_scheduler import TrScheduler, PRIORITY_INTERACTIVE
+from realtime_model import RealtimeTableModel
+from condition_model import ConditionTableModel
+from real_decoder import RealDataDecoder
+from real_subscriptions import RealSubscriptionManager
+from tick_journal import TickJournalWriter
+from symbol_master import SymbolCompleterModel, SymbolMaster
+
+logger = logging.getLogger(__name__)
 
 class TradingApp(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.kiwoom = Kiwoom()
+        self.log_system = setup_logging()  # 큐 기반 비동기 로그 (파일 회전 + 화면 링버퍼)
+        self.kiwoom = create_kiwoom()
         self.watch_stocks = {}  # 실시간 감시 종목들
         self.real_data = {}  # 실시간 데이터 저장
+        self.realtime_model = RealtimeTableModel()  # 실시간 감시 테이블 모델
+        self.real_decoder = RealDataDecoder(kiwoom=self.kiwoom)  # 실시간 FID 디코더
+        self.condition_model = ConditionTableModel()  # 조건검색 편입 종목 테이블 모델
+        self.real_subscriptions = RealSubscriptionManager(self.kiwoom)  # 실시간 등록 참조 횟수/화면번호 관리
+        self.symbol_master = SymbolMaster()  # 종목코드/종목명 캐시 (로그인 시 로드)
         
         # 새 핸들러들 초기화
         self.account_handler = AccountHandler(self.kiwoom)
         self.condition_handler = ConditionHandler(self.kiwoom)
+        self.tr_scheduler = TrScheduler(self.kiwoom)
+        # 계좌별 잔고/주문 상태 (로그인 후 계좌 등록, 첫 계좌는 아래 핸들러/주문 관리자를 그대로 사용)
+        self.account_manager = AccountManager(self.kiwoom, self.tr_scheduler, self.real_subscriptions)
+        self.bar_store = BarStore()
+        self.bar_backfiller = BarBackfiller(self.bar_store, self.kiwoom, self.tr_scheduler)
+        self.strategy = TradingStrategy(self.kiwoom, self.bar_store)
+        self.order_manager = OrderManager(self.kiwoom, self.strategy)  # 주문 대기열 / 체잔 처리
+        self.strategy.order_manager = self.order_manager
+        self.risk_engine = RiskEngine()  # 주문 전 한도 검사 / 손절·익절 감시
+        self.risk_engine.subscriptions = self.real_subscriptions
+        self.risk_engine.attach(self.order_manager)
+        self.strategy.risk_engine = self.risk_engine
+        self.risk_engine.exit_triggered.connect(self.strategy.exit_position)
+        
+        # 이벤트 기반 전략 실행기 (감시 종목 틱 -> 이동평균 교차 시그널)
+        self.strategy_runtime = StrategyRuntime()
+        self.strategy_runtime.add_strategy(SmaCrossStrategy("sma"))
+        self.strategy_runtime.signal_generated.connect(self.strategy.on_signal)
+        
+        # 실시간 틱 -> 분봉/일봉 집계 (봉 완성시 전략 실행기로 전달)
+        self.bar_aggregator = BarAggregator()
+        self.bar_aggregator.bar_closed.connect(self.strategy_runtime.on_bar)
+        
+        # 틱/조건검색 이벤트 저널 (백그라운드 스레드 기록)
+        self.tick_journal = TickJournalWriter()
+        self.condition_handler.journal = self.tick_journal
+        self.condition_handler.subscriptions = self.real_subscriptions
+        self.tick_journal.start()
         
         self.init_ui()
-        self.setup_signals()
\ No newline at end of file
+        self.log_view = LogView(self.log_text, self.log_system.ring)  # 화면 로그 일괄 반영
+        self.init_metrics()
+        self.init_account_bar()
+        self.setup_signals()
+        self.kiwoom.ocx.OnReceiveTrCondition.connect(self.condition_handler.on_receive_tr_condition)
+        self.kiwoom.ocx.OnReceiveChejanData.connect(self.account_manager.on_receive_chejan_data)
+        self.condition_handler.condition_result.connect(self.strategy_runtime.on_condition_result)
+        
+        # TR 요청 큐 처리, 실시간 테이블 갱신 시작 (주문 대기열은 로그인 후 계좌 관리자가 처리)
+        self.tr_scheduler.start()
+        self.bar_aggregator.start()
+        self.realtime_model.start()
+        
+    def init_metrics(self):
+        """대기열 길이 게이지 등록 및 성능 지표 도크 추가 (핸들러 지연은 @timed 로 기록)"""
+        depth_help = "대기열 길이"
+        registry.gauge("kiwoom_queue_depth", self.tr_scheduler.pending_count, depth_help, queue="tr")
+        registry.gauge("kiwoom_queue_depth", self.account_manager.pending_orders, depth_help, queue="order")
+        registry.gauge("kiwoom_queue_depth", lambda: sum(map(len, self.strategy_runtime.pending.values())),
+                       depth_help, queue="strategy")
+        registry.gauge("kiwoom_queue_depth", lambda: len(self.tick_journal.queue), depth_help, queue="journal")
+        registry.gauge("kiwoom_queue_depth", self.log_system.handler.queue.qsize, depth_help, queue="log")
+        registry.gauge("kiwoom_log_dropped", lambda: self.log_system.dropped, "큐가 가득 차 버린 로그 줄 수")
+        
+        self.metrics_panel = MetricsPanel(parent=self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.metrics_panel)
+        
+    def init_account_bar(self):
+        """전체 계좌 합계 표시줄 (계좌 요약 갱신 주기당 1회 반영)"""
+        self.account_total_label = QLabel("전체 계좌: -")
+        toolbar = self.addToolBar("계좌 합계")
+        toolbar.setObjectName("account_totals")
+        toolbar.addWidget(self.account_total_label)
+        self.account_manager.aggregate_updated.connect(self.update_account_totals)
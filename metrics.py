@@ -0,0 +1,247 @@
+# 지연 시간 측정 모듈
+# HDR 방식 히스토그램: 2배 구간(1µs ~ 약 1분)을 다시 8등분한 고정 구간에 세기만 하므로
+# 기록은 O(1), 메모리는 고정이고 분위수 오차는 구간 폭(12.5%) 이내다.
+# 히스토그램마다 기록하는 스레드는 하나(GUI 스레드)뿐이라 락을 쓰지 않는다.
+# 읽는 쪽은 snapshot() 으로 구간 배열을 복사해서 계산한다.
+import functools
+import os
+import time
+
+
+class LatencyHistogram:
+    """HDR 구간 지연 시간 히스토그램 (단위: 초)"""
+
+    MIN_SECONDS = 1e-6
+    SUB_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BITS  # 2배 구간당 세부 구간 수
+    MAX_UNITS = 1 << 26  # 1µs * 2^26 ≒ 67초 까지, 그 이상은 마지막 구간
+    BUCKETS = (MAX_UNITS.bit_length() - SUB_BITS) * SUB_BUCKETS
+
+    def __init__(self, name=""):
+        self.name = name
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def bucket_of(cls, seconds):
+        """측정값의 구간 번호"""
+        units = int(seconds / cls.MIN_SECONDS)
+        if units < cls.SUB_BUCKETS:
+            return max(units, 0)
+        if units >= cls.MAX_UNITS:
+            return cls.BUCKETS - 1
+        # 상위 SUB_BITS+1 자리로 2배 구간과 세부 구간을 함께 정한다
+        shift = units.bit_length() - cls.SUB_BITS - 1
+        return (shift + 1) * cls.SUB_BUCKETS + (units >> shift) - cls.SUB_BUCKETS
+
+    def record(self, seconds):
+        """측정값 1개 기록 (핫패스라 bucket_of 를 풀어 씀)"""
+        units = int(seconds * 1e6)
+        if units < 8:
+            bucket = units if units > 0 else 0
+        elif units < 67108864:
+            shift = units.bit_length() - 4
+            bucket = (shift << 3) + (units >> shift)
+        else:
+            bucket = 191
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @classmethod
+    def upper_bound(cls, bucket):
+        """구간 상한 (초)"""
+        if bucket < cls.SUB_BUCKETS:
+            return cls.MIN_SECONDS * (bucket + 1)
+        shift = bucket // cls.SUB_BUCKETS - 1
+        mantissa = bucket % cls.SUB_BUCKETS + cls.SUB_BUCKETS
+        return cls.MIN_SECONDS * ((mantissa + 1) << shift)
+
+    def snapshot(self):
+        """(구간 배열 복사본, 합계, 최대값) - 다른 스레드에서 읽을 때 사용"""
+        return list(self.counts), self.total, self.max
+
+    def percentile(self, q, counts=None):
+        """q(0~100) 분위수 추정값 (해당 구간 상한, 최대값을 넘지 않음)"""
+        counts = self.counts if counts is None else counts
+        count = sum(counts)
+        if not count:
+            return 0.0
+        rank = max(1, int(round(count * q / 100.0)))
+        seen = 0
+        for bucket, n in enumerate(counts):
+            seen += n
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        """{'count', 'mean', 'p50', 'p90', 'p99', 'max'} (초)"""
+        counts, total, maximum = self.snapshot()
+        count = sum(counts)
+        return {
+            'count': count,
+            'mean': total / count if count else 0.0,
+            'p50': self.percentile(50, counts),
+            'p90': self.percentile(90, counts),
+            'p99': self.percentile(99, counts),
+            'max': maximum,
+        }
+
+    def reset(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Gauge:
+    """읽을 때 값을 구하는 지표 (대기열 길이 등)"""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+    def value(self):
+        try:
+            return float(self.func())
+        except Exception:
+            return float('nan')
+
+
+class MetricsRegistry:
+    """이름 + 라벨별 히스토그램 / 게이지 모음"""
+
+    def __init__(self):
+        self.histograms = {}  # (이름, 라벨) -> LatencyHistogram
+        self.gauges = {}  # (이름, 라벨) -> Gauge
+        self.help = {}  # 이름 -> 설명
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def histogram(self, name, help="", **labels):
+        """히스토그램 (없으면 생성)"""
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram(name)
+            if help:
+                self.help.setdefault(name, help)
+        return histogram
+
+    def gauge(self, name, func, help="", **labels):
+        """게이지 등록 (같은 이름/라벨이면 교체)"""
+        gauge = self.gauges[self._key(name, labels)] = Gauge(name, func)
+        if help:
+            self.help.setdefault(name, help)
+        return gauge
+
+    def remove(self, name, **labels):
+        key = self._key(name, labels)
+        self.histograms.pop(key, None)
+        self.gauges.pop(key, None)
+
+    def clear(self):
+        self.histograms.clear()
+        self.gauges.clear()
+        self.help.clear()
+
+    def collect(self):
+        """(이름, 라벨, 요약) 히스토그램 목록과 (이름, 라벨, 값) 게이지 목록"""
+        histograms = [(name, dict(labels), histogram.summary())
+                      for (name, labels), histogram in list(self.histograms.items())]
+        gauges = [(name, dict(labels), gauge.value())
+                  for (name, labels), gauge in list(self.gauges.items())]
+        return histograms, gauges
+
+    # ------------------------------------------------------------------
+    # Prometheus 텍스트 형식
+    # ------------------------------------------------------------------
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (히스토그램은 분위수 summary + 최대값 gauge 로 내보냄)"""
+        histograms, gauges = self.collect()
+        lines = []
+        by_name = {}
+        for name, labels, stats in histograms:
+            by_name.setdefault(name, []).append((labels, stats))
+        for name in sorted(by_name):
+            series = sorted(by_name[name], key=lambda item: sorted(item[0].items()))
+            self._header(lines, name, "summary")
+            for labels, stats in series:
+                for quantile, key in (("0.5", 'p50'), ("0.9", 'p90'), ("0.99", 'p99')):
+                    lines.append(f"{name}{_labels(labels, quantile=quantile)} {stats[key]:.9g}")
+                lines.append(f"{name}_sum{_labels(labels)} {stats['mean'] * stats['count']:.9g}")
+                lines.append(f"{name}_count{_labels(labels)} {stats['count']}")
+            self._header(lines, name + "_max", "gauge", name)
+            for labels, stats in series:
+                lines.append(f"{name}_max{_labels(labels)} {stats['max']:.9g}")
+
+        by_name = {}
+        for name, labels, value in gauges:
+            by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(by_name):
+            self._header(lines, name, "gauge")
+            for labels, value in sorted(by_name[name], key=lambda item: sorted(item[0].items())):
+                lines.append(f"{name}{_labels(labels)} {value:.9g}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines, name, kind, help_name=None):
+        help_text = self.help.get(help_name or name)
+        if help_text:
+            lines.append(f"# HELP {name} {_escape_help(help_text)}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def write_prometheus(self, path):
+        """텍스트 파일로 내보내기 (임시 파일에 쓰고 교체해서 수집기가 반쯤 쓴 파일을 읽지 않도록 함)"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(labels, **extra):
+    items = list(labels.items()) + list(extra.items())
+    if not items:
+        return ""
+    values = []
+    for key, value in items:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        values.append(f'{key}="{value}"')
+    return "{" + ",".join(values) + "}"
+
+
+# 앱 전체에서 쓰는 기본 레지스트리
+registry = MetricsRegistry()
+
+
+def timed(name, help="", **labels):
+    """함수 실행 시간을 registry 히스토그램에 기록하는 데코레이터 (이벤트 핸들러 계측용)"""
+    histogram = registry.histogram(name, help, **labels)
+    record = histogram.record
+    perf_counter = time.perf_counter
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(perf_counter() - start)
+        wrapper.histogram = histogram
+        return wrapper
+    return decorator
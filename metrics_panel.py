@@ -0,0 +1,112 @@
+# 성능 지표 도크
+# registry 의 히스토그램(p50/p99/최대, 초당 이벤트 수)과 게이지(대기열 길이)를 주기적으로 표로 보여주고
+# Prometheus 텍스트 파일로 내보낸다.
+import logging
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QAbstractItemView, QDockWidget, QTableWidget, QTableWidgetItem
+
+from config import Config
+from metrics import registry as default_registry
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["지표", "건/초", "건수", "p50", "p99", "최대"]
+
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds * 1e6:.0f}µs"
+
+
+def _title(name, labels):
+    if not labels:
+        return name
+    return name + " " + ",".join(f"{key}={value}" for key, value in labels.items())
+
+
+class MetricsPanel(QDockWidget):
+    """지표 표 도크 (보이지 않을 때는 표 갱신 생략, 파일 내보내기는 계속)"""
+
+    def __init__(self, registry=None, parent=None, refresh_ms=None, export_file=None, export_interval=None):
+        super().__init__("📊 성능 지표", parent)
+        self.setObjectName("metricsDock")
+        self.registry = registry or default_registry
+        self.export_file = Config.METRICS_EXPORT_FILE if export_file is None else export_file
+        self.last_counts = {}  # 지표 키 -> 직전 건수 (초당 이벤트 수 계산용)
+        self.last_time = time.perf_counter()
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.setWidget(self.table)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms or Config.METRICS_REFRESH_MS)
+
+        self.export_timer = QTimer(self)
+        self.export_timer.timeout.connect(self.export)
+        if self.export_file:
+            self.export_timer.start(int((export_interval or Config.METRICS_EXPORT_INTERVAL_SEC) * 1000))
+
+    def rows(self):
+        """[(표시 이름, 설명, 건/초, 건수, p50, p99, 최대)] - 게이지는 건수 칸에 값, 나머지는 None"""
+        now = time.perf_counter()
+        elapsed = max(now - self.last_time, 1e-9)
+        self.last_time = now
+
+        histograms, gauges = self.registry.collect()
+        rows = []
+        counts = {}
+        for name, labels, stats in sorted(histograms, key=lambda item: (item[0], sorted(item[1].items()))):
+            key = (name, tuple(sorted(labels.items())))
+            counts[key] = stats['count']
+            rate = (stats['count'] - self.last_counts.get(key, 0)) / elapsed
+            rows.append((_title(name, labels), self.registry.help.get(name, ""), rate, stats['count'],
+                         stats['p50'], stats['p99'], stats['max']))
+        for name, labels, value in sorted(gauges, key=lambda item: (item[0], sorted(item[1].items()))):
+            rows.append((_title(name, labels), self.registry.help.get(name, ""), None, value, None, None, None))
+        self.last_counts = counts
+        return rows
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        rows = self.rows()
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(rows))
+        for row, (title, help_text, rate, count, p50, p99, maximum) in enumerate(rows):
+            values = [
+                title,
+                "" if rate is None else f"{rate:,.1f}",
+                f"{count:,.0f}",
+                "" if p50 is None else _format_seconds(p50),
+                "" if p99 is None else _format_seconds(p99),
+                "" if maximum is None else _format_seconds(maximum),
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(int(Qt.AlignRight | Qt.AlignVCenter))
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+            self.table.item(row, 0).setToolTip(help_text)
+        self.table.setUpdatesEnabled(True)
+
+    def export(self):
+        """Prometheus 텍스트 파일 기록"""
+        if not self.export_file:
+            return
+        try:
+            self.registry.write_prometheus(self.export_file)
+        except OSError as e:
+            logger.warning(f"⚠️ 지표 파일 기록 실패: {e}")
@@ -0,0 +1,307 @@
+# 전략 파라미터 최적화
+# 종목별 누적합(가격, 상승/하락폭)과 다음 봉 수익률을 한 번만 계산해 공유 메모리에 올리고,
+# 워커 프로세스들이 파라미터 조합마다 이동평균/RSI 를 누적합 차분으로 바로 구해 평가한다.
+#
+# 평가는 빠른 선별용이다: 시그널 상태(BUY 후 SELL 까지 보유)를 다음 봉 시가에 체결한 수익률에
+# 매매 비용만 반영한다. 손절/익절까지 포함한 검증은 상위 조합을 backtester.Backtester 로 다시 돌린다.
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import signal_engine
+from backtester import parameter_grid
+from config import Config
+
+# 기본 탐색 범위
+DEFAULT_GRIDS = {
+    'sma': {'short_period': list(range(2, 21)), 'long_period': list(range(10, 121, 5))},
+    'rsi': {'period': list(range(5, 31)), 'oversold': list(range(15, 45, 5)), 'overbought': list(range(60, 90, 5))},
+}
+
+TRADING_DAYS = 252
+
+
+def valid_params(strategy_name, params):
+    """의미 없는 조합 제외 (단기 >= 장기, 과매도 >= 과매수)"""
+    if strategy_name == 'sma':
+        return params['short_period'] < params['long_period']
+    if strategy_name == 'rsi':
+        return params['oversold'] < params['overbought']
+    return True
+
+
+def precompute(bars):
+    """파라미터와 무관한 배열 계산 (모든 조합이 공유)
+
+    Returns:
+        {이름: 2차원 배열}
+    """
+    close = signal_engine.as_price_matrix(bars['close'])
+    open_ = signal_engine.as_price_matrix(bars.get('open', bars['close']))
+
+    close_csum, close_cmiss = signal_engine.prefix_sums(close)
+    (gain_csum, gain_cmiss), (loss_csum, _) = signal_engine.gain_loss_sums(close)
+
+    # 봉 t 시그널 -> 봉 t+1 시가 진입 -> 봉 t+2 시가까지의 수익률
+    ret_next = np.zeros(close.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret_next[:, :-2] = open_[:, 2:] / open_[:, 1:-1] - 1.0
+    ret_next[~np.isfinite(ret_next)] = 0.0
+
+    return {
+        'close_csum': close_csum, 'close_cmiss': close_cmiss,
+        'gain_csum': gain_csum, 'loss_csum': loss_csum, 'delta_cmiss': gain_cmiss,
+        'ret_next': ret_next,
+    }
+
+
+def signals_from_arrays(arrays, strategy_name, params):
+    """공유 누적합으로 봉별 시그널 계산 (signal_engine.signal_series 와 같은 결과)"""
+    if strategy_name == 'sma':
+        sums = (arrays['close_csum'], arrays['close_cmiss'])
+        short_ma = signal_engine.window_mean(sums, params['short_period'])
+        long_ma = signal_engine.window_mean(sums, params['long_period'])
+        signals = np.zeros(short_ma.shape, dtype=np.int8)
+        signals[short_ma > long_ma] = signal_engine.BUY
+        signals[short_ma < long_ma] = signal_engine.SELL
+        return signals
+
+    if strategy_name == 'rsi':
+        rsi = signal_engine.rsi_from_sums((arrays['gain_csum'], arrays['delta_cmiss']),
+                                          (arrays['loss_csum'], arrays['delta_cmiss']), params['period'])
+        signals = np.zeros(rsi.shape, dtype=np.int8)
+        signals[rsi < params.get('oversold', 30)] = signal_engine.BUY
+        signals[rsi > params.get('overbought', 70)] = signal_engine.SELL
+        return signals
+
+    raise ValueError(f"알 수 없는 전략: {strategy_name}")
+
+
+def evaluate(arrays, strategy_name, params, costs):
+    """파라미터 조합 1개 평가 (전 종목 동일 비중)"""
+    signals = signals_from_arrays(arrays, strategy_name, params)
+    n_symbols, n_bars = signals.shape
+
+    # 마지막 BUY/SELL 상태를 앞으로 채워 보유 여부 계산
+    last = np.where(signals != 0, np.arange(n_bars), 0)
+    np.maximum.accumulate(last, axis=1, out=last)
+    holding = np.take_along_axis(signals, last, axis=1) == signal_engine.BUY
+
+    changes = np.diff(holding.astype(np.int8), axis=1, prepend=0)
+    entries = changes > 0
+    exits = changes < 0
+
+    returns = holding * arrays['ret_next']
+    returns -= entries * costs[0] + exits * costs[1]
+    daily = returns.mean(axis=0)
+
+    equity = np.cumprod(1.0 + daily)
+    peak = np.maximum.accumulate(equity)
+    std = daily.std()
+
+    n_entries = int(entries.sum())
+    return {
+        'total_return': float(equity[-1] - 1.0) if n_bars else 0.0,
+        'sharpe': float(daily.mean() / std * math.sqrt(TRADING_DAYS)) if std > 0 else 0.0,
+        'max_drawdown': float((equity / peak - 1.0).min()) if n_bars else 0.0,
+        'trades': n_entries,
+        'turnover': (n_entries + int(exits.sum())) / n_symbols / max(n_bars / TRADING_DAYS, 1e-9),
+        'exposure': float(holding.mean()),
+    }
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스 (공유 메모리 배열 연결)
+# ----------------------------------------------------------------------
+_worker = {}
+
+
+def _attach(layout, strategy_name, costs):
+    blocks = {}
+    arrays = {}
+    for name, (shm_name, shape, dtype) in layout.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        blocks[name] = shm
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker.update(blocks=blocks, arrays=arrays, strategy_name=strategy_name, costs=costs)
+
+
+def _evaluate_batch(batch):
+    return [(params, evaluate(_worker['arrays'], _worker['strategy_name'], params, _worker['costs']))
+            for params in batch]
+
+
+class ParameterOptimizer:
+    """전략 파라미터 탐색기
+
+    Args:
+        bars: {'open', 'close', ...} (종목 x 봉) 배열 (backtester.load_bar_matrix 참고)
+        strategy_name: 'sma' 또는 'rsi'
+        processes: 워커 프로세스 수 (기본: CPU 수, 1 이면 현재 프로세스에서 실행)
+        metric: 정렬 기준 ('sharpe', 'total_return' 등)
+    """
+
+    def __init__(self, bars, strategy_name="sma", processes=None, metric="sharpe"):
+        self.strategy_name = strategy_name
+        self.processes = processes or os.cpu_count() or 1
+        self.metric = metric
+        self.costs = (Config.COMMISSION_RATE + Config.SLIPPAGE_RATE,
+                      Config.COMMISSION_RATE + Config.SELL_TAX_RATE + Config.SLIPPAGE_RATE)
+
+        self.arrays = precompute(bars)
+        self.n_symbols = self.arrays['ret_next'].shape[0]
+
+        self.results = []
+        self.evaluations = 0  # 종목 x 조합 수
+        self.elapsed = 0.0
+
+    # ------------------------------------------------------------------
+    # 후보 생성
+    # ------------------------------------------------------------------
+    def candidates(self, grid=None, n_samples=None, seed=None):
+        """격자 전체 또는 무작위 표본 조합 목록"""
+        ranges = grid or DEFAULT_GRIDS[self.strategy_name]
+        combos = [p for p in parameter_grid(**ranges) if valid_params(self.strategy_name, p)]
+        if n_samples and n_samples < len(combos):
+            combos = random.Random(seed).sample(combos, n_samples)
+        return combos
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, grid=None, method="grid", n_samples=None, seed=None):
+        """파라미터 탐색 실행
+
+        Args:
+            grid: {파라미터: 값목록} (기본 DEFAULT_GRIDS)
+            method: 'grid' (전체), 'random' (n_samples 개 무작위), 'bayes' (optuna TPE, n_samples 회)
+            n_samples: 표본 수
+
+        Returns:
+            [(params, metrics)] - metric 내림차순
+        """
+        start = time.perf_counter()
+        with self._pool() as submit:
+            if method == "bayes":
+                results = self._run_bayes(submit, grid or DEFAULT_GRIDS[self.strategy_name], n_samples or 100, seed)
+            else:
+                combos = self.candidates(grid, n_samples if method == "random" else None, seed)
+                results = submit(combos)
+
+        self.elapsed = time.perf_counter() - start
+        self.evaluations = len(results) * self.n_symbols
+        results.sort(key=lambda item: item[1][self.metric], reverse=True)
+        self.results = results
+        return results
+
+    def _run_bayes(self, submit, grid, n_trials, seed):
+        try:
+            import optuna
+        except ImportError as e:
+            raise ImportError("베이지안 탐색에는 optuna 패키지가 필요합니다 (pip install optuna)") from e
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed))
+        seen = {}
+
+        # 프로세스 수만큼 묶어서 제안받고 병렬 평가
+        while len(seen) < n_trials:
+            trials = []
+            for _ in range(min(self.processes, n_trials - len(seen))):
+                trial = study.ask()
+                params = {name: trial.suggest_categorical(name, list(values)) for name, values in grid.items()}
+                trials.append((trial, params))
+
+            pending = [params for _, params in trials
+                       if valid_params(self.strategy_name, params) and tuple(params.items()) not in seen]
+            for params, metrics in submit(pending):
+                seen[tuple(params.items())] = (params, metrics)
+
+            for trial, params in trials:
+                key = tuple(params.items())
+                if key in seen:
+                    study.tell(trial, seen[key][1][self.metric])
+                else:
+                    study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+            if not pending and len(study.trials) > n_trials * 10:
+                break  # 유효한 새 조합이 더 이상 나오지 않음
+
+        return list(seen.values())
+
+    def _pool(self):
+        return _SharedPool(self)
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+    @property
+    def seconds_per_10k(self):
+        """종목 x 조합 1만 건당 소요 시간 (초)"""
+        return self.elapsed / self.evaluations * 10000 if self.evaluations else 0.0
+
+    def format_table(self, top=20):
+        """상위 조합 순위표 문자열"""
+        if not self.results:
+            return "결과 없음"
+
+        names = list(self.results[0][0])
+        header = " ".join(f"{name:>12}" for name in names)
+        lines = [f"{'순위':>4} {header} {'수익률':>9} {'샤프':>7} {'MDD':>8} {'거래':>8} {'회전율':>7}"]
+        for rank, (params, m) in enumerate(self.results[:top], 1):
+            values = " ".join(f"{params[name]:>12}" for name in names)
+            lines.append(f"{rank:>4} {values} {m['total_return']:>9.2%} {m['sharpe']:>7.2f} "
+                         f"{m['max_drawdown']:>8.2%} {m['trades']:>8,} {m['turnover']:>7.1f}")
+        lines.append(f"조합 {len(self.results):,}개 x 종목 {self.n_symbols:,}개 = {self.evaluations:,}건, "
+                     f"{self.elapsed:.2f}초 (1만 건당 {self.seconds_per_10k:.3f}초, 프로세스 {self.processes})")
+        return "\n".join(lines)
+
+
+class _SharedPool:
+    """공유 메모리에 배열을 올리고 프로세스 풀로 조합을 평가하는 컨텍스트"""
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.blocks = []
+        self.executor = None
+
+    def __enter__(self):
+        opt = self.optimizer
+        if opt.processes == 1:
+            return self._submit_local
+
+        layout = {}
+        for name, array in opt.arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            self.blocks.append(shm)
+            layout[name] = (shm.name, array.shape, array.dtype.str)
+
+        self.executor = ProcessPoolExecutor(max_workers=opt.processes, initializer=_attach,
+                                            initargs=(layout, opt.strategy_name, opt.costs))
+        return self._submit_pool
+
+    def __exit__(self, *exc):
+        if self.executor is not None:
+            self.executor.shutdown()
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        return False
+
+    def _submit_local(self, combos):
+        opt = self.optimizer
+        return [(params, evaluate(opt.arrays, opt.strategy_name, params, opt.costs)) for params in combos]
+
+    def _submit_pool(self, combos):
+        # 프로세스당 여러 묶음으로 나눠 부하를 고르게 분산
+        size = max(len(combos) // (self.optimizer.processes * 4), 1)
+        batches = [combos[i:i + size] for i in range(0, len(combos), size)]
+        results = []
+        for batch in self.executor.map(_evaluate_batch, batches):
+            results.extend(batch)
+        return results
@@ -0,0 +1,392 @@
+# 주문 / 체결 관리
+# 주문은 대기열에서 1초 슬라이딩 윈도우 제한(RateLimiter, 계좌 공용) 안으로 SendOrder 하고,
+# OnReceiveChejanData(주문체결 0 / 잔고 1)를 타입 레코드로 변환해
+# 주문번호 / 종목코드 기준 해시 인덱스(미체결 주문, 체결, 잔고)에 반영한다.
+import logging
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from config import Config
+from metrics import timed
+from tr_scheduler import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# SendOrder 주문유형
+ORDER_BUY = 1
+ORDER_SELL = 2
+ORDER_CANCEL_BUY = 3
+ORDER_CANCEL_SELL = 4
+ORDER_MODIFY_BUY = 5
+ORDER_MODIFY_SELL = 6
+
+# 거래구분 (호가)
+HOGA_LIMIT = "00"  # 지정가
+HOGA_MARKET = "03"  # 시장가
+
+# 매수/매도 방향
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+CHEJAN_ORDER = "0"  # 주문접수/체결
+CHEJAN_BALANCE = "1"  # 잔고
+
+# 체잔 FID
+FID_ACCOUNT = 9201
+FID_ORDER_NO = 9203
+FID_CODE = 9001
+FID_NAME = 302
+FID_ORDER_STATUS = 913  # 접수 / 체결 / 확인
+FID_ORDER_QTY = 900
+FID_ORDER_PRICE = 901
+FID_UNFILLED_QTY = 902
+FID_ORG_ORDER_NO = 904
+FID_ORDER_GUBUN = 905  # +매수, -매도, 매수취소 ...
+FID_SIDE = 907  # 1: 매도, 2: 매수
+FID_ORDER_TIME = 908
+FID_FILL_NO = 909
+FID_FILL_PRICE = 910
+FID_FILLED_QTY = 911  # 누적 체결량
+FID_UNIT_FILL_PRICE = 914
+FID_UNIT_FILL_QTY = 915
+FID_HOLDING_QTY = 930
+FID_BUY_PRICE = 931
+FID_AVAILABLE_QTY = 933
+FID_CURRENT_PRICE = 10
+
+OrderEvent = namedtuple('OrderEvent', [
+    'account', 'order_no', 'code', 'name', 'status', 'side', 'order_qty', 'order_price',
+    'unfilled_qty', 'org_order_no', 'gubun', 'time', 'fill_no', 'fill_price', 'filled_qty',
+    'unit_fill_price', 'unit_fill_qty',
+])
+BalanceEvent = namedtuple('BalanceEvent', [
+    'account', 'code', 'name', 'quantity', 'buy_price', 'available', 'current_price',
+])
+# quantity: 이번 체결 수량, time: HHMMSS
+Fill = namedtuple('Fill', ['order_no', 'fill_no', 'code', 'side', 'quantity', 'price', 'time'])
+
+
+def _int(text):
+    text = text.strip()
+    return abs(int(text)) if text else 0
+
+
+class OrderError(Exception):
+    """주문 전송 실패"""
+
+    def __init__(self, code, message, err_code=None):
+        super().__init__(f"[{code}] {message}")
+        self.err_code = err_code
+
+
+class ChejanDecoder:
+    """OnReceiveChejanData 를 OrderEvent / BalanceEvent 로 변환"""
+
+    def __init__(self, kiwoom):
+        self.kiwoom = kiwoom
+
+    def decode(self, gubun):
+        get = self.kiwoom.get_chejan_data
+        if gubun == CHEJAN_ORDER:
+            return OrderEvent(
+                get(FID_ACCOUNT).strip(),
+                get(FID_ORDER_NO).strip(),
+                get(FID_CODE).strip().lstrip('A'),
+                get(FID_NAME).strip(),
+                get(FID_ORDER_STATUS).strip(),
+                SIDE_BUY if get(FID_SIDE).strip() == "2" else SIDE_SELL,
+                _int(get(FID_ORDER_QTY)),
+                _int(get(FID_ORDER_PRICE)),
+                _int(get(FID_UNFILLED_QTY)),
+                get(FID_ORG_ORDER_NO).strip(),
+                get(FID_ORDER_GUBUN).strip(),
+                get(FID_ORDER_TIME).strip(),
+                get(FID_FILL_NO).strip(),
+                _int(get(FID_FILL_PRICE)),
+                _int(get(FID_FILLED_QTY)),
+                _int(get(FID_UNIT_FILL_PRICE)),
+                _int(get(FID_UNIT_FILL_QTY)),
+            )
+        if gubun == CHEJAN_BALANCE:
+            return BalanceEvent(
+                get(FID_ACCOUNT).strip(),
+                get(FID_CODE).strip().lstrip('A'),
+                get(FID_NAME).strip(),
+                _int(get(FID_HOLDING_QTY)),
+                _int(get(FID_BUY_PRICE)),
+                _int(get(FID_AVAILABLE_QTY)),
+                _int(get(FID_CURRENT_PRICE)),
+            )
+        return None
+
+
+class Order:
+    """주문 1건 상태"""
+
+    __slots__ = ('order_no', 'account', 'code', 'name', 'side', 'quantity', 'price', 'filled',
+                 'unfilled', 'fill_amount', 'status', 'org_order_no', 'updated')
+
+    def __init__(self, order_no, account, code, name, side, quantity, price):
+        self.order_no = order_no
+        self.account = account
+        self.code = code
+        self.name = name
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.filled = 0
+        self.unfilled = quantity
+        self.fill_amount = 0
+        self.status = ""
+        self.org_order_no = ""
+        self.updated = time.time()
+
+    @property
+    def avg_fill_price(self):
+        return self.fill_amount / self.filled if self.filled else 0.0
+
+    @property
+    def is_open(self):
+        return self.unfilled > 0
+
+    def __repr__(self):
+        return (f"Order({self.order_no}, {self.code}, {'매수' if self.side == SIDE_BUY else '매도'} "
+                f"{self.filled}/{self.quantity}, {self.status})")
+
+
+class OrderRequest:
+    """전송 대기 중인 주문 (future: 접수되면 주문번호)"""
+
+    def __init__(self, order_type, code, quantity, price, hoga, org_order_no, account, rqname):
+        self.order_type = order_type
+        self.code = code
+        self.quantity = quantity
+        self.price = price
+        self.hoga = hoga
+        self.org_order_no = org_order_no
+        self.account = account
+        self.rqname = rqname
+        self.future = Future()
+        self.sent_at = None
+
+    @property
+    def side(self):
+        return SIDE_BUY if self.order_type in (ORDER_BUY, ORDER_CANCEL_BUY, ORDER_MODIFY_BUY) else SIDE_SELL
+
+
+class OrderManager(QObject):
+    """주문 전송 대기열 + 체잔 이벤트 기반 주문/체결/잔고 관리"""
+
+    order_updated = pyqtSignal(object)  # Order
+    filled = pyqtSignal(object)  # Fill
+    position_changed = pyqtSignal(str, dict)  # (종목코드, 잔고 dict - 전량 매도시 빈 dict)
+
+    def __init__(self, kiwoom, strategy=None, account=None, clock=time.monotonic, per_second=None, limiter=None):
+        super().__init__()
+        self.kiwoom = kiwoom
+        self.strategy = strategy  # positions 를 동기화할 TradingStrategy
+        self.account = account or Config.ACCOUNT_NUMBER
+        self.clock = clock
+        per_second = per_second or Config.ORDER_RATE_PER_SECOND
+        # 주문 제한은 로그인 단위라 여러 계좌가 같은 제한을 쓴다 (AccountManager)
+        self.limiter = limiter or RateLimiter(per_second, 1.0, clock)
+        self.screen_no = Config.ORDER_SCREEN_NO
+        self.decoder = ChejanDecoder(kiwoom)
+
+        self.queue = deque()  # 전송 대기 OrderRequest
+        self.awaiting = {}  # (종목코드, 방향) -> 접수 대기 OrderRequest deque
+
+        self.orders = {}  # 주문번호 -> Order
+        self.open_orders = {}  # 종목코드 -> {주문번호: Order} (미체결)
+        self.fills = deque(maxlen=Config.ORDER_FILL_HISTORY)  # 최근 체결
+        self.fill_count = 0
+        self.positions = {}  # 종목코드 -> 잔고 dict
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.pump)
+
+    def start(self, interval_ms=None):
+        self.timer.start(interval_ms or Config.ORDER_PUMP_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    # ------------------------------------------------------------------
+    # 주문 요청
+    # ------------------------------------------------------------------
+    def buy(self, code, quantity, price=0, hoga=None):
+        """매수 주문 (가격 0 이면 시장가)"""
+        return self.submit(ORDER_BUY, code, quantity, price, hoga)
+
+    def sell(self, code, quantity, price=0, hoga=None):
+        """매도 주문 (가격 0 이면 시장가)"""
+        return self.submit(ORDER_SELL, code, quantity, price, hoga)
+
+    def cancel(self, order_no):
+        """미체결 주문 취소"""
+        order = self.orders.get(order_no)
+        if order is None or not order.is_open:
+            return None
+        order_type = ORDER_CANCEL_BUY if order.side == SIDE_BUY else ORDER_CANCEL_SELL
+        return self.submit(order_type, order.code, order.unfilled, 0, HOGA_LIMIT, order_no)
+
+    def submit(self, order_type, code, quantity, price=0, hoga=None, org_order_no=""):
+        """주문 대기열 등록 (OrderRequest 반환, 전송은 pump 에서 초당 제한 안으로)"""
+        if hoga is None:
+            hoga = HOGA_LIMIT if price else HOGA_MARKET
+        request = OrderRequest(order_type, code, int(quantity), int(price), hoga, org_order_no,
+                               self._account(), f"주문_{code}")
+        self.queue.append(request)
+        self.pump()
+        return request
+
+    def _account(self):
+        if not self.account:
+            accounts = self.kiwoom.get_login_info("ACCNO")
+            self.account = next((a for a in accounts.split(';') if a), "")
+        return self.account
+
+    def pump(self):
+        """제한 범위 안에서 대기 주문 전송"""
+        while self.queue and self.limiter.take():
+            self._send(self.queue.popleft())
+
+    def _send(self, request):
+        request.sent_at = self.clock()
+        err_code = self.kiwoom.send_order(request.rqname, self.screen_no, request.account, request.order_type,
+                                          request.code, request.quantity, request.price, request.hoga,
+                                          request.org_order_no)
+        if err_code == 0:
+            self.awaiting.setdefault((request.code, request.side), deque()).append(request)
+        else:
+            request.future.set_exception(OrderError(request.code, f"주문 전송 실패 ({err_code})", err_code))
+
+    def pending_count(self):
+        return len(self.queue)
+
+    # ------------------------------------------------------------------
+    # 체잔 이벤트
+    # ------------------------------------------------------------------
+    @timed("kiwoom_chejan_handler_seconds", "OnReceiveChejanData 처리 시간")
+    def on_receive_chejan_data(self, gubun, item_cnt, fid_list):
+        """OnReceiveChejanData 처리"""
+        try:
+            self.on_event(self.decoder.decode(gubun))
+        except Exception as e:
+            logger.error(f"❌ 체결 데이터 처리 오류: {e}")
+
+    def on_event(self, event):
+        """변환된 체잔 이벤트 반영 (여러 계좌는 AccountManager 가 계좌별로 나눠서 전달)"""
+        if isinstance(event, OrderEvent):
+            self._on_order_event(event)
+        elif isinstance(event, BalanceEvent):
+            self._on_balance_event(event)
+
+    def _on_order_event(self, event):
+        order = self.orders.get(event.order_no)
+        if order is None:
+            # 처음 보는 주문번호: 대기 중인 요청과 연결 (HTS 등 외부 주문이면 요청 없음)
+            order = Order(event.order_no, event.account, event.code, event.name, event.side,
+                          event.order_qty, event.order_price)
+            order.org_order_no = event.org_order_no
+            self.orders[event.order_no] = order
+            waiting = self.awaiting.get((event.code, event.side))
+            if waiting:
+                request = waiting.popleft()
+                if not waiting:
+                    del self.awaiting[(event.code, event.side)]
+                if not request.future.done():
+                    request.future.set_result(event.order_no)
+
+        order.status = event.status
+        order.unfilled = event.unfilled_qty
+        order.updated = time.time()
+        if event.order_qty:
+            order.quantity = event.order_qty
+
+        # 누적 체결량 기준으로 이번 체결분 계산 (단위체결 FID 가 있으면 그 값을 사용)
+        quantity = event.unit_fill_qty or event.filled_qty - order.filled
+        if quantity > 0:
+            price = event.unit_fill_price or event.fill_price
+            order.filled = event.filled_qty or order.filled + quantity
+            order.fill_amount += quantity * price
+            fill = Fill(order.order_no, event.fill_no, order.code, order.side, quantity, price, event.time)
+            self.fills.append(fill)
+            self.fill_count += 1
+            self.filled.emit(fill)
+
+        # 취소/정정 확인: 원주문의 미체결 수량 정리
+        if event.org_order_no and event.status == "확인":
+            original = self.orders.get(event.org_order_no)
+            if original is not None and "취소" in event.gubun:
+                original.unfilled = 0
+                self._index_open(original)
+            order.unfilled = 0
+
+        self._index_open(order)
+        self.order_updated.emit(order)
+
+    def _index_open(self, order):
+        book = self.open_orders.get(order.code)
+        if order.is_open:
+            if book is None:
+                book = self.open_orders[order.code] = {}
+            book[order.order_no] = order
+        elif book is not None:
+            book.pop(order.order_no, None)
+            if not book:
+                del self.open_orders[order.code]
+
+    def _on_balance_event(self, event):
+        if event.quantity:
+            position = {
+                'name': event.name,
+                'quantity': event.quantity,
+                'buy_price': event.buy_price,
+                'available': event.available,
+                'current_price': event.current_price,
+            }
+            self.positions[event.code] = position
+        else:
+            self.positions.pop(event.code, None)
+            position = {}
+
+        if self.strategy is not None:
+            if position:
+                self.strategy.positions[event.code] = dict(position)
+            else:
+                self.strategy.positions.pop(event.code, None)
+        self.position_changed.emit(event.code, position)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def open_orders_for(self, code):
+        """종목의 미체결 주문 목록"""
+        return list(self.open_orders.get(code, {}).values())
+
+    def has_open_order(self, code, side=None):
+        book = self.open_orders.get(code)
+        if not book:
+            return False
+        return side is None or any(order.side == side for order in book.values())
+
+    def position(self, code):
+        return self.positions.get(code)
+
+    def reconcile(self, holdings):
+        """잔고 조회(TR) 결과로 잔고를 맞춘다 (account_handler.get_holdings_data 형식)"""
+        self.positions = {}
+        for holding in holdings:
+            self.positions[holding['code'].lstrip('A')] = {
+                'name': holding.get('name', ""),
+                'quantity': holding['quantity'],
+                'buy_price': holding.get('buy_price', 0),
+                'available': holding.get('available', holding['quantity']),
+                'current_price': holding.get('current_price', 0),
+            }
+        if self.strategy is not None:
+            self.strategy.positions = {code: dict(p) for code, p in self.positions.items()}
@@ -0,0 +1,241 @@
+# 실시간 보유종목 평가
+# 보유종목을 슬롯 인덱스 array 컬럼(수량, 평균단가, 현재가)으로 보관하고 매입금액/평가금액 합계를 증분 갱신한다.
+# 보유 종목 틱은 O(1) 로 합계만 고치고, 계좌 요약 시그널은 타이머 주기로만 내보낸다.
+# 주기적인 잔고 조회(opw00018) 결과로 증권사 값에 다시 맞추고, 수수료/세금 등 틱으로 알 수 없는 차이는 보정값으로 유지한다.
+from array import array
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from config import Config
+
+
+class PortfolioValuation(QObject):
+    """보유종목 평가손익 실시간 계산 (계좌 요약은 REFRESH 주기로 묶어서 전달)"""
+
+    account_updated = pyqtSignal(dict)  # AccountHandler.account_updated 와 같은 형식
+
+    def __init__(self, refresh_ms=None):
+        super().__init__()
+        self.slots = {}  # 종목코드 -> 슬롯 번호
+        self.codes = []  # 슬롯 번호 -> 종목코드
+        self.names = []
+        self.quantity = array('q')
+        self.avg_price = array('d')
+        self.price = array('d')
+        self.free = []  # 전량 매도로 비운 슬롯
+
+        self.deposit = 0
+        self.cost = 0.0  # 매입금액 합계
+        self.market_value = 0.0  # 평가금액 합계
+        self.held = 0  # 보유 종목 수
+        self.value_offset = 0.0  # 증권사 총평가액 - 계산 평가금액 (잔고 조회시 갱신)
+        self.profit_offset = 0.0  # 증권사 총손익 - 계산 평가손익
+
+        self.subscriptions = None  # 보유 종목 실시간 구독 (RealSubscriptionManager)
+        self.dirty = False
+        self.ticks = 0
+        self.emitted = 0
+
+        self.refresh_ms = refresh_ms or Config.PORTFOLIO_REFRESH_MS
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+
+    def start(self):
+        """계좌 요약 전달 타이머 시작"""
+        self.timer.start(self.refresh_ms)
+
+    def stop(self):
+        self.timer.stop()
+
+    # ------------------------------------------------------------------
+    # 보유종목 반영
+    # ------------------------------------------------------------------
+    def set_position(self, code, quantity, avg_price, price=0, name=""):
+        """종목 보유 수량/평균단가 설정 (수량 0 이면 제거)"""
+        slot = self.slots.get(code)
+        if quantity <= 0:
+            if slot is not None:
+                self._remove(code, slot)
+            return
+
+        if slot is None:
+            slot = self._slot(code, name)
+        else:
+            self._discount(slot)
+            if name:
+                self.names[slot] = name
+        if price <= 0:
+            price = self.price[slot] or avg_price
+        self.quantity[slot] = quantity
+        self.avg_price[slot] = avg_price
+        self.price[slot] = price
+        self.cost += quantity * avg_price
+        self.market_value += quantity * price
+        self.dirty = True
+
+    def _slot(self, code, name):
+        if self.free:
+            slot = self.free.pop()
+            self.codes[slot] = code
+            self.names[slot] = name
+        else:
+            slot = len(self.codes)
+            self.codes.append(code)
+            self.names.append(name)
+            self.quantity.append(0)
+            self.avg_price.append(0.0)
+            self.price.append(0.0)
+        self.slots[code] = slot
+        self.held += 1
+        if self.subscriptions is not None:
+            self.subscriptions.subscribe(code)
+        return slot
+
+    def _discount(self, slot):
+        """슬롯의 현재 값을 합계에서 뺌"""
+        quantity = self.quantity[slot]
+        self.cost -= quantity * self.avg_price[slot]
+        self.market_value -= quantity * self.price[slot]
+
+    def _remove(self, code, slot):
+        self._discount(slot)
+        self.quantity[slot] = 0
+        self.avg_price[slot] = 0.0
+        self.price[slot] = 0.0
+        self.codes[slot] = None
+        self.names[slot] = ""
+        del self.slots[code]
+        self.free.append(slot)
+        self.held -= 1
+        if self.subscriptions is not None:
+            self.subscriptions.unsubscribe(code)
+        self.dirty = True
+
+    def on_position(self, code, position):
+        """OrderManager.position_changed 연결 (체결 잔고 이벤트, 전량 매도시 빈 dict)"""
+        if position:
+            self.set_position(code, position['quantity'], float(position['buy_price']),
+                              position.get('current_price', 0), position.get('name', ""))
+        else:
+            self.set_position(code, 0, 0.0)
+
+    def reconcile(self, deposit, holdings, total_value=None, total_profit=None):
+        """잔고 조회 결과로 전체 보유종목을 다시 맞춘다
+
+        Args:
+            deposit: 예수금
+            holdings: AccountHandler.holdings_from_page 형식 보유종목 목록
+            total_value / total_profit: 증권사 총평가액 / 총손익 (있으면 계산값과의 차이를 보정값으로 유지)
+
+        Returns:
+            조회 전 계산 평가금액과 조회 결과의 차이 (원)
+        """
+        before = self.market_value
+        seen = set()
+        for holding in holdings:
+            code = holding['code']
+            seen.add(code)
+            self.set_position(code, holding['quantity'], float(holding['buy_price']),
+                              holding.get('current_price', 0), holding.get('name', ""))
+        for code in [code for code in self.slots if code not in seen]:
+            self._remove(code, self.slots[code])
+
+        self.deposit = deposit
+        # 증분 합계에 쌓인 부동소수점 오차 제거
+        self._recompute()
+        self.value_offset = total_value - self.market_value if total_value is not None else 0.0
+        self.profit_offset = (total_profit - (self.market_value - self.cost)
+                              if total_profit is not None else 0.0)
+        self.dirty = True
+        return self.market_value - before
+
+    def _recompute(self):
+        n = len(self.codes)
+        if not n:
+            self.cost = self.market_value = 0.0
+            return
+        quantity = np.frombuffer(self.quantity, dtype=np.int64, count=n).astype(np.float64)
+        self.cost = float(quantity @ np.frombuffer(self.avg_price, dtype=np.float64, count=n))
+        self.market_value = float(quantity @ np.frombuffer(self.price, dtype=np.float64, count=n))
+
+    # ------------------------------------------------------------------
+    # 틱
+    # ------------------------------------------------------------------
+    def on_tick(self, code, price):
+        """실시간 체결가 (보유 종목이 아니면 dict 조회 1회)"""
+        slot = self.slots.get(code)
+        if slot is None or price <= 0:
+            return
+        old = self.price[slot]
+        if price != old:
+            self.market_value += self.quantity[slot] * (price - old)
+            self.price[slot] = price
+            self.dirty = True
+        self.ticks += 1
+
+    # ------------------------------------------------------------------
+    # 조회 / 전달
+    # ------------------------------------------------------------------
+    def summary(self):
+        """계좌 요약 {'deposit', 'total_value', 'total_profit', 'profit_rate', 'stock_count', 'total_eval'}"""
+        total_value = int(round(self.market_value + self.value_offset))
+        total_profit = int(round(self.market_value - self.cost + self.profit_offset))
+        account_data = {
+            'deposit': self.deposit,
+            'total_value': total_value,
+            'total_profit': total_profit,
+            'stock_count': self.held,
+            'total_eval': int(round(self.market_value)),  # 보유종목 평가금액 (틱 기준)
+        }
+        # 수익률 계산 (AccountHandler 와 같은 기준)
+        invested = total_value - total_profit
+        if total_value > 0 and invested:
+            account_data['profit_rate'] = total_profit / invested * 100
+        return account_data
+
+    def flush(self):
+        """바뀐 값이 있으면 계좌 요약 전달 (타이머 주기)"""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        self.emitted += 1
+        self.account_updated.emit(self.summary())
+        return True
+
+    def columns(self):
+        """보유종목 컬럼 배열 {'code', 'name', 'quantity', 'buy_price', 'current_price', 'profit', 'profit_rate'}
+
+        평가손익/수익률은 전 종목을 한 번에 계산한다.
+        """
+        n = len(self.codes)
+        quantity = np.frombuffer(self.quantity, dtype=np.int64, count=n).copy()
+        avg_price = np.frombuffer(self.avg_price, dtype=np.float64, count=n).copy()
+        price = np.frombuffer(self.price, dtype=np.float64, count=n).copy()
+        held = quantity > 0
+        quantity, avg_price, price = quantity[held], avg_price[held], price[held]
+        rate = np.divide((price - avg_price) * 100.0, avg_price, out=np.zeros(len(avg_price)), where=avg_price > 0)
+        return {
+            'code': [code for code, keep in zip(self.codes, held.tolist()) if keep],
+            'name': [name for name, keep in zip(self.names, held.tolist()) if keep],
+            'quantity': quantity,
+            'buy_price': avg_price,
+            'current_price': price,
+            'profit': (price - avg_price) * quantity,
+            'profit_rate': rate,
+        }
+
+    def clear(self):
+        """전체 초기화 (로그아웃용 - 실시간 해제는 RealSubscriptionManager.teardown 이 처리)"""
+        self.slots.clear()
+        self.codes.clear()
+        self.names.clear()
+        self.quantity = array('q')
+        self.avg_price = array('d')
+        self.price = array('d')
+        self.free.clear()
+        self.deposit = 0
+        self.cost = self.market_value = 0.0
+        self.held = 0
+        self.value_offset = self.profit_offset = 0.0
+        self.dirty = False
@@ -0,0 +1,110 @@
+# 실시간 데이터(FID) 디코더
+# OnReceiveRealData 로 함께 전달되는 탭 구분 real_data 를 한 번만 나눠서 틱 레코드로 변환한다.
+# GetCommRealData 를 FID 마다 호출하는 COM 왕복을 없애기 위한 모듈.
+from collections import namedtuple
+
+# 실시간 타입별 FID 순서 (real_data 의 탭 구분 값 순서)
+REAL_TYPE_FIDS = {
+    '주식체결': [20, 10, 11, 12, 27, 28, 15, 13, 14, 16, 17, 18, 25, 26, 29, 30, 31, 32, 228, 311, 290, 691, 567, 568],
+    '주식시세': [10, 11, 12, 27, 28, 13, 14, 16, 17, 18, 25, 26, 29, 30, 31, 32, 311, 567, 568],
+}
+
+# 주요 FID
+FID_TIME = 20  # 체결시간 (HHMMSS)
+FID_PRICE = 10  # 현재가
+FID_CHANGE = 11  # 전일대비
+FID_RATE = 12  # 등락율
+FID_TRADE_VOLUME = 15  # 거래량 (+매수체결, -매도체결)
+FID_VOLUME = 13  # 누적거래량
+
+# time: HHMMSS 정수 (없으면 -1), volume: 누적거래량, trade_volume: 체결량 (부호: 매수/매도)
+Tick = namedtuple('Tick', ['code', 'time', 'price', 'change', 'rate', 'volume', 'trade_volume'])
+
+
+def _to_int(text):
+    text = text.strip()
+    return int(text) if text else 0
+
+
+def _to_float(text):
+    text = text.strip()
+    return float(text) if text else 0.0
+
+
+class RealDataDecoder:
+    """실시간 타입별 FID 배치표로 real_data 를 Tick 으로 변환"""
+
+    def __init__(self, layouts=None, kiwoom=None):
+        self.kiwoom = kiwoom  # 페이로드가 비정상일 때 GetCommRealData 로 보완 (선택)
+        self.specs = {}
+        for real_type, fids in (layouts or REAL_TYPE_FIDS).items():
+            self.add_layout(real_type, fids)
+
+    def add_layout(self, real_type, fids):
+        """실시간 타입 FID 배치 등록"""
+        position = {fid: i for i, fid in enumerate(fids)}
+        indices = tuple(position.get(fid) for fid in
+                        (FID_TIME, FID_PRICE, FID_CHANGE, FID_RATE, FID_VOLUME, FID_TRADE_VOLUME))
+        # 가격 필드가 있어야 체결/시세 틱으로 본다
+        if indices[1] is None:
+            return
+        self.specs[real_type] = (indices, max(i for i in indices if i is not None) + 1)
+
+    def handles(self, real_type):
+        return real_type in self.specs
+
+    def decode(self, code, real_type, real_data):
+        """real_data 를 Tick 으로 변환 (지원하지 않는 실시간 타입이면 None)"""
+        spec = self.specs.get(real_type)
+        if spec is None:
+            return None
+
+        (i_time, i_price, i_change, i_rate, i_volume, i_trade), min_len = spec
+        # 필요한 마지막 필드까지만 분해
+        values = real_data.split('\t', min_len)
+        if len(values) < min_len:
+            return self._decode_slow(code, real_type)
+
+        try:
+            # int()/float() 는 앞뒤 공백과 부호를 그대로 처리한다
+            time_text = values[i_time] if i_time is not None else ""
+            return Tick(
+                code,
+                int(time_text[:6]) if time_text else -1,
+                abs(int(values[i_price])),
+                int(values[i_change]) if i_change is not None else 0,
+                float(values[i_rate]) if i_rate is not None else 0.0,
+                abs(int(values[i_volume])) if i_volume is not None else 0,
+                int(values[i_trade]) if i_trade is not None else 0,
+            )
+        except ValueError:
+            # 빈 필드가 섞인 경우
+            return Tick(
+                code,
+                _to_int(time_text[:6]) or -1,
+                abs(_to_int(values[i_price])),
+                _to_int(values[i_change]) if i_change is not None else 0,
+                _to_float(values[i_rate]) if i_rate is not None else 0.0,
+                abs(_to_int(values[i_volume])) if i_volume is not None else 0,
+                _to_int(values[i_trade]) if i_trade is not None else 0,
+            )
+
+    def _decode_slow(self, code, real_type):
+        """페이로드 필드가 부족할 때 FID 별 조회로 보완"""
+        if self.kiwoom is None:
+            return None
+
+        get = self.kiwoom.get_comm_real_data
+        price = get(code, FID_PRICE)
+        if not price:
+            return None
+        time_text = get(code, FID_TIME).strip()
+        return Tick(
+            code,
+            int(time_text[:6]) if time_text else -1,
+            abs(_to_int(price)),
+            _to_int(get(code, FID_CHANGE)),
+            _to_float(get(code, FID_RATE)),
+            abs(_to_int(get(code, FID_VOLUME))),
+            _to_int(get(code, FID_TRADE_VOLUME)),
+        )
@@ -0,0 +1,183 @@
+# 실시간 시세 등록(SetRealReg) 관리
+# 종목/FID 묶음별 관심 횟수를 세고, 같은 FID 묶음 종목을 화면번호당 최대 개수까지 채워 등록한다.
+# 짧은 시간 안의 등록/해제는 모았다가 화면번호당 한 번의 SetRealReg 로 반영한다.
+import logging
+from collections import Counter
+
+from PyQt5.QtCore import QObject, QTimer
+
+from config import Config
+from real_decoder import FID_CHANGE, FID_PRICE, FID_RATE, FID_TIME, FID_TRADE_VOLUME, FID_VOLUME
+from screen_pool import ScreenPool
+
+logger = logging.getLogger(__name__)
+
+# 체결 틱 디코딩에 필요한 기본 FID
+TICK_FIDS = (FID_TIME, FID_PRICE, FID_CHANGE, FID_RATE, FID_VOLUME, FID_TRADE_VOLUME)
+
+
+class RealSubscriptionManager(QObject):
+    """종목별 실시간 등록 참조 횟수 관리 / 화면번호 묶음 등록"""
+
+    def __init__(self, kiwoom, screen_start=None, screen_count=None, codes_per_screen=None, coalesce_ms=None):
+        super().__init__()
+        self.kiwoom = kiwoom
+        self.screen_pool = ScreenPool(screen_start or Config.REAL_SCREEN_START,
+                                      screen_count or Config.REAL_SCREEN_COUNT)
+        self.codes_per_screen = codes_per_screen or Config.REAL_CODES_PER_SCREEN
+        self.coalesce_ms = Config.REAL_COALESCE_MS if coalesce_ms is None else coalesce_ms
+
+        self.interest = {}  # 종목코드 -> Counter({FID 묶음: 참조 횟수})
+        self.assigned = {}  # 종목코드 -> (화면번호, FID 묶음)
+        self.screens = {}  # 화면번호 -> [FID 묶음, 종목코드 set]
+        self.dirty = set()  # 다음 commit 에서 다시 배치할 종목
+
+        self.reg_calls = 0
+        self.remove_calls = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.commit)
+
+    # ------------------------------------------------------------------
+    # 구독
+    # ------------------------------------------------------------------
+    def subscribe(self, code, fids=TICK_FIDS):
+        """실시간 시세 구독 (참조 횟수 반환)"""
+        key = tuple(sorted({int(fid) for fid in fids}))
+        if len(key) > Config.REAL_FIDS_PER_REGISTRATION:
+            raise ValueError(f"FID 는 한 번에 최대 {Config.REAL_FIDS_PER_REGISTRATION}개까지 등록할 수 있습니다")
+
+        counts = self.interest.setdefault(code, Counter())
+        counts[key] += 1
+        self._schedule(code)
+        return sum(counts.values())
+
+    def unsubscribe(self, code, fids=TICK_FIDS):
+        """구독 해제 (남은 참조 횟수 반환, 0 이 되면 실시간 해제)"""
+        key = tuple(sorted({int(fid) for fid in fids}))
+        counts = self.interest.get(code)
+        if not counts or counts[key] <= 0:
+            return 0
+
+        counts[key] -= 1
+        if counts[key] == 0:
+            del counts[key]
+        remaining = sum(counts.values())
+        if not remaining:
+            del self.interest[code]
+        self._schedule(code)
+        return remaining
+
+    def is_subscribed(self, code):
+        return code in self.interest
+
+    def refcount(self, code):
+        counts = self.interest.get(code)
+        return sum(counts.values()) if counts else 0
+
+    def _schedule(self, code):
+        self.dirty.add(code)
+        if self.coalesce_ms <= 0:
+            self.commit()
+        elif not self.timer.isActive():
+            self.timer.start(self.coalesce_ms)
+
+    # ------------------------------------------------------------------
+    # 반영
+    # ------------------------------------------------------------------
+    def _desired_key(self, code):
+        """종목에 필요한 FID 묶음 (구독자들이 요청한 FID 합집합)"""
+        counts = self.interest.get(code)
+        if not counts:
+            return None
+        return tuple(sorted(set().union(*counts)))
+
+    def _find_screen(self, key):
+        for screen_no, (screen_key, codes) in self.screens.items():
+            if screen_key == key and len(codes) < self.codes_per_screen:
+                return screen_no
+
+        screen_no = self.screen_pool.acquire()
+        if screen_no is not None:
+            self.screens[screen_no] = [key, set()]
+        return screen_no
+
+    def commit(self):
+        """모아 둔 변경을 화면번호당 한 번의 호출로 반영"""
+        self.timer.stop()
+        added = {}  # 화면번호 -> [추가 종목]
+        removed = set()  # 종목이 빠진 화면번호
+
+        for code in sorted(self.dirty):
+            desired = self._desired_key(code)
+            current = self.assigned.get(code)
+            if current is not None and current[1] == desired:
+                continue
+
+            if current is not None:
+                self.screens[current[0]][1].discard(code)
+                removed.add(current[0])
+                del self.assigned[code]
+
+            if desired is not None:
+                screen_no = self._find_screen(desired)
+                if screen_no is None:
+                    logger.warning(f"⚠️ 실시간 등록 화면번호 부족: {code} 미등록")
+                    continue
+                self.screens[screen_no][1].add(code)
+                self.assigned[code] = (screen_no, desired)
+                added.setdefault(screen_no, []).append(code)
+        self.dirty.clear()
+
+        for screen_no in sorted(removed | set(added)):
+            key, codes = self.screens[screen_no]
+            if not codes:
+                # 화면의 모든 종목이 빠짐: 화면 단위 해제
+                self._remove(screen_no)
+                del self.screens[screen_no]
+                self.screen_pool.release(screen_no)
+            elif screen_no in removed:
+                # 일부 종목이 빠짐: 남은 종목으로 화면 등록을 교체 ("0")
+                self._register(screen_no, sorted(codes), key, "0")
+            else:
+                # 추가만 있음: 기존 등록 유지하고 추가 ("1")
+                self._register(screen_no, added[screen_no], key, "1")
+
+    def teardown(self):
+        """모든 실시간 등록 해제 (화면번호당 1회 호출)"""
+        self.timer.stop()
+        for screen_no in list(self.screens):
+            self._remove(screen_no)
+            self.screen_pool.release(screen_no)
+        self.screens.clear()
+        self.assigned.clear()
+        self.interest.clear()
+        self.dirty.clear()
+
+    def _register(self, screen_no, codes, key, opt_type):
+        self.kiwoom.set_real_reg(screen_no, ";".join(codes), ";".join(str(fid) for fid in key), opt_type)
+        self.reg_calls += 1
+
+    def _remove(self, screen_no):
+        self.kiwoom.set_real_remove(screen_no, "ALL")
+        self.remove_calls += 1
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def screen_of(self, code):
+        assigned = self.assigned.get(code)
+        return assigned[0] if assigned else None
+
+    def registered_codes(self):
+        return set(self.assigned)
+
+    def stats(self):
+        return {
+            'codes': len(self.assigned),
+            'screens': len(self.screens),
+            'pending': len(self.dirty),
+            'reg_calls': self.reg_calls,
+            'remove_calls': self.remove_calls,
+        }
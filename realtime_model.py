@@ -0,0 +1,223 @@
+# 실시간 감시 종목 테이블 모델
+# 틱은 종목별 배열만 갱신하고, 타이머가 변경된 행을 모아 한 번의 dataChanged 로 화면에 반영한다.
+import time
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QColor
+
+from config import Config
+from metrics import registry
+
+COLUMNS = ["종목명", "종목코드", "현재가", "전일대비", "등락률", "거래량", "시간", "상태"]
+
+COL_PRICE, COL_CHANGE, COL_RATE, COL_VOLUME, COL_TIME, COL_STATUS = 2, 3, 4, 5, 6, 7
+
+RED = QColor("red")
+BLUE = QColor("blue")
+
+# 첫 미반영 틱 수신 -> 테이블 dataChanged 반영
+TABLE_LATENCY = registry.histogram("kiwoom_realtime_table_latency_seconds", "실시간 틱 수신 -> 테이블 반영 지연")
+
+
+class RealtimeTableModel(QAbstractTableModel):
+    """종목별 실시간 시세 배열 기반 테이블 모델"""
+
+    def __init__(self, refresh_hz=None, parent=None):
+        super().__init__(parent)
+        self.codes = []
+        self.names = []
+        self.rows = {}  # 종목코드 -> 행 번호
+
+        capacity = 64
+        self.price = np.zeros(capacity, dtype=np.int64)
+        self.change = np.zeros(capacity, dtype=np.int64)
+        self.rate = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self.time = np.full(capacity, -1, dtype=np.int64)  # HHMMSS (-1: 수신 전)
+        self.received = np.zeros(capacity, dtype=bool)
+        self.dirty = np.zeros(capacity, dtype=bool)
+
+        # 첫 미반영 틱 수신 시각 (화면 반영 지연 측정용)
+        self.pending_since = None
+        self.tick_count = 0
+        self.flush_count = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.refresh_hz = refresh_hz or Config.REALTIME_REFRESH_HZ
+
+    def start(self):
+        """화면 반영 타이머 시작"""
+        self.timer.start(max(int(1000 / self.refresh_hz), 1))
+
+    def stop(self):
+        self.timer.stop()
+
+    # ------------------------------------------------------------------
+    # 종목 관리
+    # ------------------------------------------------------------------
+    def _arrays(self):
+        return [self.price, self.change, self.rate, self.volume, self.time, self.received, self.dirty]
+
+    def _grow(self):
+        capacity = len(self.price) * 2
+        for name in ("price", "change", "rate", "volume", "time", "received", "dirty"):
+            old = getattr(self, name)
+            new = np.full(capacity, -1 if name == "time" else 0, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add_symbol(self, code, name):
+        """감시 종목 추가 (이미 있으면 기존 행 번호 반환)"""
+        if code in self.rows:
+            return self.rows[code]
+
+        row = len(self.codes)
+        if row >= len(self.price):
+            self._grow()
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.codes.append(code)
+        self.names.append(name)
+        self.rows[code] = row
+        for array in self._arrays():
+            array[row] = -1 if array is self.time else 0
+        self.endInsertRows()
+        return row
+
+    def remove_symbol(self, code):
+        """감시 종목 제거"""
+        row = self.rows.get(code)
+        if row is None:
+            return False
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        count = len(self.codes)
+        for array in self._arrays():
+            array[row:count - 1] = array[row + 1:count]
+        del self.codes[row]
+        del self.names[row]
+        self.rows = {code: i for i, code in enumerate(self.codes)}
+        self.endRemoveRows()
+        return True
+
+    def clear(self):
+        """전체 종목 제거"""
+        self.beginResetModel()
+        self.codes.clear()
+        self.names.clear()
+        self.rows.clear()
+        self.dirty[:] = False
+        self.pending_since = None
+        self.endResetModel()
+
+    def code_at(self, row):
+        return self.codes[row] if 0 <= row < len(self.codes) else None
+
+    def name_at(self, row):
+        return self.names[row] if 0 <= row < len(self.names) else None
+
+    def __contains__(self, code):
+        return code in self.rows
+
+    # ------------------------------------------------------------------
+    # 틱 반영
+    # ------------------------------------------------------------------
+    def update_tick(self, code, price=None, change=None, rate=None, volume=None, time_hhmmss=None):
+        """틱 1건을 배열에만 반영 (화면 갱신은 flush 에서 일괄 처리)"""
+        row = self.rows.get(code)
+        if row is None:
+            return False
+
+        if price is not None:
+            self.price[row] = price
+        if change is not None:
+            self.change[row] = change
+        if rate is not None:
+            self.rate[row] = rate
+        if volume is not None:
+            self.volume[row] = volume
+        if time_hhmmss is not None:
+            self.time[row] = time_hhmmss
+        self.received[row] = True
+        self.dirty[row] = True
+
+        if self.pending_since is None:
+            self.pending_since = time.perf_counter()
+        self.tick_count += 1
+        return True
+
+    def flush(self):
+        """변경된 행을 한 번의 dataChanged 로 반영"""
+        if self.pending_since is None:
+            return
+
+        dirty_rows = np.flatnonzero(self.dirty[:len(self.codes)])
+        self.dirty[:] = False
+        if len(dirty_rows):
+            top_left = self.index(int(dirty_rows[0]), COL_PRICE)
+            bottom_right = self.index(int(dirty_rows[-1]), COL_STATUS)
+            self.dataChanged.emit(top_left, bottom_right, [Qt.DisplayRole, Qt.ForegroundRole])
+
+        self.last_latency = time.perf_counter() - self.pending_since
+        self.max_latency = max(self.max_latency, self.last_latency)
+        TABLE_LATENCY.record(self.last_latency)
+        self.pending_since = None
+        self.flush_count += 1
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.codes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.names[row]
+            if column == 1:
+                return self.codes[row]
+            if not self.received[row]:
+                return "대기" if column == COL_STATUS else ""
+            if column == COL_PRICE:
+                return f"{int(self.price[row]):,}"
+            if column == COL_CHANGE:
+                change = int(self.change[row])
+                return f"{change:+,}" if change != 0 else "0"
+            if column == COL_RATE:
+                return f"{float(self.rate[row]):+.2f}%"
+            if column == COL_VOLUME:
+                return f"{int(self.volume[row]):,}"
+            if column == COL_TIME:
+                t = int(self.time[row])
+                return "" if t < 0 else f"{t // 10000:02d}:{t // 100 % 100:02d}:{t % 100:02d}"
+            if column == COL_STATUS:
+                return "실시간"
+
+        elif role == Qt.ForegroundRole and column in (COL_CHANGE, COL_RATE):
+            value = self.change[row] if column == COL_CHANGE else self.rate[row]
+            if value > 0:
+                return RED
+            if value < 0:
+                return BLUE
+
+        elif role == Qt.TextAlignmentRole and COL_PRICE <= column <= COL_VOLUME:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        return None
@@ -0,0 +1,50 @@
+    def create_realtime_section(self, layout):
+        """실시간 감시 섹션 (RealtimeTableModel 기반 QTableView)"""
+        group = QGroupBox("📈 실시간 감시")
+        group_layout = QVBoxLayout(group)
+        
+        # 종목 입력 및 버튼
+        input_layout = QHBoxLayout()
+        
+        self.stock_code_input = QLineEdit()
+        self.stock_code_input.setPlaceholderText("종목코드 입력 (예: 005930, 종목명으로 검색 가능)")
+        input_layout.addWidget(self.stock_code_input)
+        
+        # 종목 마스터 접두어 검색 자동완성 (선택하면 종목코드 입력)
+        self.symbol_completer_model = SymbolCompleterModel(self.symbol_master, self)
+        self.symbol_completer = QCompleter(self.symbol_completer_model, self)
+        self.symbol_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.symbol_completer.setMaxVisibleItems(10)
+        self.stock_code_input.setCompleter(self.symbol_completer)
+        self.stock_code_input.textEdited.connect(self.update_symbol_suggestions)
+        
+        self.add_stock_button = QPushButton("감시 추가")
+        self.add_stock_button.clicked.connect(self.add_watch_stock)
+        self.add_stock_button.setEnabled(False)
+        input_layout.addWidget(self.add_stock_button)
+        
+        self.remove_stock_button = QPushButton("감시 제거")
+        self.remove_stock_button.clicked.connect(self.remove_watch_stock)
+        self.remove_stock_button.setEnabled(False)
+        input_layout.addWidget(self.remove_stock_button)
+        
+        group_layout.addLayout(input_layout)
+        
+        # 실시간 테이블 (틱은 모델 배열만 갱신, 화면은 REALTIME_REFRESH_HZ 주기로 일괄 반영)
+        self.realtime_table = QTableView()
+        self.realtime_table.setModel(self.realtime_model)
+        self.realtime_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.realtime_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.realtime_table.setAlternatingRowColors(True)
+        self.realtime_table.horizontalHeader().setStretchLastSection(True)
+        self.realtime_table.verticalHeader().setVisible(False)
+        
+        group_layout.addWidget(self.realtime_table)
+        layout.addWidget(group)
+        
+    def update_symbol_suggestions(self, text):
+        """입력한 접두어로 자동완성 목록 갱신"""
+        if self.symbol_completer_model.search(text):
+            self.symbol_completer.complete()
+        else:
+            self.symbol_completer.popup().hide()
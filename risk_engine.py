@@ -0,0 +1,322 @@
+# 주문 전 리스크 검사 / 손절·익절 감시
+# 포지션·미체결·승인 대기 금액과 당일 손익을 체결/주문 이벤트마다 증분으로 갱신해 두고,
+# 주문 검사는 그 값만 비교한다. 손절/익절 가격은 종목별 정렬 배열에 넣어 두어
+# 틱 가격이 넘어선 항목만 꺼낸다.
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from datetime import datetime, timedelta
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from config import Config
+from order_manager import SIDE_BUY, SIDE_SELL
+
+EXIT_STOP_LOSS = "stop_loss"
+EXIT_TAKE_PROFIT = "take_profit"
+
+
+class TriggerBook:
+    """종목별 가격 트리거 (손절: 가격 이하, 익절: 가격 이상)
+
+    종목마다 트리거 가격을 정렬해 두고, 틱 가격으로 이분 탐색해 넘어선 트리거만 꺼낸다.
+    """
+
+    def __init__(self):
+        self.stops = {}  # 종목코드 -> 정렬된 [(가격, 키)]
+        self.takes = {}
+        self.keys = {}  # (종목코드, 키) -> (손절가, 익절가)
+
+    def set(self, code, key, stop_price=None, take_price=None):
+        """트리거 등록/교체"""
+        self.remove(code, key)
+        if stop_price:
+            insort(self.stops.setdefault(code, []), (stop_price, key))
+        if take_price:
+            insort(self.takes.setdefault(code, []), (take_price, key))
+        self.keys[(code, key)] = (stop_price, take_price)
+
+    def remove(self, code, key):
+        prices = self.keys.pop((code, key), None)
+        if prices is None:
+            return
+        for book, price in ((self.stops, prices[0]), (self.takes, prices[1])):
+            levels = book.get(code)
+            if not price or not levels:
+                continue
+            i = bisect_left(levels, (price, key))
+            if i < len(levels) and levels[i] == (price, key):
+                del levels[i]
+            if not levels:
+                del book[code]
+
+    def crossed(self, code, price):
+        """가격이 넘어선 트리거를 꺼내서 [(종류, 키, 트리거 가격)] 반환"""
+        triggered = []
+        stops = self.stops.get(code)
+        if stops and stops[-1][0] >= price:
+            # 손절가 >= 현재가 인 항목 (정렬 배열의 뒤쪽)
+            i = bisect_left(stops, (price,))
+            triggered.extend((EXIT_STOP_LOSS, key, level) for level, key in stops[i:])
+        takes = self.takes.get(code)
+        if takes and takes[0][0] <= price:
+            # 익절가 <= 현재가 인 항목 (정렬 배열의 앞쪽)
+            i = bisect_right(takes, (price, chr(0x10FFFF)))
+            triggered.extend((EXIT_TAKE_PROFIT, key, level) for level, key in takes[:i])
+
+        for _, key, _ in triggered:
+            self.remove(code, key)
+        return triggered
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class RiskEngine(QObject):
+    """주문 전 한도 검사 + 보유 종목 손절/익절 감시
+
+    주문 관리자(OrderManager)의 filled / order_updated / position_changed 시그널에 연결해
+    상태를 갱신하고, 실시간 틱은 on_tick 으로 전달한다.
+    """
+
+    exit_triggered = pyqtSignal(str, str, int)  # (종목코드, stop_loss / take_profit, 현재가)
+
+    def __init__(self, order_manager=None, clock=time.time):
+        super().__init__()
+        self.clock = clock
+        self.max_position = Config.MAX_POSITION_SIZE
+        self.max_total = Config.MAX_TOTAL_EXPOSURE
+        self.daily_loss_limit = Config.DAILY_LOSS_LIMIT
+        self.max_orders_per_minute = Config.RISK_MAX_ORDERS_PER_MINUTE
+        self.stop_loss = Config.STOP_LOSS_PERCENT
+        self.take_profit = Config.TAKE_PROFIT_PERCENT
+
+        self.holdings = {}  # 종목코드 -> [수량, 평균단가]
+        self.held_cost = {}  # 종목코드 -> 매입금액
+        self.open_notional = {}  # 종목코드 -> 미체결 매수 금액
+        self.open_sell_qty = {}  # 종목코드 -> 미체결 매도 수량
+        self.order_state = {}  # 주문번호 -> (종목코드, 방향, 미체결수량, 기준가)
+        self.reserved = {}  # (종목코드, 방향) -> 승인 후 접수 전 [(수량, 가격)]
+        self.reserved_notional = {}  # 종목코드 -> 접수 전 매수 금액
+        self.reserved_sell_qty = {}  # 종목코드 -> 접수 전 매도 수량
+        self.total_exposure = 0.0
+
+        self.last_price = {}
+        self.triggers = TriggerBook()
+        self.subscriptions = None  # 보유 종목 실시간 구독 (RealSubscriptionManager)
+
+        self.realized_pnl = 0.0
+        self.order_times = deque()  # 최근 1분 매수 승인 시각
+        self.day_end = 0.0
+        self._roll_day()
+
+        self.checks = 0
+        self.rejections = 0
+
+        if order_manager is not None:
+            self.attach(order_manager)
+
+    def attach(self, order_manager):
+        """주문 관리자 이벤트 연결 및 현재 잔고 반영"""
+        order_manager.filled.connect(self.on_fill)
+        order_manager.order_updated.connect(self.on_order)
+        order_manager.position_changed.connect(self.on_position)
+        for code, position in order_manager.positions.items():
+            self.on_position(code, position)
+
+    def _roll_day(self):
+        now = self.clock()
+        day = datetime.fromtimestamp(now)
+        self.day_end = (datetime(day.year, day.month, day.day) + timedelta(days=1)).timestamp()
+        self.realized_pnl = 0.0
+
+    # ------------------------------------------------------------------
+    # 주문 전 검사
+    # ------------------------------------------------------------------
+    def check_order(self, code, side, quantity, price=0):
+        """주문 한도 검사 (통과하면 None, 아니면 거절 사유)
+
+        통과한 주문은 접수될 때까지 금액/수량을 예약하고 주문 횟수에 포함한다.
+        """
+        self.checks += 1
+        now = self.clock()
+        if now >= self.day_end:
+            self._roll_day()
+
+        reason = self._violation(code, side, quantity, price or self.last_price.get(code, 0), now)
+        if reason is not None:
+            self.rejections += 1
+            return reason
+
+        price = price or self.last_price.get(code, 0)
+        self.reserved.setdefault((code, side), deque()).append((quantity, price))
+        if side == SIDE_BUY:
+            self.order_times.append(now)
+            notional = quantity * price
+            self.reserved_notional[code] = self.reserved_notional.get(code, 0.0) + notional
+            self.total_exposure += notional
+        else:
+            self.reserved_sell_qty[code] = self.reserved_sell_qty.get(code, 0) + quantity
+        return None
+
+    def release(self, code, side, quantity, price=0):
+        """승인했지만 접수되지 않은 주문(전송 실패 등)의 예약 해제 (해제할 예약이 없으면 False)"""
+        waiting = self.reserved.get((code, side))
+        if not waiting:
+            return False
+        for i, (reserved_qty, reserved_price) in enumerate(waiting):
+            if reserved_qty == quantity and (not price or reserved_price == price):
+                break
+        else:
+            return False
+        del waiting[i]
+        if not waiting:
+            del self.reserved[(code, side)]
+        if side == SIDE_BUY:
+            self._add(self.reserved_notional, code, -quantity * reserved_price)
+            self.total_exposure -= quantity * reserved_price
+        else:
+            self._add(self.reserved_sell_qty, code, -quantity)
+        return True
+
+    def release_if_failed(self, code, side, quantity, price, future):
+        """주문 future 완료 콜백: 전송 실패/취소로 접수되지 않았으면 예약 해제"""
+        if future.cancelled() or future.exception() is not None:
+            self.release(code, side, quantity, price)
+
+    def _violation(self, code, side, quantity, price, now):
+        if quantity <= 0:
+            return "주문 수량 오류"
+
+        if side == SIDE_SELL:
+            # 매도(청산)는 보유 수량만 확인: 주문 횟수/손실 한도로 막지 않는다
+            held = self.holdings.get(code)
+            available = (held[0] if held else 0) - self.open_sell_qty.get(code, 0) - self.reserved_sell_qty.get(code, 0)
+            if quantity > available:
+                return f"매도 가능 수량 부족 ({available}주)"
+            return None
+
+        times = self.order_times
+        while times and now - times[0] >= 60:
+            times.popleft()
+        if len(times) >= self.max_orders_per_minute:
+            return f"분당 매수 주문 한도 {self.max_orders_per_minute}회 초과"
+
+        if price <= 0:
+            return "가격 정보 없음"
+        if self.realized_pnl <= -self.daily_loss_limit:
+            return f"당일 손실 한도 도달 ({self.realized_pnl:,.0f}원)"
+
+        notional = quantity * price
+        exposure = (self.held_cost.get(code, 0.0) + self.open_notional.get(code, 0.0)
+                    + self.reserved_notional.get(code, 0.0))
+        if exposure + notional > self.max_position:
+            return f"종목 한도 초과 ({exposure + notional:,.0f} > {self.max_position:,.0f}원)"
+        if self.total_exposure + notional > self.max_total:
+            return f"전체 한도 초과 ({self.total_exposure + notional:,.0f} > {self.max_total:,.0f}원)"
+        return None
+
+    # ------------------------------------------------------------------
+    # 상태 갱신 (OrderManager 시그널)
+    # ------------------------------------------------------------------
+    def _add(self, book, code, delta):
+        value = book.get(code, 0) + delta
+        if value:
+            book[code] = value
+        else:
+            book.pop(code, None)
+
+    def on_order(self, order):
+        """주문 상태 변경: 미체결 매수 금액 / 매도 수량 갱신"""
+        previous = self.order_state.get(order.order_no)
+        if previous is None:
+            # 처음 보는 주문: 승인 예약 해제 (예약 없이 들어온 외부 주문도 그대로 반영)
+            waiting = self.reserved.get((order.code, order.side))
+            ref_price = order.price or self.last_price.get(order.code, 0)
+            if waiting:
+                quantity, reserved_price = waiting.popleft()
+                if not waiting:
+                    del self.reserved[(order.code, order.side)]
+                ref_price = ref_price or reserved_price
+                if order.side == SIDE_BUY:
+                    self._add(self.reserved_notional, order.code, -quantity * reserved_price)
+                    self.total_exposure -= quantity * reserved_price
+                else:
+                    self._add(self.reserved_sell_qty, order.code, -quantity)
+            previous = (order.code, order.side, 0, ref_price)
+
+        code, side, old_unfilled, ref_price = previous
+        delta = order.unfilled - old_unfilled
+        if delta:
+            if side == SIDE_BUY:
+                self._add(self.open_notional, code, delta * ref_price)
+                self.total_exposure += delta * ref_price
+            else:
+                self._add(self.open_sell_qty, code, delta)
+
+        if order.unfilled:
+            self.order_state[order.order_no] = (code, side, order.unfilled, ref_price)
+        else:
+            self.order_state.pop(order.order_no, None)
+
+    def on_fill(self, fill):
+        """체결: 보유 수량/평균단가, 실현손익 갱신"""
+        held = self.holdings.get(fill.code, [0, 0.0])
+        quantity, avg_price = held
+        if fill.side == SIDE_BUY:
+            avg_price = (quantity * avg_price + fill.quantity * fill.price) / (quantity + fill.quantity)
+            quantity += fill.quantity
+        else:
+            sold = min(fill.quantity, quantity)
+            self.realized_pnl += (fill.price - avg_price) * sold
+            quantity -= sold
+        self._set_holding(fill.code, quantity, avg_price)
+
+    def on_position(self, code, position):
+        """잔고 이벤트 (증권사 기준 값으로 덮어씀)"""
+        if position:
+            self._set_holding(code, position['quantity'], float(position['buy_price']))
+        else:
+            self._set_holding(code, 0, 0.0)
+
+    def _set_holding(self, code, quantity, avg_price):
+        cost = quantity * avg_price
+        self.total_exposure += cost - self.held_cost.get(code, 0.0)
+
+        if quantity > 0:
+            previous = self.holdings.get(code)
+            if previous is None and self.subscriptions is not None:
+                self.subscriptions.subscribe(code)
+            self.holdings[code] = [quantity, avg_price]
+            self.held_cost[code] = cost
+            # 평균단가가 바뀐 경우만 손절/익절 가격 재설정
+            if previous is None or previous[1] != avg_price or (code, code) not in self.triggers.keys:
+                self.triggers.set(code, code,
+                                  avg_price * (1 - self.stop_loss) if self.stop_loss else None,
+                                  avg_price * (1 + self.take_profit) if self.take_profit else None)
+        else:
+            if self.holdings.pop(code, None) is not None and self.subscriptions is not None:
+                self.subscriptions.unsubscribe(code)
+            self.held_cost.pop(code, None)
+            self.triggers.remove(code, code)
+
+    # ------------------------------------------------------------------
+    # 틱 감시
+    # ------------------------------------------------------------------
+    def on_tick(self, code, price):
+        """실시간 체결가: 넘어선 손절/익절 트리거만 처리 (트리거 없으면 dict 조회 1회)"""
+        self.last_price[code] = price
+        if code not in self.triggers.stops and code not in self.triggers.takes:
+            return None
+
+        triggered = self.triggers.crossed(code, price)
+        for kind, _, _ in triggered:
+            self.exit_triggered.emit(code, kind, int(price))
+        return triggered
+
+    def exposure(self, code=None):
+        """종목 또는 전체 노출 금액 (보유 + 미체결 매수 + 접수 전 매수)"""
+        if code is None:
+            return self.total_exposure
+        return (self.held_cost.get(code, 0.0) + self.open_notional.get(code, 0.0)
+                + self.reserved_notional.get(code, 0.0))
@@ -0,0 +1,32 @@
+# 화면번호 풀
+# 키움은 화면번호 단위로 TR/실시간 요청을 구분하므로 용도별 구간에서 번호를 빌려 쓴다.
+
+
+class ScreenPool:
+    """화면번호 대여/반납 관리"""
+
+    def __init__(self, start, count):
+        self.start = start
+        self.count = count
+        self.free = [f"{start + i:04d}" for i in reversed(range(count))]
+        self.in_use = set()
+
+    def acquire(self):
+        """사용 가능한 화면번호 반환 (없으면 None)"""
+        if not self.free:
+            return None
+        screen_no = self.free.pop()
+        self.in_use.add(screen_no)
+        return screen_no
+
+    def release(self, screen_no):
+        """화면번호 반납"""
+        if screen_no in self.in_use:
+            self.in_use.remove(screen_no)
+            self.free.append(screen_no)
+
+    def available(self):
+        return len(self.free)
+
+    def __contains__(self, screen_no):
+        return screen_no in self.in_use
@@ -0,0 +1,211 @@
+# 다종목 일괄 시그널 계산 모듈
+import numpy as np
+
+# 시그널 코드 (정수 배열로 계산 후 문자열로 변환)
+HOLD = 0
+BUY = 1
+SELL = -1
+
+SIGNAL_NAMES = {BUY: 'BUY', SELL: 'SELL', HOLD: 'HOLD'}
+
+
+def as_price_matrix(prices):
+    """가격 데이터를 (종목 x 봉) float64 2차원 배열로 변환
+
+    길이가 다른 종목은 앞쪽을 NaN으로 채워 오른쪽 끝(최신 봉)을 맞춘다.
+    """
+    if isinstance(prices, np.ndarray) and prices.ndim == 2:
+        return prices.astype(np.float64, copy=False)
+
+    rows = [np.asarray(p, dtype=np.float64) for p in prices]
+    width = max((len(r) for r in rows), default=0)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        if len(row):
+            matrix[i, width - len(row):] = row
+    return matrix
+
+
+def sma_signals(prices, short_period=5, long_period=20):
+    """이동평균 시그널 일괄 계산
+
+    TradingStrategy.simple_moving_average_strategy 와 같은 규칙으로
+    최신 봉 기준 단기/장기 이동평균을 비교한다.
+
+    Args:
+        prices: (종목 x 봉) 가격 배열
+        short_period: 단기 이동평균 기간
+        long_period: 장기 이동평균 기간
+
+    Returns:
+        signals: 종목별 BUY(1)/SELL(-1)/HOLD(0) int8 배열
+    """
+    prices = as_price_matrix(prices)
+    signals = np.zeros(prices.shape[0], dtype=np.int8)
+
+    if prices.shape[1] < long_period:
+        return signals
+
+    short_ma = prices[:, -short_period:].mean(axis=1)
+    long_ma = prices[:, -long_period:].mean(axis=1)
+
+    # 데이터가 부족한 종목(NaN)은 비교 결과가 False 이므로 HOLD
+    signals[short_ma > long_ma] = BUY
+    signals[short_ma < long_ma] = SELL
+    return signals
+
+
+def rsi_values(prices, period=14):
+    """RSI 일괄 계산 (TradingStrategy._calculate_rsi 와 동일한 단순평균 방식)
+
+    Returns:
+        rsi: 종목별 RSI float64 배열 (데이터 부족 시 NaN)
+    """
+    prices = as_price_matrix(prices)
+
+    if prices.shape[1] < period + 1:
+        return np.full(prices.shape[0], np.nan)
+
+    deltas = np.diff(prices[:, -(period + 1):], axis=1)
+    avg_gain = np.where(deltas < 0, 0.0, deltas).mean(axis=1)
+    avg_loss = np.where(deltas > 0, 0.0, -deltas).mean(axis=1)
+
+    # NaN 전파를 유지하기 위해 손실 평균이 0인 종목만 100으로 처리
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi[avg_loss == 0] = 100.0
+    return rsi
+
+
+def rsi_signals(prices, period=14, oversold=30, overbought=70):
+    """RSI 시그널 일괄 계산
+
+    Returns:
+        signals: 종목별 BUY(1)/SELL(-1)/HOLD(0) int8 배열
+    """
+    rsi = rsi_values(prices, period)
+    signals = np.zeros(rsi.shape[0], dtype=np.int8)
+    signals[rsi < oversold] = BUY
+    signals[rsi > overbought] = SELL
+    return signals
+
+
+def compute_signals(stock_codes, prices, strategy_name="sma", **params):
+    """종목코드별 시그널 매핑 반환
+
+    Args:
+        stock_codes: 종목코드 목록 (prices 의 행 순서와 동일)
+        prices: (종목 x 봉) 가격 배열
+        strategy_name: 'sma' 또는 'rsi'
+        params: 전략별 파라미터 (short_period, long_period / period, oversold, overbought)
+
+    Returns:
+        signals: {종목코드: 'BUY'/'SELL'/'HOLD'}
+    """
+    if strategy_name == "sma":
+        codes = sma_signals(prices, **params)
+    elif strategy_name == "rsi":
+        codes = rsi_signals(prices, **params)
+    else:
+        codes = np.zeros(len(stock_codes), dtype=np.int8)
+
+    names = [SIGNAL_NAMES[HOLD]] * len(stock_codes)
+    for i in np.flatnonzero(codes):
+        names[i] = SIGNAL_NAMES[int(codes[i])]
+    return dict(zip(stock_codes, names))
+
+
+# ----------------------------------------------------------------------
+# 전체 봉 구간 시그널 (백테스트용)
+# 각 봉 시점에서 위 함수들을 호출한 것과 같은 결과를 누적합으로 한 번에 계산한다.
+# ----------------------------------------------------------------------
+def prefix_sums(values):
+    """이동평균 계산용 누적합 (NaN 은 0으로 더하고 개수를 따로 누적)
+
+    Returns:
+        (csum, cmiss): 값 누적합, NaN 개수 누적합
+    """
+    values = as_price_matrix(values)
+    missing = np.isnan(values)
+    return np.cumsum(np.where(missing, 0.0, values), axis=1), np.cumsum(missing, axis=1)
+
+
+def window_mean(sums, period):
+    """prefix_sums 결과로 봉별 이동평균 계산 (기간이 달라도 누적합은 재사용)"""
+    csum, cmiss = sums
+    result = np.full(csum.shape, np.nan)
+    if csum.shape[1] < period:
+        return result
+
+    result[:, period - 1] = csum[:, period - 1]
+    result[:, period:] = csum[:, period:] - csum[:, :-period]
+    window_missing = cmiss[:, period - 1:].copy()
+    window_missing[:, 1:] -= cmiss[:, :-period]
+
+    result /= period
+    result[:, period - 1:][window_missing > 0] = np.nan
+    return result
+
+
+def rolling_mean(prices, period):
+    """봉별 이동평균 (앞쪽 period-1 개와 NaN 이 포함된 구간은 NaN)"""
+    return window_mean(prefix_sums(prices), period)
+
+
+def gain_loss_sums(prices):
+    """RSI 계산용 상승폭/하락폭 누적합 (NaN 등락은 그대로 두어 해당 구간이 NaN 이 되도록 한다)"""
+    deltas = np.diff(as_price_matrix(prices), axis=1)
+    return prefix_sums(np.where(deltas < 0, 0.0, deltas)), prefix_sums(np.where(deltas > 0, 0.0, -deltas))
+
+
+def rsi_from_sums(gain_sums, loss_sums, period):
+    """gain_loss_sums 결과로 봉별 RSI 계산"""
+    csum = gain_sums[0]
+    result = np.full((csum.shape[0], csum.shape[1] + 1), np.nan)
+    if csum.shape[1] < period:
+        return result
+
+    avg_gain = window_mean(gain_sums, period)
+    avg_loss = window_mean(loss_sums, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi[avg_loss == 0] = 100.0
+    result[:, 1:] = rsi
+    return result
+
+
+def sma_signal_series(prices, short_period=5, long_period=20):
+    """봉별 이동평균 시그널 (종목 x 봉 int8)"""
+    short_ma = rolling_mean(prices, short_period)
+    long_ma = rolling_mean(prices, long_period)
+
+    signals = np.zeros(short_ma.shape, dtype=np.int8)
+    signals[short_ma > long_ma] = BUY
+    signals[short_ma < long_ma] = SELL
+    return signals
+
+
+def rsi_series(prices, period=14):
+    """봉별 RSI (최근 period 개 등락 단순평균, 데이터 부족 구간은 NaN)"""
+    prices = as_price_matrix(prices)
+    if prices.shape[1] < period + 1:
+        return np.full(prices.shape, np.nan)
+    return rsi_from_sums(*gain_loss_sums(prices), period)
+
+
+def rsi_signal_series(prices, period=14, oversold=30, overbought=70):
+    """봉별 RSI 시그널 (종목 x 봉 int8)"""
+    rsi = rsi_series(prices, period)
+    signals = np.zeros(rsi.shape, dtype=np.int8)
+    signals[rsi < oversold] = BUY
+    signals[rsi > overbought] = SELL
+    return signals
+
+
+def signal_series(prices, strategy_name="sma", **params):
+    """전략 이름으로 봉별 시그널 계산"""
+    if strategy_name == "sma":
+        return sma_signal_series(prices, **params)
+    if strategy_name == "rsi":
+        return rsi_signal_series(prices, **params)
+    return np.zeros(as_price_matrix(prices).shape, dtype=np.int8)
@@ -1,12 +1,31 @@
-import pandas as pd
+import logging
 import numpy as np
 from datetime import datetime, timedelta
+from functools import partial
+
+import signal_engine
+from config import Config
+from indicators import IndicatorBook
+
+logger = logging.getLogger(__name__)
 
 class TradingStrategy:
-    def __init__(self, kiwoom_api):
+    def __init__(self, kiwoom_api, bar_store=None):
         self.api = kiwoom_api
+        self.bar_store = bar_store  # 로컬 일봉 저장소 (BarStore)
         self.positions = {}  # 보유 포지션
         self.order_history = []  # 주문 내역
+        self.indicators = IndicatorBook()  # 실시간 스트리밍 지표
+        self.order_manager = None  # 주문 관리자 (OrderManager, 체결시 positions 동기화)
+        self.risk_engine = None  # 주문 전 한도 검사 (RiskEngine)
+        
+    def on_price(self, stock_code, price):
+        """실시간 체결가 반영 (틱마다 O(1))"""
+        self.indicators.update(stock_code, price)
+        
+    def on_prices(self, stock_codes, prices):
+        """체결가 배열 일괄 반영 (저널 일괄 재생 등, 종목 안에서는 시간 순)"""
+        self.indicators.update_block(stock_codes, prices)
         
     def simple_moving_average_strategy(self, stock_code, short_period=5, long_period=20):
         """단순 이동평균 전략
@@ -19,18 +38,20 @@ class TradingStrategy:
         Returns:
             signal: 'BUY', 'SELL', 'HOLD'
         """
-        # 실제 구현시 과거 가격 데이터를 가져와서 계산
-        # 현재는 예시 로직
-        
-        # 가격 데이터 조회 (실제로는 API에서 가져와야 함)
-        prices = self._get_historical_prices(stock_code, long_period)
+        # 실시간 지표가 준비되어 있으면 그대로 사용
+        short_ma = self.indicators.sma(stock_code, short_period)
+        long_ma = self.indicators.sma(stock_code, long_period)
         
-        if len(prices) < long_period:
-            return 'HOLD'
+        if short_ma is None or long_ma is None:
+            # 가격 데이터 조회 (실제로는 API에서 가져와야 함)
+            prices = self._get_historical_prices(stock_code, long_period)
             
-        # 이동평균 계산
-        short_ma = np.mean(prices[-short_period:])
-        long_ma = np.mean(prices[-long_period:])
+            if len(prices) < long_period:
+                return 'HOLD'
+                
+            # 이동평균 계산
+            short_ma = np.mean(prices[-short_period:])
+            long_ma = np.mean(prices[-long_period:])
         
         # 골든크로스: 단기 이평선이 장기 이평선을 상향 돌파
         if short_ma > long_ma:
@@ -53,13 +74,16 @@ class TradingStrategy:
         Returns:
             signal: 'BUY', 'SELL', 'HOLD'
         """
-        prices = self._get_historical_prices(stock_code, period + 1)
+        rsi = self.indicators.rsi(stock_code, period)
         
-        if len(prices) < period + 1:
-            return 'HOLD'
+        if rsi is None:
+            prices = self._get_historical_prices(stock_code, period + 1)
             
-        # RSI 계산
-        rsi = self._calculate_rsi(prices, period)
+            if len(prices) < period + 1:
+                return 'HOLD'
+                
+            # RSI 계산
+            rsi = self._calculate_rsi(prices, period)
         
         if rsi < oversold:
             return 'BUY'  # 과매도 구간에서 매수
@@ -69,7 +93,11 @@ class TradingStrategy:
             return 'HOLD'
             
     def _get_historical_prices(self, stock_code, days):
-        """과거 가격 데이터 조회 (예시)"""
+        """과거 가격 데이터 조회"""
+        # 로컬 저장소에 충분한 일봉이 있으면 memmap 뷰를 그대로 반환 (복사 없음)
+        if self.bar_store is not None and self.bar_store.count(stock_code, 'D') >= days:
+            return self.bar_store.tail(stock_code, 'D', days)
+            
         # 실제로는 키움 API를 통해 데이터를 가져와야 함
         # 여기서는 임의의 데이터 생성
         np.random.seed(42)
@@ -100,26 +128,81 @@ class TradingStrategy:
         
         return rsi
         
+    def _get_price_matrix(self, stock_codes, days):
+        """여러 종목의 과거 가격을 (종목 x 봉) 배열로 조회"""
+        return signal_engine.as_price_matrix(
+            [self._get_historical_prices(code, days) for code in stock_codes]
+        )
+        
     def execute_strategy(self, stock_codes, strategy_name="sma"):
-        """전략 실행"""
-        signals = {}
-        
-        for stock_code in stock_codes:
-            if strategy_name == "sma":
-                signal = self.simple_moving_average_strategy(stock_code)
-            elif strategy_name == "rsi":
-                signal = self.rsi_strategy(stock_code)
-            else:
-                signal = 'HOLD'
-                
-            signals[stock_code] = signal
+        """전략 실행 (전 종목 일괄 계산)"""
+        stock_codes = list(stock_codes)
+        
+        if strategy_name == "sma":
+            prices = self._get_price_matrix(stock_codes, 20)
+        elif strategy_name == "rsi":
+            prices = self._get_price_matrix(stock_codes, 14 + 1)
+        else:
+            prices = None
             
-            # 실제 주문 실행 (모의투자 모드에서는 로그만 출력)
+        signals = signal_engine.compute_signals(stock_codes, prices, strategy_name)
+        
+        last_prices = prices[:, -1] if prices is not None and prices.size else np.zeros(len(stock_codes))
+        for stock_code, signal, price in zip(stock_codes, signals.values(), last_prices):
             if signal == 'BUY':
-                print(f"[{stock_code}] 매수 신호 발생")
-                # self.api.buy_stock(account, stock_code, quantity, price)
+                logger.info(f"[{stock_code}] 매수 신호 발생")
+                self._place_order(stock_code, signal, price)
             elif signal == 'SELL':
-                print(f"[{stock_code}] 매도 신호 발생")
-                # self.api.sell_stock(account, stock_code, quantity, price)
+                logger.info(f"[{stock_code}] 매도 신호 발생")
+                self._place_order(stock_code, signal, price)
+                
+        return signals
+        
+    def _place_order(self, stock_code, signal, price):
+        """시그널 주문 (Config.AUTO_ORDER 가 켜져 있고 주문 관리자가 연결된 경우만, 시장가)"""
+        if not Config.AUTO_ORDER or self.order_manager is None:
+            return None
+        if self.order_manager.has_open_order(stock_code):
+            return None  # 미체결 주문이 있으면 중복 주문하지 않음
+            
+        if signal == 'BUY':
+            if stock_code in self.positions or not price > 0:
+                return None
+            quantity = int(Config.MAX_POSITION_SIZE // price)
+        else:
+            position = self.positions.get(stock_code)
+            quantity = position.get('available', position['quantity']) if position else 0
+        if quantity <= 0:
+            return None
+            
+        # 리스크 한도 검사 (통과한 주문만 전송)
+        if self.risk_engine is not None:
+            side = 1 if signal == 'BUY' else -1
+            reason = self.risk_engine.check_order(stock_code, side, quantity, price)
+            if reason is not None:
+                logger.warning(f"🛑 [{stock_code}] {signal} 주문 거절: {reason}")
+                return None
                 
-        return signals
\ No newline at end of file
+        if signal == 'BUY':
+            request = self.order_manager.buy(stock_code, quantity)
+        else:
+            request = self.order_manager.sell(stock_code, quantity)
+        if self.risk_engine is not None:
+            # 전송 실패로 접수되지 않으면 승인 예약 해제
+            request.future.add_done_callback(
+                partial(self.risk_engine.release_if_failed, stock_code, side, quantity, price))
+            
+        self.order_history.append((datetime.now(), stock_code, signal, request))
+        return request
+        
+    def on_signal(self, strategy_name, stock_code, signal, price):
+        """전략 실행기 시그널 처리 (StrategyRuntime.signal_generated 에 연결)"""
+        label = "매수" if signal == 'BUY' else "매도"
+        logger.info(f"[{stock_code}] {label} 신호 발생 ({strategy_name})")
+        return self._place_order(stock_code, signal, price)
+        
+    def exit_position(self, stock_code, reason, price):
+        """손절/익절 트리거 청산 (RiskEngine.exit_triggered 에 연결)"""
+        label = "손절" if reason == 'stop_loss' else "익절"
+        logger.info(f"[{stock_code}] {label} 가격 도달: {price:,}원")
+        return self._place_order(stock_code, 'SELL', price)
@@ -0,0 +1,335 @@
+# 이벤트 기반 전략 실행기
+# 틱/봉/조건검색 이벤트를 종목 -> 전략 색인으로 관심 전략에만 전달한다.
+# threaded 전략은 워커 스레드 풀에서 평가하고 결과는 큐 연결 시그널로 GUI 스레드에 돌려준다.
+# 같은 (전략, 종목) 평가는 한 번에 하나만 실행하고, 밀린 틱은 최신 값 하나로 합친다.
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+import signal_engine
+from config import Config
+from indicators import StreamingRSI, StreamingSMA
+from metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+EVENT_TICK = "tick"
+EVENT_BAR = "bar"
+EVENT_CONDITION = "condition"
+
+
+class RuntimeStrategy:
+    """실행기용 전략 기본 클래스
+
+    on_tick / on_bar / on_condition 이 'BUY' / 'SELL' 을 반환하면 시그널로 전달된다.
+    threaded = True 인 전략은 워커 스레드에서 호출되며, 종목이 다르면 동시에 실행될 수 있으므로
+    종목별 상태만 다뤄야 한다.
+    """
+
+    threaded = False
+
+    def __init__(self, name, symbols=(), conditions=(), follow_conditions=True):
+        self.name = name
+        self.symbols = set(symbols)  # 구독 종목
+        self.conditions = set(conditions)  # 구독 조건식명
+        self.follow_conditions = follow_conditions  # True: 조건식 편입 종목을 자동 구독/이탈시 해제
+
+    def on_tick(self, code, price):
+        return None
+
+    def on_bar(self, code, bar):
+        return None
+
+    def on_condition(self, condition_name, code, event_type):
+        return None
+
+
+class SmaCrossStrategy(RuntimeStrategy):
+    """틱 단위 이동평균 교차 (교차가 바뀔 때만 시그널)"""
+
+    def __init__(self, name="sma", symbols=(), short_period=5, long_period=20, **kwargs):
+        super().__init__(name, symbols, **kwargs)
+        self.short_period = short_period
+        self.long_period = long_period
+        self.state = {}  # 종목코드 -> [단기 SMA, 장기 SMA, 마지막 시그널]
+
+    def on_tick(self, code, price):
+        state = self.state.get(code)
+        if state is None:
+            state = self.state[code] = [StreamingSMA(self.short_period), StreamingSMA(self.long_period), None]
+        short_ma = state[0].update(price)
+        long_ma = state[1].update(price)
+        if short_ma is None or long_ma is None or short_ma == long_ma:
+            return None
+
+        signal = 'BUY' if short_ma > long_ma else 'SELL'
+        if signal == state[2]:
+            return None
+        state[2] = signal
+        return signal
+
+
+class RsiStrategy(RuntimeStrategy):
+    """틱 단위 RSI 과매수/과매도 진입 시그널"""
+
+    def __init__(self, name="rsi", symbols=(), period=14, oversold=30, overbought=70, **kwargs):
+        super().__init__(name, symbols, **kwargs)
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.state = {}  # 종목코드 -> [RSI, 마지막 시그널]
+
+    def on_tick(self, code, price):
+        state = self.state.get(code)
+        if state is None:
+            state = self.state[code] = [StreamingRSI(self.period), None]
+        rsi = state[0].update(price)
+        if rsi is None:
+            return None
+
+        signal = 'BUY' if rsi < self.oversold else 'SELL' if rsi > self.overbought else None
+        if signal == state[1]:
+            return None
+        state[1] = signal
+        return signal
+
+
+class BarSignalStrategy(RuntimeStrategy):
+    """봉 완성시 저장소의 최근 봉 + 완성된 봉으로 signal_engine 전략 계산 (워커 스레드)"""
+
+    threaded = True
+
+    def __init__(self, name, bar_store, strategy_name="sma", timeframe='D', lookback=60, symbols=(), **params):
+        super().__init__(name, symbols)
+        self.bar_store = bar_store
+        self.strategy_name = strategy_name
+        self.timeframe = timeframe
+        self.lookback = lookback
+        self.params = params
+        self.last_signal = {}
+
+    def on_bar(self, code, bar):
+        if bar.timeframe != self.timeframe:
+            return None
+        history = self.bar_store.tail(code, self.timeframe, self.lookback)
+        times = self.bar_store.tail(code, self.timeframe, 1, 'time')
+        if not len(times) or times[-1] < bar.time:
+            # 저장소에 아직 없는 방금 완성된 봉을 이어 붙여 계산
+            history = np.append(history[1:] if len(history) >= self.lookback else history, bar.close)
+        prices = signal_engine.as_price_matrix([history])
+        signal = signal_engine.compute_signals([code], prices, self.strategy_name, **self.params)[code]
+        if signal == 'HOLD' or self.last_signal.get(code) == signal:
+            return None
+        self.last_signal[code] = signal
+        return signal
+
+
+class StrategyRuntime(QObject):
+    """전략 등록 / 이벤트 분배 / 전략별 지연 시간 집계"""
+
+    signal_generated = pyqtSignal(str, str, str, float)  # (전략명, 종목코드, 'BUY'/'SELL', 최근 가격)
+    _finished = pyqtSignal(object)  # 워커 스레드 평가 결과 (GUI 스레드로 전달)
+
+    def __init__(self, workers=None):
+        super().__init__()
+        self.strategies = {}  # 전략명 -> RuntimeStrategy
+        self.by_symbol = {}  # 종목코드 -> [RuntimeStrategy]
+        self.by_condition = {}  # 조건식명 -> [RuntimeStrategy]
+        self.last_price = {}
+
+        self.executor = ThreadPoolExecutor(max_workers=workers or Config.STRATEGY_WORKERS,
+                                           thread_name_prefix="strategy")
+        self.in_flight = set()  # 평가 중인 (전략명, 종목코드)
+        self.pending = {}  # (전략명, 종목코드) -> 대기 이벤트 deque[(종류, 인자, 수신 시각)]
+
+        # 전략별 통계: 평가 시간, 이벤트 수신 -> 결과 반영 지연
+        self.eval_latency = {}
+        self.event_latency = {}
+        self.counters = {}  # 전략명 -> {'events', 'signals', 'errors', 'coalesced'}
+
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    # ------------------------------------------------------------------
+    # 전략 등록
+    # ------------------------------------------------------------------
+    def add_strategy(self, strategy):
+        if strategy.name in self.strategies:
+            raise ValueError(f"이미 등록된 전략입니다: {strategy.name}")
+        self.strategies[strategy.name] = strategy
+        self.eval_latency[strategy.name] = LatencyHistogram(strategy.name)
+        self.event_latency[strategy.name] = LatencyHistogram(strategy.name)
+        self.counters[strategy.name] = {'events': 0, 'signals': 0, 'errors': 0, 'coalesced': 0}
+        for code in strategy.symbols:
+            self.by_symbol.setdefault(code, []).append(strategy)
+        for condition_name in strategy.conditions:
+            self.by_condition.setdefault(condition_name, []).append(strategy)
+        return strategy
+
+    def remove_strategy(self, name):
+        strategy = self.strategies.pop(name, None)
+        if strategy is None:
+            return None
+        for code in list(strategy.symbols):
+            self._unindex(self.by_symbol, code, strategy)
+        for condition_name in strategy.conditions:
+            self._unindex(self.by_condition, condition_name, strategy)
+        for key in [key for key in self.pending if key[0] == name]:
+            del self.pending[key]
+        return strategy
+
+    def watch(self, name, code):
+        """전략에 종목 구독 추가"""
+        strategy = self.strategies[name]
+        if code not in strategy.symbols:
+            strategy.symbols.add(code)
+            self.by_symbol.setdefault(code, []).append(strategy)
+
+    def unwatch(self, name, code):
+        strategy = self.strategies.get(name)
+        if strategy is not None and code in strategy.symbols:
+            strategy.symbols.discard(code)
+            self._unindex(self.by_symbol, code, strategy)
+            self.pending.pop((name, code), None)
+
+    def _unindex(self, index, key, strategy):
+        strategies = index.get(key)
+        if strategies and strategy in strategies:
+            strategies.remove(strategy)
+            if not strategies:
+                del index[key]
+
+    # ------------------------------------------------------------------
+    # 이벤트 입력
+    # ------------------------------------------------------------------
+    def on_tick(self, code, price):
+        """실시간 체결가 (구독 전략이 없으면 dict 조회 1회)"""
+        self.last_price[code] = price
+        strategies = self.by_symbol.get(code)
+        if strategies:
+            for strategy in strategies:
+                self._dispatch(strategy, code, EVENT_TICK, (code, price))
+
+    def on_bar(self, code, bar):
+        """봉 완성"""
+        strategies = self.by_symbol.get(code)
+        if strategies:
+            for strategy in strategies:
+                self._dispatch(strategy, code, EVENT_BAR, (code, bar))
+
+    def on_condition_result(self, condition_name, added, removed):
+        """ConditionHandler.condition_result 연결: 편입 [(종목코드, 편입시각)], 이탈 [종목코드]"""
+        strategies = self.by_condition.get(condition_name)
+        if not strategies:
+            return
+        for strategy in list(strategies):
+            for code, _ in added:
+                if strategy.follow_conditions:
+                    self.watch(strategy.name, code)
+                self._dispatch(strategy, code, EVENT_CONDITION, (condition_name, code, 'I'))
+            for code in removed:
+                self._dispatch(strategy, code, EVENT_CONDITION, (condition_name, code, 'D'))
+                if strategy.follow_conditions:
+                    self.unwatch(strategy.name, code)
+
+    # ------------------------------------------------------------------
+    # 평가
+    # ------------------------------------------------------------------
+    def _dispatch(self, strategy, code, kind, args):
+        received_at = time.perf_counter()
+        self.counters[strategy.name]['events'] += 1
+        if not strategy.threaded:
+            # 가벼운 전략: GUI 스레드에서 바로 평가
+            try:
+                result = getattr(strategy, "on_" + kind)(*args)
+                error = None
+            except Exception as e:
+                result, error = None, e
+            elapsed = time.perf_counter() - received_at
+            self._complete(strategy, code, result, elapsed, received_at, error)
+            return
+
+        key = (strategy.name, code)
+        if key in self.in_flight:
+            queue = self.pending.setdefault(key, deque())
+            if kind == EVENT_TICK and queue and queue[-1][0] == EVENT_TICK:
+                queue[-1] = (kind, args, received_at)  # 밀린 틱은 최신 값으로 교체
+                self.counters[strategy.name]['coalesced'] += 1
+            else:
+                queue.append((kind, args, received_at))
+            return
+        self._submit(strategy, key, kind, args, received_at)
+
+    def _submit(self, strategy, key, kind, args, received_at):
+        self.in_flight.add(key)
+        self.executor.submit(self._run, strategy, key, kind, args, received_at)
+
+    def _run(self, strategy, key, kind, args, received_at):
+        """워커 스레드: 평가 후 결과를 시그널로 전달"""
+        start = time.perf_counter()
+        try:
+            result = getattr(strategy, "on_" + kind)(*args)
+            error = None
+        except Exception as e:
+            result, error = None, e
+        self._finished.emit((strategy, key, result, time.perf_counter() - start, received_at, error))
+
+    def _on_finished(self, payload):
+        strategy, key, result, elapsed, received_at, error = payload
+        self.in_flight.discard(key)
+        if self.strategies.get(strategy.name) is not strategy:
+            return  # 평가 중 제거된 전략
+
+        self._complete(strategy, key[1], result, elapsed, received_at, error)
+
+        queue = self.pending.get(key)
+        if queue:
+            kind, args, queued_at = queue.popleft()
+            if not queue:
+                del self.pending[key]
+            self._submit(strategy, key, kind, args, queued_at)
+
+    def _complete(self, strategy, code, result, elapsed, received_at, error):
+        name = strategy.name
+        self.eval_latency[name].record(elapsed)
+        self.event_latency[name].record(time.perf_counter() - received_at)
+        if error is not None:
+            self.counters[name]['errors'] += 1
+            logger.error(f"❌ 전략 평가 오류 [{name}] {code}: {error}")
+            return
+        if result in ('BUY', 'SELL'):
+            self.counters[name]['signals'] += 1
+            self.signal_generated.emit(name, code, result, float(self.last_price.get(code, 0.0)))
+
+    # ------------------------------------------------------------------
+    # 통계 / 종료
+    # ------------------------------------------------------------------
+    def busy(self):
+        """평가 중이거나 대기 중인 이벤트가 있으면 True"""
+        return bool(self.in_flight or self.pending)
+
+    def stats(self):
+        """전략별 {'events', 'signals', 'errors', 'coalesced', 'symbols', 'eval', 'latency'} (지연은 초 단위 요약)"""
+        return {
+            name: dict(self.counters[name],
+                       symbols=len(strategy.symbols),
+                       eval=self.eval_latency[name].summary(),
+                       latency=self.event_latency[name].summary())
+            for name, strategy in self.strategies.items()
+        }
+
+    def format_stats(self):
+        lines = [f"{'전략':<12}{'이벤트':>10}{'시그널':>8}{'합침':>8}{'평가 p50':>10}{'p99':>10}{'지연 p99':>10}{'최대':>10}"]
+        for name, stats in self.stats().items():
+            lines.append(f"{name:<12}{stats['events']:>10,}{stats['signals']:>8,}{stats['coalesced']:>8,}"
+                         f"{stats['eval']['p50'] * 1e3:>9.2f}ms{stats['eval']['p99'] * 1e3:>8.2f}ms"
+                         f"{stats['latency']['p99'] * 1e3:>8.2f}ms{stats['latency']['max'] * 1e3:>8.2f}ms")
+        return "\n".join(lines)
+
+    def shutdown(self):
+        """워커 스레드 종료 (대기 이벤트는 버림)"""
+        self.pending.clear()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,227 @@
+# 종목 마스터 캐시
+# 로그인 시 시장별 GetCodeListByMarket + 종목명 조회를 한 번만 하고 파일에 저장해서 당일 재시작시 재사용한다.
+# 종목명 조회는 메모리 dict 만 사용하고(미등록 종목만 최초 1회 COM 조회), 입력창 자동완성은 정렬 목록 이분 탐색으로 찾는다.
+import bisect
+import json
+import logging
+import os
+from datetime import date
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# GetCodeListByMarket 시장 구분
+MARKET_NAMES = {
+    "0": "코스피",
+    "10": "코스닥",
+    "3": "ELW",
+    "8": "ETF",
+    "50": "코넥스",
+}
+
+FORMAT_VERSION = 1
+
+
+class SymbolMaster:
+    """종목코드 -> (종목명, 시장) 인덱스 + 종목명/코드 접두어 검색"""
+
+    def __init__(self, path=None):
+        self.path = Config.SYMBOL_MASTER_FILE if path is None else path
+        self.kiwoom = None  # 미등록 종목 조회용 (load 에서 설정)
+        self.names = {}  # 종목코드 -> 종목명
+        self.markets = {}  # 종목코드 -> 시장 구분
+        self.loaded_date = None  # 마스터를 받은 날짜 (YYYYMMDD)
+        self.misses = 0  # 마스터에 없어 COM 으로 조회한 횟수
+        self._name_index = None  # [(검색용 종목명, 종목코드)] (변경시 다시 만듦)
+        self._code_index = None  # 정렬된 종목코드
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, code):
+        return code in self.names
+
+    # ------------------------------------------------------------------
+    # 로드 / 저장
+    # ------------------------------------------------------------------
+    def load(self, kiwoom, markets=None, today=None, force=False):
+        """당일 캐시 파일이 있으면 읽고, 없으면 키움에서 받아 저장
+
+        Returns:
+            True: 키움에서 새로 받음, False: 캐시 파일 사용
+        """
+        self.kiwoom = kiwoom
+        markets = tuple(markets or Config.SYMBOL_MARKETS)
+        today = (today or date.today()).strftime("%Y%m%d")
+        if not force and self.read_cache(today, markets):
+            logger.info(f"✅ 종목 마스터 {len(self.names):,}개 (캐시 {self.loaded_date})")
+            return False
+
+        self.refresh(kiwoom, markets, today)
+        try:
+            self.save(markets)
+        except OSError as e:
+            logger.warning(f"⚠️ 종목 마스터 저장 실패: {e}")
+        logger.info(f"✅ 종목 마스터 {len(self.names):,}개 수신")
+        return True
+
+    def refresh(self, kiwoom, markets=None, today=None):
+        """키움에서 시장별 종목 목록과 종목명을 받아 인덱스 재구성"""
+        names, code_markets = {}, {}
+        for market in markets or Config.SYMBOL_MARKETS:
+            for code in kiwoom.get_code_list_by_market(market).split(';'):
+                # 여러 시장에 걸친 종목은 먼저 받은 시장 기준
+                if code and code not in names:
+                    names[code] = kiwoom.get_master_code_name(code).strip()
+                    code_markets[code] = market
+        self.names = names
+        self.markets = code_markets
+        self.loaded_date = today or date.today().strftime("%Y%m%d")
+        self._invalidate()
+
+    def read_cache(self, today, markets):
+        """캐시 파일이 오늘 받은 같은 시장 목록이면 읽어 들임"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 종목 마스터 캐시 읽기 실패: {e}")
+            return False
+        if (data.get('version') != FORMAT_VERSION or data.get('date') != today
+                or tuple(data.get('markets', ())) != markets):
+            return False
+
+        self.names = {}
+        self.markets = {}
+        for code, name, market in data['symbols']:
+            self.names[code] = name
+            self.markets[code] = market
+        self.loaded_date = today
+        self._invalidate()
+        return True
+
+    def save(self, markets=None):
+        """캐시 파일 저장 (임시 파일에 쓰고 교체)"""
+        if not self.path:
+            return
+        data = {
+            'version': FORMAT_VERSION,
+            'date': self.loaded_date,
+            'markets': list(markets or Config.SYMBOL_MARKETS),
+            'symbols': [[code, name, self.markets.get(code, "")] for code, name in self.names.items()],
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def name(self, code):
+        """종목명 (마스터에 없는 종목은 최초 1회만 COM 조회 후 기억)"""
+        name = self.names.get(code)
+        if name is None:
+            name = self._resolve(code)
+        return name
+
+    def _resolve(self, code):
+        self.misses += 1
+        name = ""
+        if self.kiwoom is not None:
+            try:
+                name = self.kiwoom.get_master_code_name(code).strip()
+            except Exception as e:
+                logger.warning(f"⚠️ 종목명 조회 실패 ({code}): {e}")
+        self.add(code, name)
+        return name
+
+    def market(self, code):
+        return self.markets.get(code, "")
+
+    def add(self, code, name, market=""):
+        """종목 1개 추가/갱신"""
+        self.names[code] = name
+        if market:
+            self.markets[code] = market
+        self._invalidate()
+
+    def _invalidate(self):
+        self._name_index = None
+        self._code_index = None
+
+    def _indexes(self):
+        if self._name_index is None:
+            self._name_index = sorted((name.casefold(), code) for code, name in self.names.items() if name)
+            self._code_index = sorted(self.names)
+        return self._name_index, self._code_index
+
+    def search(self, text, limit=None):
+        """종목명 또는 종목코드 접두어 검색
+
+        Returns:
+            [(종목코드, 종목명)] - 종목코드가 정확히 일치하면 맨 앞, 이후 종목명 / 종목코드 순
+        """
+        text = text.strip()
+        if not text:
+            return []
+        limit = limit or Config.SYMBOL_SEARCH_LIMIT
+        name_index, code_index = self._indexes()
+
+        results = []
+        seen = set()
+        if text in self.names:
+            results.append(text)
+            seen.add(text)
+
+        key = text.casefold()
+        i = bisect.bisect_left(name_index, (key,))
+        while i < len(name_index) and len(results) < limit and name_index[i][0].startswith(key):
+            code = name_index[i][1]
+            if code not in seen:
+                results.append(code)
+                seen.add(code)
+            i += 1
+
+        if text.isalnum():
+            i = bisect.bisect_left(code_index, text)
+            while i < len(code_index) and len(results) < limit and code_index[i].startswith(text):
+                if code_index[i] not in seen:
+                    results.append(code_index[i])
+                    seen.add(code_index[i])
+                i += 1
+        return [(code, self.names[code]) for code in results]
+
+
+class SymbolCompleterModel(QAbstractListModel):
+    """종목 입력창 자동완성 목록 (화면에는 '종목명 (코드)', 선택하면 종목코드 입력)"""
+
+    def __init__(self, master, parent=None):
+        super().__init__(parent)
+        self.master = master
+        self.items = []  # [(종목코드, 종목명)]
+
+    def search(self, text):
+        self.beginResetModel()
+        self.items = self.master.search(text)
+        self.endResetModel()
+        return len(self.items)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code, name = self.items[index.row()]
+        if role == Qt.DisplayRole:
+            market = MARKET_NAMES.get(self.master.market(code), "")
+            return f"{name} ({code})" + (f" {market}" if market else "")
+        if role == Qt.EditRole:
+            return code
+        return None
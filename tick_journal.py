@@ -0,0 +1,371 @@
+# 틱/조건검색 이벤트 저널
+# Qt 스레드는 큐에 튜플만 넣고, 백그라운드 스레드가 고정 길이 레코드 블록으로 압축해서
+# 일자별 파일에 이어 쓴다. 블록 시간 인덱스로 구간 재생이 가능하다.
+#
+#   {root}/{YYYYMMDD}.tj   : [블록 헤더 + 압축 레코드] 반복
+#   {root}/{YYYYMMDD}.tji  : 블록별 (첫 시각, 마지막 시각, 파일 위치, 레코드 수)
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 레코드 종류
+KIND_TICK = 0
+KIND_CONDITION_IN = 1  # 조건 편입
+KIND_CONDITION_OUT = 2  # 조건 이탈
+
+RECORD_DTYPE = np.dtype([
+    ('ts', '<i8'),  # 수신 시각 (epoch ns)
+    ('code', 'S6'),
+    ('kind', 'u1'),
+    ('condition', '<i2'),  # 조건식 인덱스 (틱은 -1)
+    ('time', '<i4'),  # 체결시간 HHMMSS
+    ('price', '<i4'),
+    ('change', '<i4'),
+    ('rate', '<f4'),
+    ('volume', '<i8'),  # 누적거래량
+    ('trade_volume', '<i4'),
+])
+
+BLOCK_MAGIC = b'TJB1'
+BLOCK_HEADER = struct.Struct('<4sBIIIqq')  # magic, 코덱, 레코드수, 원본크기, 압축크기, 첫 시각, 마지막 시각
+INDEX_ENTRY = struct.Struct('<qqQI')  # 첫 시각, 마지막 시각, 블록 위치, 레코드수
+
+CODEC_NONE, CODEC_ZLIB, CODEC_LZ4, CODEC_ZSTD = 0, 1, 2, 3
+CODEC_NAMES = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB, 'lz4': CODEC_LZ4, 'zstd': CODEC_ZSTD}
+
+
+def _load_codec(codec_id):
+    """코덱 id -> (압축 함수, 해제 함수)"""
+    if codec_id == CODEC_ZSTD:
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+    if codec_id == CODEC_LZ4:
+        import lz4.frame
+        return lz4.frame.compress, lz4.frame.decompress
+    if codec_id == CODEC_ZLIB:
+        return (lambda data: zlib.compress(data, 1)), zlib.decompress
+    return bytes, bytes
+
+
+def select_codec(name=None):
+    """설정된 코덱 id 반환 ('auto' 이면 zstd > lz4 > zlib 순으로 설치된 것 사용)"""
+    name = name or Config.JOURNAL_CODEC
+    if name != 'auto':
+        return CODEC_NAMES[name]
+
+    for codec_id in (CODEC_ZSTD, CODEC_LZ4):
+        try:
+            _load_codec(codec_id)
+            return codec_id
+        except ImportError:
+            continue
+    return CODEC_ZLIB
+
+
+def journal_path(root_dir, day):
+    return os.path.join(root_dir, f"{day}.tj")
+
+
+class TickJournalWriter:
+    """백그라운드 저널 기록기"""
+
+    def __init__(self, root_dir=None, codec=None, block_records=None, flush_interval=None):
+        self.root_dir = root_dir or Config.JOURNAL_DIR
+        self.codec_id = select_codec(codec)
+        self.compress = _load_codec(self.codec_id)[0]
+        self.block_records = block_records or Config.JOURNAL_BLOCK_RECORDS
+        self.flush_interval = flush_interval or Config.JOURNAL_FLUSH_INTERVAL_SEC
+
+        # deque.append/popleft 는 락 없이 스레드 간 안전하게 동작한다
+        self.queue = deque()
+        self.buffer = []  # 아직 블록으로 쓰지 않은 레코드 배열
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+
+        self.day = None
+        self.day_end_ns = 0
+        self.data_file = None
+        self.index_file = None
+
+        self.written = 0
+        self.blocks = 0
+        self._stop = threading.Event()
+        self.thread = None
+
+    # ------------------------------------------------------------------
+    # 생산자 (Qt 스레드)
+    # ------------------------------------------------------------------
+    def write_tick(self, tick):
+        """Tick 레코드 기록 요청"""
+        self.queue.append((time.time_ns(), tick.code, KIND_TICK, -1, tick.time, tick.price,
+                           tick.change, tick.rate, tick.volume, tick.trade_volume))
+
+    def write_condition(self, code, event_type, condition_index):
+        """조건검색 편입('I')/이탈('D') 이벤트 기록 요청"""
+        kind = KIND_CONDITION_IN if event_type == "I" else KIND_CONDITION_OUT
+        self.queue.append((time.time_ns(), code, kind, int(condition_index), -1, 0, 0, 0.0, 0, 0))
+
+    # ------------------------------------------------------------------
+    # 기록 스레드
+    # ------------------------------------------------------------------
+    def start(self):
+        if self.thread is None:
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._run, name="tick-journal", daemon=True)
+            self.thread.start()
+
+    def close(self):
+        """남은 레코드를 모두 기록하고 종료"""
+        if self.thread is not None:
+            self._stop.set()
+            self.thread.join()
+            self.thread = None
+        else:
+            self._drain(force=True)
+        if self.buffered:
+            logger.error(f"❌ 틱 저널 종료 - 기록하지 못한 레코드 {self.buffered:,}건")
+        self._close_files()
+
+    def _run(self):
+        while not self._stop.wait(0.05):
+            try:
+                self._drain()
+            except Exception as e:
+                logger.error(f"❌ 틱 저널 기록 오류: {e}")
+        self._drain(force=True)
+
+    def _drain(self, force=False):
+        records = []
+        popleft = self.queue.popleft
+        try:
+            while True:
+                records.append(popleft())
+        except IndexError:
+            pass
+
+        if records:
+            self.buffer.append(np.array(records, dtype=RECORD_DTYPE))
+            self.buffered += len(records)
+
+        if self.buffered >= self.block_records or (
+                self.buffered and (force or time.monotonic() - self.last_flush >= self.flush_interval)):
+            self._flush()
+
+    def _flush(self):
+        records = np.concatenate(self.buffer) if len(self.buffer) > 1 else self.buffer[0]
+        self.last_flush = time.monotonic()
+
+        # 날짜가 바뀌는 지점에서 파일을 나눈다. 버퍼는 블록을 다 쓴 뒤에만 비우고,
+        # 쓰기에 실패하면 아직 쓰지 않은 레코드를 남겨 다음 주기에 다시 쓴다
+        try:
+            while len(records):
+                if records['ts'][0] >= self.day_end_ns or self.data_file is None:
+                    self._open_day(int(records['ts'][0]))
+                split = min(int(np.searchsorted(records['ts'], self.day_end_ns)), self.block_records)
+                self._write_block(records[:split])
+                records = records[split:]
+        except Exception as e:
+            logger.error(f"❌ 틱 저널 쓰기 실패 - {len(records):,}건 보관 후 재시도: {e}")
+            self.buffer = [records]
+            self.buffered = len(records)
+            return
+
+        self.buffer = []
+        self.buffered = 0
+
+    def _open_day(self, ts_ns):
+        self._close_files()
+        day = datetime.fromtimestamp(ts_ns / 1e9)
+        midnight = datetime(day.year, day.month, day.day) + timedelta(days=1)
+        self.day = day.strftime("%Y%m%d")
+        self.day_end_ns = int(midnight.timestamp() * 1e9)
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = journal_path(self.root_dir, self.day)
+        self.data_file = open(path, 'ab')
+        self.index_file = open(path + 'i', 'ab')
+
+    def _write_block(self, records):
+        raw = records.tobytes()
+        payload = self.compress(raw)
+        offset = self.data_file.tell()
+        first_ts, last_ts = int(records['ts'][0]), int(records['ts'][-1])
+
+        try:
+            self.data_file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, self.codec_id, len(records),
+                                                   len(raw), len(payload), first_ts, last_ts))
+            self.data_file.write(payload)
+            self.data_file.flush()
+        except OSError:
+            # 반쯤 쓴 블록은 잘라내서 다시 쓸 때 파일이 깨지지 않게 한다
+            self.data_file.truncate(offset)
+            raise
+        self.index_file.write(INDEX_ENTRY.pack(first_ts, last_ts, offset, len(records)))
+        self.index_file.flush()
+
+        self.written += len(records)
+        self.blocks += 1
+
+    def _close_files(self):
+        for f in (self.data_file, self.index_file):
+            if f is not None:
+                f.close()
+        self.data_file = self.index_file = None
+
+
+class TickJournalReader:
+    """일자별 저널 파일 읽기/재생"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = self._load_index()
+
+    def _load_index(self):
+        index_path = self.path + 'i'
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % INDEX_ENTRY.size
+            return list(INDEX_ENTRY.iter_unpack(data[:usable]))
+
+        # 인덱스가 없으면 블록 헤더를 훑어서 만든다
+        index = []
+        with open(self.path, 'rb') as f:
+            while True:
+                offset = f.tell()
+                header = f.read(BLOCK_HEADER.size)
+                if len(header) < BLOCK_HEADER.size:
+                    break
+                _, _, count, _, comp_len, first_ts, last_ts = BLOCK_HEADER.unpack(header)
+                f.seek(comp_len, os.SEEK_CUR)
+                index.append((first_ts, last_ts, offset, count))
+        return index
+
+    def __len__(self):
+        return sum(entry[3] for entry in self.index)
+
+    def blocks(self, start_ts=None, end_ts=None):
+        """구간에 걸치는 블록을 레코드 배열로 반환 (시간 인덱스로 나머지 블록은 건너뜀)"""
+        codecs = {}
+        with open(self.path, 'rb') as f:
+            for first_ts, last_ts, offset, count in self.index:
+                if start_ts is not None and last_ts < start_ts:
+                    continue
+                if end_ts is not None and first_ts > end_ts:
+                    break
+
+                f.seek(offset)
+                magic, codec_id, count, raw_len, comp_len, _, _ = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                if magic != BLOCK_MAGIC:
+                    raise ValueError(f"손상된 저널 블록: {self.path} @ {offset}")
+                if codec_id not in codecs:
+                    codecs[codec_id] = _load_codec(codec_id)[1]
+
+                records = np.frombuffer(codecs[codec_id](f.read(comp_len)), dtype=RECORD_DTYPE)
+                if start_ts is not None or end_ts is not None:
+                    mask = np.ones(len(records), dtype=bool)
+                    if start_ts is not None:
+                        mask &= records['ts'] >= start_ts
+                    if end_ts is not None:
+                        mask &= records['ts'] <= end_ts
+                    records = records[mask]
+                yield records
+
+    def read(self, start_ts=None, end_ts=None):
+        """구간 레코드 전체를 하나의 배열로 반환"""
+        chunks = list(self.blocks(start_ts, end_ts))
+        if not chunks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(chunks)
+
+    def replay(self, on_tick, on_condition=None, start_ts=None, end_ts=None):
+        """레코드를 시간 순서대로 콜백에 전달 (최대 속도)
+
+        on_tick(code, price, volume, time_hhmmss)
+        on_condition(code, event_type, condition_index)
+
+        Returns:
+            전달한 레코드 수
+        """
+        count = 0
+        for records in self.blocks(start_ts, end_ts):
+            ticks = records['kind'] == KIND_TICK
+            if on_condition is None or ticks.all():
+                selected = records[ticks] if on_condition is None else records
+                codes = selected['code'].astype('U6').tolist()
+                for code, price, volume, t in zip(codes, selected['price'].tolist(),
+                                                  selected['volume'].tolist(), selected['time'].tolist()):
+                    on_tick(code, price, volume, t)
+                count += len(selected)
+                continue
+
+            for record in records.tolist():
+                code = record[1].decode()
+                if record[2] == KIND_TICK:
+                    on_tick(code, record[5], record[8], record[4])
+                else:
+                    on_condition(code, "I" if record[2] == KIND_CONDITION_IN else "D", record[3])
+            count += len(records)
+        return count
+
+    def replay_blocks(self, on_ticks, on_condition=None, start_ts=None, end_ts=None, batch_records=None):
+        """틱 레코드를 틱별 콜백 없이 배열로 묶어서 전달 (벡터화 전략 재생용)
+
+        on_ticks(records): 시간 순 틱 레코드 배열 (RECORD_DTYPE, 블록 여러 개를 이어 붙임)
+        on_condition(code, event_type, condition_index): 앞선 틱 배열을 먼저 넘긴 뒤 호출
+
+        Returns:
+            전달한 레코드 수
+        """
+        batch_records = batch_records or Config.JOURNAL_REPLAY_BATCH_RECORDS
+        pending = []
+        pending_count = 0
+        count = 0
+
+        def flush():
+            nonlocal pending, pending_count
+            if pending_count:
+                on_ticks(np.concatenate(pending) if len(pending) > 1 else pending[0])
+            pending = []
+            pending_count = 0
+
+        for records in self.blocks(start_ts, end_ts):
+            ticks = records['kind'] == KIND_TICK
+            if ticks.all():
+                runs = [records]
+                events = []
+            elif on_condition is None:
+                runs = [records[ticks]]
+                events = []
+            else:
+                # 조건 이벤트 앞뒤로 틱 구간을 나눠 순서 유지
+                positions = np.flatnonzero(~ticks)
+                runs = np.split(records, positions)
+                runs = [runs[0]] + [run[1:] for run in runs[1:]]
+                events = records[positions].tolist()
+
+            for i, run in enumerate(runs):
+                if i:
+                    flush()
+                    record = events[i - 1]
+                    on_condition(record[1].decode(), "I" if record[2] == KIND_CONDITION_IN else "D", record[3])
+                    count += 1
+                if len(run):
+                    pending.append(run)
+                    pending_count += len(run)
+                    count += len(run)
+            if pending_count >= batch_records:
+                flush()
+        flush()
+        return count
@@ -0,0 +1,202 @@
+# TR 응답 레코드 디코더
+# TR 코드별 필드 스키마(싱글/멀티 레코드)로 응답을 한 번에 컬럼 배열로 변환한다.
+# 멀티 레코드는 GetCommDataEx 한 번으로 전체 행을 받고, 지원하지 않는 백엔드에서만 필드별 GetCommData 로 보완한다.
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 필드 종류
+FIELD_STR = 'str'  # 문자열 (앞뒤 공백 제거)
+FIELD_CODE = 'code'  # 종목코드 ('A' 접두어 제거)
+FIELD_INT = 'int'  # 부호 있는 정수 (손익 등)
+FIELD_PRICE = 'price'  # 부호 없는 정수 (가격/수량 - 부호는 대비 방향이라 버림)
+FIELD_FLOAT = 'float'  # 실수 (수익률 등)
+FIELD_SKIP = None  # 사용하지 않는 출력 필드 (GetCommDataEx 열 위치 유지용)
+
+# name: TR 출력 항목명, key: 결과 컬럼 이름
+TrField = namedtuple('TrField', ['name', 'key', 'kind'])
+
+# single: {컬럼: 값}, rows: {컬럼: ndarray}, count: 멀티 행 수
+TrPage = namedtuple('TrPage', ['single', 'rows', 'count'])
+
+
+class TrSchema:
+    """TR 1개의 싱글/멀티 레코드 필드 배치
+
+    multi 는 KOA 출력 항목 순서 그대로 적는다 (GetCommDataEx 가 이 순서로 열을 돌려준다).
+    """
+
+    def __init__(self, trcode, single=(), multi=(), single_record="", multi_record=""):
+        self.trcode = trcode
+        self.single = [TrField(*field) for field in single]
+        self.multi = [TrField(*field) for field in multi]
+        self.single_record = single_record
+        self.multi_record = multi_record
+        # 사용하는 멀티 필드의 (열 위치, 필드)
+        self.columns = [(i, field) for i, field in enumerate(self.multi) if field.kind is not FIELD_SKIP]
+
+
+OPW00018 = TrSchema(
+    "opw00018",
+    single_record="계좌평가결과",
+    single=[
+        ("총매입금액", 'total_buy', FIELD_PRICE),
+        ("총평가금액", 'total_eval', FIELD_PRICE),
+        ("총평가손익금액", 'total_eval_profit', FIELD_INT),
+        ("총수익률(%)", 'total_profit_rate', FIELD_FLOAT),
+        ("추정예탁자산", 'estimated_assets', FIELD_PRICE),
+        ("예수금", 'deposit', FIELD_PRICE),
+        ("총평가액", 'total_value', FIELD_PRICE),
+        ("총손익금액", 'total_profit', FIELD_INT),
+    ],
+    multi_record="계좌평가잔고개별합산",
+    multi=[
+        ("종목번호", 'code', FIELD_CODE),
+        ("종목명", 'name', FIELD_STR),
+        ("평가손익", 'profit', FIELD_INT),
+        ("수익률(%)", 'profit_rate', FIELD_FLOAT),
+        ("매입가", 'buy_price', FIELD_PRICE),
+        ("전일종가", 'prev_close', FIELD_PRICE),
+        ("보유수량", 'quantity', FIELD_PRICE),
+        ("매매가능수량", 'available', FIELD_PRICE),
+        ("현재가", 'current_price', FIELD_PRICE),
+        ("전일매수수량", None, FIELD_SKIP),
+        ("전일매도수량", None, FIELD_SKIP),
+        ("금일매수수량", None, FIELD_SKIP),
+        ("금일매도수량", None, FIELD_SKIP),
+        ("매입금액", 'buy_amount', FIELD_PRICE),
+        ("매입수수료", None, FIELD_SKIP),
+        ("평가금액", 'eval_amount', FIELD_PRICE),
+        ("평가수수료", None, FIELD_SKIP),
+        ("세금", None, FIELD_SKIP),
+        ("수수료합", None, FIELD_SKIP),
+        ("보유비중(%)", None, FIELD_SKIP),
+        ("신용구분", None, FIELD_SKIP),
+        ("신용구분명", None, FIELD_SKIP),
+        ("대출일", None, FIELD_SKIP),
+    ],
+)
+
+TR_SCHEMAS = {schema.trcode: schema for schema in (OPW00018,)}
+
+
+# ----------------------------------------------------------------------
+# 값 변환
+# ----------------------------------------------------------------------
+def _int_or_zero(text):
+    text = text.strip()
+    return int(text) if text else 0
+
+
+def _float_or_zero(text):
+    text = text.strip()
+    return float(text) if text else 0.0
+
+
+def convert_value(text, kind):
+    """필드 1개 변환 (빈 값은 0 / 빈 문자열)"""
+    if kind == FIELD_STR:
+        return text.strip()
+    if kind == FIELD_CODE:
+        return text.strip().lstrip('A')
+    try:
+        if kind == FIELD_FLOAT:
+            return _float_or_zero(text)
+        value = _int_or_zero(text)
+    except ValueError:
+        logger.warning(f"⚠️ TR 값 변환 실패: {text!r}")
+        return 0.0 if kind == FIELD_FLOAT else 0
+    return abs(value) if kind == FIELD_PRICE else value
+
+
+def convert_column(values, kind):
+    """컬럼 1개 변환 (int()/float() 는 앞뒤 공백, 부호, 앞자리 0 을 그대로 처리한다)"""
+    n = len(values)
+    if kind == FIELD_STR:
+        return np.array([value.strip() for value in values], dtype=str)
+    if kind == FIELD_CODE:
+        return np.array([value.strip().lstrip('A') for value in values], dtype=str)
+    try:
+        if kind == FIELD_FLOAT:
+            return np.fromiter(map(float, values), np.float64, n)
+        column = np.fromiter(map(int, values), np.int64, n)
+    except ValueError:
+        # 빈 값이 섞인 경우만 값별로 처리
+        dtype = np.float64 if kind == FIELD_FLOAT else np.int64
+        column = np.fromiter((convert_value(value, kind) for value in values), dtype, n)
+    return np.abs(column) if kind == FIELD_PRICE else column
+
+
+# ----------------------------------------------------------------------
+# 디코더
+# ----------------------------------------------------------------------
+class TrDecoder:
+    """스키마 기반 TR 응답 변환 (OnReceiveTrData 안에서 호출)"""
+
+    def __init__(self, kiwoom, schemas=None):
+        self.kiwoom = kiwoom
+        self.schemas = dict(schemas or TR_SCHEMAS)
+        # GetCommDataEx 를 못 쓰면 (미지원/열 배치 불일치) 필드별 조회로 전환
+        self.use_ex = hasattr(kiwoom, "get_comm_data_ex")
+
+    def decode(self, trcode, rqname, schema=None):
+        """응답 1페이지를 TrPage 로 변환"""
+        schema = schema or self.schemas[trcode]
+        single = self.decode_single(schema, trcode, rqname)
+        rows, count = self.decode_multi(schema, trcode, rqname)
+        return TrPage(single, rows, count)
+
+    def decode_single(self, schema, trcode, rqname):
+        get = self.kiwoom.get_comm_data
+        return {field.key: convert_value(get(trcode, schema.single_record, rqname, 0, field.name), field.kind)
+                for field in schema.single}
+
+    def decode_multi(self, schema, trcode, rqname):
+        if not schema.columns:
+            return {}, 0
+        table = self._fetch_ex(schema, trcode) if self.use_ex else None
+        if table is None:
+            return self._fetch_by_field(schema, trcode, rqname)
+
+        count = len(table)
+        rows = {}
+        for i, field in schema.columns:
+            rows[field.key] = convert_column([row[i] for row in table], field.kind)
+        return rows, count
+
+    def _fetch_ex(self, schema, trcode):
+        """GetCommDataEx 로 전체 행 (열 수가 스키마와 다르면 None)"""
+        try:
+            table = self.kiwoom.get_comm_data_ex(trcode, schema.multi_record)
+        except Exception as e:
+            logger.warning(f"⚠️ GetCommDataEx 실패 - 필드별 조회로 전환: {e}")
+            self.use_ex = False
+            return None
+        if table is None:
+            return None
+        table = list(table)
+        if table and any(len(row) < len(schema.multi) for row in table):
+            logger.warning(f"⚠️ {trcode} GetCommDataEx 열 수가 스키마와 다름 - 필드별 조회로 전환")
+            self.use_ex = False
+            return None
+        return table
+
+    def _fetch_by_field(self, schema, trcode, rqname):
+        """GetCommData 필드별 조회 (필드 하나씩 전체 행을 모아 컬럼 변환)"""
+        get = self.kiwoom.get_comm_data
+        count = self.kiwoom.get_repeat_cnt(trcode, rqname)
+        rows = {}
+        for _, field in schema.columns:
+            values = [get(trcode, schema.multi_record, rqname, i, field.name) for i in range(count)]
+            rows[field.key] = convert_column(values, field.kind)
+        return rows, count
+
+
+def page_records(page):
+    """TrPage 멀티 컬럼 -> 행별 dict 목록"""
+    keys = list(page.rows)
+    columns = [page.rows[key].tolist() for key in keys]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
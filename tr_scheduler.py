@@ -0,0 +1,267 @@
+# TR 요청 스케줄러
+# 모든 TR 조회를 한 곳에서 큐잉해서 키움 조회 제한(초당/시간당)을 넘지 않도록 보낸다.
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from PyQt5.QtCore import QObject, QTimer
+
+from config import Config
+from metrics import registry
+from screen_pool import ScreenPool
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_INTERACTIVE = 0  # 사용자 조작 (잔고 조회 등)
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2  # 과거 데이터 백필 등 대량 조회
+
+# 조회 과부하 오류코드
+ERR_OVERLOAD = -200
+
+
+class TrRequestError(Exception):
+    """TR 요청 실패"""
+
+    def __init__(self, rqname, message, err_code=None):
+        super().__init__(f"{rqname}: {message}")
+        self.rqname = rqname
+        self.err_code = err_code
+
+
+class RateLimiter:
+    """슬라이딩 윈도우 전송 제한 (어느 window 초 구간에도 전송이 limit 건을 넘지 않음)"""
+
+    def __init__(self, limit, window, clock=time.monotonic):
+        self.limit = int(limit)
+        self.window = window
+        self.clock = clock
+        self.sent = deque()  # 최근 window 초 안의 전송 시각
+        self.blocked_until = None
+
+    def _expire(self, now):
+        sent = self.sent
+        while sent and sent[0] <= now - self.window:
+            sent.popleft()
+
+    def available(self):
+        now = self.clock()
+        if self.blocked_until is not None and now < self.blocked_until:
+            return False
+        self._expire(now)
+        return len(self.sent) < self.limit
+
+    def take(self):
+        """전송 1건 기록 (제한에 걸리면 False)"""
+        if not self.available():
+            return False
+        self.sent.append(self.clock())
+        return True
+
+    def wait_time(self):
+        """다음 전송까지 남은 시간(초)"""
+        now = self.clock()
+        wait = 0.0
+        if self.blocked_until is not None:
+            wait = max(wait, self.blocked_until - now)
+        self._expire(now)
+        if len(self.sent) >= self.limit:
+            wait = max(wait, self.sent[-self.limit] + self.window - now)
+        return wait
+
+    def drain(self):
+        """과부하 응답을 받았을 때 한 구간 동안 전송을 멈춘다"""
+        self.blocked_until = self.clock() + self.window
+
+
+class TrRequest:
+    """대기/진행 중인 TR 요청"""
+
+    def __init__(self, rqname, trcode, inputs, parser, priority, callback,
+                 follow_pages, continue_if, max_pages):
+        self.rqname = rqname
+        self.trcode = trcode
+        self.inputs = list(inputs.items()) if isinstance(inputs, dict) else list(inputs)
+        self.parser = parser  # parser(rqname, trcode) -> 페이지 데이터 (OnReceiveTrData 안에서 호출)
+        self.priority = priority
+        self.callback = callback  # callback(pages)
+        self.follow_pages = follow_pages
+        self.continue_if = continue_if  # continue_if(page) -> 다음 페이지 조회 여부
+        self.max_pages = max_pages
+        self.future = Future()
+        self.pages = []
+        self.next = 0  # 0: 최초 조회, 2: 연속 조회
+        self.screen_no = None
+        self.sent_at = None
+        self.seq = 0
+
+
+class TrScheduler(QObject):
+    """우선순위 큐 + 슬라이딩 윈도우 제한 기반 TR 스케줄러"""
+
+    def __init__(self, kiwoom, clock=time.monotonic, per_second=None, per_hour=None, screen_pool=None):
+        super().__init__()
+        self.kiwoom = kiwoom
+        self.clock = clock
+        self.second_limit = RateLimiter(per_second or Config.TR_RATE_PER_SECOND, 1.0, clock)
+        self.hour_limit = RateLimiter(per_hour or Config.TR_RATE_PER_HOUR, 3600.0, clock)
+        self.screens = screen_pool or ScreenPool(Config.TR_SCREEN_START, Config.TR_SCREEN_COUNT)
+        self.timeout = Config.TR_TIMEOUT_SEC
+
+        self.queue = []  # (우선순위, 순번, 요청)
+        self.in_flight = {}  # 화면번호 -> 요청
+        self._seq = itertools.count()
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.pump)
+
+    def start(self, interval_ms=None):
+        """주기적으로 큐 처리 시작"""
+        self.timer.start(interval_ms or Config.TR_PUMP_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def submit(self, rqname, trcode, inputs, parser=None, priority=PRIORITY_NORMAL, callback=None,
+               follow_pages=True, continue_if=None, max_pages=None):
+        """TR 요청 등록
+
+        Args:
+            rqname: 사용자 구분명
+            trcode: TR 코드 (예: opw00018)
+            inputs: SetInputValue 입력값 {항목명: 값}
+            parser: 응답 페이지 파서 parser(rqname, trcode)
+            priority: PRIORITY_INTERACTIVE / PRIORITY_NORMAL / PRIORITY_BULK
+            callback: 완료 시 callback(pages) 호출
+            follow_pages: prev_next == "2" 이면 연속 조회 자동 진행
+            continue_if: 페이지별 연속 조회 여부 판단 함수
+            max_pages: 최대 페이지 수
+
+        Returns:
+            TrRequest (request.future 로 결과 대기 가능)
+        """
+        request = TrRequest(rqname, trcode, inputs, parser, priority, callback,
+                            follow_pages, continue_if, max_pages)
+        self._enqueue(request)
+        self.pump()
+        return request
+
+    def _enqueue(self, request):
+        # 연속 조회는 최초 순번을 유지해서 같은 우선순위의 새 요청보다 먼저 나간다
+        if request.next == 0:
+            request.seq = next(self._seq)
+        heapq.heappush(self.queue, (request.priority, request.seq, request))
+
+    def pending_count(self):
+        return len(self.queue)
+
+    def pump(self):
+        """제한 범위 안에서 대기 중인 요청 전송"""
+        self._check_timeouts()
+
+        while self.queue:
+            if not (self.second_limit.available() and self.hour_limit.available()):
+                break
+
+            request = self.queue[0][2]
+            if request.screen_no is None:
+                request.screen_no = self.screens.acquire()
+                if request.screen_no is None:
+                    break  # 화면번호가 모두 사용 중
+
+            heapq.heappop(self.queue)
+            self.second_limit.take()
+            self.hour_limit.take()
+            self._send(request)
+
+    def _send(self, request):
+        for key, value in request.inputs:
+            self.kiwoom.set_input_value(key, value)
+
+        request.sent_at = self.clock()
+        self.in_flight[request.screen_no] = request
+        err_code = self.kiwoom.comm_rq_data(request.rqname, request.trcode, request.next, request.screen_no)
+
+        if err_code == 0:
+            return
+
+        del self.in_flight[request.screen_no]
+        if err_code == ERR_OVERLOAD:
+            # 서버 측 제한에 걸리면 1초 동안 멈추고 다시 대기
+            logger.warning(f"⚠️ TR 조회 과부하 - 재시도 대기: {request.rqname}")
+            self.second_limit.drain()
+            self._enqueue(request)
+        else:
+            self._fail(request, TrRequestError(request.rqname, f"요청 실패 ({err_code})", err_code))
+
+    def _check_timeouts(self):
+        if not self.in_flight:
+            return
+        now = self.clock()
+        for screen_no, request in list(self.in_flight.items()):
+            if now - request.sent_at > self.timeout:
+                del self.in_flight[screen_no]
+                self._fail(request, TrRequestError(request.rqname, "응답 시간 초과"))
+
+    def on_receive_tr_data(self, screen_no, rqname, trcode, record_name, prev_next):
+        """OnReceiveTrData 처리 (스케줄러 요청이 아니면 False)"""
+        request = self.in_flight.get(screen_no)
+        if request is None or request.rqname != rqname:
+            return False
+
+        del self.in_flight[screen_no]
+        registry.histogram("kiwoom_tr_roundtrip_seconds", "TR 요청 -> OnReceiveTrData 응답 시간",
+                           trcode=trcode).record(self.clock() - request.sent_at)
+
+        try:
+            page = request.parser(rqname, trcode) if request.parser else None
+        except Exception as e:
+            self._fail(request, e)
+            return True
+
+        request.pages.append(page)
+
+        if (prev_next == "2" and request.follow_pages
+                and (request.max_pages is None or len(request.pages) < request.max_pages)
+                and (request.continue_if is None or request.continue_if(page))):
+            request.next = 2
+            self._enqueue(request)
+        else:
+            self._complete(request)
+
+        self.pump()
+        return True
+
+    def _release(self, request):
+        if request.screen_no is not None:
+            self.screens.release(request.screen_no)
+            request.screen_no = None
+
+    def _complete(self, request):
+        self._release(request)
+        request.future.set_result(request.pages)
+        if request.callback:
+            try:
+                request.callback(request.pages)
+            except Exception as e:
+                logger.error(f"❌ TR 콜백 오류 ({request.rqname}): {e}")
+
+    def _fail(self, request, error):
+        self._release(request)
+        request.future.set_exception(error)
+        logger.error(f"❌ TR 요청 실패: {error}")
+
+    def clear(self):
+        """대기 중/진행 중인 요청 모두 취소"""
+        for _, _, request in self.queue:
+            self._release(request)
+            request.future.cancel()
+        for request in self.in_flight.values():
+            self._release(request)
+            request.future.cancel()
+        self.queue.clear()
+        self.in_flight.clear()